@@ -0,0 +1,390 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Benchmarks of the parts of the models that take the most time:
+              the model_dynamics right-hand side, switch_dataframe over 50
+              rounds, one evaluation of minimal_tumour_nr_t_4_situations_IH, a
+              whole dataframe_3D_plot grid, dynamics_MMd_MMr_limits over 500
+              generations, calculate_fitness with N = 10, 50 and 200 and
+              frac_to_fitness_values on 1000 rows. The results can be saved as
+              a JSON baseline and compared with an earlier baseline, so changes
+              to the integration can be checked for slowdowns.
+
+              Run all benchmarks and save them as baseline 'before':
+              python MM_benchmark.py --save before
+              Run two benchmarks and compare them with this baseline:
+              python MM_benchmark.py --compare before model_dynamics_rhs
+                                                        calculate_fitness_N50
+"""
+
+# Import the needed libraries
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import doctest
+import numpy as np
+from MM_paths import data_path
+from MM_parameters import number_parameters
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+# The benchmarks, with the names as keys and tuples (setup function, number of
+# repeats) as values
+BENCHMARKS = {}
+
+# The relative change in time that is seen as a real difference
+TOLERANCE = 0.1
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Run the benchmarks that are given
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description = 'Run the benchmarks.')
+        parser.add_argument('names', nargs = '*', help = 'the benchmarks, all '
+                                                'when no names are given')
+        parser.add_argument('--repeats', type = int, help = 'the number of '
+                                                        'measurements')
+        parser.add_argument('--save', help = 'save the results as baseline')
+        parser.add_argument('--compare', help = 'compare with this baseline')
+        arguments = parser.parse_args()
+
+        results = run_benchmarks(arguments.names or None, arguments.repeats,
+                                                                verbose = True)
+        if arguments.save:
+            print('Saved as', save_baseline(results, arguments.save))
+        if arguments.compare:
+            print(compare_results(results, load_baseline(
+                                        arguments.compare)).to_string())
+
+def benchmark(repeats = 5):
+    """Function that gives a decorator that adds a benchmark to BENCHMARKS.
+    The decorated function makes the inputs and gives the function that is
+    timed, so the set up time is not measured.
+
+    Parameters:
+    -----------
+    repeats: Int
+        The default number of measurements.
+
+    Example:
+    -----------
+    >>> @benchmark(repeats = 3)
+    ... def example_sum():
+    ...     values = np.arange(1000)
+    ...     return lambda: values.sum()
+    >>> BENCHMARKS['example_sum'][1]
+    3
+    >>> del BENCHMARKS['example_sum']
+    """
+    def decorator(setup):
+        BENCHMARKS[setup.__name__] = (setup, repeats)
+        return setup
+    return decorator
+
+def numbers_parameters():
+    """Function that gives the start values and parameters of the number model
+    as used in the figures of MM_model_nr_IH_inf.py (MM_parameters.py)."""
+    return number_parameters()
+
+@benchmark(repeats = 5)
+def model_dynamics_rhs():
+    """1000 calls of the model_dynamics right-hand side (number model)."""
+    import MM_model_nr_IH_inf as model
+    p = numbers_parameters()
+    y = [p['nOC'], p['nOB'], p['nMMd'], p['nMMr']]
+
+    def run():
+        for _ in range(1000):
+            model.model_dynamics(y, 0, p['growth_rates'], p['decay_rates'],
+                                                    p['matrix_no_GF_IH'], 0.3)
+    return run
+
+@benchmark(repeats = 5)
+def switch_dataframe_50_rounds():
+    """switch_dataframe with 50 rounds of IH administration and holiday."""
+    import MM_model_nr_IH_inf as model
+    p = numbers_parameters()
+    return lambda: model.switch_dataframe(30, 100, 5, 5, p['nOC'], p['nOB'],
+        p['nMMd'], p['nMMr'], p['growth_rates'], p['growth_rates_IH'],
+        p['decay_rates'], p['decay_rates_IH'], p['matrix_no_GF_IH'],
+        p['matrix_GF_IH'], 0.3)
+
+@benchmark(repeats = 3)
+def minimal_tumour_4_situations_IH():
+    """One evaluation of minimal_tumour_nr_t_4_situations_IH as in
+    minimise_MM_W_comb_GF_h_IH."""
+    import MM_model_nr_IH_inf as model
+    p = numbers_parameters()
+    t_step_IH_strength = [2.493, 3.227, 2.509, 3.520, 0.409, 0.085, 0.365,
+                                                                        0.089]
+    return lambda: model.minimal_tumour_nr_t_4_situations_IH(
+        t_step_IH_strength, model.switch_dataframe_W_comb_GF_h, False,
+        p['nOC'], p['nOB'], p['nMMd'], p['nMMr'], p['growth_rates'],
+        p['growth_rates_IH'], p['decay_rates'], p['decay_rates_IH'],
+        p['matrix_no_GF_IH'], p['matrix_GF_IH'], p['matrix_IH_comb'])
+
+@benchmark(repeats = 1)
+def dataframe_3D_plot_grid():
+    """A whole 20x20 dataframe_3D_plot grid of the number model, without the
+    result cache."""
+    import MM_model_nr_IH_inf as model
+    p = numbers_parameters()
+    return lambda: model.dataframe_3D_plot.uncached(p['nOC'], p['nOB'],
+        p['nMMd'], p['nMMr'], p['growth_rates'], p['growth_rates_IH'],
+        p['decay_rates'], p['decay_rates_IH'], p['matrix_no_GF_IH'],
+        p['matrix_GF_IH'], 0.3)
+
+@benchmark(repeats = 3)
+def dynamics_MMd_MMr_limits_500():
+    """dynamics_MMd_MMr_limits over 500 generations as in
+    Figure_AT_MMd_MMr_limit."""
+    import MM_model_nr_IH_inf as model
+    p = numbers_parameters()
+    matrix_no_GF_IH = np.array([
+        [0.0, 0.4, 0.51, 0.51],
+        [0.3, 0.0, -0.3, -0.3],
+        [0.55, 0.0, 0.5, 0.0],
+        [0.54, 0.0, -0.5, 0.7]])
+    matrix_GF_IH = np.array([
+        [0.0, 0.4, 0.51, 0.51],
+        [0.3, 0.0, -0.3, -0.3],
+        [0.08, 0.0, 0.5, 0.0],
+        [0.54, 0.0, -0.5, 0.7]])
+    return lambda: model.dynamics_MMd_MMr_limits(30, 500, 500, 250, 90, 160,
+        100, 10, p['growth_rates'], p['decay_rates'], matrix_no_GF_IH,
+        matrix_GF_IH)
+
+def calculate_fitness_benchmark(N):
+    """Function that gives the benchmark of calculate_fitness of the nonlinear
+    model of Sartakhti et al. with N cells."""
+    import model_S_nonlinear as model
+    return lambda: model.calculate_fitness(N, 0.3, 0.4, 0.3, 0.1, 0.2, 0.3,
+                                0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2)
+
+@benchmark(repeats = 5)
+def calculate_fitness_N10():
+    """calculate_fitness with N = 10."""
+    return calculate_fitness_benchmark(10)
+
+@benchmark(repeats = 5)
+def calculate_fitness_N50():
+    """calculate_fitness with N = 50."""
+    return calculate_fitness_benchmark(50)
+
+@benchmark(repeats = 3)
+def calculate_fitness_N200():
+    """calculate_fitness with N = 200."""
+    return calculate_fitness_benchmark(200)
+
+@benchmark(repeats = 5)
+def frac_to_fitness_values_1000():
+    """frac_to_fitness_values of the fraction model on 1000 rows."""
+    import MM_model_fractions as model
+    fractions = np.random.default_rng(0).dirichlet(np.ones(4), 1000)
+    df_fractions = pd.DataFrame(fractions, columns = ['xOC', 'xOB', 'xMMd',
+                                                                    'xMMr'])
+    matrix = np.array([
+        [0.0, 1.6, 2.2, 1.9],
+        [0.95, 0.0, -0.5, -0.5],
+        [2.2, 0.0, 0.2, 0.0],
+        [1.9, 0.0, -0.77, 0.2]])
+    return lambda: model.frac_to_fitness_values(df_fractions, 50, 1, 0.8, 1.2,
+                                                            1.3, matrix, 0.3)
+
+def time_function(function, repeats = 5):
+    """Function that measures how long a function takes.
+
+    Parameters:
+    -----------
+    function: Function
+        The function that is timed, without inputs.
+    repeats: Int
+        The number of measurements.
+
+    Returns:
+    --------
+    timing: Dictionary
+        The shortest, median and mean time in seconds and all times.
+
+    Example:
+    -----------
+    >>> timing = time_function(lambda: sum(range(1000)), 3)
+    >>> sorted(timing)
+    ['max', 'mean', 'median', 'min', 'repeats', 'times']
+    >>> timing['repeats']
+    3
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return {'min': min(times), 'median': statistics.median(times),
+            'mean': statistics.mean(times), 'max': max(times),
+            'repeats': repeats, 'times': times}
+
+def environment():
+    """Function that gives a description of the machine and library versions,
+    which is saved with the results."""
+    import scipy
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'scipy': scipy.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'system': platform.system(),
+            'processor': platform.processor(), 'cpu_count': os.cpu_count()}
+
+def run_benchmarks(names = None, repeats = None, verbose = False):
+    """Function that runs benchmarks. The result cache is turned off during the
+    benchmarks.
+
+    Parameters:
+    -----------
+    names: List
+        The names of the benchmarks, with None all benchmarks.
+    repeats: Int
+        The number of measurements, with None the default of every benchmark.
+    verbose: Bool
+        True to print the time of every benchmark.
+
+    Returns:
+    --------
+    results: Dictionary
+        The environment, the date and per benchmark the timing.
+
+    Example:
+    -----------
+    >>> results = run_benchmarks(['calculate_fitness_N10'], repeats = 2)
+    >>> list(results['benchmarks'])
+    ['calculate_fitness_N10']
+    """
+    names = list(BENCHMARKS) if names is None else list(names)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise KeyError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    # Turn the result cache off
+    cache_setting = os.environ.get('MM_CACHE')
+    os.environ['MM_CACHE'] = '0'
+    try:
+        timings = {}
+        for name in names:
+            setup, default_repeats = BENCHMARKS[name]
+            function = setup()
+            timings[name] = time_function(function, repeats or
+                                                            default_repeats)
+            if verbose:
+                print(f"{name}: {timings[name]['min']:.4f} s")
+    finally:
+        if cache_setting is None:
+            del os.environ['MM_CACHE']
+        else:
+            os.environ['MM_CACHE'] = cache_setting
+
+    return {'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'environment': environment(), 'benchmarks': timings}
+
+def baseline_path(name):
+    """Function that gives the path of a baseline file."""
+    return data_path('benchmarks', f'{name}.json')
+
+def save_baseline(results, name):
+    """Function that saves benchmark results as a JSON baseline.
+
+    Parameters:
+    -----------
+    results: Dictionary
+        The results of run_benchmarks.
+    name: String
+        The name of the baseline.
+
+    Returns:
+    --------
+    path: String
+        The path of the file.
+    """
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, 'w') as file:
+        json.dump(results, file, indent = 2)
+    return path
+
+def load_baseline(name):
+    """Function that loads a JSON baseline.
+
+    Parameters:
+    -----------
+    name: String
+        The name of the baseline or the path of the file.
+
+    Returns:
+    --------
+    results: Dictionary
+        The saved results.
+    """
+    path = name if name.endswith('.json') else baseline_path(name)
+    with open(path) as file:
+        return json.load(file)
+
+def compare_results(results, baseline, tolerance = TOLERANCE):
+    """Function that compares benchmark results with a baseline, using the
+    shortest time of every benchmark.
+
+    Parameters:
+    -----------
+    results: Dictionary
+        The new results.
+    baseline: Dictionary
+        The results of the baseline.
+    tolerance: Float
+        The relative change in time that is seen as a real difference.
+
+    Returns:
+    --------
+    df_comparison: DataFrame
+        Dataframe with per benchmark the baseline time, the new time, the ratio
+        of the two and whether it became faster, slower or stayed the same.
+
+    Example:
+    -----------
+    >>> baseline = {'benchmarks': {'a': {'min': 1.0}, 'b': {'min': 1.0}}}
+    >>> results = {'benchmarks': {'a': {'min': 0.5}, 'b': {'min': 1.05},
+    ...                                                 'c': {'min': 2.0}}}
+    >>> df = compare_results(results, baseline)
+    >>> df['change'].tolist()
+    ['faster', 'same', 'new']
+    >>> df['speedup'].round(2).tolist()[:2]
+    [2.0, 0.95]
+    """
+    rows = []
+    for name, timing in results['benchmarks'].items():
+        current = timing['min']
+        previous = baseline['benchmarks'].get(name, {}).get('min')
+        if previous is None:
+            ratio, change = np.nan, 'new'
+        else:
+            ratio = current / previous
+            if ratio < 1 - tolerance:
+                change = 'faster'
+            elif ratio > 1 + tolerance:
+                change = 'slower'
+            else:
+                change = 'same'
+        rows.append({'benchmark': name, 'baseline (s)': previous,
+                     'current (s)': current, 'speedup': 1 / ratio,
+                     'change': change})
+
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code of an on-disk cache for the results of expensive simulations,
+              such as the dataframes with the MM number or fraction for
+              different IH administration and holiday durations
+              (dataframe_3D_plot). The key of a result is a hash of the name of
+              the function, all its inputs and the model version, so a result
+              is only reused when the same function is called with the same
+              values. The results are saved as compressed pickle files in a
+              folder per model version. When the folder becomes larger than the
+              maximum size the results that are used the longest time ago are
+              removed.
+
+              A function is cached by adding @cached above it. Change
+              MODEL_VERSION when the model equations change, this makes all old
+              results invalid.
+"""
+
+# Import the needed libraries
+import numpy as np
+import os
+import glob
+import shutil
+import pickle
+import zlib
+import hashlib
+import inspect
+import functools
+import doctest
+import tempfile
+from MM_paths import data_path
+
+# The version of the model, change it when the model equations change
+MODEL_VERSION = '1'
+
+# The maximum size of the cache in bytes
+MAX_CACHE_SIZE = 2 * 1024 ** 3
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def update_hash(hash_object, value):
+    """Function that adds a value to a hash in a way that does not depend on
+    the type of the numbers, so 2, 2.0 and np.float64(2) give the same hash.
+
+    Parameters:
+    -----------
+    hash_object: hashlib object
+        The hash the value is added to.
+    value: Float, String, List, Tuple, Dictionary or Numpy.ndarray
+        The value, lists, tuples and dictionaries can contain other values.
+
+    Example:
+    -----------
+    >>> hash_1, hash_2 = hashlib.sha256(), hashlib.sha256()
+    >>> update_hash(hash_1, [2, np.array([0.5, 1])])
+    >>> update_hash(hash_2, [2.0, np.array([0.5, 1.0])])
+    >>> hash_1.hexdigest() == hash_2.hexdigest()
+    True
+    >>> update_hash(hash_1, object())
+    Traceback (most recent call last):
+    ...
+    TypeError: Can not make a cache key of an object of type object
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if value is None or isinstance(value, (bool, str)):
+        hash_object.update(f'{type(value).__name__}:{value};'.encode())
+    elif isinstance(value, (int, float)):
+        hash_object.update(f'float:{float(value)!r};'.encode())
+    elif isinstance(value, np.ndarray):
+        if value.dtype.kind in 'biuf':
+            value = value.astype(float)
+        value = np.ascontiguousarray(value)
+        hash_object.update(f'array:{value.dtype.str}:{value.shape};'.encode())
+        hash_object.update(value.tobytes())
+    elif isinstance(value, (list, tuple)):
+        hash_object.update(f'list:{len(value)};'.encode())
+        for item in value:
+            update_hash(hash_object, item)
+    elif isinstance(value, dict) or hasattr(value, 'as_dict'):
+        # A parameter set (MM_parameters.py) is hashed as its dictionary
+        if not isinstance(value, dict):
+            value = value.as_dict()
+        hash_object.update(f'dict:{len(value)};'.encode())
+        for name in sorted(value, key = str):
+            update_hash(hash_object, str(name))
+            update_hash(hash_object, value[name])
+    else:
+        raise TypeError('Can not make a cache key of an object of type '
+                                                    f'{type(value).__name__}')
+
+def cache_key(function_name, args, kwargs, version = MODEL_VERSION):
+    """Function that makes the key of a result out of the name of the function,
+    its inputs and the model version.
+
+    Parameters:
+    -----------
+    function_name: String
+        The name of the function.
+    args: Tuple
+        The positional inputs of the function.
+    kwargs: Dictionary
+        The keyword inputs of the function.
+    version: String
+        The model version.
+
+    Returns:
+    --------
+    key: String
+        The hexadecimal sha256 hash.
+
+    Example:
+    -----------
+    >>> key = cache_key('f', (1, [0.5, 2]), {'WMMd_inhibitor': 0})
+    >>> len(key)
+    64
+    >>> key == cache_key('f', (1.0, [0.5, 2.0]), {'WMMd_inhibitor': 0.0})
+    True
+    >>> key == cache_key('f', (1, [0.5, 2]), {'WMMd_inhibitor': 0.1})
+    False
+    >>> key == cache_key('f', (1, [0.5, 2]), {'WMMd_inhibitor': 0}, '2')
+    False
+    >>> from MM_parameters import ParameterSet
+    >>> parameters = ParameterSet(N = 50, costs = [1, 2])
+    >>> cache_key('f', (parameters,), {}) == cache_key('f', ({'N': 50.0,
+    ...                                     'costs': np.array([1, 2])},), {})
+    True
+    """
+    hash_object = hashlib.sha256()
+    update_hash(hash_object, [version, function_name, list(args), kwargs])
+    return hash_object.hexdigest()
+
+def function_name(function):
+    """Function that gives the name of a function including the name of the file
+    it is in, which is the same when the file is run and when it is imported.
+
+    Parameters:
+    -----------
+    function: Function
+        The function.
+
+    Returns:
+    --------
+    name: String
+        The name of the file and the function.
+
+    Example:
+    -----------
+    >>> function_name(cache_key)
+    'MM_cache.cache_key'
+    """
+    file_name = os.path.splitext(os.path.basename(inspect.getfile(function)))[0]
+    return f'{file_name}.{function.__qualname__}'
+
+class ResultCache:
+    """Class of an on-disk cache with a file per result.
+
+    Parameters:
+    -----------
+    folder: String
+        The folder of the cache, the results are saved in a subfolder per model
+        version. With None the folder cache in the data folder of the output
+        root (MM_paths.py) is used.
+    max_size: Int
+        The maximum size of the results of all model versions in bytes.
+    version: String
+        The model version.
+
+    Example:
+    -----------
+    >>> folder = tempfile.mkdtemp()
+    >>> cache = ResultCache(folder, max_size = 10 ** 6)
+    >>> key = cache_key('f', (1,), {})
+    >>> cache.load('f', key)
+    (False, None)
+    >>> cache.save('f', key, {'MM number': np.arange(3.0)})
+    >>> found, result = cache.load('f', key)
+    >>> found, result['MM number'].tolist()
+    (True, [0.0, 1.0, 2.0])
+    >>> cache.invalidate('f')
+    1
+    >>> cache.load('f', key)
+    (False, None)
+    >>> shutil.rmtree(folder)
+    """
+    def __init__(self, folder = None, max_size = MAX_CACHE_SIZE,
+                                                    version = MODEL_VERSION):
+        self.folder = folder
+        self.max_size = max_size
+        self.version = version
+
+    def root(self):
+        """Function that gives the folder of the cache."""
+        return data_path('cache') if self.folder is None else self.folder
+
+    def path(self, function_name, key):
+        """Function that gives the file path of a result."""
+        return os.path.join(self.root(), self.version,
+                                            f'{function_name}-{key}.pkl.z')
+
+    def files(self, all_versions = True):
+        """Function that gives the file paths of all saved results."""
+        version = '*' if all_versions else glob.escape(self.version)
+        return glob.glob(os.path.join(glob.escape(self.root()), version,
+                                                                    '*.pkl.z'))
+
+    def size(self):
+        """Function that gives the size of all saved results in bytes."""
+        return sum(os.path.getsize(file) for file in self.files())
+
+    def load(self, function_name, key):
+        """Function that loads a result.
+
+        Returns:
+        --------
+        found: Bool
+            True when the result was in the cache.
+        result: Any
+            The result, None when it was not found.
+        """
+        file_path = self.path(function_name, key)
+        try:
+            with open(file_path, 'rb') as file:
+                result = pickle.loads(zlib.decompress(file.read()))
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+            return False, None
+
+        # Mark the result as used for the eviction
+        try:
+            os.utime(file_path)
+        except OSError:
+            pass
+        return True, result
+
+    def save(self, function_name, key, result):
+        """Function that saves a result and removes the oldest results when the
+        cache became too large."""
+        file_path = self.path(function_name, key)
+        os.makedirs(os.path.dirname(file_path), exist_ok = True)
+
+        # Write to a temporary file first so that a stopped run can not leave a
+        # broken result behind
+        data = zlib.compress(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        temporary_path = f'{file_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(data)
+        os.replace(temporary_path, file_path)
+
+        self.evict()
+
+    def evict(self):
+        """Function that removes the results that are used the longest time ago
+        until the cache is not larger than the maximum size.
+
+        Returns:
+        --------
+        n_removed: Int
+            The number of removed results.
+        """
+        files = []
+        for file in self.files():
+            try:
+                files.append((os.path.getmtime(file), os.path.getsize(file),
+                                                                        file))
+            except OSError:
+                pass
+
+        total_size = sum(size for _, size, _ in files)
+        n_removed = 0
+        for _, size, file in sorted(files):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(file)
+            except OSError:
+                continue
+            total_size -= size
+            n_removed += 1
+        return n_removed
+
+    def invalidate(self, function_name = None, all_versions = False):
+        """Function that removes saved results.
+
+        Parameters:
+        -----------
+        function_name: String
+            The name of the function of which the results are removed, with None
+            the results of all functions are removed.
+        all_versions: Bool
+            If True the results of all model versions are removed and else only
+            the results of the current version.
+
+        Returns:
+        --------
+        n_removed: Int
+            The number of removed results.
+        """
+        n_removed = 0
+        for file in self.files(all_versions):
+            name = os.path.basename(file).rsplit('-', 1)[0]
+            if function_name is None or name == function_name:
+                os.remove(file)
+                n_removed += 1
+        return n_removed
+
+    def remove_old_versions(self):
+        """Function that removes the results of all other model versions.
+
+        Returns:
+        --------
+        n_removed: Int
+            The number of removed results.
+        """
+        n_removed = 0
+        for folder in glob.glob(os.path.join(glob.escape(self.root()), '*')):
+            if os.path.isdir(folder) and \
+                                    os.path.basename(folder) != self.version:
+                n_removed += len(glob.glob(os.path.join(glob.escape(folder),
+                                                                '*.pkl.z')))
+                shutil.rmtree(folder)
+        return n_removed
+
+# The cache that is used by the @cached functions
+default_cache = ResultCache()
+
+def cached(function):
+    """Decorator that caches the results of a function in default_cache. The
+    function is only run when it was not run with the same inputs before. The
+    original function is available as the attribute uncached and setting the
+    environment variable MM_CACHE to 0 turns the cache off.
+
+    Parameters:
+    -----------
+    function: Function
+        The function, its inputs have to be numbers, strings, lists, tuples,
+        dictionaries, arrays or parameter sets and its result has to be
+        picklable.
+
+    Returns:
+    --------
+    wrapper: Function
+        The cached function.
+
+    Example:
+    -----------
+    >>> default_cache.folder = tempfile.mkdtemp()
+    >>> calls = []
+    >>> @cached
+    ... def square(x):
+    ...     calls.append(x)
+    ...     return x ** 2
+    >>> square(3), square(3), square(3.0), square(4)
+    (9, 9, 9, 16)
+    >>> calls
+    [3, 4]
+    >>> shutil.rmtree(default_cache.folder)
+    >>> default_cache.folder = None
+    """
+    name = function_name(function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if os.environ.get('MM_CACHE', '1') == '0':
+            return function(*args, **kwargs)
+
+        key = cache_key(name, args, kwargs, default_cache.version)
+        found, result = default_cache.load(name, key)
+        if not found:
+            result = function(*args, **kwargs)
+            default_cache.save(name, key, result)
+        return result
+
+    wrapper.uncached = function
+    return wrapper
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to save the progress of long runs (checkpoints), so a run
+              that is stopped (for example by preemption on a compute node) can
+              continue where it was. A checkpoint saves the finished tasks, the
+              finished points of sweeps and of every Nelder-Mead optimisation
+              all evaluated points with their MM number. A restarted run skips
+              the finished tasks and sweep points and replays the optimisations
+              that were busy: Nelder-Mead is deterministic, so with the saved
+              evaluations it follows the same steps without integrating the
+              model again until it is back at the last simplex, and then goes
+              on. The checkpoint is saved after every finished task and sweep
+              point and during an optimisation at most once per interval.
+              While a task runs its checkpoint is active, so the grids of the
+              model files (dataframe_3D_plot) save their finished points with
+              checkpoint_sweep.
+
+              Run the minimise functions of a model file with a checkpoint:
+              python MM_checkpoint.py MM_model_nr_IH_inf minimise_MM_GF_W_h
+                                                            minimise_MM_W_GF_h
+              or a Figure function with a 3D grid:
+              python MM_checkpoint.py MM_model_numbers
+                                        Figure_3D_MM_numb_IH_add_and_holiday
+"""
+
+# Import the needed libraries
+import os
+import sys
+import time
+import pickle
+import inspect
+import importlib
+import doctest
+import numpy as np
+from MM_paths import data_path
+from MM_cache import cache_key, function_name
+from MM_lazy import lazy_function
+
+# Import the optimisation function only when it is used
+minimize = lazy_function('scipy.optimize', 'minimize')
+
+# The default number of seconds between two saves during an optimisation
+SAVE_INTERVAL = 60
+
+# The checkpoints of the tasks that are running, the last is active
+ACTIVE_CHECKPOINTS = []
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Run the given functions of a model file with a checkpoint
+    if len(sys.argv) > 1:
+        module = importlib.import_module(sys.argv[1])
+        names = sys.argv[2:] or minimise_functions(module)
+        checkpoint = Checkpoint(sys.argv[1])
+        for name in names:
+            if checkpoint.finished(name):
+                print(name, 'already done')
+            else:
+                checkpoint.run(name, getattr(module, name), modules = [module])
+                print(name, 'done')
+
+def minimise_functions(module):
+    """Function that gives the names of the minimise_* functions of a module
+    that can be called without inputs, in the order of the file.
+
+    Parameters:
+    -----------
+    module: Module
+        The model file.
+
+    Returns:
+    --------
+    names: List
+        The names of the functions.
+    """
+    functions = []
+    for name, function in vars(module).items():
+        if name.startswith('minimise_') and inspect.isfunction(function) and \
+                                    function.__module__ == module.__name__:
+            parameters = inspect.signature(function).parameters.values()
+            if all(parameter.default is not inspect.Parameter.empty for
+                                                    parameter in parameters):
+                functions.append(name)
+    return functions
+
+class Checkpoint:
+    """Class of the checkpoint of a run, saved as a pickle file.
+
+    Parameters:
+    -----------
+    name: String
+        The name of the run, the file is data/checkpoints/{name}.pkl.
+    interval: Float
+        The number of seconds between two saves during an optimisation.
+    path: String
+        The path of the file, by default in the checkpoint folder.
+
+    Example:
+    -----------
+    >>> import tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'run.pkl')
+    >>> checkpoint = Checkpoint('run', path = path)
+    >>> checkpoint.run('square', lambda x: x ** 2, 3)
+    9
+    >>> Checkpoint('run', path = path).run('square', lambda x: x ** 3, 3)
+    9
+    """
+    def __init__(self, name, interval = SAVE_INTERVAL, path = None):
+        self.name = name
+        self.interval = interval
+        self.path = path or data_path('checkpoints', f'{name}.pkl')
+        self.state = {'tasks': {}, 'sweeps': {}, 'optimisations': {}}
+        self.last_save = time.monotonic()
+        self.task = None
+        self.n_optimisations = 0
+
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as file:
+                self.state = pickle.load(file)
+
+    def save(self):
+        """Function that saves the checkpoint, first to a temporary file so a
+        stopped run can not leave a broken checkpoint behind."""
+        os.makedirs(os.path.dirname(self.path), exist_ok = True)
+        temporary_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            pickle.dump(self.state, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self.path)
+        self.last_save = time.monotonic()
+
+    def save_if_due(self):
+        """Function that saves the checkpoint when the interval has passed."""
+        if time.monotonic() - self.last_save >= self.interval:
+            self.save()
+
+    def finished(self, task):
+        """Function that gives True when a task is finished."""
+        return task in self.state['tasks']
+
+    def remove(self):
+        """Function that removes the checkpoint file, for example when the
+        whole run is finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.state = {'tasks': {}, 'sweeps': {}, 'optimisations': {}}
+
+    def run(self, task, function, *args, modules = (), **kwargs):
+        """Function that runs a task when it is not finished yet and otherwise
+        gives the saved result. During the task the minimize function of the
+        given modules is replaced by the minimize of the checkpoint, so the
+        optimisations in the task are saved and resumed, and the checkpoint is
+        active for checkpoint_sweep.
+
+        Parameters:
+        -----------
+        task: String
+            The unique name of the task.
+        function: Function
+            The function of the task.
+        args: Tuple
+            The inputs of the function.
+        modules: List
+            The modules whose minimize function is replaced.
+        kwargs: Dictionary
+            The keyword inputs of the function.
+
+        Returns:
+        --------
+        result: Any
+            The result of the function (None when it can not be pickled).
+        """
+        if self.finished(task):
+            return self.state['tasks'][task]
+
+        # Replace the minimize functions
+        originals = [(module, module.minimize) for module in modules]
+        for module in modules:
+            module.minimize = self.minimize
+        self.task = task
+        self.n_optimisations = 0
+        ACTIVE_CHECKPOINTS.append(self)
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            ACTIVE_CHECKPOINTS.remove(self)
+            for module, original in originals:
+                module.minimize = original
+            self.task = None
+
+        # Save the result and remove the saved optimisations and sweeps of the
+        # task
+        try:
+            pickle.dumps(result)
+        except Exception:
+            result = None
+        self.state['tasks'][task] = result
+        for key in [key for key in self.state['optimisations'] if
+                                                        key[0] == task]:
+            del self.state['optimisations'][key]
+        for key in [key for key in self.state['sweeps'] if key == task or
+                                (isinstance(key, tuple) and key[0] == task)]:
+            del self.state['sweeps'][key]
+        self.save()
+        return result
+
+    def sweep(self, task, values, function):
+        """Function that calculates a function for all values of a sweep and
+        saves every result, a restarted sweep skips the finished values.
+
+        Parameters:
+        -----------
+        task: String
+            The unique name of the sweep.
+        values: List
+            The values (the inputs of the function).
+        function: Function
+            Function of one value.
+
+        Returns:
+        --------
+        results: List
+            The results for all values.
+
+        Example:
+        -----------
+        >>> import tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'sweep.pkl')
+        >>> checkpoint = Checkpoint('sweep', path = path)
+        >>> checkpoint.sweep('squares', [1, 2, 3], lambda x: x ** 2)
+        [1, 4, 9]
+        >>> checkpoint.sweep('squares', [1, 2, 3], lambda x: x ** 3)
+        [1, 4, 9]
+        """
+        # Start again when the sweep does not belong to these values
+        values = list(values)
+        saved = self.state['sweeps'].get(task)
+        if saved is None or saved['values'] != values:
+            saved = {'values': values, 'results': {}}
+            self.state['sweeps'][task] = saved
+
+        done = saved['results']
+        results = []
+        for index, value in enumerate(values):
+            if index not in done:
+                done[index] = function(value)
+                self.save()
+            results.append(done[index])
+        return results
+
+    def minimize(self, fun, x0, args = (), method = None, **kwargs):
+        """Function with the same inputs as scipy.optimize.minimize that saves
+        all evaluated points of the optimisation and the result. An
+        optimisation that was busy when the run stopped is replayed from the
+        saved evaluations.
+
+        Example:
+        -----------
+        >>> import tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'optimise.pkl')
+        >>> calls = []
+        >>> def fun(x):
+        ...     calls.append(1)
+        ...     return float(np.sum((x - 1) ** 2))
+        >>> checkpoint = Checkpoint('optimise', path = path)
+        >>> checkpoint.task = 'task'
+        >>> result = checkpoint.minimize(fun, [3.0, 2.0], method = 'Nelder-Mead')
+        >>> n_calls = len(calls)
+        >>> key = ('task', 0)
+        >>> checkpoint.state['optimisations'][key]['result'] = None
+        >>> checkpoint.n_optimisations = 0
+        >>> replay = checkpoint.minimize(fun, [3.0, 2.0], method = 'Nelder-Mead')
+        >>> len(calls) == n_calls, bool(np.all(replay.x == result.x))
+        (True, True)
+        """
+        key = (self.task, self.n_optimisations)
+        self.n_optimisations += 1
+        x0 = np.asarray(x0, dtype = float)
+        saved = self.state['optimisations'].get(key)
+
+        # Start again when the optimisation does not belong to this start point
+        if saved is None or not np.array_equal(saved['x0'], x0):
+            saved = {'x0': x0, 'evaluations': {}, 'result': None}
+            self.state['optimisations'][key] = saved
+        if saved['result'] is not None:
+            return saved['result']
+
+        evaluations = saved['evaluations']
+        args = args if isinstance(args, tuple) else (args,)
+
+        def checkpointed_fun(x, *args):
+            point = np.asarray(x, dtype = float).tobytes()
+            if point not in evaluations:
+                evaluations[point] = fun(x, *args)
+                self.save_if_due()
+            return evaluations[point]
+
+        result = minimize(checkpointed_fun, x0, args = args, method = method,
+                                                                    **kwargs)
+        saved['result'] = result
+        self.save()
+        return result
+
+def checkpoint_sweep(values, function, args = ()):
+    """Function that calculates a function for all values of a sweep. In a task
+    of Checkpoint.run every result is saved in the checkpoint, so a restarted
+    task skips the finished values, otherwise the values are just calculated.
+    The sweep is saved under the cache key (MM_cache.py) of the function, the
+    values and the other inputs, so a restarted task only uses the results of
+    the same sweep, also when other sweeps are skipped (for example because
+    their results are in the result cache).
+
+    Parameters:
+    -----------
+    values: List
+        The values (the inputs of the function).
+    function: Function
+        Function of one value.
+    args: Tuple
+        The other inputs the results depend on.
+
+    Returns:
+    --------
+    results: List
+        The results for all values.
+
+    Example:
+    -----------
+    >>> import tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'grid.pkl')
+    >>> grid = lambda: checkpoint_sweep([(2, 2), (2, 3)], lambda t_step:
+    ...                                                 t_step[0] * t_step[1])
+    >>> grid()
+    [4, 6]
+    >>> checkpoint = Checkpoint('grid', path = path)
+    >>> checkpoint.run('grid', grid)
+    [4, 6]
+    >>> scaled = lambda factor: checkpoint_sweep([1, 2], lambda value:
+    ...                                         factor * value, (factor,))
+    >>> checkpoint.run('grids', lambda: [scaled(10), 1 / 0])
+    Traceback (most recent call last):
+    ...
+    ZeroDivisionError: division by zero
+    >>> checkpoint.run('grids', lambda: [scaled(1000), scaled(10)])
+    [[1000, 2000], [10, 20]]
+    """
+    if not ACTIVE_CHECKPOINTS:
+        return [function(value) for value in values]
+    checkpoint = ACTIVE_CHECKPOINTS[-1]
+    values = list(values)
+    key = cache_key(function_name(function), [values] + list(args), {})
+    return checkpoint.sweep((checkpoint.task, key), values, function)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to simulate a cohort of virtual patients. Every patient has its
+              own growth rates, decay rates, interaction matrix values and start
+              numbers of nOC, nOB, nMMd and nMMr, which are drawn from given
+              distributions. The therapy is a schedule (MM_schedule.py) that is
+              made from the parameters of the patients. The patients are split
+              in chunks, every chunk is integrated as one batch and the chunks
+              are divided over multiple processes, which share the parameters
+              of the patients and the outcome arrays (MM_shared.py). The
+              result is the distribution of the outcomes over the cohort.
+"""
+
+# Import the needed libraries
+import numpy as np
+import doctest
+import warnings
+from functools import partial
+from scipy.integrate import ODEintWarning
+from MM_schedule import run_schedule, continuous_schedule
+from MM_shared import shared_map
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+# The outcomes of cohort_outcomes
+OUTCOMES = ['nOC', 'nOB', 'nMMd', 'nMMr', 'total nMM', 'average total nMM',
+                                                            'highest nMMr']
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def draw_parameter(rng, distribution, n_patients):
+    """Function that draws the values of one parameter for all patients.
+
+    Parameters:
+    -----------
+    rng: Numpy.random.Generator
+        The random number generator.
+    distribution: Tuple, Float or List
+        A fixed value (the same for all patients) or a tuple (name, a, b) with
+        the name of the distribution and its two parameters:
+        - ('normal', mean, standard deviation)
+        - ('lognormal', median, sigma), the sigma of the log of the values
+        - ('uniform', lowest value, highest value)
+        a and b can be arrays with the shape of the parameter.
+    n_patients: Int
+        The number of patients.
+
+    Returns:
+    --------
+    values: Numpy.ndarray
+        Array with the values, the first axis contains the patients.
+
+    Example:
+    -----------
+    >>> rng = np.random.default_rng(0)
+    >>> draw_parameter(rng, [0.8, 1.2], 3).tolist()
+    [[0.8, 1.2], [0.8, 1.2], [0.8, 1.2]]
+    >>> draw_parameter(rng, ('uniform', [0, 10], [1, 20]), 1000).shape
+    (1000, 2)
+    >>> draw_parameter(rng, ('normal', 1, 2), 5, ).shape
+    (5,)
+    """
+    if not isinstance(distribution, tuple):
+        values = np.asarray(distribution, dtype = float)
+        return np.broadcast_to(values, (n_patients,) + values.shape).copy()
+
+    name, a, b = distribution
+    a = np.asarray(a, dtype = float)
+    b = np.asarray(b, dtype = float)
+    size = (n_patients,) + np.broadcast(a, b).shape
+
+    if name == 'normal':
+        return rng.normal(a, b, size)
+    if name == 'lognormal':
+        return a * np.exp(rng.normal(0, 1, size) * b)
+    if name == 'uniform':
+        return rng.uniform(a, b, size)
+    raise ValueError(f"Unknown distribution: {name}")
+
+def draw_cohort(n_patients, distributions, seed = None):
+    """Function that draws the parameters of a cohort of virtual patients.
+
+    Parameters:
+    -----------
+    n_patients: Int
+        The number of patients.
+    distributions: Dictionary
+        Dictionary with the names of the parameters as keys and their
+        distributions (see draw_parameter) as values. The start numbers of nOC,
+        nOB, nMMd and nMMr have the name y0.
+    seed: Int
+        The seed of the random number generator.
+
+    Returns:
+    --------
+    cohort: Dictionary
+        Dictionary with the parameter values of all patients.
+
+    Example:
+    -----------
+    >>> cohort = draw_cohort(100, {'y0': ('uniform', [150, 250, 150, 0],
+    ...     [200, 300, 200, 0]), 'matrix': ('normal', np.eye(4), 0.05)},
+    ...                                                         seed = 1)
+    >>> cohort['y0'].shape, cohort['matrix'].shape
+    ((100, 4), (100, 4, 4))
+    """
+    rng = np.random.default_rng(seed)
+    return {name: draw_parameter(rng, distribution, n_patients) for name,
+                                            distribution in distributions.items()}
+
+def cohort_outcomes(t, y):
+    """Function that determines the outcomes of a batch of patients.
+
+    Parameters:
+    -----------
+    t: Numpy.ndarray
+        Array with all the time points.
+    y: Numpy.ndarray
+        Array with the cell numbers of all patients at all time points, shape
+        (time points, patients, 4).
+
+    Returns:
+    --------
+    outcomes: Dictionary
+        Dictionary with the end numbers, the average total MM number and the
+        highest MMr number per patient.
+
+    Example:
+    -----------
+    >>> t = np.array([0.0, 1.0, 2.0])
+    >>> y = np.array([[[1, 1, 2, 0]], [[1, 1, 4, 1]], [[1, 1, 6, 2]]])
+    >>> outcomes = cohort_outcomes(t, y)
+    >>> outcomes['total nMM'].tolist(), outcomes['average total nMM'].tolist()
+    ([8.0], [5.0])
+    """
+    y = np.asarray(y, dtype = float)
+    total_MM = y[..., 2] + y[..., 3]
+
+    # Leave out the double time points at the phase changes for the average
+    new_time = np.append(True, np.diff(t) > 0)
+    average_total_MM = np.trapz(total_MM[new_time], t[new_time], axis = 0) / \
+                                                            (t[-1] - t[0])
+
+    return {'nOC': y[-1, :, 0], 'nOB': y[-1, :, 1], 'nMMd': y[-1, :, 2],
+            'nMMr': y[-1, :, 3], 'total nMM': total_MM[-1],
+            'average total nMM': average_total_MM,
+            'highest nMMr': y[..., 3].max(axis = 0)}
+
+def run_chunk(schedule, y0, mutation_start, outcomes = cohort_outcomes):
+    """Function that integrates the schedule of a chunk of patients as one
+    batch and gives the outcomes. When the integration fails (for example
+    because the numbers of one patient become extremely high) the results of
+    all patients of the batch are unreliable, then the chunk is split in two
+    halves that are integrated again.
+
+    Parameters:
+    -----------
+    schedule: List
+        List with the phases with the parameters of the patients of the chunk.
+    y0: Numpy.ndarray
+        Array with the start numbers of the patients.
+    mutation_start: Float
+        The generation from which resistance mutations can occur.
+    outcomes: Function
+        Function outcomes(t, y) that gives a dictionary with arrays that have
+        the patients on the first axis.
+
+    Returns:
+    --------
+    outcomes: Dictionary
+        Dictionary with the outcomes per patient.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', ODEintWarning)
+        try:
+            t, y = run_schedule(schedule, y0, mutation_start)
+            return outcomes(t, y)
+        except ODEintWarning:
+            if len(y0) == 1:
+                warnings.simplefilter('ignore', ODEintWarning)
+                t, y = run_schedule(schedule, y0, mutation_start)
+                return outcomes(t, y)
+
+    # Integrate the two halves on their own
+    half = len(y0) // 2
+    results = [run_chunk(chunk_schedule(schedule, start, stop, len(y0)),
+                y0[start: stop], mutation_start, outcomes) for start, stop in
+                [(0, half), (half, len(y0))]]
+    return {name: np.concatenate([result[name] for result in results]) for
+                                                        name in results[0]}
+
+def chunk_schedule(schedule, start, stop, n_patients):
+    """Function that takes the parameters of a part of the patients out of a
+    schedule. Parameters that are the same for all patients stay the same.
+
+    Parameters:
+    -----------
+    schedule: List
+        List with the phases with the parameters of all patients.
+    start: Int
+        The first patient of the chunk.
+    stop: Int
+        The patient after the last patient of the chunk.
+    n_patients: Int
+        The number of patients.
+
+    Returns:
+    --------
+    schedule: List
+        List with the phases with the parameters of the patients of the chunk.
+    """
+    chunk = []
+    for phase in schedule:
+        chunk_phase = {}
+        for name, value in phase.items():
+            # Only the arrays with a value for every patient are split
+            batched = {'growth_rates': 2, 'decay_rates': 2, 'matrix': 3,
+                                'WMMd_inhibitor': 1}.get(name)
+            if batched is not None and np.ndim(value) == batched and \
+                                                len(value) == n_patients:
+                value = value[start:stop]
+            chunk_phase[name] = value
+        chunk.append(chunk_phase)
+    return chunk
+
+def split_schedule(schedule):
+    """Function that splits a schedule in the arrays of the phases and the
+    other values, so the arrays can be put in shared memory.
+
+    Parameters:
+    -----------
+    schedule: List
+        List with the phases.
+
+    Returns:
+    --------
+    phases: List
+        List with the phases without the arrays.
+    arrays: Dictionary
+        The arrays with '{phase number}:{name}' as name.
+
+    Example:
+    -----------
+    >>> phases, arrays = split_schedule(continuous_schedule(10, 40,
+    ...     np.ones((5, 4)), np.ones((5, 4)), np.ones(4), np.ones(4),
+    ...     np.zeros((4, 4)), np.zeros((4, 4)), 1, 0.5))
+    >>> sorted(arrays)[:3], float(arrays['1:WMMd_inhibitor'])
+    (['0:WMMd_inhibitor', '0:decay_rates', '0:growth_rates'], 0.5)
+    >>> join_schedule(phases, arrays)[0]['growth_rates'].shape
+    (5, 4)
+    """
+    phases, arrays = [], {}
+    for index, phase in enumerate(schedule):
+        phases.append({name: value for name, value in phase.items() if not
+                                            isinstance(value, np.ndarray)})
+        arrays.update({f'{index}:{name}': value for name, value in
+                        phase.items() if isinstance(value, np.ndarray)})
+    return phases, arrays
+
+def join_schedule(phases, arrays):
+    """Function that puts the arrays of split_schedule back in the phases."""
+    schedule = [dict(phase) for phase in phases]
+    for name, value in arrays.items():
+        if ':' in name:
+            index, name = name.split(':', 1)
+            schedule[int(index)][name] = value
+    return schedule
+
+def cohort_chunk(start, stop, arrays, phases, mutation_start):
+    """Function that simulates the patients start to stop and writes their
+    outcomes in the outputs (the function of shared_map)."""
+    n_patients = len(arrays['y0'])
+    schedule = chunk_schedule(join_schedule(phases, arrays), start, stop,
+                                                                    n_patients)
+    outcomes = run_chunk(schedule, arrays['y0'][start:stop], mutation_start)
+    for name in OUTCOMES:
+        arrays[name][start:stop] = outcomes[name]
+
+def run_cohort(cohort, therapy, mutation_start = 0, chunk_size = 500,
+                                                            n_workers = None):
+    """Function that simulates a therapy for a whole cohort of virtual patients.
+    The patients are integrated in batches of chunk_size patients, the batches
+    are divided over n_workers processes that share the parameters of the
+    patients and the outcomes.
+
+    Parameters:
+    -----------
+    cohort: Dictionary
+        Dictionary with the parameter values of all patients (from
+        draw_cohort), it has to contain the start numbers y0.
+    therapy: Function
+        Function that makes the schedule from the cohort dictionary, the
+        parameters in the phases can have a patient axis.
+    mutation_start: Float
+        The generation from which resistance mutations can occur.
+    chunk_size: Int
+        The number of patients that are integrated together.
+    n_workers: Int
+        The number of processes, with 1 everything is done in this process and
+        with None the number of processors is used.
+
+    Returns:
+    --------
+    df_outcomes: DataFrame
+        Dataframe with the outcomes of every patient.
+
+    Example:
+    -----------
+    >>> cohort = draw_cohort(20, {'y0': ('uniform', [170, 270, 160, 0],
+    ...     [190, 290, 180, 0]), 'growth_rates': ('lognormal',
+    ...     [0.8, 1.2, 0.3, 0.3], 0.05), 'decay_rates': [0.9, 0.08, 0.2, 0.1],
+    ...     'matrix': np.array([
+    ...    [0.0, 0.4, 0.6, 0.54],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.5, 0.0],
+    ...    [0.54, 0.0, -0.6, 0.65]])}, seed = 2)
+    >>> def MTD_therapy(cohort):
+    ...     return continuous_schedule(10, 40, cohort['growth_rates'],
+    ...         cohort['growth_rates'] * 0.9, cohort['decay_rates'],
+    ...         cohort['decay_rates'], cohort['matrix'], cohort['matrix'],
+    ...         1, 0.5)
+    >>> df = run_cohort(cohort, MTD_therapy, chunk_size = 8, n_workers = 1)
+    >>> df.shape
+    (20, 7)
+    >>> df_2 = run_cohort(cohort, MTD_therapy, chunk_size = 20, n_workers = 2)
+    >>> bool(np.allclose(df['total nMM'], df_2['total nMM'], rtol = 1e-4))
+    True
+    """
+    y0 = np.asarray(cohort['y0'], dtype = float)
+    n_patients = len(y0)
+    schedule = therapy(cohort)
+
+    # Put the parameters in shared memory, the chunks of patients are
+    # integrated as one batch
+    phases, arrays = split_schedule(schedule)
+    arrays['y0'] = y0
+    outcomes = shared_map(partial(cohort_chunk, phases = phases,
+                mutation_start = mutation_start), n_patients, arrays,
+                {name: n_patients for name in OUTCOMES}, chunk_size, n_workers)
+
+    return pd.DataFrame(outcomes)
+
+if __name__ == "__main__":
+    main()
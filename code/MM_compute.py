@@ -0,0 +1,54 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Entry point with only the functions that compute the model: the
+              right-hand sides and Jacobians of the number and fraction models
+              (MM_kernels.py), the batched integration and parameter scans
+              (MM_scan.py), the batched Runge-Kutta integrators
+              (MM_integrators.py), the trajectories with dense output
+              (MM_dense.py), the fixed points (MM_steady_state.py), the therapy
+              schedules (MM_schedule.py), the parameter sets
+              (MM_parameters.py) and the parallel map with shared memory
+              (MM_shared.py). Importing this file only loads NumPy and
+              SciPy and none of the plotting libraries or pandas, so worker
+              processes that only integrate the ODEs start fast. The functions
+              that make dataframes import pandas the first time they are used.
+"""
+
+# Import the needed libraries
+import doctest
+from MM_kernels import (number_rhs, mutation_rhs, number_jacobian,
+            fitness_matrix, fraction_fitness, fraction_rhs, fraction_jacobian)
+from MM_scan import (batch_odeint, scan_parameters, scan_nr, scan_frac,
+                                                                adaptive_scan)
+from MM_integrators import batch_rk4, batch_rk45, batch_integrate
+from MM_dense import Trajectory, dense_odeint, schedule_trajectory
+from MM_steady_state import (fixed_points_nr, fixed_points_frac,
+            unique_stable_fixed_point, steady_state_nr, steady_state_frac,
+            reached_fixed_point_frac)
+from MM_schedule import (mutation_rates, make_phase, continuous_schedule,
+            switch_schedule, schedule_times, run_schedule)
+from MM_parameters import ParameterSet, derive_matrix
+from MM_shared import SharedArrays, shared_map
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def loaded_libraries():
+    """Function that gives the heavy libraries that are imported together with
+    this file in a new Python process.
+
+    Example:
+    -----------
+    >>> loaded_libraries()
+    []
+    """
+    from MM_lazy import heavy_imports
+    return heavy_imports('MM_compute')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code of trajectories with dense output. A trajectory is integrated
+              once and stores per phase a piecewise cubic Hermite polynomial
+              through the solver values and the changes (the right-hand side)
+              at a fixed number of points per generation. The trajectory can
+              then be sampled at any time points afterwards, so the resolution
+              of a figure or data file does not determine the integration and
+              a figure, a tail average and a data file can come from the same
+              integration. Between phases the polynomial is not continued, so
+              the jumps in the changes at a therapy switch are kept.
+"""
+
+# Import the needed libraries
+import numpy as np
+import doctest
+from scipy.interpolate import CubicHermiteSpline
+from MM_kernels import mutation_rhs
+from MM_scan import batch_odeint
+from MM_schedule import mutation_rates
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+# The number of solver points per generation of the polynomials
+POINTS_PER_GENERATION = 4
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+class Trajectory:
+    """Class of a trajectory that consists of phases with a piecewise cubic
+    polynomial each.
+
+    Parameters:
+    -----------
+    segments: List
+        List with the CubicHermiteSpline of every phase, in time order.
+    columns: List
+        The names of the variables, for example nOC, nOB, nMMd and nMMr.
+
+    Example:
+    -----------
+    >>> trajectory = dense_odeint(lambda y, t: -y, [1.0], 0, 2)
+    >>> trajectory = trajectory.then(lambda y, t: -2 * y, 1)
+    >>> trajectory.start, trajectory.end
+    (0.0, 3.0)
+    >>> np.round(trajectory([1, 2, 3])[:, 0], 4).tolist()
+    [0.3679, 0.1353, 0.0183]
+    """
+    def __init__(self, segments, columns = None):
+        self.segments = list(segments)
+        self.columns = columns
+
+    @property
+    def start(self):
+        """The first time point."""
+        return float(self.segments[0].x[0])
+
+    @property
+    def end(self):
+        """The last time point."""
+        return float(self.segments[-1].x[-1])
+
+    @property
+    def breakpoints(self):
+        """Array with the start and end times of the phases."""
+        return np.array([self.start] + [float(segment.x[-1]) for segment in
+                                                            self.segments])
+
+    @property
+    def final_state(self):
+        """The values at the last time point."""
+        return self.segments[-1](self.segments[-1].x[-1])
+
+    def __call__(self, t):
+        """Function that gives the values at the given time points, on a phase
+        change the value at the start of the next phase is given.
+
+        Parameters:
+        -----------
+        t: Numpy.ndarray
+            Array with the time points, between the start and end time.
+
+        Returns:
+        --------
+        y: Numpy.ndarray
+            Array with the values, the first axis is the time.
+        """
+        t = np.atleast_1d(np.asarray(t, dtype = float))
+        phase = np.clip(np.searchsorted(self.breakpoints, t, side = 'right') -
+                                                1, 0, len(self.segments) - 1)
+        y = np.empty(t.shape + self.final_state.shape)
+        for index, segment in enumerate(self.segments):
+            in_phase = phase == index
+            if in_phase.any():
+                y[in_phase] = segment(t[in_phase])
+        return y
+
+    def then(self, rhs, duration, points_per_generation =
+                                                        POINTS_PER_GENERATION):
+        """Function that gives the trajectory extended with a next phase that
+        starts at the final state.
+
+        Parameters:
+        -----------
+        rhs: Function
+            Function rhs(y, t) that gives the change during the next phase.
+        duration: Float
+            The number of generations of the next phase.
+        points_per_generation: Int
+            The number of solver points per generation.
+
+        Returns:
+        --------
+        trajectory: Trajectory
+            The extended trajectory.
+        """
+        phase = dense_odeint(rhs, self.final_state, self.end, self.end +
+                                            duration, points_per_generation)
+        return Trajectory(self.segments + phase.segments, self.columns)
+
+    def sample(self, n_points = None, step = None, start = None, end = None):
+        """Function that samples the trajectory on an evenly spaced grid.
+
+        Parameters:
+        -----------
+        n_points: Int
+            The number of time points.
+        step: Float
+            The distance between the time points, used when n_points is None
+            (by default one generation).
+        start: Float
+            The first time point, by default the start of the trajectory.
+        end: Float
+            The last time point, by default the end of the trajectory.
+
+        Returns:
+        --------
+        t: Numpy.ndarray
+            Array with the time points.
+        y: Numpy.ndarray
+            Array with the values at the time points.
+
+        Example:
+        -----------
+        >>> trajectory = dense_odeint(lambda y, t: -y, [1.0], 0, 2)
+        >>> t, y = trajectory.sample(step = 0.5)
+        >>> t.tolist()
+        [0.0, 0.5, 1.0, 1.5, 2.0]
+        """
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        if n_points is None:
+            step = 1 if step is None else step
+            n_points = int(round((end - start) / step)) + 1
+        t = np.linspace(start, end, n_points)
+        return t, self(t)
+
+    def dataframe(self, t = None, total = 'total nMM', **grid):
+        """Function that makes a dataframe of the trajectory (of one system).
+
+        Parameters:
+        -----------
+        t: Numpy.ndarray
+            Array with the time points, when None the grid is made with sample.
+        total: String
+            Name of the column with the sum of the last two variables (the MMd
+            and MMr), None for no such column.
+        grid: Dictionary
+            The inputs n_points, step, start and end of sample.
+
+        Returns:
+        --------
+        df_trajectory: DataFrame
+            Dataframe with the generations and the values.
+
+        Example:
+        -----------
+        >>> trajectory = dense_odeint(lambda y, t: -y, [[1.0, 2.0, 3.0, 4.0]],
+        ...                                                           0, 10)
+        >>> trajectory.columns = ['nOC', 'nOB', 'nMMd', 'nMMr']
+        >>> df = trajectory.dataframe(n_points = 3)
+        >>> df.columns.tolist()
+        ['Generation', 'nOC', 'nOB', 'nMMd', 'nMMr', 'total nMM']
+        >>> float(df['total nMM'].iloc[0])
+        7.0
+        """
+        if t is None:
+            t, y = self.sample(**grid)
+        else:
+            t = np.asarray(t, dtype = float)
+            y = self(t)
+        y = y.reshape(len(t), -1)
+        columns = self.columns or [f'y{index}' for index in range(y.shape[1])]
+
+        df_trajectory = pd.DataFrame({'Generation': t})
+        for index, column in enumerate(columns):
+            df_trajectory[column] = y[:, index]
+        if total is not None and self.columns is not None:
+            df_trajectory[total] = y[:, -1] + y[:, -2]
+        return df_trajectory
+
+    def integral(self, start = None, end = None):
+        """Function that gives the exact integral of the polynomials over time.
+
+        Parameters:
+        -----------
+        start: Float
+            The start time, by default the start of the trajectory.
+        end: Float
+            The end time, by default the end of the trajectory.
+
+        Returns:
+        --------
+        integral: Numpy.ndarray
+            The integral of every variable.
+        """
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        integral = np.zeros(self.final_state.shape)
+        for segment in self.segments:
+            lower = max(start, segment.x[0])
+            upper = min(end, segment.x[-1])
+            if upper > lower:
+                integral += segment.integrate(lower, upper)
+        return integral
+
+    def average(self, start = None, end = None):
+        """Function that gives the time average of the variables.
+
+        Parameters:
+        -----------
+        start: Float
+            The start time, by default the start of the trajectory.
+        end: Float
+            The end time, by default the end of the trajectory.
+
+        Returns:
+        --------
+        average: Numpy.ndarray
+            The time average of every variable.
+
+        Example:
+        -----------
+        >>> trajectory = dense_odeint(lambda y, t: np.ones_like(y), [0.0], 0, 4)
+        >>> trajectory.average(2, 4).round(6).tolist()
+        [3.0]
+        """
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        return self.integral(start, end) / (end - start)
+
+    def tail_average(self, duration):
+        """Function that gives the time average over the last generations.
+
+        Parameters:
+        -----------
+        duration: Float
+            The number of generations at the end.
+
+        Returns:
+        --------
+        average: Numpy.ndarray
+            The time average of every variable.
+        """
+        return self.average(self.end - duration, self.end)
+
+def dense_odeint(rhs, y0, start, end, points_per_generation =
+                                    POINTS_PER_GENERATION, columns = None):
+    """Function that integrates one phase with batch_odeint and makes a
+    trajectory of it.
+
+    Parameters:
+    -----------
+    rhs: Function
+        Function rhs(y, t) that gives the change of the states y, it should
+        also work on an array with the states at all time points at once (like
+        the functions of MM_kernels.py).
+    y0: Numpy.ndarray
+        Array with the start values, the last axis contains the variables of
+        one system and the axes in front of it are batch axes.
+    start: Float
+        The start time.
+    end: Float
+        The end time.
+    points_per_generation: Int
+        The number of solver points per generation.
+    columns: List
+        The names of the variables.
+
+    Returns:
+    --------
+    trajectory: Trajectory
+        The trajectory of the phase.
+
+    Example:
+    -----------
+    >>> trajectory = dense_odeint(lambda y, t: -y, [1.0], 0, 5)
+    >>> np.round(trajectory([0.25, 4.1])[:, 0], 5).tolist()
+    [0.7788, 0.01657]
+    """
+    y0 = np.asarray(y0, dtype = float)
+    n_points = max(2, int(np.ceil((end - start) * points_per_generation)) + 1)
+    t = np.linspace(start, end, n_points)
+    y = batch_odeint(rhs, y0, t)
+    dydt = rhs(y, t.reshape((-1,) + (1,) * y0.ndim))
+    return Trajectory([CubicHermiteSpline(t, y, dydt, axis = 0)], columns)
+
+def schedule_trajectory(schedule, y0, mutation_start = 0,
+                            points_per_generation = POINTS_PER_GENERATION):
+    """Function that integrates the number model with resistance mutations over
+    a whole schedule (MM_schedule.py) and makes a trajectory of it. Like in
+    run_schedule a new phase starts at every phase change and at the mutation
+    start.
+
+    Parameters:
+    -----------
+    schedule: List
+        List with the phases.
+    y0: List
+        List with the start values of nOC, nOB, nMMd and nMMr.
+    mutation_start: Float
+        The generation from which resistance mutations can occur.
+    points_per_generation: Int
+        The number of solver points per generation.
+
+    Returns:
+    --------
+    trajectory: Trajectory
+        The trajectory of the cell numbers.
+
+    Example:
+    -----------
+    >>> from MM_schedule import continuous_schedule, run_schedule
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.54],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.5, 0.0],
+    ...    [0.54, 0.0, -0.6, 0.65]])
+    >>> matrix_GF_IH = matrix.copy()
+    >>> matrix_GF_IH[2, 0] = 0.09
+    >>> schedule = continuous_schedule(30, 100, [0.8, 1.2, 0.3, 0.3],
+    ...     [0.7, 1.3, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1],
+    ...     matrix, matrix_GF_IH, 1)
+    >>> trajectory = schedule_trajectory(schedule, [180, 280, 170, 0], 60)
+    >>> t, y = run_schedule(schedule, [180, 280, 170, 0], 60)
+    >>> bool(np.allclose(trajectory(t), y, rtol = 1e-4))
+    True
+    """
+    y0 = np.asarray(y0, dtype = float)
+    segments = []
+    start = 0.0
+    state = y0
+
+    for phase in schedule:
+        end = start + phase['duration']
+        restarts = [start] + ([float(mutation_start)] if start <
+                                        mutation_start < end else []) + [end]
+
+        for restart, next_restart in zip(restarts[:-1], restarts[1:]):
+            # The mutations are on from the mutation start
+            mutation_rate = mutation_rates(phase['IH_present']) * \
+                        (phase['mutations'] and mutation_start <= restart)
+            part = dense_odeint(lambda y, t: mutation_rhs(y,
+                phase['growth_rates'], phase['decay_rates'], phase['matrix'],
+                mutation_rate, phase['WMMd_inhibitor']), state, restart,
+                next_restart, points_per_generation)
+            segments += part.segments
+            state = part.final_state
+        start = end
+
+    return Trajectory(segments, ['nOC', 'nOB', 'nMMd', 'nMMr'])
+
+if __name__ == "__main__":
+    main()
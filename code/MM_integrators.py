@@ -0,0 +1,387 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code of NumPy Runge-Kutta integrators for batches of ODE systems,
+              with the same inputs as batch_odeint (MM_scan.py). The output of
+              the models is needed at (about) every generation, so the fixed-step
+              RK4 integrator takes a fixed number of steps per generation. All
+              systems of the batch are integrated at the same time with array
+              operations, so there is no set up cost per system like with
+              odeint. The adaptive Dormand-Prince integrator (RK45) uses one
+              step size for the whole batch that keeps the error of every system
+              within the tolerances.
+
+              accuracy_report compares the integrators with odeint for the
+              scenarios of the model files. With backend = 'jit' the compiled
+              loops of MM_jit.py are used when numba is installed.
+"""
+
+# Import the needed libraries
+import numpy as np
+import time
+import doctest
+from scipy.integrate import odeint
+from MM_kernels import number_rhs, fraction_rhs, mutation_rhs
+from MM_scan import batch_odeint
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def batch_rk4(rhs, y0, t, steps_per_generation = 10):
+    """Function that integrates a batch of independent ODE systems with the
+    classic fixed-step Runge-Kutta method (RK4).
+
+    Parameters:
+    -----------
+    rhs: Function
+        Function rhs(y, t) that gives the change of the batch of states y, y has
+        the same shape as y0.
+    y0: Numpy.ndarray
+        Array with the start values, the last axis contains the variables of
+        one system and the axes in front of it are batch axes.
+    t: Numpy.ndarray
+        Array with all the time points.
+    steps_per_generation: Int
+        The number of RK4 steps per generation, between two time points there
+        are at least one and otherwise this number times the time difference
+        (rounded up) steps.
+
+    Returns:
+    --------
+    y: Numpy.ndarray
+        Array with the states at all time points, shape (len(t),) + y0.shape.
+
+    Example:
+    -----------
+    >>> y = batch_rk4(lambda y, t: -y, np.array([[1.0, 2.0], [3.0, 4.0]]),
+    ...                                                     np.linspace(0, 1, 3))
+    >>> y.shape
+    (3, 2, 2)
+    >>> np.round(y[-1], 4).tolist()
+    [[0.3679, 0.7358], [1.1036, 1.4715]]
+    """
+    y0 = np.asarray(y0, dtype = float)
+    t = np.asarray(t, dtype = float)
+    y = np.empty((len(t),) + y0.shape)
+    y[0] = y0
+    state = y0
+
+    for index in range(1, len(t)):
+        interval = t[index] - t[index - 1]
+        n_steps = max(1, int(np.ceil(interval * steps_per_generation - 1e-9)))
+        step = interval / n_steps
+        time_point = t[index - 1]
+
+        for _ in range(n_steps):
+            k1 = rhs(state, time_point)
+            k2 = rhs(state + 0.5 * step * k1, time_point + 0.5 * step)
+            k3 = rhs(state + 0.5 * step * k2, time_point + 0.5 * step)
+            k4 = rhs(state + step * k3, time_point + step)
+            state = state + step / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            time_point += step
+        y[index] = state
+    return y
+
+def batch_rk45(rhs, y0, t, rtol = 1e-6, atol = 1e-9, first_step = 0.01,
+                                                            min_step = 1e-12):
+    """Function that integrates a batch of independent ODE systems with the
+    adaptive Dormand-Prince Runge-Kutta method (RK45). The whole batch takes the
+    same steps, the step size is adapted to keep the local error of every system
+    within the tolerances and the steps end exactly on the time points.
+
+    Parameters:
+    -----------
+    rhs: Function
+        Function rhs(y, t) that gives the change of the batch of states y, y has
+        the same shape as y0.
+    y0: Numpy.ndarray
+        Array with the start values, the last axis contains the variables of
+        one system and the axes in front of it are batch axes.
+    t: Numpy.ndarray
+        Array with all the time points.
+    rtol: Float
+        The relative tolerance.
+    atol: Float
+        The absolute tolerance.
+    first_step: Float
+        The size of the first step.
+    min_step: Float
+        The smallest step size, a ValueError is raised when the error is still
+        too large at this step size or when the error is not finite.
+
+    Returns:
+    --------
+    y: Numpy.ndarray
+        Array with the states at all time points, shape (len(t),) + y0.shape.
+
+    Example:
+    -----------
+    >>> y = batch_rk45(lambda y, t: -y, np.array([[1.0, 2.0], [3.0, 4.0]]),
+    ...                                                     np.linspace(0, 1, 3))
+    >>> np.round(y[-1], 4).tolist()
+    [[0.3679, 0.7358], [1.1036, 1.4715]]
+    >>> batch_rk45(lambda y, t: np.where(t > 0.5, np.nan, -y), np.ones((2, 2)),
+    ...                                                     np.linspace(0, 1, 3))
+    Traceback (most recent call last):
+    ...
+    ValueError: The RK45 error is not finite at generation 0.5
+    """
+    y0 = np.asarray(y0, dtype = float)
+    t = np.asarray(t, dtype = float)
+    y = np.empty((len(t),) + y0.shape)
+    y[0] = y0
+    state = y0
+    time_point = t[0]
+    step = first_step
+    k1 = rhs(state, time_point)
+
+    for index in range(1, len(t)):
+        while time_point < t[index]:
+            # Make sure the step ends on the time point
+            last_step = time_point + step >= t[index]
+            if last_step:
+                step = t[index] - time_point
+
+            # Dormand-Prince stages (the last stage is the first of the next
+            # step)
+            k2 = rhs(state + step * (1/5 * k1), time_point + step / 5)
+            k3 = rhs(state + step * (3/40 * k1 + 9/40 * k2), time_point +
+                                                                3 * step / 10)
+            k4 = rhs(state + step * (44/45 * k1 - 56/15 * k2 + 32/9 * k3),
+                                                    time_point + 4 * step / 5)
+            k5 = rhs(state + step * (19372/6561 * k1 - 25360/2187 * k2 +
+                        64448/6561 * k3 - 212/729 * k4), time_point +
+                                                                8 * step / 9)
+            k6 = rhs(state + step * (9017/3168 * k1 - 355/33 * k2 +
+                        46732/5247 * k3 + 49/176 * k4 - 5103/18656 * k5),
+                                                            time_point + step)
+            new_state = state + step * (35/384 * k1 + 500/1113 * k3 +
+                        125/192 * k4 - 2187/6784 * k5 + 11/84 * k6)
+            k7 = rhs(new_state, time_point + step)
+
+            # Determine the error with the embedded fourth order solution, the
+            # system with the largest error sets the step size
+            error = step * (71/57600 * k1 - 71/16695 * k3 + 71/1920 * k4 -
+                        17253/339200 * k5 + 22/525 * k6 - 1/40 * k7)
+            scale = atol + rtol * np.maximum(np.abs(state), np.abs(new_state))
+            error_norm = np.max(np.sqrt(np.mean((error / scale) ** 2,
+                                                                axis = -1)))
+
+            # Stop when the error is not finite or can not be made small
+            # enough, so a step that is not accurate is never accepted
+            if not np.isfinite(error_norm):
+                raise ValueError('The RK45 error is not finite at generation '
+                                                            f'{time_point:g}')
+            if error_norm > 1 and step < min_step:
+                raise ValueError(f'The RK45 step size is smaller than '
+                                f'{min_step:g} at generation {time_point:g}')
+
+            # Accept the step when the error is small enough
+            if error_norm <= 1:
+                time_point = t[index] if last_step else time_point + step
+                state = new_state
+                k1 = k7
+
+            # Adapt the step size
+            if error_norm == 0:
+                factor = 5.0
+            else:
+                factor = min(5.0, max(0.2, 0.9 * error_norm ** -0.2))
+            step = step * factor
+        y[index] = state
+    return y
+
+def batch_integrate(rhs, y0, t, method = 'rk4', steps_per_generation = 10,
+                                rtol = 1e-6, atol = 1e-9, backend = 'numpy'):
+    """Function that integrates a batch of independent ODE systems with the
+    chosen integrator. With the backend 'jit' a CompiledRHS (MM_jit.py) is
+    integrated with the compiled RK4 or RK45 loop when numba is installed,
+    otherwise (and for odeint) the NumPy path is used.
+
+    Parameters:
+    -----------
+    rhs: Function
+        Function rhs(y, t) that gives the change of the batch of states y.
+    y0: Numpy.ndarray
+        Array with the start values, the last axis contains the variables of
+        one system.
+    t: Numpy.ndarray
+        Array with all the time points.
+    method: String
+        'rk4', 'rk45' or 'odeint'.
+    steps_per_generation: Int
+        The number of RK4 steps per generation.
+    rtol: Float
+        The relative tolerance of RK45.
+    atol: Float
+        The absolute tolerance of RK45.
+    backend: String
+        'numpy' or 'jit'.
+
+    Returns:
+    --------
+    y: Numpy.ndarray
+        Array with the states at all time points, shape (len(t),) + y0.shape.
+
+    Example:
+    -----------
+    >>> from MM_jit import CompiledRHS
+    >>> rhs = CompiledRHS('number', [0.8, 1.2, 0.3, 0.3],
+    ...    [0.9, 0.08, 0.2, 0.1], np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]]), np.array([0.0, 0.3]))
+    >>> y0, t = np.array([[20, 30, 20, 5], [20, 30, 20, 5]]), np.arange(6)
+    >>> np.allclose(batch_integrate(rhs, y0, t, backend = 'jit'),
+    ...                                             batch_integrate(rhs, y0, t))
+    True
+    >>> batch_integrate(rhs, y0, t, backend = 'gpu')
+    Traceback (most recent call last):
+    ...
+    ValueError: Unknown integration backend: gpu
+    """
+    if backend not in ('numpy', 'jit'):
+        raise ValueError(f"Unknown integration backend: {backend}")
+
+    # Integrate in compiled code when numba is installed
+    if backend == 'jit' and method in ('rk4', 'rk45'):
+        from MM_jit import JIT_AVAILABLE, CompiledRHS
+        if JIT_AVAILABLE and isinstance(rhs, CompiledRHS):
+            return rhs.integrate(y0, t, method, steps_per_generation, rtol,
+                                                                        atol)
+
+    if method == 'rk4':
+        return batch_rk4(rhs, y0, t, steps_per_generation)
+    if method == 'rk45':
+        return batch_rk45(rhs, y0, t, rtol, atol)
+    if method == 'odeint':
+        return batch_odeint(rhs, y0, t)
+    raise ValueError(f"Unknown integration method: {method}")
+
+def scenarios(n_systems = 100):
+    """Function that makes the scenarios of the accuracy report: the parameters
+    of the number model, the fraction model and the number model with
+    mutations of the model files, with a batch of WMMd IH strengths.
+
+    Parameters:
+    -----------
+    n_systems: Int
+        The number of WMMd IH strengths in a batch.
+
+    Returns:
+    --------
+    scenarios: Dictionary
+        Dictionary with the names of the scenarios as keys and tuples (rhs, y0,
+        t) as values.
+    """
+    # The number model (MM_model_numbers.py)
+    matrix_numbers = np.array([
+        [0.0, 0.4, 0.6, 0.5],
+        [0.3, 0.0, -0.3, -0.3],
+        [0.58, 0.0, 0.2, 0.0],
+        [0.55, 0.0, -0.6, 0.4]])
+    WMMd_numbers = np.linspace(0, 0.5, n_systems)
+    numbers = (lambda y, t: number_rhs(y, [0.8, 1.2, 0.3, 0.3],
+            [0.9, 0.08, 0.2, 0.1], matrix_numbers, WMMd_numbers),
+            np.tile([20.0, 30.0, 20.0, 5.0], (n_systems, 1)),
+            np.linspace(0, 100, 100))
+
+    # The fraction model (MM_model_fractions.py)
+    matrix_fractions = np.array([
+        [0.0, 1.6, 2.2, 1.9],
+        [0.95, 0.0, -0.5, -0.5],
+        [1.1, 0.0, 0.2, 0.0],
+        [1.9, 0.0, -0.77, 0.2]])
+    WMMd_fractions = np.linspace(0, 1.5, n_systems)
+    fractions = (lambda y, t: fraction_rhs(y, 50, [1, 0.8, 1.2, 1.3],
+            matrix_fractions, WMMd_fractions),
+            np.tile([0.2, 0.3, 0.2, 0.3], (n_systems, 1)),
+            np.linspace(0, 100, 100))
+
+    # The number model with mutations (MM_model_nr_IH_inf_mutation.py)
+    matrix_mutation = np.array([
+        [0.0, 0.4, 0.6, 0.55],
+        [0.3, 0.0, -0.3, -0.3],
+        [0.6, 0.0, 0.2, 0.0],
+        [0.55, 0.0, -0.6, 0.4]])
+    WMMd_mutation = np.linspace(0, 0.5, n_systems)
+    mutation = (lambda y, t: mutation_rhs(y, [0.8, 1.2, 0.3, 0.3],
+            [0.9, 0.08, 0.2, 0.1], matrix_mutation, 0.0001, WMMd_mutation),
+            np.tile([20.0, 30.0, 200.0, 0.0], (n_systems, 1)),
+            np.linspace(0, 100, 100))
+
+    return {'numbers': numbers, 'fractions': fractions,
+                                                    'mutation': mutation}
+
+def accuracy_report(n_systems = 100, steps = (2, 5, 10, 20), rtol = 1e-6):
+    """Function that compares the RK4 and RK45 integrators and odeint with its
+    default tolerances (system by system as in the model files and for the
+    whole batch) with a reference solution
+    (odeint with tolerances of 1e-11) for the scenarios. The error is the
+    largest difference with the reference relative to the largest value of the
+    cell type in the reference. In the mutation scenario the change is not
+    smooth when the first MMr appear (nMMr = 0 is counted as one in the
+    interactions), so there RK4 converges slower than in the other scenarios.
+
+    Parameters:
+    -----------
+    n_systems: Int
+        The number of systems in a batch.
+    steps: Tuple
+        The numbers of RK4 steps per generation that are compared.
+    rtol: Float
+        The relative tolerance of RK45.
+
+    Returns:
+    --------
+    df_report: DataFrame
+        Dataframe with per scenario and integrator the largest relative error
+        and the time it took.
+
+    Example:
+    -----------
+    >>> df = accuracy_report(n_systems = 10, steps = (10,))
+    >>> df['integrator'].tolist()[:4]
+    ['odeint (per system)', 'odeint', 'rk4 (10 steps)', 'rk45']
+    >>> df_numbers = df[df['scenario'] == 'numbers']
+    >>> bool((df_numbers['max relative error'] < 1e-5).all())
+    True
+    """
+    rows = []
+    for name, (rhs, y0, t) in scenarios(n_systems).items():
+        # Determine the reference solution system by system
+        reference = np.stack([odeint(lambda y, t: rhs(np.broadcast_to(y,
+            y0.shape), t)[system], y0[system], t, rtol = 1e-11,
+            atol = 1e-11) for system in range(len(y0))], axis = 1)
+
+        # odeint system by system (as in the model files) and for the batch
+        integrators = [('odeint (per system)', lambda: np.stack([odeint(
+            lambda y, t: rhs(np.broadcast_to(y, y0.shape), t)[system],
+            y0[system], t) for system in range(len(y0))], axis = 1)),
+            ('odeint', lambda: batch_odeint(rhs, y0, t))]
+        integrators += [(f'rk4 ({n} steps)', lambda n = n: batch_rk4(rhs, y0,
+                                                        t, n)) for n in steps]
+        integrators.append(('rk45', lambda: batch_rk45(rhs, y0, t, rtol)))
+
+        for integrator, run in integrators:
+            start = time.perf_counter()
+            y = run()
+            duration = time.perf_counter() - start
+            error = np.max(np.abs(y - reference) / np.max(np.abs(reference),
+                                                                axis = 0))
+            rows.append({'scenario': name, 'integrator': integrator,
+                        'max relative error': error, 'time (s)': duration})
+
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Compiled kernels of the model dynamics together with a fixed-step
+              (RK4) and an adaptive (Dormand-Prince RK45) integration loop. When
+              numba is installed the kernels and the loops are compiled, so a
+              whole integration of a batch of systems runs in compiled code
+              without calling Python every time step. The kernels give the same
+              values as the RHS functions of MM_kernels.py:
+              - the number model (number_rhs)
+              - the number model with MMd to MMr mutations (mutation_rhs)
+              - the fraction model (fraction_rhs)
+
+              The compiled backend is chosen with backend = 'jit' in
+              batch_integrate (MM_integrators.py) and run_schedule
+              (MM_schedule.py), the RHS is then given as a CompiledRHS. When
+              numba is not installed batch_integrate uses the NumPy path (the
+              array RHS of MM_kernels.py with the batched NumPy integrators).
+"""
+
+# Import the needed libraries
+import math
+import numpy as np
+import doctest
+from MM_kernels import number_rhs, mutation_rhs, fraction_rhs, MMR_SCALE
+
+# Use numba when it is installed
+try:
+    from numba import njit
+    JIT_AVAILABLE = True
+except ImportError:
+    JIT_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Function that replaces numba.njit when numba is not installed, the
+        function is returned without compiling it."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+@njit(cache = True)
+def number_kernel(y, parameters, i):
+    """Function that determines the change of nOC, nOB, nMMd and nMMr of system
+    i in the number model.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the values of nOC, nOB, nMMd and nMMr.
+    parameters: Tuple
+        The growth rates, decay rates, matrices, WMMd IH strengths and mutation
+        rates of all systems (CompiledRHS.kernel_parameters).
+    i: Int
+        The number of the system.
+
+    Returns:
+    --------
+    change: Numpy.ndarray
+        Array with the changes in nOC, nOB, nMMd and nMMr.
+
+    Example:
+    -----------
+    >>> parameters = CompiledRHS('number', [0.8, 0.9, 1.3, 0.5],
+    ...    [0.4, 0.3, 0.3, 0.6], np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]])).kernel_parameters(())
+    >>> np.round(number_kernel(np.array([10.0, 20.0, 10.0, 5.0]), parameters,
+    ...                                                         0), 4).tolist()
+    [744654.2267, 1489.0458, 6825.9723, 270.9896]
+    """
+    growth_rates, decay_rates, matrix, WMMd_inhibitor, mutation_rate = \
+                                                                    parameters
+    change = np.empty(4)
+    for k in range(4):
+        growth = growth_rates[i, k]
+        for j in range(4):
+            growth *= y[j] ** matrix[i, k, j]
+        change[k] = growth - decay_rates[i, k] * y[k]
+    change[2] -= WMMd_inhibitor[i] * y[2]
+    return change
+
+@njit(cache = True)
+def mutation_kernel(y, parameters, i):
+    """Function that determines the change of nOC, nOB, nMMd and nMMr of system
+    i in the number model in which MMd can become MMr through mutations, with
+    the same regularised power of nMMr as mutation_rhs.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the values of nOC, nOB, nMMd and nMMr.
+    parameters: Tuple
+        The growth rates, decay rates, matrices, WMMd IH strengths and mutation
+        rates of all systems (CompiledRHS.kernel_parameters).
+    i: Int
+        The number of the system.
+
+    Returns:
+    --------
+    change: Numpy.ndarray
+        Array with the changes in nOC, nOB, nMMd and nMMr.
+
+    Example:
+    -----------
+    >>> parameters = CompiledRHS('mutation', [0.8, 0.9, 1.3, 0.5],
+    ...    [0.4, 0.3, 0.3, 0.6], np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]]), 0.00012).kernel_parameters(())
+    >>> np.round(mutation_kernel(np.array([10.0, 20.0, 10.0, 0.0]), parameters,
+    ...                                                         0), 4).tolist()
+    [25354.2911, 293.0092, 9419.1344, 0.0012]
+    """
+    mutation_rate = parameters[4]
+
+    # Go smoothly to a nMMr of one in the interactions where there are (almost)
+    # no MMr
+    nMMr = max(y[3], 0.0)
+    weight = nMMr ** 4 / (nMMr ** 4 + MMR_SCALE ** 4)
+    y_interaction = y.copy()
+    y_interaction[3] = nMMr ** weight
+
+    # Determine the change values, the MMr only change when there are MMr
+    change = number_kernel(y_interaction, parameters, i)
+    change[3] *= weight
+
+    # Part of the MMd become MMr
+    change[2] -= y[2] * mutation_rate[i]
+    change[3] += y[2] * mutation_rate[i]
+    return change
+
+@njit(cache = True)
+def fraction_kernel(y, parameters, i):
+    """Function that determines the change of xOC, xOB, xMMd and xMMr of system
+    i in the fraction model.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the values of xOC, xOB, xMMd and xMMr.
+    parameters: Tuple
+        The N values, costs, matrices and WMMd IH strengths of all systems
+        (CompiledRHS.kernel_parameters).
+    i: Int
+        The number of the system.
+
+    Returns:
+    --------
+    change: Numpy.ndarray
+        Array with the changes in xOC, xOB, xMMd and xMMr.
+
+    Example:
+    -----------
+    >>> parameters = CompiledRHS('fraction', 10, [0.3, 0.2, 0.3, 0.5],
+    ...    np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]])).kernel_parameters(())
+    >>> np.round(fraction_kernel(np.array([0.4, 0.2, 0.3, 0.1]), parameters,
+    ...                                                         0), 6).tolist()
+    [0.030276, -0.010762, 0.007317, -0.026831]
+    """
+    N, costs, matrix, WMMd_inhibitor = parameters
+    fraction = (N[i] - 1) / N[i]
+    fitness = np.empty(4)
+    for k in range(4):
+        benefit = 0.0
+        for j in range(4):
+            benefit += matrix[i, k, j] * costs[i, j] * y[j]
+        fitness[k] = benefit * fraction - costs[i, k]
+    fitness[2] -= WMMd_inhibitor[i] * fraction
+
+    # Determine the average fitness and the replicator dynamics
+    W_average = 0.0
+    for k in range(4):
+        W_average += y[k] * fitness[k]
+    change = np.empty(4)
+    for k in range(4):
+        change[k] = y[k] * (fitness[k] - W_average)
+    return change
+
+@njit
+def rk4_loop(kernel, y0, t, parameters, steps_per_generation):
+    """Function that integrates every system of a batch with the classic
+    fixed-step Runge-Kutta method (RK4), with the same steps as batch_rk4.
+
+    Parameters:
+    -----------
+    kernel: Function
+        One of the kernels.
+    y0: Numpy.ndarray
+        Array with the start values, one row per system.
+    t: Numpy.ndarray
+        Array with all the time points.
+    parameters: Tuple
+        The parameters of the kernel.
+    steps_per_generation: Int
+        The number of RK4 steps per generation.
+
+    Returns:
+    --------
+    y: Numpy.ndarray
+        Array with the values at all time points, shape (len(t),) + y0.shape.
+    """
+    n_systems, n_variables = y0.shape
+    y = np.empty((len(t), n_systems, n_variables))
+    for i in range(n_systems):
+        state = y0[i].copy()
+        y[0, i] = state
+        for index in range(1, len(t)):
+            interval = t[index] - t[index - 1]
+            n_steps = max(1, int(math.ceil(interval * steps_per_generation -
+                                                                        1e-9)))
+            step = interval / n_steps
+            for _ in range(n_steps):
+                k1 = kernel(state, parameters, i)
+                k2 = kernel(state + 0.5 * step * k1, parameters, i)
+                k3 = kernel(state + 0.5 * step * k2, parameters, i)
+                k4 = kernel(state + step * k3, parameters, i)
+                state = state + step / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            y[index, i] = state
+    return y
+
+@njit
+def rk45_loop(kernel, y0, t, parameters, rtol, atol, first_step, min_step):
+    """Function that integrates every system of a batch with the adaptive
+    Dormand-Prince Runge-Kutta method (RK45). Every system has its own step
+    size, the steps end exactly on the time points.
+
+    Parameters:
+    -----------
+    kernel: Function
+        One of the kernels.
+    y0: Numpy.ndarray
+        Array with the start values, one row per system.
+    t: Numpy.ndarray
+        Array with all the time points.
+    parameters: Tuple
+        The parameters of the kernel.
+    rtol: Float
+        The relative tolerance.
+    atol: Float
+        The absolute tolerance.
+    first_step: Float
+        The size of the first step.
+    min_step: Float
+        The smallest step size, a ValueError is raised when the error is still
+        too large at this step size or when the error is not finite.
+
+    Returns:
+    --------
+    y: Numpy.ndarray
+        Array with the values at all time points, shape (len(t),) + y0.shape.
+    """
+    n_systems, n_variables = y0.shape
+    y = np.empty((len(t), n_systems, n_variables))
+    for i in range(n_systems):
+        state = y0[i].copy()
+        y[0, i] = state
+        time_point = t[0]
+        step = first_step
+        k1 = kernel(state, parameters, i)
+
+        for index in range(1, len(t)):
+            while time_point < t[index]:
+                # Make sure the step ends on the time point
+                last_step = time_point + step >= t[index]
+                if last_step:
+                    step = t[index] - time_point
+
+                # Dormand-Prince stages (the last stage is the first of the
+                # next step)
+                k2 = kernel(state + step * (1/5 * k1), parameters, i)
+                k3 = kernel(state + step * (3/40 * k1 + 9/40 * k2),
+                                                                parameters, i)
+                k4 = kernel(state + step * (44/45 * k1 - 56/15 * k2 +
+                                                32/9 * k3), parameters, i)
+                k5 = kernel(state + step * (19372/6561 * k1 - 25360/2187 * k2 +
+                            64448/6561 * k3 - 212/729 * k4), parameters, i)
+                k6 = kernel(state + step * (9017/3168 * k1 - 355/33 * k2 +
+                            46732/5247 * k3 + 49/176 * k4 - 5103/18656 * k5),
+                                                                parameters, i)
+                new_state = state + step * (35/384 * k1 + 500/1113 * k3 +
+                            125/192 * k4 - 2187/6784 * k5 + 11/84 * k6)
+                k7 = kernel(new_state, parameters, i)
+
+                # Determine the error with the embedded fourth order solution
+                error = step * (71/57600 * k1 - 71/16695 * k3 + 71/1920 * k4 -
+                            17253/339200 * k5 + 22/525 * k6 - 1/40 * k7)
+                scale = atol + rtol * np.maximum(np.abs(state),
+                                                            np.abs(new_state))
+                error_norm = np.sqrt(np.mean((error / scale) ** 2))
+
+                # Stop when the error is not finite or can not be made small
+                # enough, so a step that is not accurate is never accepted
+                if not np.isfinite(error_norm):
+                    raise ValueError('The RK45 error is not finite')
+                if error_norm > 1 and step < min_step:
+                    raise ValueError('The RK45 step size is too small')
+
+                # Accept the step when the error is small enough
+                if error_norm <= 1:
+                    if last_step:
+                        time_point = t[index]
+                    else:
+                        time_point += step
+                    state = new_state
+                    k1 = k7
+
+                # Adapt the step size
+                if error_norm == 0:
+                    factor = 5.0
+                else:
+                    factor = min(5.0, max(0.2, 0.9 * error_norm ** -0.2))
+                step = step * factor
+            y[index, i] = state
+    return y
+
+# The array RHS (MM_kernels.py) and the kernel of every model
+MODELS = {'number': (number_rhs, number_kernel),
+          'mutation': (mutation_rhs, mutation_kernel),
+          'fraction': (fraction_rhs, fraction_kernel)}
+
+class CompiledRHS:
+    """Class of the RHS of a model with fixed parameters. It can be called as
+    rhs(y, t) like the RHS of the NumPy integrators and be integrated in
+    compiled code with integrate.
+
+    Parameters:
+    -----------
+    model: String
+        'number', 'mutation' or 'fraction'.
+    *parameters:
+        The inputs of number_rhs, mutation_rhs or fraction_rhs (MM_kernels.py)
+        after y, they can have batch axes.
+
+    Example:
+    -----------
+    >>> from MM_integrators import batch_rk4, batch_rk45
+    >>> rhs = CompiledRHS('mutation', [0.8, 1.2, 0.3, 0.3],
+    ...    [0.9, 0.08, 0.2, 0.1], np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]]), 0.0001, np.array([0.0, 0.3]))
+    >>> y0 = np.array([[20.0, 30.0, 20.0, 0.0], [20.0, 30.0, 20.0, 0.0]])
+    >>> t = np.linspace(0, 10, 11)
+    >>> y = rhs.integrate(y0, t)
+    >>> y.shape
+    (11, 2, 4)
+    >>> np.allclose(y, batch_rk4(rhs, y0, t))
+    True
+    >>> np.allclose(rhs.integrate(y0, t, 'rk45'), batch_rk45(rhs, y0, t),
+    ...                                                         rtol = 1e-5)
+    True
+    """
+    def __init__(self, model, *parameters):
+        if model not in MODELS:
+            raise ValueError(f"Unknown model: {model}, the models are "
+                                                    f"{', '.join(MODELS)}")
+        self.model = model
+        self.parameters = parameters
+
+    def __call__(self, y, t):
+        return MODELS[self.model][0](y, *self.parameters)
+
+    def kernel_parameters(self, batch_shape):
+        """Function that gives the parameters of the kernel as float arrays
+        with one row per system of the batch.
+
+        Parameters:
+        -----------
+        batch_shape: Tuple
+            The batch axes of the start values.
+
+        Returns:
+        --------
+        parameters: Tuple
+            Tuple with the parameter arrays.
+        """
+        n_systems = int(np.prod(batch_shape))
+
+        def batch(value, shape):
+            value = np.asarray(value, dtype = np.float64)
+            value = np.broadcast_to(value, tuple(batch_shape) + shape)
+            return np.ascontiguousarray(value.reshape((n_systems,) + shape))
+
+        if self.model == 'fraction':
+            N, costs, matrix, WMMd_inhibitor = (list(self.parameters) +
+                                                                    [0])[:4]
+            return (batch(N, ()), batch(costs, (4,)), batch(matrix, (4, 4)),
+                                                    batch(WMMd_inhibitor, ()))
+
+        if self.model == 'number':
+            growth_rates, decay_rates, matrix, WMMd_inhibitor = \
+                                            (list(self.parameters) + [0])[:4]
+            mutation_rate = 0
+        else:
+            growth_rates, decay_rates, matrix, mutation_rate, WMMd_inhibitor = \
+                                            (list(self.parameters) + [0])[:5]
+        return (batch(growth_rates, (4,)), batch(decay_rates, (4,)),
+                batch(matrix, (4, 4)), batch(WMMd_inhibitor, ()),
+                batch(mutation_rate, ()))
+
+    def integrate(self, y0, t, method = 'rk4', steps_per_generation = 10,
+                    rtol = 1e-6, atol = 1e-9, first_step = 0.01,
+                    min_step = 1e-12):
+        """Function that integrates a batch of systems with the compiled RK4
+        or RK45 loop.
+
+        Parameters:
+        -----------
+        y0: Numpy.ndarray
+            Array with the start values, the last axis contains the variables
+            of one system and the axes in front of it are batch axes.
+        t: Numpy.ndarray
+            Array with all the time points.
+        method: String
+            'rk4' or 'rk45'.
+        steps_per_generation: Int
+            The number of RK4 steps per generation.
+        rtol: Float
+            The relative tolerance of RK45.
+        atol: Float
+            The absolute tolerance of RK45.
+        first_step: Float
+            The size of the first RK45 step.
+        min_step: Float
+            The smallest RK45 step size.
+
+        Returns:
+        --------
+        y: Numpy.ndarray
+            Array with the states at all time points, shape (len(t),) +
+            y0.shape.
+        """
+        y0 = np.asarray(y0, dtype = np.float64)
+        t = np.asarray(t, dtype = np.float64)
+        parameters = self.kernel_parameters(y0.shape[:-1])
+        systems = np.ascontiguousarray(y0.reshape(-1, y0.shape[-1]))
+        kernel = MODELS[self.model][1]
+
+        if method == 'rk4':
+            y = rk4_loop(kernel, systems, t, parameters,
+                                                    int(steps_per_generation))
+        elif method == 'rk45':
+            y = rk45_loop(kernel, systems, t, parameters, float(rtol),
+                            float(atol), float(first_step), float(min_step))
+        else:
+            raise ValueError(f"Unknown compiled integration method: {method}")
+        return y.reshape((len(t),) + y0.shape)
+
+if __name__ == "__main__":
+    main()
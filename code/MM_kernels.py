@@ -0,0 +1,368 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Array versions of the right-hand sides (RHS) of the number and
+              fraction models of the multiple myeloma (MM) microenvironment with
+              four cell types: drug-sensitive MM cells (MMd), resistant MM cells
+              (MMr), osteoblasts (OB) and osteoclasts (OC). The RHS functions give
+              the same values as model_dynamics in the model files, but they work
+              on whole arrays of states (and parameters) at once. The analytic
+              Jacobians of both models are also given, these are needed to
+              determine the stability of fixed points.
+
+              The last axis of a state array always contains the four cell
+              types (OC, OB, MMd, MMr), all axes in front of it are batch axes.
+
+Example interaction matrix:
+M = np.array([
+         Foc     Fob   Fmmd   Fmmr
+    OC  [b1,1,  b2,1,  b3,1,  b4,1],
+    OB  [b1,2,  b2,2,  b3,2,  b4,2],
+    MMd [b1,3,  b2,3,  b3,3,  b4,3],
+    MMr [b1,4,  b2,4,  b3,4,  b4,4]])
+"""
+
+# Import the needed libraries
+import numpy as np
+import doctest
+
+# The nMMr below which the MMr are (smoothly) left out of the interactions of
+# the model with mutations
+MMR_SCALE = 1e-6
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def number_rhs(y, growth_rates, decay_rates, matrix, WMMd_inhibitor = 0):
+    """Function that determines the change in the cell numbers of the number
+    model for one or more states.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the nOC, nOB, nMMd and nMMr values on the last axis.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors (can have batch axes).
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness (can be an array).
+
+    Returns:
+    --------
+    change: Numpy.ndarray
+        Array with the changes in nOC, nOB, nMMd and nMMr on the last axis.
+
+    Example:
+    -----------
+    >>> np.round(number_rhs(np.array([10, 20, 10, 5]), [0.8, 0.9, 1.3, 0.5],
+    ...    [0.4, 0.3, 0.3, 0.6], np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]])), 6).tolist()
+    [744654.226654, 1489.045836, 6825.972291, 270.989557]
+    """
+    y = np.asarray(y, dtype = float)
+    matrix = np.asarray(matrix, dtype = float)
+    growth_rates = np.asarray(growth_rates, dtype = float)
+    decay_rates = np.asarray(decay_rates, dtype = float)
+    WMMd_inhibitor = np.asarray(WMMd_inhibitor, dtype = float)
+
+    # Multiply the growth rate with all the n_j**b_j,i terms per cell type
+    growth = growth_rates * np.ones(y.shape)
+    for j in range(4):
+        growth = growth * y[..., np.newaxis, j] ** matrix[..., :, j]
+
+    # Determine the change values
+    change = growth - decay_rates * y
+    change[..., 2] = change[..., 2] - y[..., 2] * WMMd_inhibitor
+
+    return change
+
+def mutation_rhs(y, growth_rates, decay_rates, matrix, mutation_rate,
+                                                        WMMd_inhibitor = 0):
+    """Function that determines the change in the cell numbers of the number
+    model in which MMd can become MMr through mutations, for one or more states.
+    Where there are no MMr the nMMr**b terms are left out (like in
+    model_dynamics of MM_model_nr_IH_inf_mutation.py) with a regularised power:
+    nMMr is raised to a weight that goes smoothly from one to zero below
+    MMR_SCALE, so the change has no jump when the first MMr are made, no branch
+    is needed and all states are done at once.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the nOC, nOB, nMMd and nMMr values on the last axis.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors (can have batch axes).
+    mutation_rate: Float
+        The rate at which MMd become MMr (can be an array).
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness (can be an array).
+
+    Returns:
+    --------
+    change: Numpy.ndarray
+        Array with the changes in nOC, nOB, nMMd and nMMr on the last axis.
+
+    Example:
+    -----------
+    >>> change = mutation_rhs(np.array([[10, 20, 10, 5], [10, 20, 10, 0]]),
+    ...    [0.8, 0.9, 1.3, 0.5], [0.4, 0.3, 0.3, 0.6], np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]]), 0.00012)
+    >>> np.round(change[0], 6).tolist()
+    [744654.226654, 1489.045836, 6825.971091, 270.990757]
+    >>> np.round(change[1], 6).tolist()
+    [25354.291079, 293.009167, 9419.134428, 0.0012]
+    """
+    y = np.asarray(y, dtype = float)
+    mutation_rate = np.asarray(mutation_rate, dtype = float)
+
+    # Go smoothly to a nMMr of one in the interactions (0**0 = 1 and 1**b = 1)
+    # where there are (almost) no MMr
+    nMMr = np.maximum(y[..., 3], 0.0)
+    weight = nMMr ** 4 / (nMMr ** 4 + MMR_SCALE ** 4)
+    y_interaction = y.copy()
+    y_interaction[..., 3] = nMMr ** weight
+
+    # Determine the change values, the MMr only change when there are MMr
+    change = number_rhs(y_interaction, growth_rates, decay_rates, matrix,
+                                                                WMMd_inhibitor)
+    change[..., 3] = change[..., 3] * weight
+
+    # Part of the MMd become MMr
+    change[..., 2] = change[..., 2] - y[..., 2] * mutation_rate
+    change[..., 3] = change[..., 3] + y[..., 2] * mutation_rate
+
+    return change
+
+def number_jacobian(y, growth_rates, decay_rates, matrix, WMMd_inhibitor = 0):
+    """Function that determines the analytic Jacobian of the number model. The
+    entry [i, j] is the derivative of the change of cell type i to the number of
+    cell type j. Entries are not finite when a cell type with a number of zero
+    has an interaction factor between 0 and 1.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the nOC, nOB, nMMd and nMMr values on the last axis.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors (can have batch axes).
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness (can be an array).
+
+    Returns:
+    --------
+    jacobian: Numpy.ndarray
+        Array with a 4x4 Jacobian on the last two axes.
+
+    Example:
+    -----------
+    >>> np.round(number_jacobian(np.array([1.0, 1.0, 1.0, 1.0]),
+    ...    [1.0, 1.0, 1.0, 1.0], [0.5, 0.5, 0.5, 0.5], np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]]), 0.1), 3).tolist()
+    [[-0.5, 0.4, 0.6, 0.5], [0.3, -0.5, -0.3, -0.3], [0.6, 0.0, -0.4, 0.0], [0.55, 0.0, -0.6, -0.1]]
+    """
+    y = np.asarray(y, dtype = float)
+    matrix = np.asarray(matrix, dtype = float)
+    growth_rates = np.asarray(growth_rates, dtype = float)
+    decay_rates = np.asarray(decay_rates, dtype = float)
+    WMMd_inhibitor = np.asarray(WMMd_inhibitor, dtype = float)
+
+    # Derivative of the growth term: g_i * P_i * b_j,i / n_j
+    growth = growth_rates * np.ones(y.shape)
+    for j in range(4):
+        growth = growth * y[..., np.newaxis, j] ** matrix[..., :, j]
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        jacobian = growth[..., :, np.newaxis] * matrix / y[..., np.newaxis, :]
+
+    # Where b_j,i is zero the cell type j has no influence at all
+    jacobian = np.where(matrix == 0, 0.0, jacobian)
+
+    # Subtract the decay (and the WMMd IH) on the diagonal
+    decay = np.broadcast_to(decay_rates, y.shape).copy()
+    decay[..., 2] = decay[..., 2] + WMMd_inhibitor
+    jacobian = jacobian - decay[..., np.newaxis] * np.eye(4)
+
+    return jacobian
+
+def fitness_matrix(N, costs, matrix):
+    """Function that determines the matrix A of the fraction model for which the
+    fitness is W = A x - ((N-1)/N) * WMMd_inhibitor * e_MMd - c.
+
+    Parameters:
+    -----------
+    N: Int
+        Number of cells in the difussion range.
+    costs: List
+        List with the cost parameters of the OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors (can have batch axes).
+
+    Returns:
+    --------
+    A: Numpy.ndarray
+        Array with the 4x4 fitness matrix on the last two axes.
+
+    Example:
+    -----------
+    >>> np.round(fitness_matrix(10, [0.3, 0.2, 0.3, 0.5], np.eye(4)), 3
+    ...                                                    ).diagonal().tolist()
+    [0.27, 0.18, 0.27, 0.45]
+    """
+    matrix = np.asarray(matrix, dtype = float)
+    costs = np.asarray(costs, dtype = float)
+    N = np.asarray(N, dtype = float)[..., np.newaxis, np.newaxis]
+    return matrix * costs[..., np.newaxis, :] * (N - 1) / N
+
+def fraction_fitness(y, N, costs, matrix, WMMd_inhibitor = 0):
+    """Function that determines the fitness of the four cell types in the
+    fraction model.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the xOC, xOB, xMMd and xMMr values on the last axis.
+    N: Int
+        Number of cells in the difussion range.
+    costs: List
+        List with the cost parameters of the OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors (can have batch axes).
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness (can be an array).
+
+    Returns:
+    --------
+    fitness: Numpy.ndarray
+        Array with the WOC, WOB, WMMd and WMMr values on the last axis.
+
+    Example:
+    -----------
+    >>> np.round(fraction_fitness(np.array([0.4, 0.2, 0.3, 0.1]), 10,
+    ...    [0.3, 0.2, 0.3, 0.5], np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]])), 4).tolist()
+    [0.1086, -0.0209, 0.0573, -0.2354]
+    """
+    y = np.asarray(y, dtype = float)
+    costs = np.asarray(costs, dtype = float)
+    N = np.asarray(N, dtype = float)
+    WMMd_inhibitor = np.asarray(WMMd_inhibitor, dtype = float)
+
+    # Determine the fitness values
+    A = fitness_matrix(N, costs, matrix)
+    fitness = np.einsum('...ij,...j->...i', A, y) - costs
+    fitness = fitness.copy()
+    fitness[..., 2] = fitness[..., 2] - WMMd_inhibitor * (N - 1) / N
+
+    return fitness
+
+def fraction_rhs(y, N, costs, matrix, WMMd_inhibitor = 0):
+    """Function that determines the change in the cell fractions of the fraction
+    model (replicator dynamics) for one or more states.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the xOC, xOB, xMMd and xMMr values on the last axis.
+    N: Int
+        Number of cells in the difussion range.
+    costs: List
+        List with the cost parameters of the OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors (can have batch axes).
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness (can be an array).
+
+    Returns:
+    --------
+    change: Numpy.ndarray
+        Array with the changes in xOC, xOB, xMMd and xMMr on the last axis.
+
+    Example:
+    -----------
+    >>> np.round(fraction_rhs(np.array([0.4, 0.2, 0.3, 0.1]), 10,
+    ...    [0.3, 0.2, 0.3, 0.5], np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]])), 6).tolist()
+    [0.030276, -0.010762, 0.007317, -0.026831]
+    """
+    y = np.asarray(y, dtype = float)
+    fitness = fraction_fitness(y, N, costs, matrix, WMMd_inhibitor)
+
+    # Determine the average fitness and the replicator dynamics
+    W_average = np.sum(y * fitness, axis = -1, keepdims = True)
+    return y * (fitness - W_average)
+
+def fraction_jacobian(y, N, costs, matrix, WMMd_inhibitor = 0):
+    """Function that determines the analytic Jacobian of the fraction model. The
+    entry [i, j] is the derivative of the change of cell type i to the fraction
+    of cell type j.
+
+    Parameters:
+    -----------
+    y: Numpy.ndarray
+        Array with the xOC, xOB, xMMd and xMMr values on the last axis.
+    N: Int
+        Number of cells in the difussion range.
+    costs: List
+        List with the cost parameters of the OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors (can have batch axes).
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness (can be an array).
+
+    Returns:
+    --------
+    jacobian: Numpy.ndarray
+        Array with a 4x4 Jacobian on the last two axes.
+
+    Example:
+    -----------
+    >>> np.round(fraction_jacobian(np.array([0.25, 0.25, 0.25, 0.25]), 10,
+    ...    [1.0, 1.0, 1.0, 1.0], np.eye(4)), 4).tolist()
+    [[0.3625, 0.1375, 0.1375, 0.1375], [0.1375, 0.3625, 0.1375, 0.1375], [0.1375, 0.1375, 0.3625, 0.1375], [0.1375, 0.1375, 0.1375, 0.3625]]
+    """
+    y = np.asarray(y, dtype = float)
+    A = fitness_matrix(N, costs, matrix)
+    fitness = fraction_fitness(y, N, costs, matrix, WMMd_inhibitor)
+    W_average = np.sum(y * fitness, axis = -1)
+
+    # Derivative of the average fitness: W_j + sum_k x_k A_k,j
+    d_W_average = fitness + np.einsum('...k,...kj->...j', y, A)
+
+    # J_i,j = delta_i,j (W_i - W_average) + x_i (A_i,j - dW_average/dx_j)
+    jacobian = (fitness - W_average[..., np.newaxis])[..., np.newaxis] * \
+        np.eye(4) + y[..., :, np.newaxis] * (A - d_W_average[..., np.newaxis, :])
+
+    return jacobian
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to import libraries only when they are used (lazy imports).
+              The plotting libraries (matplotlib, plotly, ternary), pandas and
+              the optimisation and statistics functions of scipy take a large
+              part of the start up time of the model files, while the processes
+              that only integrate the ODEs do not need them. With lazy_import
+              and lazy_function they are imported the first time they are
+              used. It also contains functions to measure the start up time of
+              a module and which libraries are imported with it.
+"""
+
+# Import the needed libraries
+import sys
+import importlib
+import subprocess
+import doctest
+
+# The libraries that are not needed to integrate the ODEs
+HEAVY_LIBRARIES = ['pandas', 'matplotlib', 'mpl_toolkits.mplot3d', 'plotly',
+                                        'ternary', 'numba', 'scipy.stats']
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Print the start up time of the given modules
+    for module_name in sys.argv[1:]:
+        print(module_name, round(startup_time(module_name), 3), 's',
+                                                heavy_imports(module_name))
+
+class LazyModule:
+    """Class of a module that is imported the first time one of its
+    attributes is used.
+
+    Parameters:
+    -----------
+    name: String
+        The name of the module.
+
+    Example:
+    -----------
+    >>> fractions = LazyModule('fractions')
+    >>> fractions
+    <lazy module 'fractions'>
+    >>> fractions.Fraction(1, 2) + fractions.Fraction(1, 3)
+    Fraction(5, 6)
+    """
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        if self._module is None:
+            self.__dict__['_module'] = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        if self._module is None:
+            return f"<lazy module '{self._name}'>"
+        return repr(self._module)
+
+def lazy_import(name):
+    """Function that gives a module that is imported the first time it is
+    used. A module that is already imported is given directly.
+
+    Parameters:
+    -----------
+    name: String
+        The name of the module, for example matplotlib.pyplot.
+
+    Returns:
+    --------
+    module: Module or LazyModule
+        The module.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+def lazy_function(module_name, function_name):
+    """Function that gives a function that imports its module the first time
+    it is called.
+
+    Parameters:
+    -----------
+    module_name: String
+        The name of the module, for example scipy.optimize.
+    function_name: String
+        The name of the function in the module, for example minimize.
+
+    Returns:
+    --------
+    function: Function
+        The function.
+
+    Example:
+    -----------
+    >>> gcd = lazy_function('math', 'gcd')
+    >>> gcd(12, 18)
+    6
+    """
+    def function(*args, **kwargs):
+        module = importlib.import_module(module_name)
+        return getattr(module, function_name)(*args, **kwargs)
+
+    function.__name__ = function_name
+    function.__doc__ = f"Lazily imported {module_name}.{function_name}."
+    return function
+
+def startup_time(module_name, repeats = 3):
+    """Function that measures the time it takes to import a module in a new
+    Python process (the fastest of a number of repeats).
+
+    Parameters:
+    -----------
+    module_name: String
+        The name of the module.
+    repeats: Int
+        The number of measurements.
+
+    Returns:
+    --------
+    startup_time: Float
+        The import time in seconds.
+
+    Example:
+    -----------
+    >>> startup_time('MM_kernels', 1) > 0
+    True
+    """
+    code = ('import time; start = time.perf_counter(); '
+            f'import {module_name}; print(time.perf_counter() - start)')
+    times = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, '-c', code], check = True,
+                                            capture_output = True, text = True)
+        times.append(float(result.stdout.split()[-1]))
+    return min(times)
+
+def heavy_imports(module_name):
+    """Function that gives the heavy libraries (HEAVY_LIBRARIES) that are
+    imported when a module is imported in a new Python process.
+
+    Parameters:
+    -----------
+    module_name: String
+        The name of the module.
+
+    Returns:
+    --------
+    libraries: List
+        List with the names of the imported heavy libraries.
+
+    Example:
+    -----------
+    >>> heavy_imports('MM_kernels')
+    []
+    """
+    code = (f'import sys, {module_name}; print(" ".join(name for name in '
+            f'{HEAVY_LIBRARIES!r} if name in sys.modules))')
+    result = subprocess.run([sys.executable, '-c', code], check = True,
+                                            capture_output = True, text = True)
+    return result.stdout.split()
+
+if __name__ == "__main__":
+    main()
@@ -28,12 +28,22 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.integrate import odeint
-import csv
-from scipy.optimize import minimize
-from mpl_toolkits.mplot3d import Axes3D
 import doctest
+from MM_cache import cached
+from MM_parameters import derive_matrix, parameter_set_objective
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_scan import adaptive_scan, scan_frac
+from MM_steady_state import fixed_points_frac, unique_stable_fixed_point
+from MM_lazy import lazy_import, lazy_function
+from MM_checkpoint import checkpoint_sweep
+
+# Import the plotting and optimisation libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+minimize = lazy_function('scipy.optimize', 'minimize')
 
 def main():
     # Do doc tests
@@ -645,41 +655,40 @@ def combine_dataframes(df_1, df_2):
 
     return(combined_df)
 
-def save_dataframe(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_dataframe(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The dataframe containing the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
-def save_dictionary(dictionary, file_path):
-    """ Function that saves a dictionary as csv file.
+def save_dictionary(dictionary, file_path, metadata = None):
+    """ Function that saves a dictionary as binary (npz) file.
 
     Parameters:
     -----------
     dictionary: Dictionary
         The dictionary containing the collected data.
     file_path: String
-        The name of the csv file and the path where the dictionary will be saved.
+        The name of the file and the path where the dictionary will be
+        saved, the .csv extension is replaced by the extension of the
+        storage format (MM_storage.py).
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-
-        # Create a header
-        writer.writerow(['Key', 'Value'])
-
-        # Loop over the rows
-        for key, value in dictionary.items():
-            writer.writerow([str(key), str(value)])
+    MM_writer.write(MM_storage.save_dictionary, dictionary, file_path,
+                                                                    metadata)
 
 def save_Figure(figure, file_name, folder_path):
     """Save the Figure to a specific folder.
@@ -694,7 +703,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 
 def make_part_df(dataframe, start_time, time, N, cOC, cOB, cMMd, cMMr, matrix,
@@ -922,6 +934,7 @@ def continuous_add_IH_df(time_start_drugs, end_generation, xOC, xOB, xMMd, xMMr,
 
     return df_total
 
+@parameter_set_objective
 def minimal_tumour_frac_t_steps(t_steps_drug, t_steps_no_drug, xOC, xOB, xMMd,
                             xMMr, N, cOC, cOB, cMMd, cMMr, cOC_IH, cOB_IH,
                             matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
@@ -1001,6 +1014,7 @@ def minimal_tumour_frac_t_steps(t_steps_drug, t_steps_no_drug, xOC, xOB, xMMd,
     return float(average_MM_fraction)
 
 
+@cached
 def dataframe_3D_plot(xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd, cMMr, cOC_IH,
             cOB_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
     """ Function that create a dataframe with the average MM fraction for
@@ -1048,19 +1062,29 @@ def dataframe_3D_plot(xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd, cMMr, cOC_IH,
     column_names = ['Generations no drug', 'Generations drug', 'MM fraction']
     df_MM_frac = pd.DataFrame(columns=column_names)
 
-    # Loop over all the t_step values for drug administration and drug holidays
-    for t_steps_no_drug in range(2, 22):
+    # Determine the MM fraction for all t_step values for drug administration
+    # and drug holidays, in a task of a checkpoint (MM_checkpoint.py) every
+    # finished value is saved
+    t_steps = [(t_steps_no_drug, t_steps_drug) for t_steps_no_drug in
+                                range(2, 22) for t_steps_drug in range(2, 22)]
 
-        for t_steps_drug in range(2, 22):
-            frac_tumour = minimal_tumour_frac_t_steps(t_steps_drug,
+    def frac_tumour_t_steps(t_step):
+        t_steps_no_drug, t_steps_drug = t_step
+        return minimal_tumour_frac_t_steps(t_steps_drug,
                 t_steps_no_drug, xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd, cMMr,
                 cOC_IH, cOB_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor)
 
-            # Add results to the dataframe
-            new_row_df = pd.DataFrame([{'Generations no drug': \
+    frac_tumours = checkpoint_sweep(t_steps, frac_tumour_t_steps, (xOC, xOB,
+                            xMMd, xMMr, N, cOC, cOB, cMMd, cMMr, cOC_IH, cOB_IH,
+                                 matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor))
+
+    for (t_steps_no_drug, t_steps_drug), frac_tumour in zip(t_steps,
+                                                            frac_tumours):
+        # Add results to the dataframe
+        new_row_df = pd.DataFrame([{'Generations no drug': \
                     int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
                                          'MM fraction': float(frac_tumour)}])
-            df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
+        df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
 
     return(df_MM_frac)
 
@@ -1139,8 +1163,10 @@ def avarage_MMr_MMd_nr(dataframe, time, therapy):
     print(f'{therapy}: xMMd =',average_MMd_fraction,
                                         'and xMMr =', average_MMr_fraction)
 
+@parameter_set_objective
 def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
-                        cMMd, cMMr, cOC_IH, cOB_IH, matrix, t, b_OC_MMd_array):
+                        cMMd, cMMr, cOC_IH, cOB_IH, matrix, t, b_OC_MMd_array,
+                                                        equilibrium = True):
     """Function that determines the fraction of the population being MM for a
     specific b_OC_MMd value.
 
@@ -1176,6 +1202,9 @@ def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
         Array with all the time points.
     b_OC_MMd_array: Float
         If True b_OC_MMd is an array and if False b_OC_MMd is a float.
+    equilibrium: Bool
+        If True the MM fraction is taken from the stable fixed point of the
+        model when there is exactly one, otherwise the model is integrated.
 
     Returns:
     --------
@@ -1186,8 +1215,16 @@ def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
     if b_OC_MMd_array == True:
         b_OC_MMd = b_OC_MMd[0]
 
-    # Change the b_OC_MM value to the specified value
-    matrix[2, 0]= b_OC_MMd
+    # Derive a matrix with the specified b_OC_MMd value
+    matrix = derive_matrix(matrix, {(2, 0): b_OC_MMd})
+
+    # Determine the MM fraction in the stable fixed point if there is only one
+    if equilibrium == True:
+        df_fixed_points = fixed_points_frac(N, cOC_IH, cOB_IH, cMMd, cMMr,
+                                                                        matrix)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total xMM'])
 
     # Set the initial conditions
     y0 = [xOC, xOB, xMMd, xMMr]
@@ -1204,8 +1241,10 @@ def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
     return float(last_MM_fraction)
 
 """Determine the best drug effect value for high and low cOB and cOC values"""
+@parameter_set_objective
 def minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd, xMMr, N, cOC,
-            cOB, cMMd, cMMr, cOC_IH, cOB_IH, matrix, t, WMMd_inhibitor_array):
+            cOB, cMMd, cMMr, cOC_IH, cOB_IH, matrix, t, WMMd_inhibitor_array,
+                                                        equilibrium = True):
     """Function that determines the fraction of the population being MM for a
     specific WMMd drug inhibitor value.
 
@@ -1241,6 +1280,9 @@ def minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd, xMMr, N, cOC,
         Array with all the time points.
     WMMd_inhibitor_array: Float
         If True WMMd_inhibitor is an array and if False WMMd_inhibitor is a float.
+    equilibrium: Bool
+        If True the MM fraction is taken from the stable fixed point of the
+        model when there is exactly one, otherwise the model is integrated.
 
     Returns:
     --------
@@ -1251,6 +1293,14 @@ def minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd, xMMr, N, cOC,
     if WMMd_inhibitor_array == True:
         WMMd_inhibitor = WMMd_inhibitor[0]
 
+    # Determine the MM fraction in the stable fixed point if there is only one
+    if equilibrium == True:
+        df_fixed_points = fixed_points_frac(N, cOC_IH, cOB_IH, cMMd, cMMr,
+                                                        matrix, WMMd_inhibitor)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total xMM'])
+
     # Set initial conditions
     y0 = [xOC, xOB, xMMd, xMMr]
     parameters = (N, cOC_IH, cOB_IH, cMMd, cMMr, matrix, WMMd_inhibitor)
@@ -1293,19 +1343,21 @@ def Figure_best_WMMd_IH():
 
     t = np.linspace(0, 100, 100)
 
-    # Make a dictionary
-    dict_frac_tumour = {}
+    # Scan the WMMd_inhibitor values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_frac_tumour = adaptive_scan(lambda values: scan_frac(values,
+                'WMMd_inhibitor', [xOC, xOB, xMMd, xMMr], t, N, cOC_IH, cOB_IH,
+                cMMd, cMMr, matrix), 0, 3)
 
-    # Loop over the different WMMd_inhibitor values
-    for WMMd_inhibitor in range(3000):
-        WMMd_inhibitor = WMMd_inhibitor/1000
-        frac_tumour = minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd,
-                xMMr, N, cOC, cOB, cMMd, cMMr, cOC_IH, cOB_IH, matrix, t, False)
-        dict_frac_tumour[WMMd_inhibitor] = frac_tumour
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'cOC_IH': cOC_IH, 'cOB_IH': cOB_IH, 'matrix': matrix}
 
     # Save the data
     save_dictionary(dict_frac_tumour,
-            r'..\data\data_model_frac_IH_inf\dict_cell_frac_IH_WMMd_IH.csv')
+           data_path('data_model_frac_IH_inf', 'dict_cell_frac_IH_WMMd_IH.csv'),
+                                                                       metadata)
 
     # Retrieve the optimal value
     min_value = min(dict_frac_tumour.values())
@@ -1327,8 +1379,8 @@ def Figure_best_WMMd_IH():
     plt.ylabel('MM fraction')
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_frac_IH_change_WMMd_IH',
-                                 r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                 figure_path('results_model_frac_IH_inf'))
+    show()
 
 
 """ Figure to determine the best b_OC_MMd value """
@@ -1361,21 +1413,22 @@ def Figure_best_b_OC_MMd():
     t = np.linspace(0, 100, 100)
     b_OC_MMd_start = 1.5
 
-    # Make a dictionary
-    dict_frac_tumour_GF = {}
+    # Scan the b_OC_MMd values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_frac_tumour_GF = adaptive_scan(lambda values: scan_frac(values,
+                'b_OC_MMd', [xOC, xOB, xMMd, xMMr], t, N, cOC_IH, cOB_IH,
+                cMMd, cMMr, matrix), 0, 3)
 
-    # Loop over all the b_OC_MMd values
-    for b_OC_MMd in range(3000):
-        b_OC_MMd = b_OC_MMd/1000
-
-        # Determine the total MM fraction
-        frac_tumour = minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd,
-                xMMr, N, cOC, cOB, cMMd, cMMr, cOB_IH, cOC_IH, matrix, t, False)
-        dict_frac_tumour_GF[b_OC_MMd] = frac_tumour
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'cOC_IH': cOC_IH, 'cOB_IH': cOB_IH, 'matrix': matrix,
+                'b_OC_MMd_start': b_OC_MMd_start}
 
     # Save the data
     save_dictionary(dict_frac_tumour_GF,
-             r'..\data\data_model_frac_IH_inf\dict_cell_frac_IH_b_OC_MMd.csv')
+          data_path('data_model_frac_IH_inf', 'dict_cell_frac_IH_b_OC_MMd.csv'),
+                                                                       metadata)
 
     # Retrieve the optimal value
     min_value = min(dict_frac_tumour_GF.values())
@@ -1396,8 +1449,8 @@ def Figure_best_b_OC_MMd():
     plt.title(r'MM fraction for different $b_{OC, MMd}$ values')
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_frac_IH_change_b_OC_MMd',
-                                r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                figure_path('results_model_frac_IH_inf'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 (original situation)"""
@@ -1477,19 +1530,28 @@ def Figure_continuous_MTD_vs_AT_a_h(n_switches, t_steps_drug):
                             cOB, cMMd, cMMr, cOC_IH, cOB_IH, matrix_no_GF_IH,
                             matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr, 'cOC_IH': cOC_IH,
+                'cOB_IH': cOB_IH, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF,'df_cell_frac_IH_switch_GF_IH_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_frac_IH_switch_WMMd_IH_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_frac_IH_switch_comb_IH_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_IH_continuous_GF_IH_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_frac_IH_continuous_WMMd_IH_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_frac_IH_continuous_comb_IH_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1547,8 +1609,8 @@ def Figure_continuous_MTD_vs_AT_a_h(n_switches, t_steps_drug):
     legend_labels = ['Fraction OC', 'Fraction OB', 'Fraction MMd', 'Fraction MMr']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_frac_IH_AT_MTD_a_h',
-                                 r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                 figure_path('results_model_frac_IH_inf'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 Shorter holiday and administration periods and weaker IHs compared to the original
@@ -1640,19 +1702,28 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
     avarage_MMr_MMd_nr(df_total_WMMd, 10, 'Traditional thearpy WMMd IH')
     avarage_MMr_MMd_nr(df_total_comb, 10, 'Traditional thearpy IH combination')
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr, 'cOC_IH': cOC_IH,
+                'cOB_IH': cOB_IH, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF,'df_cell_frac_IH_switch_GF_IH_r.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd,'df_cell_frac_IH_switch_WMMd_IH_r.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb,'df_cell_frac_IH_switch_comb_IH_r.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_IH_continuous_GF_IH_r.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd,'df_cell_frac_IH_continuous_WMMd_IH_r.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb,'df_cell_frac_IH_continuous_comb_IH_r.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1729,8 +1800,8 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=5,
                                                             fontsize='x-large')
     save_Figure(plt, 'line_plot_cell_frac_IH_AT_MTD_r',
-                                 r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                 figure_path('results_model_frac_IH_inf'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 The AT administration and holiday durations depend on the MMd and MMr fraction"""
@@ -1811,13 +1882,23 @@ def Figure_AT_MMd_MMr_limit(upper_limit_MMd, upper_limit_MMr):
     {round(a_dur_comb, 0)} generations and the average IH combination holiday
     duration is {round(h_dur_comb, 0)} generations""")
 
+    # The parameters that are saved with the data
+    metadata = {'upper_limit_MMd': upper_limit_MMd,
+                'upper_limit_MMr': upper_limit_MMr, 'N': N, 'cMMr': cMMr,
+                'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC, 'xOB': xOB,
+                'xMMd': xMMd, 'xMMr': xMMr, 'cOC_IH': cOC_IH, 'cOB_IH': cOB_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF,'df_cell_frac_IH_switch_GF_IH_d.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd,'df_cell_frac_IH_switch_WMMd_IH_d.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb,'df_cell_frac_IH_switch_comb_IH_d.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(1, 3, figsize=(20, 5))
@@ -1861,8 +1942,8 @@ def Figure_AT_MMd_MMr_limit(upper_limit_MMd, upper_limit_MMr):
     fig.legend(labels = legend_labels, loc='upper center', ncol=5,
                                                             fontsize='x-large')
     save_Figure(plt, 'line_plot_cell_frac_IH_AT_MTD_d',
-                                 r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                 figure_path('results_model_frac_IH_inf'))
+    show()
 
 
 """ Figure to determine the difference between traditional and adaptive therapy.
@@ -1943,19 +2024,28 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
                                 cOB, cMMd, cMMr, cOC_IH, cOB_IH, matrix_no_GF_IH,
                                 matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr, 'cOC_IH': cOC_IH,
+                'cOB_IH': cOB_IH, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_frac_IH_switch_GF_IH_short_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_frac_IH_switch_WMMd_IH_short_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_frac_IH_switch_comb_IH_short_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_IH_continuous_GF_IH_short_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_frac_IH_continuous_WMMd_IH_short_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_frac_IH_continuous_comb_IH_short_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -2014,8 +2104,8 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                 fontsize='large')
     save_Figure(plt, 'line_plot_cell_frac_IH_AT_MTD_short_a_h',
-                             r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                             figure_path('results_model_frac_IH_inf'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 Weaker IHs compared to the original situation"""
@@ -2095,19 +2185,28 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
                                 cOB, cMMd, cMMr, cOC_IH, cOB_IH, matrix_no_GF_IH,
                                 matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr, 'cOC_IH': cOC_IH,
+                'cOB_IH': cOB_IH, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_frac_IH_switch_GF_IH_weak_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_frac_IH_switch_WMMd_IH_weak_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_frac_IH_switch_comb_IH_weak_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_IH_continuous_GF_IH_weak_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_frac_IH_continuous_WMMd_IH_weak_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_frac_IH_continuous_comb_IH_weak_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -2166,8 +2265,8 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                fontsize='large')
     save_Figure(plt, 'line_plot_cell_frac_IH_AT_MTD_weak_a_h',
-                             r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                             figure_path('results_model_frac_IH_inf'))
+    show()
 
 
 """ Figure to determine the difference between traditional and adaptive therapy
@@ -2249,19 +2348,28 @@ def Figure_continuous_MTD_vs_AT_OB_a_h(n_switches, t_steps_drug):
                                 matrix_IH_comb, WMMd_inhibitor_comb)
 
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr, 'cOC_IH': cOC_IH,
+                'cOB_IH': cOB_IH, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF,'df_cell_frac_IH_switch_GF_IH_OB_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_frac_IH_switch_WMMd_IH_OB_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_frac_IH_switch_comb_IH_OB_a_h.csv',
-                                        r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_IH_continuous_GF_IH_OB_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_frac_IH_continuous_WMMd_IH_OB_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_frac_IH_continuous_comb_IH_OB_a_h.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -2320,8 +2428,8 @@ def Figure_continuous_MTD_vs_AT_OB_a_h(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                 fontsize='large')
     save_Figure(plt, 'line_plot_cell_frac_IH_AT_MTD_OB_a_h',
-                             r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                             figure_path('results_model_frac_IH_inf'))
+    show()
 
 """ 3D plot showing the best IH holiday and administration periods"""
 def Figure_3D_MM_frac_IH_add_and_holiday():
@@ -2375,9 +2483,18 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
     df_holiday_GF_IH = dataframe_3D_plot( xOC, xOB, xMMd, xMMr, N, cOC, cOB,
         cMMd, cMMr, cOC_IH, cOB_IH, matrix_no_GF_IH, matrix_GF_IH)
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'cOC_IH': cOC_IH, 'cOB_IH': cOB_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_holiday_GF_IH, 'df_cell_frac_IH_best_MMd_GF_IH_holiday.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Determine the axis values
     X_GF_IH, Y_GF_IH, Z_GF_IH = x_y_z_axis_values_3d_plot(df_holiday_GF_IH,
@@ -2389,7 +2506,7 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_W_IH, 'df_cell_frac_IH_best_WMMd_IH_holiday.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Determine the axis values
     X_W_IH, Y_W_IH, Z_W_IH = x_y_z_axis_values_3d_plot(df_holiday_W_IH, "W IH")
@@ -2401,7 +2518,7 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_frac_IH_best_comb_IH_holiday.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Determine the axis values
     X_comb, Y_comb, Z_comb = x_y_z_axis_values_3d_plot(df_holiday_comb,
@@ -2468,8 +2585,8 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
 
     # Add a color bar
     save_Figure(fig, '3d_plot_MM_frac_IH_best_IH_h_a_periods',
-                                r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                figure_path('results_model_frac_IH_inf'))
+    show()
 
 """ 3D plot showing the best IH strengths """
 def Figure_3D_MM_frac_MMd_IH_strength():
@@ -2539,9 +2656,15 @@ def Figure_3D_MM_frac_MMd_IH_strength():
 
             df_holiday = combine_dataframes(df_holiday, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'cOC_IH': cOC_IH, 'cOB_IH': cOB_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Save the data
     save_dataframe(df_holiday, 'df_cell_frac_IH_best_comb_IH_strength.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
 
     # Find the drug administration and holiday period causing the lowest MM
@@ -2594,8 +2717,8 @@ def Figure_3D_MM_frac_MMd_IH_strength():
     color_bar.set_label('MM fraction')
 
     save_Figure(fig, '3d_plot_MM_frac_IH_best_IH_strength',
-                                r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                figure_path('results_model_frac_IH_inf'))
+    show()
 
 
 """ Figure with a longer IH administration than holiday and the other way around"""
@@ -2655,11 +2778,20 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
                                 cOB, cMMd, cMMr, cOC_IH, cOB_IH, matrix_no_GF_IH,
                                 matrix_GF_IH_half, WMMd_inhibitor_half)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                't_steps_no_drug': t_steps_no_drug, 'N': N, 'cMMr': cMMr,
+                'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC, 'xOB': xOB,
+                'xMMd': xMMd, 'xMMr': xMMr, 'cOC_IH': cOC_IH, 'cOB_IH': cOB_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH_half': matrix_GF_IH_half,
+                'WMMd_inhibitor_half': WMMd_inhibitor_half}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_frac_IH_short_a_long_h_MMd_IH.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_frac_IH_long_a_short_h_MMd_IH.csv.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(1, 2, figsize=(16, 6))
@@ -2690,8 +2822,8 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     axs[1].grid(True)
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_frac_IH_diff_h_and_a_MMd_IH',
-                                 r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                 figure_path('results_model_frac_IH_inf'))
+    show()
 
 """ Figure showing the fraction and fitness dynamics"""
 def Figure_frac_fitness_dynamics():
@@ -2807,15 +2939,21 @@ def Figure_frac_fitness_dynamics():
     df_fitness_MMd_GF_IH= combine_dataframes(df_fitness_MMd_GF_IH_1,
                                                         df_fitness_MMd_GF_IH_2)
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'cOC_IH': cOC_IH, 'cOB_IH': cOB_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_WMMd_IH, 'df_cell_frac_WMMd_inhibit.csv',
-                                            r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_MMd_GF_IH, 'df_cell_frac_MMd_GF_inhibit.csv',
-                                             r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_fitness_WMMd_IH, 'df_fitness_WMMd_inhibit.csv',
-                                             r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
     save_dataframe(df_fitness_MMd_GF_IH, 'df_fitness_MMd_GF_inhibit.csv',
-                                            r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 2, figsize=(16, 8))
@@ -2863,8 +3001,8 @@ def Figure_frac_fitness_dynamics():
     axs[1, 1].grid(True)
     plt.tight_layout()
     save_Figure(plt, 'line_plot_cell_frac_fitness_drugs',
-                                r'..\visualisation\results_model_frac_IH_inf')
-    plt.show()
+                                figure_path('results_model_frac_IH_inf'))
+    show()
 
 if __name__ == "__main__":
     main()
@@ -27,13 +27,24 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.integrate import odeint
-import csv
-from scipy.optimize import minimize
-from scipy.stats import spearmanr
-from mpl_toolkits.mplot3d import Axes3D
 import doctest
+from MM_cache import cached
+from MM_parameters import derive_matrix, parameter_set_objective
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_scan import adaptive_scan, scan_frac
+from MM_steady_state import (fixed_points_frac, unique_stable_fixed_point,
+                                                    reached_fixed_point_frac)
+from MM_lazy import lazy_import, lazy_function
+from MM_checkpoint import checkpoint_sweep
+
+# Import the plotting and optimisation libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+minimize = lazy_function('scipy.optimize', 'minimize')
+spearmanr = lazy_function('scipy.stats', 'spearmanr')
 
 def main():
     # Do doc tests
@@ -481,41 +492,40 @@ def combine_dataframes(df_1, df_2):
 
     return(combined_df)
 
-def save_dataframe(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_dataframe(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The dataframe containing the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
-def save_dictionary(dictionary, file_path):
-    """ Function that saves a dictionary as csv file.
+def save_dictionary(dictionary, file_path, metadata = None):
+    """ Function that saves a dictionary as binary (npz) file.
 
     Parameters:
     -----------
     dictionary: Dictionary
         The dictionary containing the collected data.
     file_path: String
-        The name of the csv file and the path where the dictionary will be saved.
+        The name of the file and the path where the dictionary will be
+        saved, the .csv extension is replaced by the extension of the
+        storage format (MM_storage.py).
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-
-        # Create a header
-        writer.writerow(['Key', 'Value'])
-
-        # Loop over the rows
-        for key, value in dictionary.items():
-            writer.writerow([str(key), str(value)])
+    MM_writer.write(MM_storage.save_dictionary, dictionary, file_path,
+                                                                    metadata)
 
 def save_Figure(figure, file_name, folder_path):
     """Save the Figure to a specific folder.
@@ -530,7 +540,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def make_part_df(dataframe, start_time, time, N, cOC, cOB, cMMd, cMMr, matrix,
             WMMd_inhibitor = 0):
@@ -826,6 +839,7 @@ def continuous_add_IH_df(end_generation, xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd
 
     return df_total
 
+@parameter_set_objective
 def minimal_tumour_frac_t_steps(t_steps_drug, t_steps_no_drug, xOC, xOB, xMMd,
                                 xMMr, N, cOC, cOB, cMMd, cMMr, matrix_no_GF_IH,
                                 matrix_GF_IH, WMMd_inhibitor = 0):
@@ -900,6 +914,7 @@ def minimal_tumour_frac_t_steps(t_steps_drug, t_steps_no_drug, xOC, xOB, xMMd,
 
     return float(average_MM_fraction)
 
+@cached
 def dataframe_3D_plot(xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd, cMMr,
                             matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
     """ Function that create a dataframe with the average MM fraction for
@@ -943,19 +958,29 @@ def dataframe_3D_plot(xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd, cMMr,
     column_names = ['Generations no drug', 'Generations drug', 'MM fraction']
     df_MM_frac = pd.DataFrame(columns=column_names)
 
-    # Loop over all the t_step values for drug administration and drug holidays
-    for t_steps_no_drug in range(2, 22):
+    # Determine the MM fraction for all t_step values for drug administration
+    # and drug holidays, in a task of a checkpoint (MM_checkpoint.py) every
+    # finished value is saved
+    t_steps = [(t_steps_no_drug, t_steps_drug) for t_steps_no_drug in
+                                range(2, 22) for t_steps_drug in range(2, 22)]
 
-        for t_steps_drug in range(2, 22):
-            frac_tumour = minimal_tumour_frac_t_steps(t_steps_drug,
+    def frac_tumour_t_steps(t_step):
+        t_steps_no_drug, t_steps_drug = t_step
+        return minimal_tumour_frac_t_steps(t_steps_drug,
                 t_steps_no_drug, xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd, cMMr,
                 matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor)
 
-            # Add results to the dataframe
-            new_row_df = pd.DataFrame([{'Generations no drug': \
+    frac_tumours = checkpoint_sweep(t_steps, frac_tumour_t_steps, (xOC, xOB,
+             xMMd, xMMr, N, cOC, cOB, cMMd, cMMr, matrix_no_GF_IH, matrix_GF_IH,
+                                                                WMMd_inhibitor))
+
+    for (t_steps_no_drug, t_steps_drug), frac_tumour in zip(t_steps,
+                                                            frac_tumours):
+        # Add results to the dataframe
+        new_row_df = pd.DataFrame([{'Generations no drug': \
                     int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
                                          'MM fraction': float(frac_tumour)}])
-            df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
+        df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
 
     return(df_MM_frac)
 
@@ -1014,8 +1039,10 @@ def x_y_z_axis_values_3d_plot(dataframe, name):
 
     return (X_values, Y_values, Z_values)
 
+@parameter_set_objective
 def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
-                                        cMMd, cMMr, matrix, t, b_OC_MMd_array):
+                                        cMMd, cMMr, matrix, t, b_OC_MMd_array,
+                                                        equilibrium = True):
     """Function that determines the fraction of the population being MM for a
     specific b_OC_MMd value.
 
@@ -1047,6 +1074,9 @@ def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
         Array with all the time points.
     b_OC_MMd_array: Float
         If True b_OC_MMd is an array and if False b_OC_MMd is a float.
+    equilibrium: Bool
+        If True the MM fraction is taken from the stable fixed point of the
+        model when there is exactly one, otherwise the model is integrated.
 
     Returns:
     --------
@@ -1057,8 +1087,15 @@ def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
     if b_OC_MMd_array == True:
         b_OC_MMd = b_OC_MMd[0]
 
-    # Change the b_OC_MM value to the specified value
-    matrix[2, 0]= b_OC_MMd
+    # Derive a matrix with the specified b_OC_MMd value
+    matrix = derive_matrix(matrix, {(2, 0): b_OC_MMd})
+
+    # Determine the MM fraction in the stable fixed point if there is only one
+    if equilibrium == True:
+        df_fixed_points = fixed_points_frac(N, cOC, cOB, cMMd, cMMr, matrix)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total xMM'])
 
     # Set the initial conditions
     y0 = [xOC, xOB, xMMd, xMMr]
@@ -1075,8 +1112,10 @@ def minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
     return float(last_MM_fraction)
 
 """Determine the best drug effect value for high and low cOB and cOC values"""
+@parameter_set_objective
 def minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd, xMMr, N, cOC,
-                            cOB, cMMd, cMMr, matrix, t, WMMd_inhibitor_array):
+                            cOB, cMMd, cMMr, matrix, t, WMMd_inhibitor_array,
+                                                        equilibrium = True):
     """Function that determines the fraction of the population being MM for a
     specific WMMd drug inhibitor value.
 
@@ -1108,6 +1147,9 @@ def minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd, xMMr, N, cOC,
         Array with all the time points.
     WMMd_inhibitor_array: Float
         If True WMMd_inhibitor is an array and if False WMMd_inhibitor is a float.
+    equilibrium: Bool
+        If True the MM fraction is taken from the stable fixed point of the
+        model when there is exactly one, otherwise the model is integrated.
 
     Returns:
     --------
@@ -1118,6 +1160,14 @@ def minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd, xMMr, N, cOC,
     if WMMd_inhibitor_array == True:
         WMMd_inhibitor = WMMd_inhibitor[0]
 
+    # Determine the MM fraction in the stable fixed point if there is only one
+    if equilibrium == True:
+        df_fixed_points = fixed_points_frac(N, cOC, cOB, cMMd, cMMr, matrix,
+                                                                WMMd_inhibitor)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total xMM'])
+
     # Set initial conditions
     y0 = [xOC, xOB, xMMd, xMMr]
     parameters = (N, cOC, cOB, cMMd, cMMr, matrix, WMMd_inhibitor)
@@ -1170,19 +1220,21 @@ def Figure_best_WMMd_IH():
                 float(optimal_WMMd_IH_high[0]), ', gives tumour fraction:',
                                                             result_high.fun)
 
-    # Make a dictionary
-    dict_frac_tumour_high_c = {}
+    # Scan the WMMd_inhibitor values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_frac_tumour_high_c = adaptive_scan(lambda values: scan_frac(values,
+                'WMMd_inhibitor', [xOC, xOB, xMMd, xMMr], t, N, cOC, cOB,
+                cMMd, cMMr, matrix), 0, 3)
 
-    # Loop over the different WMMd_inhibitor values
-    for WMMd_inhibitor in range(3000):
-        WMMd_inhibitor = WMMd_inhibitor/1000
-        frac_tumour = minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd,
-                                xMMr, N, cOC, cOB, cMMd, cMMr, matrix, t, False)
-        dict_frac_tumour_high_c[WMMd_inhibitor] = frac_tumour
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'xOC': xOC, 'xOB': xOB,
+                'xMMd': xMMd, 'xMMr': xMMr, 'matrix': matrix,
+                'WMMd_IH_start': WMMd_IH_start}
 
     # Save the data
     save_dictionary(dict_frac_tumour_high_c,
-           r'..\data\data_model_fractions\dict_cell_frac_WMMd_IH_high_c.csv')
+         data_path('data_model_fractions', 'dict_cell_frac_WMMd_IH_high_c.csv'),
+                                                                       metadata)
 
     # Make lists of the keys and the values
     keys_high_c = list(dict_frac_tumour_high_c.keys())
@@ -1204,16 +1256,16 @@ def Figure_best_WMMd_IH():
                     float(optimal_WMMd_IH_low[0]),'gives tumour fraction',
                                                                 result_low.fun)
 
-    # Loop over the different WMMd_inhibitor values
-    for WMMd_inhibitor in range(3000):
-        WMMd_inhibitor = WMMd_inhibitor/1000
-        frac_tumour = minimal_tumour_frac_WMMd_IH(WMMd_inhibitor, xOC, xOB, xMMd,
-                                xMMr, N, cOC, cOB, cMMd, cMMr, matrix, t, False)
-        dict_frac_tumour_low_c[WMMd_inhibitor] = frac_tumour
+    # Scan the WMMd_inhibitor values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_frac_tumour_low_c = adaptive_scan(lambda values: scan_frac(values,
+                'WMMd_inhibitor', [xOC, xOB, xMMd, xMMr], t, N, cOC, cOB,
+                cMMd, cMMr, matrix), 0, 3)
 
     # Save the data
     save_dictionary(dict_frac_tumour_low_c,
-            r'..\data\data_model_fractions\dict_cell_frac_WMMd_IH_low_c.csv')
+          data_path('data_model_fractions', 'dict_cell_frac_WMMd_IH_low_c.csv'),
+                                                                       metadata)
 
     # Make lists of the keys and the values
     keys_low_c = list(dict_frac_tumour_low_c.keys())
@@ -1242,8 +1294,8 @@ def Figure_best_WMMd_IH():
     plt.tight_layout()
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_frac_change_WMMd_IH_high_low_c',
-                                 r'..\visualisation\results_model_fractions')
-    plt.show()
+                                 figure_path('results_model_fractions'))
+    show()
 
 
 """ Figure to determine the best b_OC_MMd value """
@@ -1283,21 +1335,21 @@ def Figure_best_b_OC_MMd():
     print("Optimal value for b_OC_MMd", float(optimal_b_OC_MMd[0]),
                                             'gives tumour fraction', result.fun)
 
-    # Make a dictionary
-    dict_frac_tumour_GF = {}
-
-    # Loop over all the b_OC_MMd values
-    for b_OC_MMd in range(3000):
-        b_OC_MMd = b_OC_MMd/1000
+    # Scan the b_OC_MMd values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_frac_tumour_GF = adaptive_scan(lambda values: scan_frac(values,
+                'b_OC_MMd', [xOC, xOB, xMMd, xMMr], t, N, cOC, cOB,
+                cMMd, cMMr, matrix), 0, 3)
 
-        # Determine the total MM fraction
-        frac_tumour = minimal_tumour_frac_b_OC_MMd(b_OC_MMd, xOC, xOB, xMMd,
-                                xMMr, N, cOC, cOB, cMMd, cMMr, matrix, t, False)
-        dict_frac_tumour_GF[b_OC_MMd] = frac_tumour
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'matrix': matrix, 'b_OC_MMd_start': b_OC_MMd_start}
 
     # Save the data
     save_dictionary(dict_frac_tumour_GF,
-                 r'..\data\data_model_fractions\dict_cell_frac_b_OC_MMd.csv')
+               data_path('data_model_fractions', 'dict_cell_frac_b_OC_MMd.csv'),
+                                                                       metadata)
 
     # Make a list of the keys and one of the values
     b_OC_MMd_values = list(dict_frac_tumour_GF.keys())
@@ -1310,8 +1362,8 @@ def Figure_best_b_OC_MMd():
     plt.title(r'MM fraction for different $b_{OC, MMd}$ values')
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_frac_change_b_OC_MMd',
-                                r'..\visualisation\results_model_fractions')
-    plt.show()
+                                figure_path('results_model_fractions'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 (original situation)"""
@@ -1385,19 +1437,28 @@ def Figure_continuous_MTD_vs_AT_a_h(n_switches, t_steps_drug):
     df_total_comb = continuous_add_IH_df(135, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
             cMMd, cMMr, matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_frac_switch_GF_IH_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_frac_switch_WMMd_IH_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_frac_switch_comb_IH_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_continuous_GF_IH_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_frac_continuous_WMMd_IH_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_comb, 'df_cell_frac_continuous_comb_IH_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1456,8 +1517,8 @@ def Figure_continuous_MTD_vs_AT_a_h(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                             fontsize='large')
     save_Figure(plt, 'line_plot_cell_frac_AT_MTD_a_h',
-                                 r'..\visualisation\results_model_fractions')
-    plt.show()
+                                 figure_path('results_model_fractions'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 Shorter holiday and administration periods compared to the original situation"""
@@ -1531,19 +1592,28 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     df_total_comb = continuous_add_IH_df(135, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
             cMMd, cMMr, matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_frac_switch_GF_IH_short_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_frac_switch_WMMd_IH_short_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_frac_switch_comb_IH_short_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_continuous_GF_IH_short_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_frac_continuous_WMMd_IH_short_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_comb, 'df_cell_frac_continuous_comb_IH_short_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1602,8 +1672,8 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                 fontsize='large')
     save_Figure(plt, 'line_plot_cell_frac_AT_MTD_short_a_h',
-                                 r'..\visualisation\results_model_fractions')
-    plt.show()
+                                 figure_path('results_model_fractions'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 Weaker IHs compared to the original situation"""
@@ -1677,19 +1747,28 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     df_total_comb = continuous_add_IH_df(135, xOC, xOB, xMMd, xMMr, N, cOC, cOB,
             cMMd, cMMr, matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC,
+                'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_frac_switch_GF_IH_weak_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_frac_switch_WMMd_IH_weak_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_frac_switch_comb_IH_weak_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_GF, 'df_cell_frac_continuous_GF_IH_weak_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_frac_continuous_WMMd_IH_weak_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_comb, 'df_cell_frac_continuous_comb_IH_weak_a_h.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1748,8 +1827,8 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                fontsize='large')
     save_Figure(plt, 'line_plot_cell_frac_AT_MTD_weak_a_h',
-                                 r'..\visualisation\results_model_fractions')
-    plt.show()
+                                 figure_path('results_model_fractions'))
+    show()
 
 """ 3D plot showing the best IH holiday and administration periods"""
 def Figure_3D_MM_frac_IH_add_and_holiday():
@@ -1800,9 +1879,17 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
     df_holiday_GF_IH = dataframe_3D_plot( xOC, xOB, xMMd, xMMr, N, cOC, cOB,
         cMMd, cMMr, matrix_no_GF_IH, matrix_GF_IH)
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_holiday_GF_IH, 'df_cell_frac_best_MMd_GH_IH_holiday.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Determine the axis values
     X_GF_IH, Y_GF_IH, Z_GF_IH = x_y_z_axis_values_3d_plot(df_holiday_GF_IH,
@@ -1814,7 +1901,7 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_W_IH, 'df_cell_frac_best_WMMd_IH_holiday.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Determine the axis values
     X_W_IH, Y_W_IH, Z_W_IH = x_y_z_axis_values_3d_plot(df_holiday_W_IH, "W IH")
@@ -1825,7 +1912,7 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_frac_IH_best_comb_IH_holiday.csv',
-                                         r'..\data\data_model_frac_IH_inf')
+                                  data_path('data_model_frac_IH_inf'), metadata)
 
     # Determine the axis values
     X_comb, Y_comb, Z_comb = x_y_z_axis_values_3d_plot(df_holiday_comb,
@@ -1833,7 +1920,7 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_frac_best_comb_IH_holiday.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a figure and a grid of subplots
     fig, axes = plt.subplots(2, 2, figsize=(11, 9), subplot_kw={'projection': '3d'},
@@ -1896,8 +1983,8 @@ def Figure_3D_MM_frac_IH_add_and_holiday():
 
     # Add a color bar
     save_Figure(fig, '3d_plot_MM_frac_best_IH_h_a_periods',
-                                r'..\visualisation\results_model_fractions')
-    plt.show()
+                                figure_path('results_model_fractions'))
+    show()
 
 """ 3D plot showing the best IH strengths """
 def Figure_3D_MM_frac_MMd_IH_strength():
@@ -1963,9 +2050,14 @@ def Figure_3D_MM_frac_MMd_IH_strength():
 
             df_holiday = combine_dataframes(df_holiday, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Save the data
     save_dataframe(df_holiday, 'df_cell_frac_best_comb_IH_strength.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
 
     # Find the drug administration and holiday period causing the lowest MM
@@ -2018,8 +2110,8 @@ def Figure_3D_MM_frac_MMd_IH_strength():
     color_bar.set_label('MM fraction')
 
     save_Figure(fig, '3d_plot_MM_frac_best_IH_strength',
-                                r'..\visualisation\results_model_fractions')
-    plt.show()
+                                figure_path('results_model_fractions'))
+    show()
 
 """ Figure with different GF IH administration and holiday periods"""
 def Figure_3_senarios_MMd_GF_IH(n_switches, t_steps_drug):
@@ -2095,15 +2187,21 @@ def Figure_3_senarios_MMd_GF_IH(n_switches, t_steps_drug):
     # Combine the dataframes
     df_total = combine_dataframes(df_1, df_2)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_frac_G6_MMd_GF_inhibit.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_frac_G8_MMd_GF_inhibit.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_3, 'df_cell_frac_G12_MMd_GF_inhibit.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total, 'df_cell_frac_MMd_GF_inhibit_continuously.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 2, figsize=(16, 10))
@@ -2151,8 +2249,8 @@ def Figure_3_senarios_MMd_GF_IH(n_switches, t_steps_drug):
     axs[1, 1].legend(loc = 'upper right')
     axs[1, 1].grid(True)
     save_Figure(plt, 'line_plot_cell_frac_MMd_GF_inhibit',
-                                 r'..\visualisation\results_model_fractions')
-    plt.show()
+                                 figure_path('results_model_fractions'))
+    show()
 
 """ Figure with different WMMd IH administration and holiday periods"""
 def Figure_3_senarios_WMMd_IH(n_switches, t_steps_drug):
@@ -2225,15 +2323,20 @@ def Figure_3_senarios_WMMd_IH(n_switches, t_steps_drug):
     # Combine the dataframes
     df_total = combine_dataframes(df_1, df_2)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'matrix': matrix, 'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_frac_G8_WMMd_inhibit.csv',
-                                        r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_frac_G10_WMMd_inhibit.csv',
-                                        r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_3, 'df_cell_frac_G12_WMMd_inhibit.csv',
-                                        r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total, 'df_cell_frac_WMMd_inhibit_continuously.csv',
-                                         r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 2, figsize=(16, 10))
@@ -2281,8 +2384,8 @@ def Figure_3_senarios_WMMd_IH(n_switches, t_steps_drug):
     axs[1, 1].legend(loc = 'upper right')
     axs[1, 1].grid(True)
     save_Figure(plt, 'line_plot_cell_frac_WMMd_inhibit',
-                                 r'..\visualisation\results_model_fractions')
-    plt.show()
+                                 figure_path('results_model_fractions'))
+    show()
 
 """ Figure with different IH administration and holiday periods"""
 def Figure_3_senarios_MMd_GF_WMMd_IH(n_switches, t_steps_drug):
@@ -2360,15 +2463,22 @@ def Figure_3_senarios_MMd_GF_WMMd_IH(n_switches, t_steps_drug):
     # Combine the dataframes
     df_total = combine_dataframes(df_1, df_2)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug, 'N': N,
+                'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH_half': matrix_GF_IH_half,
+                'WMMd_inhibitor_half': WMMd_inhibitor_half}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_frac_G10_MMd_GF_WMMd_inhibit.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_frac_G12_MMd_GF_WMMd_inhibit.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_3, 'df_cell_frac_G14_MMd_GF_WMMd_inhibit.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total, 'df_cell_frac_MMd_GF_WMMd_inhibit_continuously.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 2, figsize=(16, 10))
@@ -2419,8 +2529,8 @@ def Figure_3_senarios_MMd_GF_WMMd_IH(n_switches, t_steps_drug):
     axs[1, 1].legend(loc = 'upper right')
     axs[1, 1].grid(True)
     save_Figure(plt, 'line_plot_cell_frac_MMd_GF_WMMd_inhibit',
-                                r'..\visualisation\results_model_fractions')
-    plt.show()
+                                figure_path('results_model_fractions'))
+    show()
 
 """ Figure showing the fraction and fitness dynamics"""
 def Figure_frac_fitness_dynamics():
@@ -2533,15 +2643,20 @@ def Figure_frac_fitness_dynamics():
     df_fitness_MMd_GF_IH = combine_dataframes(df_fitness_MMd_GF_IH_1,
                                                         df_fitness_MMd_GF_IH_2)
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_WMMd_IH, 'df_cell_frac_cWMMd_inhibit.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_MMd_GF_IH, 'df_cell_frac_MMd_GF_inhibit.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_fitness_WMMd_IH, 'df_fitness_WMMd_inhibit.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_fitness_MMd_GF_IH, 'df_fitness_MMd_GF_inhibit.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 2, figsize=(16, 8))
@@ -2589,8 +2704,8 @@ def Figure_frac_fitness_dynamics():
     axs[1, 1].grid(True)
     plt.tight_layout()
     save_Figure(plt, 'line_plot_cell_frac_fitness_drugs',
-                                r'..\visualisation\results_model_fractions')
-    plt.show()
+                                figure_path('results_model_fractions'))
+    show()
 
 
 """ Figure with a longer IH administration than holiday and the other way around"""
@@ -2645,11 +2760,19 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
                 t_steps_no_drug[1], xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd,
                 cMMr, matrix_no_GF_IH, matrix_GF_IH_half, WMMd_inhibitor_half)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                't_steps_no_drug': t_steps_no_drug, 'N': N, 'cMMr': cMMr,
+                'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC, 'xOC': xOC, 'xOB': xOB,
+                'xMMd': xMMd, 'xMMr': xMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH_half': matrix_GF_IH_half,
+                'WMMd_inhibitor_half': WMMd_inhibitor_half}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_frac_short_a_long_h_MMd_IH.csv',
-                                         r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_frac_long_a_short_h_MMd_IH.csv.csv',
-                                         r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(1, 2, figsize=(16, 6))
@@ -2680,8 +2803,8 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     axs[1].grid(True)
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_frac_diff_h_and_a_MMd_IH',
-                                 r'..\visualisation\results_model_fractions')
-    plt.show()
+                                 figure_path('results_model_fractions'))
+    show()
 
 
 """Tables showing the effect of chaning interaction matrix on the eigenvalues H
@@ -2729,24 +2852,15 @@ def Dataframe_bOCMMd_eigenvalues():
         # Determine the eigenvalues
         eigenvalues = np.linalg.eigvals(matrix_drugs)
 
-        # Make a dataframe
-        column_names = ['Generations no drug', 'Generations drug', 'MM fraction']
-        df_holiday = pd.DataFrame(columns=column_names)
-
-        # Loop over al the t_step values for drug dministration and drug holidays
-        for t_steps_no_drug in range(2, 22):
-
-            for t_steps_drug in range(2, 22):
+        # Determine the Jacobian eigenvalues and the stability of the fixed
+        # point that is reached with this payoff matrix
+        fixed_point = reached_fixed_point_frac([xOC, xOB, xMMd, xMMr], N, cOC,
+                                            cOB, cMMd, cMMr, matrix_drugs)
 
-                frac_tumour = minimal_tumour_frac_t_steps(t_steps_drug,
-                                t_steps_no_drug, xOC, xOB, xMMd, xMMr, N, cOC,
-                                cOB, cMMd, cMMr, matrix_no_drugs, matrix_drugs)
-
-                # Add results to the dataframe
-                new_row_df = pd.DataFrame([{'Generations no drug': \
-                    int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
-                    'MM fraction': float(frac_tumour)}])
-                df_holiday = combine_dataframes(df_holiday, new_row_df)
+        # Make a dataframe with the MM fraction for all drug administration and
+        # holiday durations, the cached results are used when they exist
+        df_holiday = dataframe_3D_plot(xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd,
+                                        cMMr, matrix_no_drugs, matrix_drugs)
 
         # Find the drug administration and holiday period causing the lowest MM
         # fraction
@@ -2760,7 +2874,11 @@ def Dataframe_bOCMMd_eigenvalues():
                 'Eigenvalue 1': eigenvalues[0], 'Eigenvalue 2': eigenvalues[1],
                 'Eigenvalue 3': eigenvalues[2], 'Eigenvalue 4': eigenvalues[3],
                 'period H': g_no_drug_min, 'period A': g_drug_min,
-                'MM fraction': frac_min}])
+                'MM fraction': frac_min,
+                'Jacobian eigenvalue 1': fixed_point['Eigenvalue 1'],
+                'Jacobian eigenvalue 2': fixed_point['Eigenvalue 2'],
+                'Jacobian eigenvalue 3': fixed_point['Eigenvalue 3'],
+                'Stability': fixed_point['Stability']}])
         df_eigenvalues = combine_dataframes(df_eigenvalues, new_row_df)
 
         # Add data to a dataframe and discard the imaginary part to make it a float
@@ -2827,9 +2945,14 @@ def Dataframe_bOCMMd_eigenvalues():
     print(f"""Eigenvalue 4 and the lowest MM fraction: p-value = {p_value},
     correlation coefficient = {correlation_coefficient}""")
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr,
+                'matrix_no_drugs': matrix_no_drugs}
+
     # Save the data
     save_dataframe(df_eigenvalues, 'df_eigenvalues_bOCMMd.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
 
 """Tables showing the effect of chaning interaction matrix on the eigenvalues H
@@ -2878,24 +3001,15 @@ def Dataframe_bMMrOC_eigenvalues():
         # Determine the eigenvalues
         eigenvalues = np.linalg.eigvals(matrix_drugs)
 
-        # Make a dataframe
-        column_names = ['Generations no drug', 'Generations drug', 'MM fraction']
-        df_holiday = pd.DataFrame(columns=column_names)
-
-        # Loop over al the t_step values for drug dministration and drug holidays
-        for t_steps_no_drug in range(2, 22):
+        # Determine the Jacobian eigenvalues and the stability of the fixed
+        # point that is reached with this payoff matrix
+        fixed_point = reached_fixed_point_frac([xOC, xOB, xMMd, xMMr], N, cOC,
+                                            cOB, cMMd, cMMr, matrix_drugs)
 
-            for t_steps_drug in range(2, 22):
-
-                frac_tumour = minimal_tumour_frac_t_steps(t_steps_drug,
-                                t_steps_no_drug, xOC, xOB, xMMd, xMMr, N, cOC,
-                                cOB, cMMd, cMMr, matrix_no_drugs, matrix_drugs)
-
-                # Add results to the dataframe
-                new_row_df = pd.DataFrame([{'Generations no drug': \
-                    int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
-                    'MM fraction': float(frac_tumour)}])
-                df_holiday = combine_dataframes(df_holiday, new_row_df)
+        # Make a dataframe with the MM fraction for all drug administration and
+        # holiday durations, the cached results are used when they exist
+        df_holiday = dataframe_3D_plot(xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd,
+                                        cMMr, matrix_no_drugs, matrix_drugs)
 
         # Find the drug administration and holiday period causing the lowest MM
         # fraction
@@ -2909,7 +3023,11 @@ def Dataframe_bMMrOC_eigenvalues():
                 'Eigenvalue 1': eigenvalues[0], 'Eigenvalue 2': eigenvalues[1],
                 'Eigenvalue 3': eigenvalues[2], 'Eigenvalue 4': eigenvalues[3],
                 'period H': g_no_drug_min, 'period A': g_drug_min,
-                'MM fraction': frac_min}])
+                'MM fraction': frac_min,
+                'Jacobian eigenvalue 1': fixed_point['Eigenvalue 1'],
+                'Jacobian eigenvalue 2': fixed_point['Eigenvalue 2'],
+                'Jacobian eigenvalue 3': fixed_point['Eigenvalue 3'],
+                'Stability': fixed_point['Stability']}])
         df_eigenvalues = combine_dataframes(df_eigenvalues, new_row_df)
 
         # Add data to a dataframe and discard the imaginary part to make it a float
@@ -2976,9 +3094,13 @@ def Dataframe_bMMrOC_eigenvalues():
     print(f"""Eigenvalue 4 and the lowest MM fraction: p-value = {p_value},
     correlation coefficient = {correlation_coefficient}""")
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr}
+
     # Save the data
     save_dataframe(df_eigenvalues, 'df_eigenvalues_bMMrOC.csv',
-                                             r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
 def Dataframe_bMMdMMd_bMMrMMr_eigenvalues():
     """ Function that makes a table of the eigenvalues of the interaction matrix,
@@ -3026,23 +3148,15 @@ def Dataframe_bMMdMMd_bMMrMMr_eigenvalues():
         # Determine the eigenvalues
         eigenvalues = np.linalg.eigvals(matrix_no_drugs)
 
-        # Make a dataframe
-        column_names = ['Generations no drug', 'Generations drug', 'MM fraction']
-        df_holiday = pd.DataFrame(columns=column_names)
+        # Determine the Jacobian eigenvalues and the stability of the fixed
+        # point that is reached with this payoff matrix
+        fixed_point = reached_fixed_point_frac([xOC, xOB, xMMd, xMMr], N, cOC,
+                                            cOB, cMMd, cMMr, matrix_no_drugs)
 
-        # Loop over al the t_step values for drug dministration and drug holidays
-        for t_steps_no_drug in range(2, 22):
-
-            for t_steps_drug in range(2, 22):
-                frac_tumour = minimal_tumour_frac_t_steps(t_steps_drug,
-                                t_steps_no_drug, xOC, xOB, xMMd, xMMr, N, cOC,
-                                cOB, cMMd, cMMr, matrix_no_drugs, matrix_drugs)
-
-                # Add results to the dataframe
-                new_row_df = pd.DataFrame([{'Generations no drug': \
-                    int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
-                    'MM fraction': float(frac_tumour)}])
-                df_holiday = combine_dataframes(df_holiday, new_row_df)
+        # Make a dataframe with the MM fraction for all drug administration and
+        # holiday durations, the cached results are used when they exist
+        df_holiday = dataframe_3D_plot(xOC, xOB, xMMd, xMMr, N, cOC, cOB, cMMd,
+                                        cMMr, matrix_no_drugs, matrix_drugs)
 
         # Find the drug administration and holiday period causing the lowest MM
         # fraction
@@ -3056,7 +3170,11 @@ def Dataframe_bMMdMMd_bMMrMMr_eigenvalues():
                 'Eigenvalue 1': eigenvalues[0], 'Eigenvalue 2': eigenvalues[1],
                 'Eigenvalue 3': eigenvalues[2], 'Eigenvalue 4': eigenvalues[3],
                 'period H': g_no_drug_min, 'period A': g_drug_min,
-                'MM fraction': frac_min}])
+                'MM fraction': frac_min,
+                'Jacobian eigenvalue 1': fixed_point['Eigenvalue 1'],
+                'Jacobian eigenvalue 2': fixed_point['Eigenvalue 2'],
+                'Jacobian eigenvalue 3': fixed_point['Eigenvalue 3'],
+                'Stability': fixed_point['Stability']}])
         df_eigenvalues = combine_dataframes(df_eigenvalues, new_row_df)
 
         # Add data to a dataframe and discard the imaginary part to make it a float
@@ -3123,9 +3241,13 @@ def Dataframe_bMMdMMd_bMMrMMr_eigenvalues():
     print(f"""Eigenvalue 4 and the lowest MM fraction: p-value = {p_value},
     correlation coefficient = {correlation_coefficient}""")
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cMMr': cMMr, 'cMMd': cMMd, 'cOB': cOB, 'cOC': cOC,
+                'xOC': xOC, 'xOB': xOB, 'xMMd': xMMd, 'xMMr': xMMr}
+
     # Save the data
     save_dataframe(df_eigenvalues, 'df_eigenvalues_bMMdMMd_bMMrMMr.csv',
-                                            r'..\data\data_model_fractions')
+                                    data_path('data_model_fractions'), metadata)
 
 if __name__ == "__main__":
     main()
@@ -29,12 +29,26 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.integrate import odeint
 import csv
-from scipy.optimize import minimize
-from mpl_toolkits.mplot3d import Axes3D
 import doctest
+from MM_cache import cached
+from MM_parameters import (derive_matrix, number_parameters,
+            parameter_set_objective)
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_scan import adaptive_scan, scan_nr
+from MM_steady_state import fixed_points_nr, unique_stable_fixed_point
+from MM_kernels import number_rhs
+from MM_dense import dense_odeint
+from MM_lazy import lazy_import, lazy_function
+from MM_checkpoint import checkpoint_sweep
+
+# Import the plotting and optimisation libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+minimize = lazy_function('scipy.optimize', 'minimize')
 
 def main():
     # Do doc tests
@@ -688,41 +702,40 @@ def dynamics_MMd_MMr_limits(time_IH, time_end, upper_limit_MMd, upper_limit_MMr,
 
     return df_numbers, average_a_duration, average_h_duration
 
-def save_dataframe(dataframe, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_dataframe(dataframe, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     dataframe: DataFrame
         The dataframe containing the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    dataframe.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, dataframe,
+                    os.path.join(folder_path, file_name), metadata)
 
-def save_dictionary(dictionary, file_path):
-    """ Function that saves a dictionary as csv file.
+def save_dictionary(dictionary, file_path, metadata = None):
+    """ Function that saves a dictionary as binary (npz) file.
 
     Parameters:
     -----------
     dictionary: Dictionary
         The dictionary containing the collected data.
     file_path: String
-        The name of the csv file and the path where the dictionary will be saved.
+        The name of the file and the path where the dictionary will be
+        saved, the .csv extension is replaced by the extension of the
+        storage format (MM_storage.py).
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-
-        # Create a header
-        writer.writerow(['Key', 'Value'])
-
-        # Loop over the rows
-        for key, value in dictionary.items():
-            writer.writerow([str(key), str(value)])
+    MM_writer.write(MM_storage.save_dictionary, dictionary, file_path,
+                                                                    metadata)
 
 def save_optimised_results(results, file_path):
     """ Function that saves the results of the optimised function as csv file.
@@ -745,6 +758,8 @@ def save_optimised_results(results, file_path):
             "Optimal MM nr": optimal_value, 'nr iterations': number_iterations,
             'nr evaluations': number_evaluations}]
 
+    # Make the folder when it does not exist (for example in a new output root)
+    os.makedirs(os.path.dirname(file_path), exist_ok = True)
     with open(file_path, 'w', newline='') as csvfile:
 
         # Create header names
@@ -770,7 +785,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def optimise_matrix():
     """Function that returns theinteraction matrices that are used for the
@@ -783,28 +801,10 @@ def optimise_matrix():
         The interaction matrices used during the optimisation.
     """
 
-    # Payoff matrix when no drugs are present
-    matrix_no_GF_IH = np.array([
-        [0.0, 0.4, 0.65, 0.55],
-        [0.3, 0.0, -0.3, -0.3],
-        [0.6, 0.0, 0.2, 0.0],
-        [0.55, 0.0, -0.6, 0.4]])
-
-    # Payoff matrix when only GF inhibitor drugs are present
-    matrix_GF_IH = np.array([
-        [0.0, 0.4, 0.65, 0.55],
-        [0.3, 0.0, -0.3, -0.3],
-        [0.2, 0.0, 0.2, 0.0],
-        [0.55, 0.0, -0.6, 0.4]])
-
-    # Payoff matrix when both inhibitor drugs are present
-    matrix_IH_comb = np.array([
-        [0.0, 0.4, 0.65, 0.55],
-        [0.3, 0.0, -0.3, -0.3],
-        [0.4, 0.0, 0.2, 0.0],
-        [0.55, 0.0, -0.8, 0.4]])
-
-    return matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb
+    # Payoff matrices (MM_parameters.py)
+    parameters = number_parameters()
+    return parameters['matrix_no_GF_IH'], parameters['matrix_GF_IH'], \
+                                                parameters['matrix_IH_comb']
 
 def combine_dataframes(df_1, df_2):
     """ Function that combines two datafranes in on dataframe
@@ -976,42 +976,105 @@ def switch_dataframe(time_IH, n_switches, t_steps_drug, t_steps_no_drug, nOC,
     df_total_switch: DataFrame
         Dataframe with the nOC, nOB, nMMd and nMMr values over time.
     """
-    # Set initial values
-    x = 0
-    time = 0
+    # Integrate the whole schedule once
+    trajectory = switch_trajectory(time_IH, n_switches, t_steps_drug,
+                t_steps_no_drug, nOC, nOB, nMMd, nMMr, growth_rates,
+                growth_rates_IH, decay_rates, decay_rates_IH, matrix_no_GF_IH,
+                matrix_GF_IH, WMMd_inhibitor)
 
-    # Make dataframe
-    df_total_switch = start_df(time_IH, nOC, nOB, nMMd, nMMr, growth_rates,
-                    decay_rates, matrix_no_GF_IH)
+    # Use the same time points as start_df and make_part_df
+    t = [np.linspace(0, time_IH, time_IH*2)]
+    time = time_IH
+    for i in range(n_switches):
+        t_steps = t_steps_drug if i % 2 == 0 else t_steps_no_drug
+        t.append(np.linspace(time, time+ t_steps, int(t_steps)))
+        time += t_steps
 
-    # Increase the time
-    time += time_IH
+    df_total_switch = trajectory.dataframe(np.concatenate(t))
+    return df_total_switch
 
-    # Perform a number of switches
-    for i in range(n_switches):
+def switch_trajectory(time_IH, n_switches, t_steps_drug, t_steps_no_drug, nOC,
+            nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
+            decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
+    """ Function that integrates the nOC, nOB, nMMd and nMMr values over time
+    for a given time of drug holiday and administration periods once, and gives
+    a trajectory (MM_dense.py) that can be sampled at any time points.
 
-        # If x = 0 make sure the MMd is inhibited
-        if x == 0:
+    Parameters:
+    -----------
+    time_IH: Int
+        The time point at witch the drugs are administered
+    n_switches: Int
+        The number of switches between giving drugs and not giving drugs.
+    t_steps_drug: Int
+        The number of generations drugs are administared.
+    t_steps_no_drug: Int
+        The number of generations drugs are not administared.
+    nOC: Float
+        Number of OC.
+    nOB: Float
+        Number of OB.
+    nMMd: Float
+        Number of the MMd.
+    nMMr: Float
+        Number of the MMr.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    growth_rates_IH: List
+        List with the growth rate values of the OC, OB, MMd and MMr when a IH
+        is administered.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    decay_rates_IH: List
+        List with the decay rate values of OC, OB, MMd and MMr when a IH is
+        administered.
+    matrix_no_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when no GF IH are
+        administered.
+    matrix_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when GF IH are administered.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
 
-            # Extend the dataframe
-            df_total_switch = make_part_df(df_total_switch, time, t_steps_drug,
-                growth_rates_IH, decay_rates_IH, matrix_GF_IH, WMMd_inhibitor)
+    Returns:
+    --------
+    trajectory: Trajectory
+        The trajectory of the nOC, nOB, nMMd and nMMr values.
 
-            # Change the x and time value
-            x = int(1)
-            time += t_steps_drug
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]])
+    >>> matrix_GF_IH = matrix.copy()
+    >>> matrix_GF_IH[2, 0] = 0.1
+    >>> trajectory = switch_trajectory(30, 4, 10, 10, 20, 30, 20, 5,
+    ...     [0.8, 1.2, 0.3, 0.3], [0.7, 1.3, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1],
+    ...     [1.0, 0.08, 0.2, 0.1], matrix, matrix_GF_IH)
+    >>> trajectory.breakpoints.tolist()
+    [0.0, 30.0, 40.0, 50.0, 60.0, 70.0]
+    >>> df = trajectory.dataframe(step = 0.5)
+    >>> len(df)
+    141
+    """
+    # Integrate the period before the drugs are administered
+    trajectory = dense_odeint(lambda y, t: number_rhs(y, growth_rates,
+        decay_rates, matrix_no_GF_IH), [nOC, nOB, nMMd, nMMr], 0, time_IH,
+        columns = ['nOC', 'nOB', 'nMMd', 'nMMr'])
 
-        # If x = 1 make sure the MMd is not inhibited
+    # Perform a number of switches, starting with the drug administration
+    for i in range(n_switches):
+        if i % 2 == 0:
+            trajectory = trajectory.then(lambda y, t: number_rhs(y,
+                growth_rates_IH, decay_rates_IH, matrix_GF_IH,
+                WMMd_inhibitor), t_steps_drug)
         else:
-            # Extend the dataframe
-            df_total_switch = make_part_df(df_total_switch, time, t_steps_no_drug,
-                    growth_rates, decay_rates, matrix_no_GF_IH)
-
-            # Change the x and time value
-            x = int(0)
-            time += t_steps_no_drug
+            trajectory = trajectory.then(lambda y, t: number_rhs(y,
+                growth_rates, decay_rates, matrix_no_GF_IH), t_steps_no_drug)
 
-    return df_total_switch
+    return trajectory
 
 def switch_dataframe_GF_W_h(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
                             t_steps_no_drug, nOC, nOB, nMMd, nMMr, growth_rates,
@@ -2072,6 +2135,7 @@ def switch_dataframe_W_WandGF_GF_h(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
     return df_total_switch
 
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_situations(t_steps_IH_strength, function_order, nOC,
                 nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
                 decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor):
@@ -2137,6 +2201,7 @@ def minimal_tumour_nr_t_3_situations(t_steps_IH_strength, function_order, nOC,
     return float(average_MM_number)
 
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_situations_IH(t_steps_IH_strength, function_order,
                 weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
                 decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH):
@@ -2190,7 +2255,7 @@ def minimal_tumour_nr_t_3_situations_IH(t_steps_IH_strength, function_order,
 
     # Determine the round duration and the matrix value
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
 
     # Create a dataframe of the numbers
     df = function_order(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
@@ -2213,6 +2278,7 @@ def minimal_tumour_nr_t_3_situations_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_sit_GF_IH(t_steps_IH_strength, function_order,
     weight_MMr, nOC,nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
     decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb):
@@ -2268,8 +2334,8 @@ def minimal_tumour_nr_t_3_sit_GF_IH(t_steps_IH_strength, function_order,
     n_rounds = 50
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH_comb
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH_comb})
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_comb
 
     # Create a dataframe of the numbers
@@ -2295,6 +2361,7 @@ def minimal_tumour_nr_t_3_sit_GF_IH(t_steps_IH_strength, function_order,
     return float(average_MM_number)
 
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_sit_W_IH(t_steps_IH_strength, function_order,
                 weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
                 decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_IH_comb):
@@ -2348,7 +2415,7 @@ def minimal_tumour_nr_t_3_sit_W_IH(t_steps_IH_strength, function_order,
     n_rounds = 50
 
     # Determine the round duration and the matrix values
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH_comb
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH_comb})
     time_round =  t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
     # Create a dataframe of the numbers
@@ -2373,6 +2440,7 @@ def minimal_tumour_nr_t_3_sit_W_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_4_situations_IH(t_steps_IH_strength, function_order,
             weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
             decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH):
@@ -2427,7 +2495,7 @@ def minimal_tumour_nr_t_3_4_situations_IH(t_steps_IH_strength, function_order,
     # Determine the round duration and the matrix value
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + \
                                                                 t_steps_no_drug
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
 
     # Create a dataframe of the numbers
     df = function_order(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
@@ -2450,6 +2518,7 @@ def minimal_tumour_nr_t_3_4_situations_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_situations(t_steps, function_order, nOC, nOB, nMMd,
                         nMMr, growth_rates, growth_rates_IH, decay_rates,
                         decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH,
@@ -2521,6 +2590,7 @@ def minimal_tumour_nr_t_4_situations(t_steps, function_order, nOC, nOB, nMMd,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_sit_equal(t_steps_IH_strength, function_order, nOC, nOB,
         nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
         matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb, WMMd_inhibitor):
@@ -2591,6 +2661,7 @@ def minimal_tumour_nr_t_4_sit_equal(t_steps_IH_strength, function_order, nOC, nO
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_sit_equal_IH(t_steps_IH_strength, function_order,
     weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
     decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb):
@@ -2646,8 +2717,8 @@ def minimal_tumour_nr_t_4_sit_equal_IH(t_steps_IH_strength, function_order,
                                             WMMd_inhibitor = t_steps_IH_strength
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH})
     n_rounds = 50
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
@@ -2674,6 +2745,7 @@ def minimal_tumour_nr_t_4_sit_equal_IH(t_steps_IH_strength, function_order,
     return float(average_MM_number)
 
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_situations_IH(t_steps_IH_strength, function_order,
     weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
     decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb):
@@ -2728,8 +2800,8 @@ def minimal_tumour_nr_t_4_situations_IH(t_steps_IH_strength, function_order,
     n_rounds = 50
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH_comb
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH_comb})
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
     # Create a dataframe of the numbers
@@ -2774,6 +2846,7 @@ def avarage_MMr_MMd_nr(dataframe, time, therapy):
     print(f'{therapy}: nMMd =',average_MMd_number,
                                         'and nMMr =', average_MMr_number)
 
+@cached
 def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
  decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
     """ Function that create a dataframe with the average MM number for
@@ -2817,20 +2890,30 @@ def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
     column_names = ['Generations no drug', 'Generations drug', 'MM number']
     df_MM_nr = pd.DataFrame(columns=column_names)
 
-    # Loop over all the t_step values for drug administration and drug holidays
-    for t_steps_no_drug in range(2, 22):
+    # Determine the MM number for all t_step values for drug administration
+    # and drug holidays, in a task of a checkpoint (MM_checkpoint.py) every
+    # finished value is saved
+    t_steps = [(t_steps_no_drug, t_steps_drug) for t_steps_no_drug in
+                                range(2, 22) for t_steps_drug in range(2, 22)]
 
-        for t_steps_drug in range(2, 22):
-            numb_tumour = minimal_tumour_numb_t_steps(t_steps_drug,
+    def numb_tumour_t_steps(t_step):
+        t_steps_no_drug, t_steps_drug = t_step
+        return minimal_tumour_numb_t_steps(t_steps_drug,
                     t_steps_no_drug, nOC, nOB, nMMd, nMMr, growth_rates,
                     growth_rates_IH, decay_rates, decay_rates_IH, matrix_no_GF_IH,
                     matrix_GF_IH, WMMd_inhibitor)
 
-            # Add results to the dataframe
-            new_row_df = pd.DataFrame([{'Generations no drug': \
+    numb_tumours = checkpoint_sweep(t_steps, numb_tumour_t_steps, (nOC, nOB,
+                         nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
+                 decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor))
+
+    for (t_steps_no_drug, t_steps_drug), numb_tumour in zip(t_steps,
+                                                            numb_tumours):
+        # Add results to the dataframe
+        new_row_df = pd.DataFrame([{'Generations no drug': \
                     int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
                                              'MM number': float(numb_tumour)}])
-            df_MM_nr = combine_dataframes(df_MM_nr, new_row_df)
+        df_MM_nr = combine_dataframes(df_MM_nr, new_row_df)
 
     return(df_MM_nr)
 
@@ -2877,34 +2960,17 @@ def continuous_add_IH_df(time_IH, end_generation, nOC, nOB, nMMd, nMMr,
     df_total: DataFrame
         The dataframe with the cell numbers when IHs are continiously administered.
     """
-    # Set the start values
-    t = np.linspace(0, time_IH, time_IH)
-    y0 = [nOC, nOB, nMMd, nMMr]
-    parameters = (growth_rates, decay_rates, matrix_no_GF_IH)
-
-    # Determine the ODE solutions
-    y = odeint(model_dynamics, y0, t, args=parameters)
-    df_1 = pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
-                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
-
-    # Determine the current numbers
-    nOC = df_1['nOC'].iloc[-1]
-    nOB = df_1['nOB'].iloc[-1]
-    nMMd = df_1['nMMd'].iloc[-1]
-    nMMr = df_1['nMMr'].iloc[-1]
-
-    # Set the currect values
-    t = np.linspace(time_IH, end_generation, 400)
-    y0 = [nOC, nOB, nMMd, nMMr]
-    parameters = (growth_rates_IH, decay_rates_IH, matrix_GF_IH, WMMd_inhibitor)
-
-    # Determine the ODE solutions
-    y = odeint(model_dynamics, y0, t, args=parameters)
-    df_2 = pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
-                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
-
-    # Combine the dataframes
-    df_total = combine_dataframes(df_1, df_2)
+    # Integrate the period without and with IHs once
+    trajectory = dense_odeint(lambda y, t: number_rhs(y, growth_rates,
+        decay_rates, matrix_no_GF_IH), [nOC, nOB, nMMd, nMMr], 0, time_IH,
+        columns = ['nOC', 'nOB', 'nMMd', 'nMMr'])
+    trajectory = trajectory.then(lambda y, t: number_rhs(y, growth_rates_IH,
+        decay_rates_IH, matrix_GF_IH, WMMd_inhibitor), end_generation - time_IH)
+
+    # Sample the periods on the same time points as before
+    t = np.concatenate((np.linspace(0, time_IH, time_IH),
+                                    np.linspace(time_IH, end_generation, 400)))
+    df_total = trajectory.dataframe(t)
 
     return df_total
 
@@ -2963,6 +3029,7 @@ def x_y_z_axis_values_3d_plot(dataframe, name):
 
     return (X_values, Y_values, Z_values)
 
+@parameter_set_objective
 def minimal_tumour_numb_t_steps(t_steps_drug, t_steps_no_drug, nOC, nOB, nMMd,
                 nMMr, growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                 matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
@@ -3022,8 +3089,10 @@ def minimal_tumour_numb_t_steps(t_steps_drug, t_steps_no_drug, nOC, nOB, nMMd,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
-        growth_rates_IH, decay_rates, decay_rates_IH, matrix, b_OC_MMd_array):
+        growth_rates_IH, decay_rates, decay_rates_IH, matrix, b_OC_MMd_array,
+                                                        equilibrium = True):
     """Function that determines the number of the population being MM for a
     specific b_OC_MMd value.
 
@@ -3053,6 +3122,10 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
         4x4 matrix containing the interaction factors.
     b_OC_MMd_array: Float
         If True b_OC_MMd is an array and if False b_OC_MMd is a float.
+    equilibrium: Bool
+        If True the MM number is taken from the stable fixed point of the model
+        during the drug period when there is exactly one, otherwise the model
+        is integrated.
 
     Returns:
     --------
@@ -3066,11 +3139,30 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
     ...    [0.3, 0.0, -0.3, -0.3],
     ...    [0.6, 0.0, 0.2, 0.0],
     ...    [0.55, 0.0, -0.6, 0.4]])
-    >>> minimal_tumour_numb_b_OC_MMd(0.4, 20, 30, 20, 5, [0.8, 1.2, 0.3, 0.3],
-    ...                            [0.7, 1.3, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1],
-    ...                            [1.0, 0.08, 0.2, 0.1], matrix, False)
-    21.716742987793786
+    >>> round(minimal_tumour_numb_b_OC_MMd(0.4, 20, 30, 20, 5,
+    ...             [0.8, 1.2, 0.3, 0.3], [0.7, 1.3, 0.3, 0.3],
+    ...             [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1], matrix,
+    ...                                                             False), 4)
+    21.7381
+    >>> round(minimal_tumour_numb_b_OC_MMd(0.4, 20, 30, 20, 5,
+    ...             [0.8, 1.2, 0.3, 0.3], [0.7, 1.3, 0.3, 0.3],
+    ...             [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1], matrix, False,
+    ...             equilibrium = False), 4)
+    21.7167
     """
+    # Change b_OC_MMd to a float if it is an array
+    if b_OC_MMd_array == True:
+        b_OC_MMd = b_OC_MMd[0]
+
+    # Determine the MM number in the stable fixed point if there is only one
+    if equilibrium == True:
+        matrix_drug = derive_matrix(matrix, {(2, 0): b_OC_MMd})
+        df_fixed_points = fixed_points_nr(growth_rates_IH, decay_rates_IH,
+                                                                matrix_drug)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total nMM'])
+
     # Set the initial conditions
     y0 = [nOC, nOB, nMMd, nMMr]
     parameters = (growth_rates, decay_rates, matrix)
@@ -3087,12 +3179,8 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
     nMMd = df_1['nMMd'].iloc[-1]
     nMMr = df_1['nMMr'].iloc[-1]
 
-    # Change b_OC_MMd to a float if it is an array
-    if b_OC_MMd_array == True:
-        b_OC_MMd = b_OC_MMd[0]
-
-    # Change the b_OC_MMd value to the specified value
-    matrix[2, 0]= b_OC_MMd
+    # Derive a matrix with the specified b_OC_MMd value
+    matrix = derive_matrix(matrix, {(2, 0): b_OC_MMd})
 
     # Set initial conditions
     t_over = np.linspace(70, 200, 140)
@@ -3109,9 +3197,11 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
 
     return float(last_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd, nMMr,
                     growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
-                    matrix, WMMd_inhibitor_array):
+                    matrix, WMMd_inhibitor_array,
+                                                        equilibrium = True):
     """Function that determines the number of the population being MM for a
     specific WMMd drug inhibitor value.
 
@@ -3141,6 +3231,10 @@ def minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd, nMMr,
         4x4 matrix containing the interaction factors.
     WMMd_inhibitor_array: Float
         If True WMMd_inhibitor is an array and if False WMMd_inhibitor is a float.
+    equilibrium: Bool
+        If True the MM number is taken from the stable fixed point of the model
+        during the drug period when there is exactly one, otherwise the model
+        is integrated.
 
     Returns:
     --------
@@ -3157,15 +3251,29 @@ def minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd, nMMr,
     ...    [0.3, 0.0, -0.3, -0.3],
     ...    [0.6, 0.0, 0.2, 0.0],
     ...    [0.55, 0.0, -0.6, 0.4]])
-    >>> minimal_tumour_numb_WMMd_IH(0.3, 20, 30, 20, 5, [0.8, 1.2, 0.3, 0.3],
-    ...                            [0.7, 1.3, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1],
-    ...                            [1.0, 0.08, 0.2, 0.1], matrix, False)
-    24.805076184735565
+    >>> round(minimal_tumour_numb_WMMd_IH(0.3, 20, 30, 20, 5,
+    ...             [0.8, 1.2, 0.3, 0.3], [0.7, 1.3, 0.3, 0.3],
+    ...             [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1], matrix,
+    ...                                                             False), 4)
+    24.8112
+    >>> round(minimal_tumour_numb_WMMd_IH(0.3, 20, 30, 20, 5,
+    ...             [0.8, 1.2, 0.3, 0.3], [0.7, 1.3, 0.3, 0.3],
+    ...             [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1], matrix, False,
+    ...             equilibrium = False), 4)
+    24.8051
     """
     # Determine if WMMd_inhibitor is an array
     if WMMd_inhibitor_array == True:
         WMMd_inhibitor = WMMd_inhibitor[0]
 
+    # Determine the MM number in the stable fixed point if there is only one
+    if equilibrium == True:
+        df_fixed_points = fixed_points_nr(growth_rates_IH, decay_rates_IH,
+                                                        matrix, WMMd_inhibitor)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total nMM'])
+
     # Set initial conditions
     t = np.linspace(0, 60, 60)
     y0 = [nOC, nOB, nMMd, nMMr]
@@ -3207,34 +3315,38 @@ def Figure_optimisation():
     IH -> holiday.
     """
     # Collect needed data -> normal growth and decay rate
-    df_GF_W_h_changing_GF = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_GF_W_h_changing_GF_IH.csv')
-    df_W_GF_h_changing_GF = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_W_GF_h_changing_GF_IH.csv')
-    df_GF_W_h_changing_W = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_GF_W_h_changing_W_IH.csv')
-    df_W_GF_h_changing_W = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_W_GF_h_changing_W_IH.csv')
+    df_GF_W_h_changing_GF = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_GF_W_h_changing_GF_IH.csv'))
+    df_W_GF_h_changing_GF = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_W_GF_h_changing_GF_IH.csv'))
+    df_GF_W_h_changing_W = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_GF_W_h_changing_W_IH.csv'))
+    df_W_GF_h_changing_W = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_W_GF_h_changing_W_IH.csv'))
 
     # Collect needed data -> increased growth and decay rate
-    df_GF_W_h_changing_GF_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_GF_W_h_changing_GF_IH_h_gr_dr.csv')
-    df_W_GF_h_changing_GF_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_W_GF_h_changing_GF_IH_h_gr_dr.csv')
-    df_GF_W_h_changing_W_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_GF_W_h_changing_W_IH_h_gr_dr.csv')
-    df_W_GF_h_changing_W_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_W_GF_h_changing_W_IH_h_gr_dr.csv')
+    df_GF_W_h_changing_GF_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf',
+                                     'df_MM_GF_W_h_changing_GF_IH_h_gr_dr.csv'))
+    df_W_GF_h_changing_GF_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf',
+                                     'df_MM_W_GF_h_changing_GF_IH_h_gr_dr.csv'))
+    df_GF_W_h_changing_W_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_GF_W_h_changing_W_IH_h_gr_dr.csv'))
+    df_W_GF_h_changing_W_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_W_GF_h_changing_W_IH_h_gr_dr.csv'))
 
     # Collect needed data -> decreased growth and decay rate
-    df_GF_W_h_changing_GF_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_GF_W_h_changing_GF_IH_l_gr_dr.csv')
-    df_W_GF_h_changing_GF_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_W_GF_h_changing_GF_IH_l_gr_dr.csv')
-    df_GF_W_h_changing_W_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_GF_W_h_changing_W_IH_l_gr_dr.csv')
-    df_W_GF_h_changing_W_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf\df_MM_W_GF_h_changing_W_IH_l_gr_dr.csv')
+    df_GF_W_h_changing_GF_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf',
+                                     'df_MM_GF_W_h_changing_GF_IH_l_gr_dr.csv'))
+    df_W_GF_h_changing_GF_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf',
+                                     'df_MM_W_GF_h_changing_GF_IH_l_gr_dr.csv'))
+    df_GF_W_h_changing_W_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_GF_W_h_changing_W_IH_l_gr_dr.csv'))
+    df_W_GF_h_changing_W_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf', 'df_MM_W_GF_h_changing_W_IH_l_gr_dr.csv'))
 
     # Create a plot with two sublot next to eachother
     fig, axs = plt.subplots(2, 3, figsize=(22, 12))
@@ -3311,8 +3423,8 @@ def Figure_optimisation():
 
     # Save and show the plot
     save_Figure(plt, 'Figure_optimisation_comb_n_h_l',
-                                    r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                    figure_path('results_model_nr_IH_inf'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 (original situation)"""
@@ -3389,19 +3501,30 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
                     growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                     matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -3461,8 +3584,8 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                 fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD',
-                                 r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                 figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 """ Figure to determine the difference between traditional and adaptive therapy
@@ -3546,19 +3669,30 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
     avarage_MMr_MMd_nr(df_total_switch_WMMd, 6, "Adaptive therapy WMMd IH")
     avarage_MMr_MMd_nr(df_total_switch_comb, 6, "Adaptive therapy IH combination")
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH_r.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH_r.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH_r.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH_r.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH_r.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH_r.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -3637,8 +3771,8 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=5,
                                                             fontsize='x-large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD_r',
-                                 r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                 figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 
@@ -3725,33 +3859,44 @@ def Figure_AT_MMd_MMr_limit(upper_limit_MMd, upper_limit_MMr, limit):
     {round(a_dur_comb, 0)} generations and the average IH combination holiday
     duration is {round(h_dur_comb, 0)} generations""")
 
+    # The parameters that are saved with the data
+    metadata = {'upper_limit_MMd': upper_limit_MMd,
+                'upper_limit_MMr': upper_limit_MMr, 'limit': limit, 'nOC': nOC,
+                'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb}
+
     # Determine if the MMr limit and save the data under the correct name
     if limit == 'low':
         # Save the data
         save_dataframe(df_switch_GF, 'df_cell_nr_GF_IH_AT_MM_limit_l.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
         save_dataframe(df_switch_WMMd, 'df_cell_nr_W_IH_AT_MM_limit_l.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
         save_dataframe(df_switch_comb, 'df_cell_nr_IH_comb_AT_MM_limit_l.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     if limit == 'middel':
         # Save the data
         save_dataframe(df_switch_GF, 'df_cell_nr_GF_IH_AT_MM_limit.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
         save_dataframe(df_switch_WMMd, 'df_cell_nr_W_IH_AT_MM_limit.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
         save_dataframe(df_switch_comb, 'df_cell_nr_IH_comb_AT_MM_limit.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     else:
         # Save the data
         save_dataframe(df_switch_GF, 'df_cell_nr_GF_IH_AT_MM_limit_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
         save_dataframe(df_switch_WMMd, 'df_cell_nr_W_IH_AT_MM_limit_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
         save_dataframe(df_switch_comb, 'df_cell_nr_IH_comb_AT_MM_limit_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     fig, axs = plt.subplots(1, 3, figsize=(18, 6))
 
@@ -3797,14 +3942,14 @@ def Figure_AT_MMd_MMr_limit(upper_limit_MMd, upper_limit_MMr, limit):
     # Determine if the MMr limit and save the figure under the correct name
     if limit == 'low':
         save_Figure(plt, 'line_plot_cell_nr_AT_l_limit_MMd_MMr',
-                                r'..\visualisation\results_model_nr_IH_inf')
+                                figure_path('results_model_nr_IH_inf'))
     if limit == 'middel':
         save_Figure(plt, 'line_plot_cell_nr_AT_limit_MMd_MMr',
-                                r'..\visualisation\results_model_nr_IH_inf')
+                                figure_path('results_model_nr_IH_inf'))
     else:
         save_Figure(plt, 'line_plot_cell_nr_AT_h_limit_MMd_MMr',
-                                 r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                 figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 """ Figure to determine the difference between traditional and adaptive therapy.
@@ -3883,19 +4028,30 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
                     growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                     matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -3954,8 +4110,8 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
                                                                 'Number of MMr']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD_short_a_h',
-                                 r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                 figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 """ Figure to determine the difference between traditional and adaptive therapy
@@ -4034,19 +4190,30 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
                     growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                     matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -4106,8 +4273,8 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                 fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD_weak_a_h',
-                                 r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                 figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 """ 3D plot showing the best IH holiday and administration periods"""
@@ -4159,9 +4326,19 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
             growth_rates_IH, decay_rates, decay_rates_IH, matrix_no_GF_IH,
             matrix_GF_IH)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_holiday_GF_IH, 'df_cell_nr_IH_inf_best_MMd_GF_IH_holiday.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Determine the axis values
     X_GF_IH, Y_GF_IH, Z_GF_IH = x_y_z_axis_values_3d_plot(df_holiday_GF_IH,
@@ -4174,7 +4351,7 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_W_IH, 'df_cell_nr_IH_inf_best_WMMd_IH_holiday.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Determine the axis values
     X_W_IH, Y_W_IH, Z_W_IH = x_y_z_axis_values_3d_plot(df_holiday_W_IH, 'W IH')
@@ -4186,7 +4363,7 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_nr_IH_inf_best_comb_IH_holiday.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Determine the axis values
     X_comb, Y_comb, Z_comb = x_y_z_axis_values_3d_plot(df_holiday_comb,
@@ -4253,8 +4430,8 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Add a color bar
     save_Figure(fig, '3d_plot_MM_nr_IH_inf_best_IH_h_a_periods',
-                                r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                figure_path('results_model_nr_IH_inf'))
+    show()
 
 """ 3D plot showing the best IH strengths """
 def Figure_3D_MM_numb_MMd_IH_strength():
@@ -4322,9 +4499,16 @@ def Figure_3D_MM_numb_MMd_IH_strength():
 
             df_holiday = combine_dataframes(df_holiday, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Save the data
     save_dataframe(df_holiday, 'df_cell_nr_IH_inf_best_comb_IH_strength.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
 
     # Find the drug administration and holiday period causing the lowest MM number
@@ -4376,8 +4560,8 @@ def Figure_3D_MM_numb_MMd_IH_strength():
     color_bar.set_label('Number of MM')
 
     save_Figure(fig, '3d_plot_MM_nr_IH_inf_best_IH_strength',
-                                r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 """ Figure to determine the best WMMd IH value """
@@ -4408,28 +4592,36 @@ def Figure_best_WMMd_IH():
     # Perform the optimization
     result = minimize(minimal_tumour_numb_WMMd_IH, WMMd_IH_start, args = (nOC,
                                 nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
-                                decay_rates, decay_rates_IH, matrix, True),
-                                bounds=[(0, 0.8)], method='Nelder-Mead')
+                                decay_rates, decay_rates_IH, matrix, True,
+                                True), bounds=[(0, 0.8)], method='Nelder-Mead')
 
     # Retrieve the optimal value
     optimal_WMMd_IH = result.x
     print("Optimal value for the WMMd IH:", float(optimal_WMMd_IH[0]),
                                         ', gives tumour number:', result.fun)
 
-    # Make a dictionary
-    dict_numb_tumour = {}
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 60,
+                        60), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(60, 200, 140)
 
-    # Loop over the different WMMd_inhibitor values
-    for WMMd_inhibitor in range(800):
-        WMMd_inhibitor = WMMd_inhibitor/1000
-        numb_tumour = minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd,
-                        nMMr, growth_rates, growth_rates_IH, decay_rates,
-                        decay_rates_IH, matrix, False)
-        dict_numb_tumour[WMMd_inhibitor] = numb_tumour
+    # Scan the WMMd_inhibitor values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_numb_tumour = adaptive_scan(lambda values: scan_nr(values,
+                'WMMd_inhibitor', y[-1], t_over, growth_rates_IH,
+                decay_rates_IH, matrix), 0, 0.8)
+
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH, 'matrix': matrix,
+                'WMMd_IH_start': WMMd_IH_start}
 
     # Save the data
     save_dictionary(dict_numb_tumour,
-            r'..\data\data_model_nr_IH_inf\dict_cell_nr_IH_inf_WMMd_IH.csv')
+           data_path('data_model_nr_IH_inf', 'dict_cell_nr_IH_inf_WMMd_IH.csv'),
+                                                                       metadata)
 
     # Make lists of the keys and the values
     WMM_IH = list(dict_numb_tumour.keys())
@@ -4443,8 +4635,8 @@ def Figure_best_WMMd_IH():
     plt.grid(True)
     plt.tight_layout()
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_change_WMMd_IH',
-                                 r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                 figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 """ Figure to determine the best b_OC_MMd value """
@@ -4483,21 +4675,28 @@ def Figure_best_b_OC_MMd():
     print("Optimal value for b_OC_MMd:", float(optimal_b_OC_MMd[0]),
                                             'gives tumour number:', result.fun)
 
-    # Make a dictionary
-    dict_numb_tumour_GF = {}
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 70,
+                        70), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(70, 200, 140)
 
-    # Loop over all the b_OC_MMd values
-    for b_OC_MMd in range(800):
-        b_OC_MMd = b_OC_MMd/1000
+    # Scan the b_OC_MMd values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_numb_tumour_GF = adaptive_scan(lambda values: scan_nr(values,
+                'b_OC_MMd', y[-1], t_over, growth_rates_IH,
+                decay_rates_IH, matrix), 0, 0.8)
 
-        # Determine the total MM number
-        numb_tumour = minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr,
-        growth_rates, growth_rates_IH, decay_rates, decay_rates_IH, matrix, False)
-        dict_numb_tumour_GF[b_OC_MMd] = numb_tumour
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH, 'matrix': matrix,
+                'b_OC_MMd_start': b_OC_MMd_start}
 
     # Save the data
     save_dictionary(dict_numb_tumour_GF,
-             r'..\data\data_model_nr_IH_inf\dict_cell_nr_IH_inf_b_OC_MMd.csv')
+          data_path('data_model_nr_IH_inf', 'dict_cell_nr_IH_inf_b_OC_MMd.csv'),
+                                                                       metadata)
 
     # Make a list of the keys and one of the values
     b_OC_MMd_values = list(dict_numb_tumour_GF.keys())
@@ -4510,8 +4709,8 @@ def Figure_best_b_OC_MMd():
     plt.title(r'MM number for different $b_{OC, MMd}$ values')
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_change_b_OC_MMd',
-                                r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                figure_path('results_model_nr_IH_inf'))
+    show()
 
 
 """ Figure with a longer IH administration than holiday and the other way around"""
@@ -4566,12 +4765,22 @@ def Figure_duration_a_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
                         growth_rates_IH, decay_rates, decay_rates_IH,
                         matrix_no_GF_IH, matrix_GF_IH_half, WMMd_inhibitor_half)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                't_steps_no_drug': t_steps_no_drug, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'growth_rates': growth_rates,
+                'decay_rates': decay_rates, 'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH_half': matrix_GF_IH_half,
+                'WMMd_inhibitor_half': WMMd_inhibitor_half}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_nr_IH_inf_short_a_long_h_MMd_IH.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
     save_dataframe(df_total_switch_2,
                             'df_cell_nr_IH_inf_long_a_short_h_MMd_IH.csv.csv',
-                                             r'..\data\data_model_nr_IH_inf')
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(1, 2, figsize=(16, 6))
@@ -4600,8 +4809,8 @@ def Figure_duration_a_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     axs[1].grid(True)
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_diff_h_and_a_MMd_IH',
-                                 r'..\visualisation\results_model_nr_IH_inf')
-    plt.show()
+                                 figure_path('results_model_nr_IH_inf'))
+    show()
 
 """optimise IH administration duration and holiday duration for MMd GF IH -> WMMd
 IH -> holiday """
@@ -4644,7 +4853,7 @@ def minimise_MM_GF_W_h():
 
     # Save the results
     save_optimised_results(result,
-                        r'..\data\data_model_nr_IH_inf\optimise_GF_W_h.csv')
+                       data_path('data_model_nr_IH_inf', 'optimise_GF_W_h.csv'))
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> MMd GF
@@ -4686,7 +4895,7 @@ def minimise_MM_W_GF_h():
 
     # Save the results
     save_optimised_results(result,
-                        r'..\data\data_model_nr_IH_inf\optimise_W_GF_h.csv')
+                       data_path('data_model_nr_IH_inf', 'optimise_W_GF_h.csv'))
 
 
 """optimise IH administration duration, holiday duration and strength for
@@ -4730,7 +4939,7 @@ def minimise_MM_GF_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                        r'..\data\data_model_nr_IH_inf\optimise_GF_W_h_IH.csv')
+                    data_path('data_model_nr_IH_inf', 'optimise_GF_W_h_IH.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -4773,7 +4982,7 @@ def minimise_MM_W_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                        r'..\data\data_model_nr_IH_inf\optimise_W_GF_h_IH.csv')
+                    data_path('data_model_nr_IH_inf', 'optimise_W_GF_h_IH.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -4817,7 +5026,7 @@ def minimise_MM_GF_h_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                    r'..\data\data_model_nr_IH_inf\optimise_GF_h_W_h_IH.csv')
+                  data_path('data_model_nr_IH_inf', 'optimise_GF_h_W_h_IH.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for
 WMMd IH -> holiday -> MMd GF IH -> holiday """
@@ -4859,7 +5068,7 @@ def minimise_MM_W_h_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                    r'..\data\data_model_nr_IH_inf\optimise_W_h_GF_h_IH.csv')
+                  data_path('data_model_nr_IH_inf', 'optimise_W_h_GF_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH ->
 IH combination -> MMd GF IH -> holiday"""
@@ -4909,7 +5118,7 @@ def minimise_MM_W_comb_GF_h():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_W_comb_GF_h.csv')
+                data_path('data_model_nr_IH_inf', 'optimise_W_comb_GF_h.csv'))
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
 IH combination -> WMMd IH -> holiday"""
@@ -4958,7 +5167,7 @@ def minimise_MM_GF_comb_W_h():
 
     # Save the results
     save_optimised_results(result,
-                  r'..\data\data_model_nr_IH_inf\optimise_GF_comb_W_h.csv')
+                  data_path('data_model_nr_IH_inf', 'optimise_GF_comb_W_h.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
 IH combination -> MMd GF IH -> holiday"""
@@ -5006,7 +5215,7 @@ def minimise_MM_W_comb_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_W_comb_GF_h_IH.csv')
+               data_path('data_model_nr_IH_inf', 'optimise_W_comb_GF_h_IH.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -5056,7 +5265,7 @@ def minimise_MM_GF_comb_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_GF_comb_W_h_IH.csv')
+               data_path('data_model_nr_IH_inf', 'optimise_GF_comb_W_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> WMMd
 IH + MMd GF IH -> MMd GF IH -> holiday"""
@@ -5102,7 +5311,7 @@ def minimise_MM_W_WandGF_GF_h():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_W_WandGF_GF_h.csv')
+                data_path('data_model_nr_IH_inf', 'optimise_W_WandGF_GF_h.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH-> MMd
@@ -5149,7 +5358,7 @@ def minimise_MM_GF_GFandW_W_h():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_GF_WandGF_W_h.csv')
+                data_path('data_model_nr_IH_inf', 'optimise_GF_WandGF_W_h.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> WMMd
 IH + MMd GF IH -> MMd GF IH -> holiday"""
@@ -5194,7 +5403,7 @@ def minimise_MM_W_WandGF_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_W_WandGF_GF_h_IH.csv')
+             data_path('data_model_nr_IH_inf', 'optimise_W_WandGF_GF_h_IH.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH-> MMd
@@ -5240,7 +5449,7 @@ def minimise_MM_GF_GFandW_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_GF_WandGF_W_h_IH.csv')
+             data_path('data_model_nr_IH_inf', 'optimise_GF_WandGF_W_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
 IH combination -> holiday"""
@@ -5284,7 +5493,7 @@ def minimise_MM_W_comb_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_W_comb_h_IH.csv')
+                data_path('data_model_nr_IH_inf', 'optimise_W_comb_h_IH.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -5330,7 +5539,7 @@ def minimise_MM_GF_comb_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_GF_comb_h_IH.csv')
+                data_path('data_model_nr_IH_inf', 'optimise_GF_comb_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> MMd GF
 IH -> holiday by different WMMd IH strengths"""
@@ -5415,8 +5624,16 @@ def minimise_MM_W_GF_h_changing_W_IH(growth_rates, growth_rates_IH, decay_rates,
                  result.x[2], 'MM number':result.fun}])
         df_W_GF_h_change_W = combine_dataframes(df_W_GF_h_change_W, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH}
+
     # Save the data
-    save_dataframe(df_W_GF_h_change_W, filename, r'..\data\data_model_nr_IH_inf')
+    save_dataframe(df_W_GF_h_change_W, filename,
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     return(df_W_GF_h_change_W)
 
@@ -5506,8 +5723,16 @@ def minimise_MM_W_GF_h_changing_GF_IH(growth_rates, growth_rates_IH, decay_rates
                  result.x[2], 'MM number':result.fun}])
         df_W_GF_h_change_GF = combine_dataframes(df_W_GF_h_change_GF, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
-    save_dataframe(df_W_GF_h_change_GF, filename, r'..\data\data_model_nr_IH_inf')
+    save_dataframe(df_W_GF_h_change_GF, filename,
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     return(df_W_GF_h_change_GF)
 
@@ -5593,8 +5818,16 @@ def minimise_MM_GF_W_h_changing_W_IH(growth_rates, growth_rates_IH, decay_rates,
                  result.x[0], 'WMMd IH duration':result.x[1],
                  'Holiday duration': result.x[2], 'MM number':result.fun}])
         df_GF_W_h_change_W = combine_dataframes(df_GF_W_h_change_W, new_row_df)
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH}
+
     # Save the data
-    save_dataframe(df_GF_W_h_change_W, filename, r'..\data\data_model_nr_IH_inf')
+    save_dataframe(df_GF_W_h_change_W, filename,
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     return(df_GF_W_h_change_W)
 
@@ -5683,8 +5916,16 @@ def minimise_MM_GF_W_h_changing_GF_IH(growth_rates, growth_rates_IH, decay_rates
             result.x[2], 'MM number':result.fun}])
         df_GF_W_h_change_GF = combine_dataframes(df_GF_W_h_change_GF, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
-    save_dataframe(df_GF_W_h_change_GF, filename, r'..\data\data_model_nr_IH_inf')
+    save_dataframe(df_GF_W_h_change_GF, filename,
+                                    data_path('data_model_nr_IH_inf'), metadata)
 
     return(df_GF_W_h_change_GF)
 
@@ -5737,7 +5978,7 @@ def minimise_MM_GF_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-                        r'..\data\data_model_nr_IH_inf\optimise_GF_W_h_IH_w.csv')
+                  data_path('data_model_nr_IH_inf', 'optimise_GF_W_h_IH_w.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -5787,7 +6028,7 @@ def minimise_MM_W_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf\optimise_W_GF_h_IH_w.csv')
+                data_path('data_model_nr_IH_inf', 'optimise_W_GF_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
@@ -5844,7 +6085,7 @@ def minimise_MM_W_comb_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf\optimise_W_comb_GF_h_IH_w.csv')
+        data_path('data_model_nr_IH_inf', 'optimise_W_comb_GF_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -5901,7 +6142,7 @@ def minimise_MM_GF_comb_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf\optimise_GF_comb_W_h_IH_w.csv')
+        data_path('data_model_nr_IH_inf', 'optimise_GF_comb_W_h_IH_w.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for WMMd
 IH -> holiday -> MMd GF IH -> holiday where the weight of the MMr relative to the
@@ -5952,7 +6193,7 @@ def minimise_MM_W_h_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf\optimise_W_h_GF_h_IH_w.csv')
+            data_path('data_model_nr_IH_inf', 'optimise_W_h_GF_h_IH_w.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for MMd GF
 IH -> holiday -> WMMd IH -> holiday where the weight of the MMr relative to the
@@ -6003,7 +6244,7 @@ def minimise_MM_GF_h_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf\optimise_GF_h_W_h_IH_w.csv')
+            data_path('data_model_nr_IH_inf', 'optimise_GF_h_W_h_IH_w.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> WMMd
 IH + MMd GF IH -> MMd GF IH -> holiday where the weight of the MMr relative to
@@ -6056,7 +6297,7 @@ def minimise_MM_W_WandGF_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-       r'..\data\data_model_nr_IH_inf\optimise_W_WandGF_GF_h_IH_w.csv')
+       data_path('data_model_nr_IH_inf', 'optimise_W_WandGF_GF_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH-> MMd
@@ -6110,7 +6351,7 @@ def minimise_MM_GF_GFandW_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-       r'..\data\data_model_nr_IH_inf\optimise_GF_WandGF_W_h_IH_w.csv')
+       data_path('data_model_nr_IH_inf', 'optimise_GF_WandGF_W_h_IH_w.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
 IH combination -> holiday where the weight of the MMr relative to
@@ -6162,7 +6403,7 @@ def minimise_MM_W_comb_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-         r'..\data\data_model_nr_IH_inf\optimise_W_comb_h_IH_w.csv')
+         data_path('data_model_nr_IH_inf', 'optimise_W_comb_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -6217,7 +6458,7 @@ def minimise_MM_GF_comb_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-         r'..\data\data_model_nr_IH_inf\optimise_GF_comb_h_IH_w.csv')
+         data_path('data_model_nr_IH_inf', 'optimise_GF_comb_h_IH_w.csv'))
 
 if __name__ == "__main__":
     main()
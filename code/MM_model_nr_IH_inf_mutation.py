@@ -37,13 +37,24 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.integrate import odeint
 import csv
-from scipy.optimize import minimize
-from mpl_toolkits.mplot3d import Axes3D
 import doctest
+from MM_cache import cached
+from MM_parameters import derive_matrix, parameter_set_objective
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_schedule import make_phase, schedule_dataframe
+from MM_kernels import MMR_SCALE
 import random
+from MM_lazy import lazy_import, lazy_function
+from MM_checkpoint import checkpoint_sweep
+
+# Import the plotting and optimisation libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+minimize = lazy_function('scipy.optimize', 'minimize')
 
 def main():
     # Do doc tests
@@ -478,147 +489,6 @@ def dMMr_dt(nOC, nOB, nMMd, nMMr, gr_MMr, dr_MMr, matrix):
                                                                 (dr_MMr * nMMr)
     return change_nMMr
 
-def dOC_dt_no_MMr(nOC, nOB, nMMd, nMMr, gr_OC, dr_OC, matrix):
-    """
-    Function that calculates the change in the number of osteoclasts when no MMr
-    are present.
-
-    Parameters:
-    -----------
-    nOC: Float
-         of OC.
-    nOB: Float
-         of OB.
-    nMMd: Float
-         of the MMd.
-    nMMr: Float
-         of the MMr.
-    gr_OC: Float
-        Growth rate of the OC.
-    dr_OC: Float
-        Dacay rate of the OC.
-    matrix: Numpy.ndarray
-        4x4 matrix containing the interaction factors.
-
-    Returns:
-    --------
-    change_nOC: Float
-        Change in the number of OC.
-
-    Example:
-    -----------
-    >>> dOC_dt(10, 20, 10, 5, 0.8, 0.4, np.array([
-    ...    [0.7, 1, 2.5, 2.1],
-    ...    [1, 1.4, -0.3, 1.0],
-    ...    [2.5, 0.2, 1.1, -0.2],
-    ...    [2.1, 0, -0.2, 1.2]]))
-    744654.2266544278
-    """
-    # Extract the needed matrix values
-    b1_1 = matrix[0, 0]
-    b2_1 = matrix[0, 1]
-    b3_1 = matrix[0, 2]
-
-    # Calculate the Change on in the number of OC
-    change_nOC = (gr_OC * nOC**b1_1 * nOB**b2_1 * nMMd**b3_1) - (dr_OC * nOC)
-    return change_nOC
-
-def dOB_dt_no_MMr(nOC, nOB, nMMd, nMMr, gr_OB, dr_OB, matrix):
-    """
-    Function that calculates the change in the number of osteoblast when no MMr
-    are present.
-
-    Parameters:
-    -----------
-    nOC: Float
-        Number of OC.
-    nOB: Float
-        Number of OB.
-    nMMd: Float
-        Number of the MMd.
-    nMMr: Float
-        Number of the MMr.
-    gr_OB: Float
-        Growth rate of the OB.
-    dr_OB: Float
-        Dacay rate of the OB.
-    matrix: Numpy.ndarray
-        4x4 matrix containing the interaction factors.
-
-    Returns:
-    --------
-    change_nOB: Float
-        Change in the number of OB.
-
-    Example:
-    -----------
-    >>> dOB_dt(10, 20, 10, 5, 0.8, 0.4, np.array([
-    ...    [0.7, 1, 2.5, 2.1],
-    ...    [1, 1.4, -0.3, 1.0],
-    ...    [2.5, 0.2, 1.1, -0.2],
-    ...    [2.1, 0, -0.2, 1.2]]))
-    1320.9296319483412
-    """
-    # Extract the necessary matrix values
-    b1_2 = matrix[1, 0]
-    b2_2 = matrix[1, 1]
-    b3_2 = matrix[1, 2]
-
-    # Calculate the change in number of OB
-    change_nOB = (gr_OB * nOC**b1_2 * nOB**b2_2 * nMMd**b3_2) - (dr_OB * nOB)
-    return change_nOB
-
-def dMMd_dt_no_MMr(nOC, nOB, nMMd, nMMr, gr_MMd, dr_MMd, matrix,
-                                                        WMMd_inhibitor = 0):
-    """
-    Function that calculates the change in the number of a drug-senstive MM cells
-    when no MMr are present.
-
-    Parameters:
-    -----------
-    nOC: Float
-        Number of OC.
-    nOB: Float
-         Number of OB.
-    nMMd: Float
-        Number of the MMd.
-    nMMr: Float
-        Number of the MMr.
-    gr_MMd: Float
-        Growth rate of the MMd.
-    dr_MMd: Float
-        Decay rate of the MMd.
-    matrix: Numpy.ndarray
-        4x4 matrix containing the interaction factors.
-    WMMd_inhibitor: Float
-        The effect of a drug on the MMd fitness.
-
-    Returns:
-    --------
-    change_nMMd: Float
-        Change in the number of MMd.
-
-    Example:
-    -----------
-    >>> dMMd_dt(10, 20, 10, 5, 0.8, 0.4, np.array([
-    ...    [0.7, 1, 2.5, 2.1],
-    ...    [1, 1.4, -0.3, 1.0],
-    ...    [2.5, 0.2, 1.1, -0.2],
-    ...    [2.1, 0, -0.2, 1.2]]))
-    4198.444487046028
-    """
-    # Extract the necessary matrix values
-    b1_3 = matrix[2, 0]
-    b2_3 = matrix[2, 1]
-    b3_3 = matrix[2, 2]
-
-    # Calculate the change in the number of MMd
-    change_nMMd = (gr_MMd * nOC**b1_3 * nOB**b2_3 * nMMd**b3_3 - nMMd * \
-                                            WMMd_inhibitor) - (dr_MMd * nMMd)
-
-    return change_nMMd
-
-
 def mutation_MMd_to_MMr(IH_present, nMMd, nMMd_change, nMMr_change):
     """Function that determines the number of MMd that become a MMr through
     a mutation
@@ -701,29 +571,35 @@ def model_dynamics(y, t, growth_rates, decay_rates, matrix, IH_present,
     ...    [2.5, 0.2, 1.1, -0.2],
     ...    [2.1, 0.0, -0.2, 1.2]]), 1)
     [744654.2266544278, 1489.0458359418838, 6825.971091449797, 270.9907565963043]
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]])
+    >>> np.allclose(model_dynamics([20, 30, 20, 0], 1, [0.8, 1.2, 0.3, 0.3],
+    ...     [0.9, 0.08, 0.2, 0.1], matrix, 1), model_dynamics([20, 30, 20,
+    ...     1e-12], 1, [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], matrix, 1))
+    True
     """
     nOC, nOB, nMMd, nMMr = y
 
-    if nMMr == 0:
-        # Determine the change values
-        nOC_change = dOC_dt_no_MMr(nOC, nOB, nMMd, nMMr, growth_rates[0],
-                                                        decay_rates[0], matrix)
-        nOB_change = dOB_dt_no_MMr(nOC, nOB, nMMd, nMMr, growth_rates[1],
-                                                        decay_rates[1], matrix)
-        nMMd_change = dMMd_dt_no_MMr(nOC, nOB, nMMd, nMMr, growth_rates[2],
-                                        decay_rates[2], matrix, WMMd_inhibitor)
-        nMMr_change = 0
+    # Without MMr the nMMr**b terms have to be left out (1**b = 1). This is done
+    # smoothly with a regularised power: below MMR_SCALE (MM_kernels.py) the
+    # power of nMMr goes to zero (0**0 = 1), so the first MMr that are made by
+    # mutations do not cause a jump in the changes
+    nMMr_positive = max(nMMr, 0.0)
+    weight = nMMr_positive ** 4 / (nMMr_positive ** 4 + MMR_SCALE ** 4)
+    nMMr_interaction = nMMr_positive ** weight
 
-    else:
-        # Determine the change values
-        nOC_change = dOC_dt(nOC, nOB, nMMd, nMMr, growth_rates[0],
+    # Determine the change values, the MMr only change when there are MMr
+    nOC_change = dOC_dt(nOC, nOB, nMMd, nMMr_interaction, growth_rates[0],
                                                         decay_rates[0], matrix)
-        nOB_change = dOB_dt(nOC, nOB, nMMd, nMMr, growth_rates[1],
+    nOB_change = dOB_dt(nOC, nOB, nMMd, nMMr_interaction, growth_rates[1],
                                                         decay_rates[1], matrix)
-        nMMd_change = dMMd_dt(nOC, nOB, nMMd, nMMr, growth_rates[2],
+    nMMd_change = dMMd_dt(nOC, nOB, nMMd, nMMr_interaction, growth_rates[2],
                                         decay_rates[2], matrix, WMMd_inhibitor)
-        nMMr_change = dMMr_dt(nOC, nOB, nMMd, nMMr, growth_rates[3],
-                                                         decay_rates[3], matrix)
+    nMMr_change = weight * dMMr_dt(nOC, nOB, nMMd, nMMr_interaction,
+                                        growth_rates[3], decay_rates[3], matrix)
 
 
     # Determine the change in nMMd and nMMr based on the mutation rate
@@ -935,26 +811,23 @@ def model_dynamics_no_mut(y, t, growth_rates, decay_rates, matrix, IH_present,
     """
     nOC, nOB, nMMd, nMMr = y
 
-    if nMMr == 0:
-        # Determine the change values
-        nOC_change = dOC_dt_no_MMr(nOC, nOB, nMMd, nMMr, growth_rates[0],
-                                                        decay_rates[0], matrix)
-        nOB_change = dOB_dt_no_MMr(nOC, nOB, nMMd, nMMr, growth_rates[1],
-                                                        decay_rates[1], matrix)
-        nMMd_change = dMMd_dt_no_MMr(nOC, nOB, nMMd, nMMr, growth_rates[2],
-                                        decay_rates[2], matrix, WMMd_inhibitor)
-        nMMr_change = 0
+    # Without MMr the nMMr**b terms have to be left out (1**b = 1). This is done
+    # smoothly with a regularised power: below MMR_SCALE (MM_kernels.py) the
+    # power of nMMr goes to zero (0**0 = 1), so the first MMr that are made by
+    # mutations do not cause a jump in the changes
+    nMMr_positive = max(nMMr, 0.0)
+    weight = nMMr_positive ** 4 / (nMMr_positive ** 4 + MMR_SCALE ** 4)
+    nMMr_interaction = nMMr_positive ** weight
 
-    else:
-        # Determine the change values
-        nOC_change = dOC_dt(nOC, nOB, nMMd, nMMr, growth_rates[0],
+    # Determine the change values, the MMr only change when there are MMr
+    nOC_change = dOC_dt(nOC, nOB, nMMd, nMMr_interaction, growth_rates[0],
                                                         decay_rates[0], matrix)
-        nOB_change = dOB_dt(nOC, nOB, nMMd, nMMr, growth_rates[1],
+    nOB_change = dOB_dt(nOC, nOB, nMMd, nMMr_interaction, growth_rates[1],
                                                         decay_rates[1], matrix)
-        nMMd_change = dMMd_dt(nOC, nOB, nMMd, nMMr, growth_rates[2],
+    nMMd_change = dMMd_dt(nOC, nOB, nMMd, nMMr_interaction, growth_rates[2],
                                         decay_rates[2], matrix, WMMd_inhibitor)
-        nMMr_change = dMMr_dt(nOC, nOB, nMMd, nMMr, growth_rates[3],
-                                                         decay_rates[3], matrix)
+    nMMr_change = weight * dMMr_dt(nOC, nOB, nMMd, nMMr_interaction,
+                                        growth_rates[3], decay_rates[3], matrix)
 
     # Make floats of the arrays
     nOC_change = float(nOC_change)
@@ -995,21 +868,23 @@ def combine_dataframes(df_1, df_2):
 
     return(combined_df)
 
-def save_dataframe(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_dataframe(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The dataframe containing the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
 def save_optimised_results(results, file_path):
     """ Function that saves the results of the optimised function as csv file.
@@ -1032,6 +907,8 @@ def save_optimised_results(results, file_path):
             "Optimal MM nr": optimal_value, 'nr iterations': number_iterations,
             'nr evaluations': number_evaluations}]
 
+    # Make the folder when it does not exist (for example in a new output root)
+    os.makedirs(os.path.dirname(file_path), exist_ok = True)
     with open(file_path, 'w', newline='') as csvfile:
 
         # Create header names
@@ -1057,7 +934,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def optimise_matrix():
     """Function that returns theinteraction matrices that are used for the
@@ -1327,107 +1207,27 @@ def switch_dataframe_mut_t(time_IH, n_switches, n_switches_no_mut, t_steps_drug,
     df_total_switch: DataFrame
         Dataframe with the nOC, nOB, nMMd and nMMr values over time.
     """
-    # Set initial values
-    x = 0
-    time = 0
-    df_total_switch = pd.DataFrame()
-    t_steps = time_IH
-    t = np.linspace(0, t_steps, t_steps*2)
-    y0 = [nOC, nOB, nMMd, nMMr]
-    parameters = (growth_rates, decay_rates, matrix_no_GF_IH, int(0))
-
-    # Determine the ODE solutions
-    y = odeint(model_dynamics_no_mut, y0, t, args=parameters)
-    df_total_switch = pd.DataFrame({'Generation': t, 'nOC': y[:, 0],
-                            'nOB': y[:, 1], 'nMMd': y[:, 2], 'nMMr': y[:, 3],
-                            'total nMM': y[:, 3]+ y[:, 2]})
-
-    # Increase the time
-    time += t_steps
-
-    # Perform a number of switches
-    for i in range(n_switches_no_mut):
-
-        # If x = 0 make sure the MMd is inhibited
-        if x == 0:
-            # Determine the start numbers
-            nOC = df_total_switch['nOC'].iloc[-1]
-            nOB = df_total_switch['nOB'].iloc[-1]
-            nMMd = df_total_switch['nMMd'].iloc[-1]
-            nMMr = df_total_switch['nMMr'].iloc[-1]
-
-            # Payoff matrix
-            matrix = matrix_GF_IH
-
-            t = np.linspace(time, time + t_steps_drug, t_steps_drug)
-            y0 = [nOC, nOB, nMMd, nMMr]
-            parameters = (growth_rates_IH, decay_rates_IH, matrix, IH_present,
-                                                                WMMd_inhibitor)
-
-            # Determine the ODE solutions
-            y = odeint(model_dynamics_no_mut, y0, t, args=parameters)
-            df = pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
-                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
-
-            # Add dataframe to total dataframe
-            df_total_switch = combine_dataframes(df_total_switch, df)
-            df_total_switch.reset_index(drop=True, inplace=True)
-
-            # Change the x and time value
-            x = int(1)
-            time += t_steps_drug
-
-        # If x = 1 make sure the MMd is not inhibited
+    # The first part is without IHs
+    schedule = [make_phase(time_IH, growth_rates, decay_rates, matrix_no_GF_IH,
+                                                0, n_points = time_IH * 2)]
+    mutation_start = time_IH
+
+    # Alternate between administration and holiday phases, the mutations start
+    # after the switches without mutations
+    for i in range(n_switches_no_mut + n_switches):
+        if i % 2 == 0:
+            schedule.append(make_phase(t_steps_drug, growth_rates_IH,
+                decay_rates_IH, matrix_GF_IH, IH_present, WMMd_inhibitor))
         else:
-            # Determine the start numbers
-            nOC = df_total_switch['nOC'].iloc[-1]
-            nOB = df_total_switch['nOB'].iloc[-1]
-            nMMd = df_total_switch['nMMd'].iloc[-1]
-            nMMr = df_total_switch['nMMr'].iloc[-1]
-
-            # Payoff matrix
-            matrix = matrix_no_GF_IH
-
-            t = np.linspace(time, time + t_steps_no_drug , t_steps_no_drug)
-            y0 = [nOC, nOB, nMMd, nMMr]
-            parameters = (growth_rates, decay_rates, matrix, int(0))
-
-            # Determine the ODE solutions
-            y = odeint(model_dynamics_no_mut, y0, t, args=parameters)
-            df = pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
-                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
-
-            # Add dataframe to total dataframe
-            df_total_switch = combine_dataframes(df_total_switch, df)
-            df_total_switch.reset_index(drop=True, inplace=True)
-
-            # Change the x and time value
-            x = int(0)
-            time += t_steps_no_drug
-
-    # Perform a number of switches
-    for i in range(n_switches):
-
-        # If x = 0 make sure the MMd is inhibited
-        if x == 0:
-            # Extend the dataframe
-            df_total_switch = make_part_df(df_total_switch, time, t_steps_drug,
-                    growth_rates_IH, decay_rates_IH, matrix_GF_IH, IH_present,
-                    WMMd_inhibitor)
-
-            # Change the x and time value
-            x = int(1)
-            time += t_steps_drug
+            schedule.append(make_phase(t_steps_no_drug, growth_rates,
+                decay_rates, matrix_no_GF_IH, 0))
 
-        # If x = 1 make sure the MMd is not inhibited
-        else:
-            # Extend the dataframe
-            df_total_switch = make_part_df(df_total_switch, time, t_steps_no_drug,
-                    growth_rates, decay_rates, matrix_no_GF_IH, int(0))
+        if i < n_switches_no_mut:
+            mutation_start += schedule[-1]['duration']
 
-            # Change the x and time value
-            x = int(0)
-            time += t_steps_no_drug
+    # Determine the ODE solutions of the whole schedule
+    df_total_switch = schedule_dataframe(schedule, [nOC, nOB, nMMd, nMMr],
+                                                                mutation_start)
 
     return df_total_switch
 
@@ -2506,6 +2306,7 @@ def switch_dataframe_W_WandGF_GF_h(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
     return df_total_switch
 
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_situations(t_steps_IH_strength, function_order, nOC,
                 nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
                 decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor):
@@ -2572,6 +2373,7 @@ def minimal_tumour_nr_t_3_situations(t_steps_IH_strength, function_order, nOC,
     return float(average_MM_number)
 
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_situations_IH(t_steps_IH_strength, function_order,
             weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
             decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH):
@@ -2625,7 +2427,7 @@ def minimal_tumour_nr_t_3_situations_IH(t_steps_IH_strength, function_order,
 
     # Determine the round duration and the matrix value
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
 
     # Create a dataframe of the numbers
     df = function_order(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
@@ -2648,6 +2450,7 @@ def minimal_tumour_nr_t_3_situations_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_4_situations_IH(t_steps_IH_strength, function_order,
             weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
             decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH):
@@ -2702,7 +2505,7 @@ def minimal_tumour_nr_t_3_4_situations_IH(t_steps_IH_strength, function_order,
     # Determine the round duration and the matrix value
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + \
                                                                 t_steps_no_drug
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
 
     # Create a dataframe of the numbers
     df = function_order(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
@@ -2725,6 +2528,7 @@ def minimal_tumour_nr_t_3_4_situations_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_situations(t_steps, function_order, nOC, nOB, nMMd,
                         nMMr, growth_rates, growth_rates_IH, decay_rates,
                         decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH,
@@ -2796,6 +2600,7 @@ def minimal_tumour_nr_t_4_situations(t_steps, function_order, nOC, nOB, nMMd,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_sit_equal(t_steps_IH_strength, function_order, nOC, nOB,
         nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
         matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb, WMMd_inhibitor):
@@ -2865,6 +2670,7 @@ def minimal_tumour_nr_t_4_sit_equal(t_steps_IH_strength, function_order, nOC, nO
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_sit_equal_IH(t_steps_IH_strength, function_order,
     weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
     decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb):
@@ -2919,8 +2725,8 @@ def minimal_tumour_nr_t_4_sit_equal_IH(t_steps_IH_strength, function_order,
                                             WMMd_inhibitor = t_steps_IH_strength
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH})
     n_rounds = 60
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
@@ -2947,6 +2753,7 @@ def minimal_tumour_nr_t_4_sit_equal_IH(t_steps_IH_strength, function_order,
     return float(average_MM_number)
 
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_sit_GF_IH(t_steps_IH_strength, function_order,
     weight_MMr, nOC,nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
     decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb):
@@ -3002,8 +2809,8 @@ def minimal_tumour_nr_t_3_sit_GF_IH(t_steps_IH_strength, function_order,
     n_rounds = 60
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH_comb
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH_comb})
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_comb
 
     # Create a dataframe of the numbers
@@ -3028,6 +2835,7 @@ def minimal_tumour_nr_t_3_sit_GF_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_3_sit_W_IH(t_steps_IH_strength, function_order,
             weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
             decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_IH_comb):
@@ -3081,7 +2889,7 @@ def minimal_tumour_nr_t_3_sit_W_IH(t_steps_IH_strength, function_order,
     n_rounds = 60
 
     # Determine the round duration and the matrix values
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH_comb
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH_comb})
     time_round =  t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
     # Create a dataframe of the numbers
@@ -3106,6 +2914,7 @@ def minimal_tumour_nr_t_3_sit_W_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_nr_t_4_situations_IH(t_steps_IH_strength, function_order,
     weight_MMr, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
     decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb):
@@ -3160,8 +2969,8 @@ def minimal_tumour_nr_t_4_situations_IH(t_steps_IH_strength, function_order,
     n_rounds = 60
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH_comb
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH_comb})
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
     # Create a dataframe of the numbers
@@ -3186,6 +2995,7 @@ def minimal_tumour_nr_t_4_situations_IH(t_steps_IH_strength, function_order,
 
     return float(average_MM_number)
 
+@cached
 def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
                 decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH,
                 IH_present, WMMd_inhibitor = 0):
@@ -3233,20 +3043,31 @@ def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
     column_names = ['Generations no drug', 'Generations drug', 'MM number']
     df_MM_nr = pd.DataFrame(columns=column_names)
 
-    # Loop over all the t_step values for drug administration and drug holidays
-    for t_steps_no_drug in range(2, 22):
+    # Determine the MM number for all t_step values for drug administration
+    # and drug holidays, in a task of a checkpoint (MM_checkpoint.py) every
+    # finished value is saved
+    t_steps = [(t_steps_no_drug, t_steps_drug) for t_steps_no_drug in
+                                range(2, 22) for t_steps_drug in range(2, 22)]
 
-        for t_steps_drug in range(2, 22):
-            numb_tumour = minimal_tumour_numb_t_steps(t_steps_drug,
+    def numb_tumour_t_steps(t_step):
+        t_steps_no_drug, t_steps_drug = t_step
+        return minimal_tumour_numb_t_steps(t_steps_drug,
                     t_steps_no_drug, nOC, nOB, nMMd, nMMr, growth_rates,
                     growth_rates_IH, decay_rates, decay_rates_IH, matrix_no_GF_IH,
                     matrix_GF_IH, IH_present, WMMd_inhibitor)
 
-            # Add results to the dataframe
-            new_row_df = pd.DataFrame([{'Generations no drug': \
+    numb_tumours = checkpoint_sweep(t_steps, numb_tumour_t_steps, (nOC, nOB,
+                         nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
+                      decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, IH_present,
+                                                                WMMd_inhibitor))
+
+    for (t_steps_no_drug, t_steps_drug), numb_tumour in zip(t_steps,
+                                                            numb_tumours):
+        # Add results to the dataframe
+        new_row_df = pd.DataFrame([{'Generations no drug': \
                     int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
                                              'MM number': float(numb_tumour)}])
-            df_MM_nr = combine_dataframes(df_MM_nr, new_row_df)
+        df_MM_nr = combine_dataframes(df_MM_nr, new_row_df)
 
     return(df_MM_nr)
 
@@ -3377,53 +3198,20 @@ def continuous_add_IH_df_mut_t(time_IH, mutation_start, end_generation, nOC, nOB
     df_total: DataFrame
         The dataframe with the cell numbers when IHs are continiously administered.
     """
-    # Set the start values
-    t = np.linspace(0, time_IH, time_IH)
-    y0 = [nOC, nOB, nMMd, nMMr]
-    parameters = (growth_rates, decay_rates, matrix_no_GF_IH, int(0))
-
-    # Determine the ODE solutions
-    y = odeint(model_dynamics_no_mut, y0, t, args=parameters)
-    df_1 = pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
-                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
-
-    # Determine the current numbers
-    nOC = df_1['nOC'].iloc[-1]
-    nOB = df_1['nOB'].iloc[-1]
-    nMMd = df_1['nMMd'].iloc[-1]
-    nMMr = df_1['nMMr'].iloc[-1]
-
-    # Set the currect values
-    t = np.linspace(time_IH, mutation_start, 50)
-    y0 = [nOC, nOB, nMMd, nMMr]
-    parameters = (growth_rates_IH, decay_rates_IH, matrix_GF_IH, IH_present,
-                                                    WMMd_inhibitor)
-
-    # Determine the ODE solutions
-    y = odeint(model_dynamics_no_mut, y0, t, args=parameters)
-    df_2 = pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
-                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
-
-    # Determine the current numbers
-    nOC = df_2['nOC'].iloc[-1]
-    nOB = df_2['nOB'].iloc[-1]
-    nMMd = df_2['nMMd'].iloc[-1]
-    nMMr = df_2['nMMr'].iloc[-1]
-
-    # Set the currect values
-    t = np.linspace(mutation_start, end_generation, 200)
-    y0 = [nOC, nOB, nMMd, nMMr]
-    parameters = (growth_rates_IH, decay_rates_IH, matrix_GF_IH, IH_present,
-                                                    WMMd_inhibitor)
-
-    # Determine the ODE solutions
-    y = odeint(model_dynamics, y0, t, args=parameters)
-    df_3 = pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
-                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
-
-    # Combine the dataframes
-    df_total = combine_dataframes(df_1, df_2)
-    df_total = combine_dataframes(df_total, df_3)
+    # Make the schedule, the IH phase has extra time points after the start of
+    # the mutations
+    schedule = [make_phase(time_IH, growth_rates, decay_rates, matrix_no_GF_IH,
+                                                    0, n_points = time_IH),
+                make_phase(mutation_start - time_IH, growth_rates_IH,
+                    decay_rates_IH, matrix_GF_IH, IH_present, WMMd_inhibitor,
+                    n_points = 50),
+                make_phase(end_generation - mutation_start, growth_rates_IH,
+                    decay_rates_IH, matrix_GF_IH, IH_present, WMMd_inhibitor,
+                    n_points = 200)]
+
+    # Determine the ODE solutions of the whole schedule
+    df_total = schedule_dataframe(schedule, [nOC, nOB, nMMd, nMMr],
+                                                                mutation_start)
 
     return df_total
 
@@ -3482,6 +3270,7 @@ def x_y_z_axis_values_3d_plot(dataframe, name):
 
     return (X_values, Y_values, Z_values)
 
+@parameter_set_objective
 def minimal_tumour_numb_t_steps(t_steps_drug, t_steps_no_drug, nOC, nOB, nMMd,
                 nMMr, growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                 matrix_no_GF_IH, matrix_GF_IH, IH_present, WMMd_inhibitor = 0):
@@ -3619,19 +3408,30 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
                 growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                 matrix_no_GF_IH, matrix_IH_comb, int(2), WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH_r.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH_r.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH_r.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH_r.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH_r.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH_r.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -3711,8 +3511,8 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=5,
                                                             fontsize='x-large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD_r',
-                            r'..\visualisation\results_model_nr_IH_inf_mutation')
-    plt.show()
+                            figure_path('results_model_nr_IH_inf_mutation'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 The interaction matrix is changed to make it more realistic"""
@@ -3790,19 +3590,30 @@ def Figure_continuous_MTD_vs_AT_MMr_comb(n_switches, t_steps_drug):
                 growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                 matrix_no_GF_IH, matrix_IH_comb, int(2), WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH_c.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH_c.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH_c.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH_c.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH_c.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH_c.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -3882,8 +3693,8 @@ def Figure_continuous_MTD_vs_AT_MMr_comb(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=5,
                                                             fontsize='x-large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD_c',
-                            r'..\visualisation\results_model_nr_IH_inf_mutation')
-    plt.show()
+                            figure_path('results_model_nr_IH_inf_mutation'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 The interaction matrix is changed to make it more realistic"""
@@ -3962,19 +3773,30 @@ def Figure_continuous_MTD_vs_AT_therapy_mut(n_switches, t_steps_drug):
                 growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                 matrix_no_GF_IH, matrix_IH_comb, int(2), WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH_t.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH_t.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH_t.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH_t.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH_t.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH_t.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -4053,8 +3875,8 @@ def Figure_continuous_MTD_vs_AT_therapy_mut(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=5,
                                                             fontsize='x-large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD_t',
-                            r'..\visualisation\results_model_nr_IH_inf_mutation')
-    plt.show()
+                            figure_path('results_model_nr_IH_inf_mutation'))
+    show()
 
 """ 3D plot showing the best IH holiday and administration periods"""
 def Figure_3D_MM_numb_IH_add_and_holiday():
@@ -4105,9 +3927,19 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
                 growth_rates_IH, decay_rates, decay_rates_IH, matrix_no_GF_IH,
                 matrix_GF_IH, int(1))
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_holiday_GF_IH, 'df_cell_nr_IH_inf_best_MMd_GH_IH_holiday.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     # Determine the axis values
     X_GF_IH, Y_GF_IH, Z_GF_IH = x_y_z_axis_values_3d_plot(df_holiday_GF_IH,
@@ -4120,7 +3952,7 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_W_IH, 'df_cell_nr_IH_inf_best_WMMd_IH_holiday.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     # Determine the axis values
     X_W_IH, Y_W_IH, Z_W_IH = x_y_z_axis_values_3d_plot(df_holiday_W_IH, 'W IH')
@@ -4132,7 +3964,7 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_nr_IH_inf_best_comb_IH_holiday.csv',
-                                        r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     # Determine the axis values
     X_comb, Y_comb, Z_comb = x_y_z_axis_values_3d_plot(df_holiday_comb,
@@ -4199,8 +4031,8 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Add a color bar
     save_Figure(fig, '3d_plot_MM_nr_IH_inf_best_IH_h_a_periods',
-                        r'..\visualisation\results_model_nr_IH_inf_mutation')
-    plt.show()
+                        figure_path('results_model_nr_IH_inf_mutation'))
+    show()
 
 """ 3D plot showing the best IH strengths """
 def Figure_3D_MM_numb_MMd_IH_strength():
@@ -4268,9 +4100,16 @@ def Figure_3D_MM_numb_MMd_IH_strength():
 
             df_holiday = combine_dataframes(df_holiday, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Save the data
     save_dataframe(df_holiday, 'df_cell_nr_IH_inf_best_comb_IH_strength.csv',
-                                     r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     # Find the drug administration and holiday period causing the lowest MM number
     min_index = df_holiday['MM number'].idxmin()
@@ -4321,8 +4160,8 @@ def Figure_3D_MM_numb_MMd_IH_strength():
     color_bar.set_label('Number of MM')
 
     save_Figure(fig, '3d_plot_MM_nr_IH_inf_best_IH_strength',
-                        r'..\visualisation\results_model_nr_IH_inf_mutation')
-    plt.show()
+                        figure_path('results_model_nr_IH_inf_mutation'))
+    show()
 
 """ Figure that shows the MM number after optimisation for different MMd GF IH
 and WMMd IH strengths"""
@@ -4333,34 +4172,46 @@ def Figure_optimisation():
     IH -> holiday.
     """
     # Collect needed data -> normal growth and decay rate
-    df_GF_W_h_changing_GF = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_GF_W_h_changing_GF_IH.csv')
-    df_W_GF_h_changing_GF = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_W_GF_h_changing_GF_IH.csv')
-    df_GF_W_h_changing_W = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_GF_W_h_changing_W_IH.csv')
-    df_W_GF_h_changing_W = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_W_GF_h_changing_W_IH.csv')
+    df_GF_W_h_changing_GF = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                             'df_MM_GF_W_h_changing_GF_IH.csv'))
+    df_W_GF_h_changing_GF = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                             'df_MM_W_GF_h_changing_GF_IH.csv'))
+    df_GF_W_h_changing_W = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                              'df_MM_GF_W_h_changing_W_IH.csv'))
+    df_W_GF_h_changing_W = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                              'df_MM_W_GF_h_changing_W_IH.csv'))
 
     # Collect needed data -> increased growth and decay rate
-    df_GF_W_h_changing_GF_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_GF_W_h_changing_GF_IH_h_gr_dr.csv')
-    df_W_GF_h_changing_GF_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_W_GF_h_changing_GF_IH_h_gr_dr.csv')
-    df_GF_W_h_changing_W_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_GF_W_h_changing_W_IH_h_gr_dr.csv')
-    df_W_GF_h_changing_W_h = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_W_GF_h_changing_W_IH_h_gr_dr.csv')
+    df_GF_W_h_changing_GF_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                     'df_MM_GF_W_h_changing_GF_IH_h_gr_dr.csv'))
+    df_W_GF_h_changing_GF_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                     'df_MM_W_GF_h_changing_GF_IH_h_gr_dr.csv'))
+    df_GF_W_h_changing_W_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                      'df_MM_GF_W_h_changing_W_IH_h_gr_dr.csv'))
+    df_W_GF_h_changing_W_h = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                      'df_MM_W_GF_h_changing_W_IH_h_gr_dr.csv'))
 
     # Collect needed data -> decreased growth and decay rate
-    df_GF_W_h_changing_GF_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_GF_W_h_changing_GF_IH_l_gr_dr.csv')
-    df_W_GF_h_changing_GF_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_W_GF_h_changing_GF_IH_l_gr_dr.csv')
-    df_GF_W_h_changing_W_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_GF_W_h_changing_W_IH_l_gr_dr.csv')
-    df_W_GF_h_changing_W_l = pd.read_csv(\
-    r'..\data\data_model_nr_IH_inf_mutation\df_MM_W_GF_h_changing_W_IH_l_gr_dr.csv')
+    df_GF_W_h_changing_GF_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                     'df_MM_GF_W_h_changing_GF_IH_l_gr_dr.csv'))
+    df_W_GF_h_changing_GF_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                     'df_MM_W_GF_h_changing_GF_IH_l_gr_dr.csv'))
+    df_GF_W_h_changing_W_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                      'df_MM_GF_W_h_changing_W_IH_l_gr_dr.csv'))
+    df_W_GF_h_changing_W_l = MM_storage.load_table(\
+    data_path('data_model_nr_IH_inf_mutation',
+                                      'df_MM_W_GF_h_changing_W_IH_l_gr_dr.csv'))
 
     # Create a plot with two sublot next to eachother
     fig, axs = plt.subplots(2, 3, figsize=(22, 12))
@@ -4437,8 +4288,8 @@ def Figure_optimisation():
 
     # Save and show the plot
     save_Figure(plt, 'Figure_optimisation_comb_n_h_l',
-                        r'..\visualisation\results_model_nr_IH_inf_mutation')
-    plt.show()
+                        figure_path('results_model_nr_IH_inf_mutation'))
+    show()
 
 
 """ Figure to determine the difference between traditional and adaptive therapy
@@ -4539,34 +4390,44 @@ def Figure_AT_MMd_MMr_limit(upper_limit_MMd, upper_limit_MMr, limit):
     {round(a_dur_comb, 0)} generations and the average IH combination holiday
     duration is {round(h_dur_comb, 0)} generations""")
 
+    # The parameters that are saved with the data
+    metadata = {'upper_limit_MMd': upper_limit_MMd,
+                'upper_limit_MMr': upper_limit_MMr, 'limit': limit, 'nOC': nOC,
+                'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb}
+
     # Determine if the MMr limit is low or high and save the data under the
     # correct name
     if limit == 'low':
         # Save the data
         save_dataframe(df_switch_GF, 'df_cell_nr_GF_IH_AT_MM_limit_l.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
         save_dataframe(df_switch_WMMd, 'df_cell_nr_W_IH_AT_MM_limit_l.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
         save_dataframe(df_switch_comb, 'df_cell_nr_IH_comb_AT_MM_limit_l.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     if limit == 'middel':
         # Save the data
         save_dataframe(df_switch_GF, 'df_cell_nr_GF_IH_AT_MM_limit.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
         save_dataframe(df_switch_WMMd, 'df_cell_nr_W_IH_AT_MM_limit.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
         save_dataframe(df_switch_comb, 'df_cell_nr_IH_comb_AT_MM_limit.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     else:
         # Save the data
         save_dataframe(df_switch_GF, 'df_cell_nr_GF_IH_AT_MM_limit_h.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
         save_dataframe(df_switch_WMMd, 'df_cell_nr_W_IH_AT_MM_limit_h.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
         save_dataframe(df_switch_comb, 'df_cell_nr_IH_comb_AT_MM_limit_h.csv',
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
     fig, axs = plt.subplots(1, 3, figsize=(18, 6))
 
@@ -4613,15 +4474,15 @@ def Figure_AT_MMd_MMr_limit(upper_limit_MMd, upper_limit_MMr, limit):
     # correct name
     if limit == 'low':
         save_Figure(plt, 'line_plot_cell_nr_AT_l_limit_MMd_MMr',
-                        r'..\visualisation\results_model_nr_IH_inf_mutation')
+                        figure_path('results_model_nr_IH_inf_mutation'))
     if limit == 'middel':
         save_Figure(plt, 'line_plot_cell_nr_AT_limit_MMd_MMr',
-                        r'..\visualisation\results_model_nr_IH_inf_mutation')
+                        figure_path('results_model_nr_IH_inf_mutation'))
     else:
         save_Figure(plt, 'line_plot_cell_nr_AT_h_limit_MMd_MMr',
-                        r'..\visualisation\results_model_nr_IH_inf_mutation')
+                        figure_path('results_model_nr_IH_inf_mutation'))
 
-    plt.show()
+    show()
 
 """optimise IH administration duration and holiday duration for MMd GF IH -> WMMd
 IH -> holiday """
@@ -4664,7 +4525,7 @@ def minimise_MM_GF_W_h():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_W_h.csv')
+              data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_W_h.csv'))
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> MMd GF
@@ -4706,7 +4567,7 @@ def minimise_MM_W_GF_h():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf_mutation\optimise_W_GF_h.csv')
+              data_path('data_model_nr_IH_inf_mutation', 'optimise_W_GF_h.csv'))
 
 
 """optimise IH administration duration, holiday duration and strength for
@@ -4750,7 +4611,7 @@ def minimise_MM_GF_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_W_h_IH.csv')
+           data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_W_h_IH.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -4793,7 +4654,7 @@ def minimise_MM_W_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf_mutation\optimise_W_GF_h_IH.csv')
+           data_path('data_model_nr_IH_inf_mutation', 'optimise_W_GF_h_IH.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -4837,7 +4698,7 @@ def minimise_MM_GF_h_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_h_W_h_IH.csv')
+         data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_h_W_h_IH.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for
 WMMd IH -> holiday -> MMd GF IH -> holiday """
@@ -4879,7 +4740,7 @@ def minimise_MM_W_h_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_W_h_GF_h_IH.csv')
+         data_path('data_model_nr_IH_inf_mutation', 'optimise_W_h_GF_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH ->
 IH combination -> MMd GF IH -> holiday"""
@@ -4928,7 +4789,7 @@ def minimise_MM_W_comb_GF_h():
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf_mutation\optimise_W_comb_GF_h.csv')
+        data_path('data_model_nr_IH_inf_mutation', 'optimise_W_comb_GF_h.csv'))
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
 IH combination -> WMMd IH -> holiday"""
@@ -4976,7 +4837,7 @@ def minimise_MM_GF_comb_W_h():
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_comb_W_h.csv')
+         data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_comb_W_h.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
 IH combination -> MMd GF IH -> holiday"""
@@ -5024,7 +4885,7 @@ def minimise_MM_W_comb_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf_mutation\optimise_W_comb_GF_h_IH.csv')
+      data_path('data_model_nr_IH_inf_mutation', 'optimise_W_comb_GF_h_IH.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -5074,7 +4935,7 @@ def minimise_MM_GF_comb_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_comb_W_h_IH.csv')
+      data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_comb_W_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> WMMd
 IH + MMd GF IH -> MMd GF IH -> holiday"""
@@ -5120,7 +4981,7 @@ def minimise_MM_W_WandGF_GF_h():
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_W_WandGF_GF_h.csv')
+       data_path('data_model_nr_IH_inf_mutation', 'optimise_W_WandGF_GF_h.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH-> MMd
@@ -5167,7 +5028,7 @@ def minimise_MM_GF_GFandW_W_h():
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_WandGF_W_h.csv')
+       data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_WandGF_W_h.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> WMMd
 IH + MMd GF IH -> MMd GF IH -> holiday"""
@@ -5212,7 +5073,7 @@ def minimise_MM_W_WandGF_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf_mutation\optimise_W_WandGF_GF_h_IH.csv')
+    data_path('data_model_nr_IH_inf_mutation', 'optimise_W_WandGF_GF_h_IH.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH-> MMd
@@ -5258,7 +5119,7 @@ def minimise_MM_GF_GFandW_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_WandGF_W_h_IH.csv')
+    data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_WandGF_W_h_IH.csv'))
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
@@ -5303,7 +5164,7 @@ def minimise_MM_W_comb_h_IH():
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf_mutation\optimise_W_comb_h_IH.csv')
+         data_path('data_model_nr_IH_inf_mutation', 'optimise_W_comb_h_IH.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -5350,7 +5211,7 @@ def minimise_MM_GF_comb_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_comb_h_IH.csv')
+        data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_comb_h_IH.csv'))
 
 
 """optimise IH administration duration and holiday duration for MMd GF IH -> WMMd
@@ -5430,9 +5291,16 @@ def minimise_MM_GF_W_h_changing_W_IH(growth_rates, growth_rates_IH, decay_rates,
              result.x[0], 'WMMd IH duration':result.x[1], 'Holiday duration': \
              result.x[2], 'MM number':result.fun}])
         df_GF_W_h_change_W = combine_dataframes(df_GF_W_h_change_W, new_row_df)
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH}
+
     # Save the dataframe
     save_dataframe(df_GF_W_h_change_W, filename,
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
 
 """optimise IH administration duration and holiday duration for MMd GF IH -> WMMd
@@ -5515,9 +5383,16 @@ def minimise_MM_GF_W_h_changing_GF_IH(growth_rates, growth_rates_IH, decay_rates
             result.x[2], 'MM number':result.fun}])
         df_GF_W_h_change_GF = combine_dataframes(df_GF_W_h_change_GF, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the dataframe
     save_dataframe(df_GF_W_h_change_GF, filename,
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> MMd GF
@@ -5598,9 +5473,16 @@ def minimise_MM_W_GF_h_changing_W_IH(growth_rates, growth_rates_IH, decay_rates,
             result.x[2], 'MM number':result.fun}])
         df_W_GF_h_change_W = combine_dataframes(df_W_GF_h_change_W, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH}
+
     # Save the dataframe
     save_dataframe(df_W_GF_h_change_W, filename,
-                                    r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> MMd GF
@@ -5683,9 +5565,16 @@ def minimise_MM_W_GF_h_changing_GF_IH(growth_rates, growth_rates_IH, decay_rates
              result.x[2], 'MM number':result.fun}])
         df_W_GF_h_change_GF = combine_dataframes(df_W_GF_h_change_GF, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'growth_rates': growth_rates,
+                'growth_rates_IH': growth_rates_IH, 'decay_rates': decay_rates,
+                'decay_rates_IH': decay_rates_IH, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the dataframe
     save_dataframe(df_W_GF_h_change_GF, filename,
-                                        r'..\data\data_model_nr_IH_inf_mutation')
+                           data_path('data_model_nr_IH_inf_mutation'), metadata)
 
 
 """optimise IH administration duration, holiday duration and strength for
@@ -5737,7 +5626,7 @@ def minimise_MM_GF_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_W_h_IH_w.csv')
+         data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_W_h_IH_w.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -5787,7 +5676,7 @@ def minimise_MM_W_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-                r'..\data\data_model_nr_IH_inf_mutation\optimise_W_GF_h_IH_w.csv')
+         data_path('data_model_nr_IH_inf_mutation', 'optimise_W_GF_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
@@ -5844,7 +5733,7 @@ def minimise_MM_W_comb_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf_mutation\optimise_W_comb_GF_h_IH_w.csv')
+    data_path('data_model_nr_IH_inf_mutation', 'optimise_W_comb_GF_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -5901,7 +5790,7 @@ def minimise_MM_GF_comb_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_comb_W_h_IH_w.csv')
+    data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_comb_W_h_IH_w.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for WMMd
 IH -> holiday -> MMd GF IH -> holiday where the weight of the MMr relative to the
@@ -5952,7 +5841,7 @@ def minimise_MM_W_h_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_W_h_GF_h_IH_w.csv')
+       data_path('data_model_nr_IH_inf_mutation', 'optimise_W_h_GF_h_IH_w.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for MMd GF
 IH -> holiday -> WMMd IH -> holiday where the weight of the MMr relative to the
@@ -6003,7 +5892,7 @@ def minimise_MM_GF_h_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-            r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_h_W_h_IH_w.csv')
+       data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_h_W_h_IH_w.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> WMMd
 IH + MMd GF IH -> MMd GF IH -> holiday where the weight of the MMr relative to
@@ -6056,7 +5945,8 @@ def minimise_MM_W_WandGF_GF_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-       r'..\data\data_model_nr_IH_inf_mutation\optimise_W_WandGF_GF_h_IH_w.csv')
+       data_path('data_model_nr_IH_inf_mutation',
+                                             'optimise_W_WandGF_GF_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH-> MMd
@@ -6110,7 +6000,8 @@ def minimise_MM_GF_GFandW_W_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-       r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_WandGF_W_h_IH_w.csv')
+       data_path('data_model_nr_IH_inf_mutation',
+                                             'optimise_GF_WandGF_W_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
@@ -6163,7 +6054,7 @@ def minimise_MM_W_comb_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-             r'..\data\data_model_nr_IH_inf_mutation\optimise_W_comb_h_IH_w.csv')
+       data_path('data_model_nr_IH_inf_mutation', 'optimise_W_comb_h_IH_w.csv'))
 
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
@@ -6218,7 +6109,7 @@ def minimise_MM_GF_comb_h_IH_w(relative_weight_MMr):
 
     # Save the results
     save_optimised_results(result,
-         r'..\data\data_model_nr_IH_inf_mutation\optimise_GF_comb_h_IH_w.csv')
+      data_path('data_model_nr_IH_inf_mutation', 'optimise_GF_comb_h_IH_w.csv'))
 
 if __name__ == "__main__":
     main()
@@ -27,12 +27,21 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.integrate import odeint
-import csv
-from scipy.optimize import minimize
-from mpl_toolkits.mplot3d import Axes3D
 import doctest
+from MM_cache import cached
+from MM_parameters import derive_matrix, parameter_set_objective
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_scan import adaptive_scan, scan_nr
+from MM_lazy import lazy_import, lazy_function
+from MM_checkpoint import checkpoint_sweep
+
+# Import the plotting and optimisation libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+minimize = lazy_function('scipy.optimize', 'minimize')
 
 def main():
     # Do doc tests
@@ -344,41 +353,40 @@ def combine_dataframes(df_1, df_2):
 
     return(combined_df)
 
-def save_dataframe(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_dataframe(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The dataframe containing the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
-def save_dictionary(dictionary, file_path):
-    """ Function that saves a dictionary as csv file.
+def save_dictionary(dictionary, file_path, metadata = None):
+    """ Function that saves a dictionary as binary (npz) file.
 
     Parameters:
     -----------
     dictionary: Dictionary
         The dictionary containing the collected data.
     file_path: String
-        The name of the csv file and the path where the dictionary will be saved.
+        The name of the file and the path where the dictionary will be
+        saved, the .csv extension is replaced by the extension of the
+        storage format (MM_storage.py).
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-
-        # Create a header
-        writer.writerow(['Key', 'Value'])
-
-        # Loop over the rows
-        for key, value in dictionary.items():
-            writer.writerow([str(key), str(value)])
+    MM_writer.write(MM_storage.save_dictionary, dictionary, file_path,
+                                                                    metadata)
 
 def save_Figure(figure, file_name, folder_path):
     """Save the Figure to a specific folder.
@@ -393,7 +401,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def number_to_fractions(dataframe):
     """ Function that converts the numbers in a dataframe to a fractions
@@ -555,6 +566,7 @@ def switch_dataframe(n_switches, t_steps_drug, t_steps_no_drug, nOC, nOB, nMMd,
     return df_total_switch
 
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_steps(t_steps_drug, t_steps_no_drug, nOC, nOB,
                         nMMd, nMMr, growth_rates, decay_rates, matrix_no_GF_IH,
                         matrix_GF_IH, WMMd_inhibitor = 0):
@@ -729,6 +741,7 @@ def x_y_z_axis_values_3d_plot(dataframe, name):
 
     return (X_values, Y_values, Z_values)
 
+@cached
 def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, decay_rates,
                             matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
 
@@ -736,22 +749,33 @@ def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, decay_rates,
     column_names = ['Generations no drug', 'Generations drug', 'MM fraction']
     df_MM_frac = pd.DataFrame(columns=column_names)
 
-    # Loop over all the t_step values for drug administration and drug holidays
-    for t_steps_no_drug in range(2, 22):
+    # Determine the MM fraction for all t_step values for drug administration
+    # and drug holidays, in a task of a checkpoint (MM_checkpoint.py) every
+    # finished value is saved
+    t_steps = [(t_steps_no_drug, t_steps_drug) for t_steps_no_drug in
+                                range(2, 22) for t_steps_drug in range(2, 22)]
 
-        for t_steps_drug in range(2, 22):
-            nr_to_frac_tumour = minimal_tumour_nr_to_frac_t_steps( t_steps_drug,
+    def nr_to_frac_tumour_t_steps(t_step):
+        t_steps_no_drug, t_steps_drug = t_step
+        return minimal_tumour_nr_to_frac_t_steps(t_steps_drug,
                     t_steps_no_drug, nOC, nOB, nMMd, nMMr, growth_rates,
                     decay_rates, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor)
 
-            # Add results to the dataframe
-            new_row_df = pd.DataFrame([{'Generations no drug':
+    nr_to_frac_tumours = checkpoint_sweep(t_steps, nr_to_frac_tumour_t_steps,
+            (nOC, nOB, nMMd, nMMr, growth_rates, decay_rates, matrix_no_GF_IH,
+                                                  matrix_GF_IH, WMMd_inhibitor))
+
+    for (t_steps_no_drug, t_steps_drug), nr_to_frac_tumour in \
+                                            zip(t_steps, nr_to_frac_tumours):
+        # Add results to the dataframe
+        new_row_df = pd.DataFrame([{'Generations no drug':
                     int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
                                     'MM fraction': float(nr_to_frac_tumour)}])
-            df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
+        df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
 
     return (df_MM_frac)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr,
                         growth_rates, decay_rates, matrix, b_OC_MMd_array):
     """Function that determines the fraction of the population being MM for a
@@ -814,8 +838,8 @@ def minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr,
     if b_OC_MMd_array == True:
         b_OC_MMd = b_OC_MMd[0]
 
-    # Change the b_OC_MMd value to the specified value
-    matrix[2, 0]= b_OC_MMd
+    # Derive a matrix with the specified b_OC_MMd value
+    matrix = derive_matrix(matrix, {(2, 0): b_OC_MMd})
 
     # Set initial conditions
     t_over = np.linspace(70, 200, 140)
@@ -835,6 +859,7 @@ def minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr,
 
     return float(last_MM_fraction)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd, nMMr,
                     growth_rates, decay_rates, matrix, WMMd_inhibitor_array):
     """Function that determines the fraction of the population being MM for a
@@ -992,19 +1017,28 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
     df_total_WMMd = number_to_fractions(df_total_WMMd)
     df_total_comb = number_to_fractions(df_total_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_to_frac_switch_GF_IH.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_to_frac_switch_WMMd_IH.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_to_frac_switch_comb_IH.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_to_frac_continuous_GF_IH.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_to_frac_continuous_WMMd_IH.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_to_frac_continuous_comb_IH.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1063,8 +1097,8 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                 fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_to_frac_AT_MTD',
-                                 r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                 figure_path('results_model_nr_to_frac'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy.
 Shorter holiday and administration periods compared to the original situation"""
@@ -1143,19 +1177,28 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     df_total_WMMd = number_to_fractions(df_total_WMMd)
     df_total_comb = number_to_fractions(df_total_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_to_frac_switch_GF_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_to_frac_switch_WMMd_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_to_frac_switch_comb_IH_short_a_h.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_to_frac_continuous_GF_IH_short_a_h.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_to_frac_continuous_WMMd_IH_short_a_h.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_to_frac_continuous_comb_IH_short_a_h.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1213,8 +1256,8 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     legend_labels = ['OC fraction', 'OB fraction', 'MMd fraction', 'MMr fraction']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_to_frac_AT_MTD_short_a_h',
-                                 r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                 figure_path('results_model_nr_to_frac'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 Weaker IHs compared to the original situation"""
@@ -1293,19 +1336,28 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     df_total_WMMd = number_to_fractions(df_total_WMMd)
     df_total_comb = number_to_fractions(df_total_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_to_frac_switch_GF_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_to_frac_switch_WMMd_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_to_frac_switch_comb_IH_weak_a_h.csv',
-                                            r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_to_frac_continuous_GF_IH_weak_a_h.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_to_frac_continuous_WMMd_IH_weak_a_h.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_to_frac_continuous_comb_IH_weak_a_h.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1363,8 +1415,8 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     legend_labels = ['OC fraction', 'OB fraction', 'MMd fraction', 'MMr fraction']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_to_frac_AT_MTD_weak_a_h',
-                                 r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                 figure_path('results_model_nr_to_frac'))
+    show()
 
 """ Figure to determine the best WMMd IH value """
 def Figure_best_WMMd_IH():
@@ -1399,19 +1451,28 @@ def Figure_best_WMMd_IH():
     print("Optimal value for the WMMd IH:", float(optimal_WMMd_IH[0]),
                                         ', gives tumour number:', result.fun)
 
-    # Make a dictionary
-    dict_nr_to_frac_tumour = {}
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 60,
+                        60), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(60, 200, 140)
+
+    # Scan the WMMd_inhibitor values, first coarse and then dense close to the
+    # minimum and kinks, the values are integrated like in the function that
+    # is minimised
+    dict_nr_to_frac_tumour = adaptive_scan(lambda values: scan_nr(values,
+                'WMMd_inhibitor', y[-1], t_over, growth_rates,
+                decay_rates, matrix, fractions = True,
+                equilibrium = False), 0, 0.8)
 
-    # Loop over the different WMMd_inhibitor values
-    for WMMd_inhibitor in range(800):
-        WMMd_inhibitor = WMMd_inhibitor/1000
-        nr_to_frac_tumour = minimal_tumour_nr_to_frac_WMMd_IH(WMMd_inhibitor,
-                nOC, nOB, nMMd, nMMr, growth_rates, decay_rates, matrix, False)
-        dict_nr_to_frac_tumour[WMMd_inhibitor] = nr_to_frac_tumour
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix': matrix, 'WMMd_IH_start': WMMd_IH_start}
 
     # Save the data
     save_dictionary(dict_nr_to_frac_tumour,
-            r'..\data\data_model_nr_to_frac\dict_cell_nr_to_frac_WMMd_IH.csv')
+         data_path('data_model_nr_to_frac', 'dict_cell_nr_to_frac_WMMd_IH.csv'),
+                                                                       metadata)
 
     # Make lists of the keys and the values
     WMM_IH = list(dict_nr_to_frac_tumour.keys())
@@ -1425,8 +1486,8 @@ def Figure_best_WMMd_IH():
     plt.grid(True)
     plt.tight_layout()
     save_Figure(plt, 'line_plot_cell_nr_to_frac_change_WMMd_IH',
-                                 r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                 figure_path('results_model_nr_to_frac'))
+    show()
 
 
 """ Figure to determine the best b_OC_MMd value """
@@ -1462,21 +1523,28 @@ def Figure_best_b_OC_MMd():
     print("Optimal value for b_OC_MMd:", float(optimal_b_OC_MMd[0]),
                                             'gives tumour fration:', result.fun)
 
-    # Make a dictionary
-    dict_nr_to_frac_tumour_GF = {}
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 70,
+                        70), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(70, 200, 140)
 
-    # Loop over all the b_OC_MMd values
-    for b_OC_MMd in range(800):
-        b_OC_MMd = b_OC_MMd/1000
+    # Scan the b_OC_MMd values, first coarse and then dense close to the
+    # minimum and kinks, the values are integrated like in the function that
+    # is minimised
+    dict_nr_to_frac_tumour_GF = adaptive_scan(lambda values: scan_nr(values,
+                'b_OC_MMd', y[-1], t_over, growth_rates,
+                decay_rates, matrix, fractions = True,
+                equilibrium = False), 0, 0.8)
 
-        # Determine the total MM number
-        nr_to_frac_tumour = minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd, nOC, nOB,
-                            nMMd, nMMr, growth_rates, decay_rates, matrix, False)
-        dict_nr_to_frac_tumour_GF[b_OC_MMd] = nr_to_frac_tumour
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix': matrix, 'b_OC_MMd_start': b_OC_MMd_start}
 
     # Save the data
     save_dictionary(dict_nr_to_frac_tumour_GF,
-             r'..\data\data_model_nr_to_frac\dict_cell_nr_to_frac_b_OC_MMd.csv')
+        data_path('data_model_nr_to_frac', 'dict_cell_nr_to_frac_b_OC_MMd.csv'),
+                                                                       metadata)
 
     # Make a list of the keys and one of the values
     b_OC_MMd_values = list(dict_nr_to_frac_tumour_GF.keys())
@@ -1489,8 +1557,8 @@ def Figure_best_b_OC_MMd():
     plt.title(r'MM fraction for different $b_{OC, MMd}$ values')
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_nr_to_frac_change_b_OC_MMd',
-                                r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                figure_path('results_model_nr_to_frac'))
+    show()
 
 
 """ 3D plot showing the best IH holiday and administration periods"""
@@ -1539,9 +1607,17 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
     df_holiday_GF_IH = dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates,
                                 decay_rates, matrix_no_GF_IH, matrix_GF_IH)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_holiday_GF_IH, 'df_cell_nr_to_frac_best_MMd_GH_IH_holiday.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
     # Determine the axis values
     X_GF_IH, Y_GF_IH, Z_GF_IH = x_y_z_axis_values_3d_plot(df_holiday_GF_IH,
@@ -1553,7 +1629,7 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_W_IH, 'df_cell_nr_to_frac_best_WMMd_IH_holiday.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
     # Determine the axis values
     X_W_IH, Y_W_IH, Z_W_IH = x_y_z_axis_values_3d_plot(df_holiday_W_IH, 'W IH')
@@ -1564,7 +1640,7 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_nr_to_frac_best_comb_IH_holiday.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
     # Determine the axis values
     X_comb, Y_comb, Z_comb = x_y_z_axis_values_3d_plot(df_holiday_comb,
@@ -1631,8 +1707,8 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
 
     # Add a color bar
     save_Figure(fig, '3d_plot_MM_nr_to_frac_best_IH_h_a_periods',
-                                r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                figure_path('results_model_nr_to_frac'))
+    show()
 
 
 """ 3D plot showing the best IH strengths """
@@ -1698,9 +1774,14 @@ def Figure_3D_MM_nr_to_frac_MMd_IH_strength():
 
             df_holiday = combine_dataframes(df_holiday, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Save the data
     save_dataframe(df_holiday, 'df_cell_nr_to_frac_best_comb_IH_strength.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
 
     # Find the drug administration and holiday period causing the lowest MM number
@@ -1752,8 +1833,8 @@ def Figure_3D_MM_nr_to_frac_MMd_IH_strength():
     color_bar.set_label('MM fraction')
 
     save_Figure(fig, '3d_plot_MM_nr_to_frac_best_IH_strength',
-                                r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                figure_path('results_model_nr_to_frac'))
+    show()
 
 
 """ Figure with a longer IH administration than holiday and the other way around"""
@@ -1808,11 +1889,19 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     df_total_switch_1 = number_to_fractions(df_total_switch_1)
     df_total_switch_2 = number_to_fractions(df_total_switch_2)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                't_steps_no_drug': t_steps_no_drug, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'growth_rates': growth_rates,
+                'decay_rates': decay_rates, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH_half': matrix_GF_IH_half,
+                'WMMd_inhibitor_half': WMMd_inhibitor_half}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_nr_to_frac_short_a_long_h_MMd_IH.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_nr_to_frac_long_a_short_h_MMd_IH.csv.csv',
-                                             r'..\data\data_model_nr_to_frac')
+                                   data_path('data_model_nr_to_frac'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(1, 2, figsize=(16, 6))
@@ -1843,8 +1932,8 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     axs[1].grid(True)
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_nr_to_frac_diff_h_and_a_MMd_IH',
-                                 r'..\visualisation\results_model_nr_to_frac')
-    plt.show()
+                                 figure_path('results_model_nr_to_frac'))
+    show()
 
 if __name__ == "__main__":
     main()
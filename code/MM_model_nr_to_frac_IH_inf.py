@@ -27,12 +27,22 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.integrate import odeint
 import csv
-from scipy.optimize import minimize
-from mpl_toolkits.mplot3d import Axes3D
 import doctest
+from MM_cache import cached
+from MM_parameters import derive_matrix, parameter_set_objective
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_scan import adaptive_scan, scan_nr
+from MM_lazy import lazy_import, lazy_function
+from MM_checkpoint import checkpoint_sweep
+
+# Import the plotting and optimisation libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+minimize = lazy_function('scipy.optimize', 'minimize')
 
 def main():
     # Do doc tests
@@ -435,41 +445,40 @@ def optimise_matrix():
 
     return matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb
 
-def save_dataframe(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_dataframe(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The dataframe containing the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
-def save_dictionary(dictionary, file_path):
-    """ Function that saves a dictionary as csv file.
+def save_dictionary(dictionary, file_path, metadata = None):
+    """ Function that saves a dictionary as binary (npz) file.
 
     Parameters:
     -----------
     dictionary: Dictionary
         The dictionary containing the collected data.
     file_path: String
-        The name of the csv file and the path where the dictionary will be saved.
+        The name of the file and the path where the dictionary will be
+        saved, the .csv extension is replaced by the extension of the
+        storage format (MM_storage.py).
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-
-        # Create a header
-        writer.writerow(['Key', 'Value'])
-
-        # Loop over the rows
-        for key, value in dictionary.items():
-            writer.writerow([str(key), str(value)])
+    MM_writer.write(MM_storage.save_dictionary, dictionary, file_path,
+                                                                    metadata)
 
 def save_optimised_results(results, file_path):
     """ Function that saves the results of the optimised function as csv file.
@@ -492,6 +501,8 @@ def save_optimised_results(results, file_path):
             "Optimal MM frac": optimal_value, 'nr iterations': number_iterations,
             'nr evaluations': number_evaluations}]
 
+    # Make the folder when it does not exist (for example in a new output root)
+    os.makedirs(os.path.dirname(file_path), exist_ok = True)
     with open(file_path, 'w', newline='') as csvfile:
 
         # Create header names
@@ -517,7 +528,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def number_to_fractions(dataframe):
     """ Function that converts the numbers in a dataframe to a fractions
@@ -1587,6 +1601,7 @@ def switch_dataframe_W_WandGF_GF_h(n_rounds, t_steps_GF_IH, t_steps_WMMd_IH,
     return df_total_switch
 
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_3_situations(t_steps_IH_strength, function_order,
                 nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
                 decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor):
@@ -1655,6 +1670,7 @@ def minimal_tumour_nr_to_frac_t_3_situations(t_steps_IH_strength, function_order
     return float(average_MM_fraction)
 
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_3_situations_IH(t_steps_IH_strength,
         function_order, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
         decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH):
@@ -1702,7 +1718,7 @@ def minimal_tumour_nr_to_frac_t_3_situations_IH(t_steps_IH_strength,
     # Unpack the values that should be optimised
     t_steps_GF_IH, t_steps_WMMd_IH, t_steps_no_drug, GF_IH,\
                                             WMMd_inhibitor = t_steps_IH_strength
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
     n_rounds = 50
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH
 
@@ -1720,6 +1736,7 @@ def minimal_tumour_nr_to_frac_t_3_situations_IH(t_steps_IH_strength,
 
     return float(average_MM_fraction)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_3_4_situations_IH(t_steps_IH_strength,
             function_order, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
             decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH):
@@ -1767,7 +1784,7 @@ def minimal_tumour_nr_to_frac_t_3_4_situations_IH(t_steps_IH_strength,
     # Unpack the values that should be optimised
     t_steps_GF_IH, t_steps_WMMd_IH, t_steps_no_drug, GF_IH,\
                                             WMMd_inhibitor = t_steps_IH_strength
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
     n_rounds = 50
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + t_steps_no_drug
 
@@ -1785,6 +1802,7 @@ def minimal_tumour_nr_to_frac_t_3_4_situations_IH(t_steps_IH_strength,
 
     return float(average_MM_fraction)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_4_situations(t_steps, function_order, nOC, nOB,
         nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
         matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb, WMMd_inhibitor,
@@ -1857,6 +1875,7 @@ def minimal_tumour_nr_to_frac_t_4_situations(t_steps, function_order, nOC, nOB,
 
     return float(average_MM_fraction)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_4_sit_equal_IH(t_steps_IH_strength, function_order,
                 nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
                 decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, matrix_IH_comb):
@@ -1909,8 +1928,8 @@ def minimal_tumour_nr_to_frac_t_4_sit_equal_IH(t_steps_IH_strength, function_ord
                                             WMMd_inhibitor = t_steps_IH_strength
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH})
     n_rounds = 50
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
@@ -1929,6 +1948,7 @@ def minimal_tumour_nr_to_frac_t_4_sit_equal_IH(t_steps_IH_strength, function_ord
 
     return float(average_MM_fraction)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_4_situations_IH(t_steps_IH_strength,
             function_order, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
             decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH,
@@ -1987,8 +2007,8 @@ def minimal_tumour_nr_to_frac_t_4_situations_IH(t_steps_IH_strength,
     n_rounds = 50
 
     # Determine the round duration and the matrix values
-    matrix_GF_IH[2, 0] = 0.6 - GF_IH
-    matrix_IH_comb[2, 0] = 0.6 - GF_IH_comb
+    matrix_GF_IH = derive_matrix(matrix_GF_IH, {(2, 0): 0.6 - GF_IH})
+    matrix_IH_comb = derive_matrix(matrix_IH_comb, {(2, 0): 0.6 - GF_IH_comb})
     time_round = t_steps_GF_IH + t_steps_no_drug + t_steps_WMMd_IH + t_steps_comb
 
     # Create a dataframe of the numbers
@@ -2078,6 +2098,7 @@ def continuous_add_IH_df(start_therapy, end_generation, nOC, nOB, nMMd, nMMr,
 
     return df_total
 
+@cached
 def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
                 decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH,
                 WMMd_inhibitor = 0):
@@ -2086,20 +2107,30 @@ def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
     column_names = ['Generations no drug', 'Generations drug', 'MM fraction']
     df_MM_frac = pd.DataFrame(columns=column_names)
 
-    # Loop over all the t_step values for drug administration and drug holidays
-    for t_steps_no_drug in range(2, 22):
+    # Determine the MM fraction for all t_step values for drug administration
+    # and drug holidays, in a task of a checkpoint (MM_checkpoint.py) every
+    # finished value is saved
+    t_steps = [(t_steps_no_drug, t_steps_drug) for t_steps_no_drug in
+                                range(2, 22) for t_steps_drug in range(2, 22)]
 
-        for t_steps_drug in range(2, 22):
-            nr_to_frac_tumour = minimal_tumour_nr_to_frac_t_steps( t_steps_drug,
+    def nr_to_frac_tumour_t_steps(t_step):
+        t_steps_no_drug, t_steps_drug = t_step
+        return minimal_tumour_nr_to_frac_t_steps(t_steps_drug,
                         t_steps_no_drug, nOC, nOB, nMMd, nMMr, growth_rates,
                         growth_rates_IH, decay_rates, decay_rates_IH,
                         matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor)
 
-            # Add results to the dataframe
-            new_row_df = pd.DataFrame([{'Generations no drug':
+    nr_to_frac_tumours = checkpoint_sweep(t_steps, nr_to_frac_tumour_t_steps,
+            (nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
+                 decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor))
+
+    for (t_steps_no_drug, t_steps_drug), nr_to_frac_tumour in \
+                                            zip(t_steps, nr_to_frac_tumours):
+        # Add results to the dataframe
+        new_row_df = pd.DataFrame([{'Generations no drug':
                     int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
                                     'MM fraction': float(nr_to_frac_tumour)}])
-            df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
+        df_MM_frac = combine_dataframes(df_MM_frac, new_row_df)
 
     return (df_MM_frac)
 
@@ -2159,6 +2190,7 @@ def x_y_z_axis_values_3d_plot(dataframe, name):
     return (X_values, Y_values, Z_values)
 
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_t_steps(t_steps_drug, t_steps_no_drug, nOC,
             nOB, nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
             decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
@@ -2221,6 +2253,7 @@ def minimal_tumour_nr_to_frac_t_steps(t_steps_drug, t_steps_no_drug, nOC,
 
     return float(average_MM_fraction)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr,
                 growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
                 matrix, b_OC_MMd_array):
@@ -2291,8 +2324,8 @@ def minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr,
     if b_OC_MMd_array == True:
         b_OC_MMd = b_OC_MMd[0]
 
-    # Change the b_OC_MMd value to the specified value
-    matrix[2, 0]= b_OC_MMd
+    # Derive a matrix with the specified b_OC_MMd value
+    matrix = derive_matrix(matrix, {(2, 0): b_OC_MMd})
 
     # Set initial conditions
     t_over = np.linspace(70, 200, 140)
@@ -2312,6 +2345,7 @@ def minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr,
 
     return float(average_MM_fraction)
 
+@parameter_set_objective
 def minimal_tumour_nr_to_frac_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd,
             nMMr, growth_rates, growth_rates_IH, decay_rates,
             decay_rates_IH, matrix, WMMd_inhibitor_array):
@@ -2482,19 +2516,30 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
     df_total_WMMd = number_to_fractions(df_total_WMMd)
     df_total_comb = number_to_fractions(df_total_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_to_frac_switch_GF_IH.csv',
-                                r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_to_frac_switch_WMMd_IH.csv',
-                                r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_to_frac_switch_comb_IH.csv',
-                                r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_to_frac_continuous_GF_IH.csv',
-                                r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_to_frac_continuous_WMMd_IH.csv',
-                                r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_to_frac_continuous_comb_IH.csv',
-                                r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -2553,8 +2598,8 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=4,
                                                                 fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_to_frac_AT_MTD',
-                         r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                         figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 
 """ Figure to determine the difference between traditional and adaptive therapy
@@ -2641,19 +2686,30 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
     df_total_WMMd = number_to_fractions(df_total_WMMd)
     df_total_comb = number_to_fractions(df_total_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_IH_inf_switch_GF_IH_r.csv',
-                                            r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_IH_inf_switch_WMMd_IH_r.csv',
-                                            r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_IH_inf_switch_comb_IH_r.csv',
-                                            r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_IH_inf_continuous_GF_IH_r.csv',
-                                             r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_IH_inf_continuous_WMMd_IH_r.csv',
-                                             r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_IH_inf_continuous_comb_IH_r.csv',
-                                             r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -2731,8 +2787,8 @@ def Figure_continuous_MTD_vs_AT_realistic(n_switches, t_steps_drug):
     fig.legend(labels = legend_labels, loc='upper center', ncol=5,
                                                             fontsize='x-large')
     save_Figure(plt, 'line_plot_cell_nr_IH_inf_AT_MTD_r',
-                         r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                         figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy.
 Shorter holiday and administration periods compared to the original situation"""
@@ -2818,19 +2874,30 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     df_total_WMMd = number_to_fractions(df_total_WMMd)
     df_total_comb = number_to_fractions(df_total_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_to_frac_switch_GF_IH_short_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_to_frac_switch_WMMd_IH_short_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_to_frac_switch_comb_IH_short_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_to_frac_continuous_GF_IH_short_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_to_frac_continuous_WMMd_IH_short_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_to_frac_continuous_comb_IH_short_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -2888,8 +2955,8 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     legend_labels = ['OC fraction', 'OB fraction', 'MMd fraction', 'MMr fraction']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_to_frac_AT_MTD_short_a_h',
-                        r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                        figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 Weaker IHs compared to the original situation"""
@@ -2975,19 +3042,30 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     df_total_WMMd = number_to_fractions(df_total_WMMd)
     df_total_comb = number_to_fractions(df_total_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_nr_to_frac_switch_GF_IH_weak_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_nr_to_frac_switch_WMMd_IH_weak_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_nr_to_frac_switch_comb_IH_weak_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_GF, 'df_cell_nr_to_frac_continuous_GF_IH_weak_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_nr_to_frac_continuous_WMMd_IH_weak_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_comb, 'df_cell_nr_to_frac_continuous_comb_IH_weak_a_h.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -3045,8 +3123,8 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     legend_labels = ['OC fraction', 'OB fraction', 'MMd fraction', 'MMr fraction']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_nr_to_frac_AT_MTD_weak_a_h',
-                     r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                     figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 """ Figure to determine the best WMMd IH value """
 def Figure_best_WMMd_IH():
@@ -3084,20 +3162,30 @@ def Figure_best_WMMd_IH():
     print("Optimal value for the WMMd IH:", float(optimal_WMMd_IH[0]),
                                         ', gives tumour number:', result.fun)
 
-    # Make a dictionary
-    dict_nr_to_frac_tumour = {}
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 60,
+                        60), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(60, 200, 140)
 
-    # Loop over the different WMMd_inhibitor values
-    for WMMd_inhibitor in range(800):
-        WMMd_inhibitor = WMMd_inhibitor/1000
-        nr_to_frac_tumour = minimal_tumour_nr_to_frac_WMMd_IH(
-            WMMd_inhibitor, nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
-            decay_rates, decay_rates_IH, matrix, False)
-        dict_nr_to_frac_tumour[WMMd_inhibitor] = nr_to_frac_tumour
+    # Scan the WMMd_inhibitor values, first coarse and then dense close to the
+    # minimum and kinks, the values are integrated like in the function that
+    # is minimised
+    dict_nr_to_frac_tumour = adaptive_scan(lambda values: scan_nr(values,
+                'WMMd_inhibitor', y[-1], t_over, growth_rates_IH,
+                decay_rates_IH, matrix, fractions = True,
+                equilibrium = False), 0, 0.8)
+
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH, 'matrix': matrix,
+                'WMMd_IH_start': WMMd_IH_start}
 
     # Save the data
     save_dictionary(dict_nr_to_frac_tumour,
-        r'..\data\data_model_nr_to_frac_IH_inf\dict_cell_nr_to_frac_WMMd_IH.csv')
+        data_path('data_model_nr_to_frac_IH_inf',
+                                  'dict_cell_nr_to_frac_WMMd_IH.csv'), metadata)
 
     # Make lists of the keys and the values
     WMM_IH = list(dict_nr_to_frac_tumour.keys())
@@ -3111,8 +3199,8 @@ def Figure_best_WMMd_IH():
     plt.grid(True)
     plt.tight_layout()
     save_Figure(plt, 'line_plot_cell_nr_to_frac_change_WMMd_IH',
-                      r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                      figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 
 """ Figure to determine the best b_OC_MMd value """
@@ -3151,22 +3239,30 @@ def Figure_best_b_OC_MMd():
     print("Optimal value for b_OC_MMd:", float(optimal_b_OC_MMd[0]),
                                             'gives tumour fration:', result.fun)
 
-    # Make a dictionary
-    dict_nr_to_frac_tumour_GF = {}
-
-    # Loop over all the b_OC_MMd values
-    for b_OC_MMd in range(800):
-        b_OC_MMd = b_OC_MMd/1000
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 70,
+                        70), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(70, 200, 140)
 
-        # Determine the total MM number
-        nr_to_frac_tumour = minimal_tumour_nr_to_frac_b_OC_MMd(b_OC_MMd,
-                    nOC, nOB, nMMd, nMMr, growth_rates, growth_rates_IH,
-                    decay_rates, decay_rates_IH,matrix, False)
-        dict_nr_to_frac_tumour_GF[b_OC_MMd] = nr_to_frac_tumour
+    # Scan the b_OC_MMd values, first coarse and then dense close to the
+    # minimum and kinks, the values are integrated like in the function that
+    # is minimised
+    dict_nr_to_frac_tumour_GF = adaptive_scan(lambda values: scan_nr(values,
+                'b_OC_MMd', y[-1], t_over, growth_rates_IH,
+                decay_rates_IH, matrix, fractions = True,
+                equilibrium = False), 0, 0.8)
+
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH, 'matrix': matrix,
+                'b_OC_MMd_start': b_OC_MMd_start}
 
     # Save the data
     save_dictionary(dict_nr_to_frac_tumour_GF,
-        r'..\data\data_model_nr_to_frac_IH_inf\dict_cell_nr_to_frac_b_OC_MMd.csv')
+        data_path('data_model_nr_to_frac_IH_inf',
+                                 'dict_cell_nr_to_frac_b_OC_MMd.csv'), metadata)
 
     # Make a list of the keys and one of the values
     b_OC_MMd_values = list(dict_nr_to_frac_tumour_GF.keys())
@@ -3179,8 +3275,8 @@ def Figure_best_b_OC_MMd():
     plt.title(r'MM fraction for different $b_{OC, MMd}$ values')
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_nr_to_frac_change_b_OC_MMd',
-                        r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                        figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 
 """ 3D plot showing the best IH holiday and administration periods"""
@@ -3232,9 +3328,19 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
                                 growth_rates_IH, decay_rates, decay_rates_IH,
                                 matrix_no_GF_IH, matrix_GF_IH)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_holiday_GF_IH, 'df_cell_nr_to_frac_best_MMd_GH_IH_holiday.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Determine the axis values
     X_GF_IH, Y_GF_IH, Z_GF_IH = x_y_z_axis_values_3d_plot(df_holiday_GF_IH,
@@ -3247,7 +3353,7 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_W_IH, 'df_cell_nr_to_frac_best_WMMd_IH_holiday.csv',
-                                     r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Determine the axis values
     X_W_IH, Y_W_IH, Z_W_IH = x_y_z_axis_values_3d_plot(df_holiday_W_IH, 'W IH')
@@ -3259,7 +3365,7 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_nr_to_frac_best_comb_IH_holiday.csv',
-                                     r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Determine the axis values
     X_comb, Y_comb, Z_comb = x_y_z_axis_values_3d_plot(df_holiday_comb,
@@ -3326,8 +3432,8 @@ def Figure_3D_MM_nr_to_frac_IH_add_and_holiday():
 
     # Add a color bar
     save_Figure(fig, '3d_plot_MM_nr_to_frac_best_IH_h_a_periods',
-                        r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                        figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 
 """ 3D plot showing the best IH strengths """
@@ -3396,9 +3502,16 @@ def Figure_3D_MM_nr_to_frac_MMd_IH_strength():
 
             df_holiday = combine_dataframes(df_holiday, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Save the data
     save_dataframe(df_holiday, 'df_cell_nr_to_frac_best_comb_IH_strength.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
 
     # Find the drug administration and holiday period causing the lowest MM number
@@ -3450,8 +3563,8 @@ def Figure_3D_MM_nr_to_frac_MMd_IH_strength():
     color_bar.set_label('MM fraction')
 
     save_Figure(fig, '3d_plot_MM_nr_to_frac_best_IH_strength',
-                    r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                    figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 
 """ Figure with a longer IH administration than holiday and the other way around"""
@@ -3510,11 +3623,21 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     df_total_switch_1 = number_to_fractions(df_total_switch_1)
     df_total_switch_2 = number_to_fractions(df_total_switch_2)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                't_steps_no_drug': t_steps_no_drug, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'growth_rates': growth_rates,
+                'decay_rates': decay_rates, 'growth_rates_IH': growth_rates_IH,
+                'decay_rates_IH': decay_rates_IH,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH_half': matrix_GF_IH_half,
+                'WMMd_inhibitor_half': WMMd_inhibitor_half}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_nr_to_frac_short_a_long_h_MMd_IH.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_nr_to_frac_long_a_short_h_MMd_IH.csv.csv',
-                                    r'..\data\data_model_nr_to_frac_IH_inf')
+                            data_path('data_model_nr_to_frac_IH_inf'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(1, 2, figsize=(16, 6))
@@ -3545,8 +3668,8 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     axs[1].grid(True)
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_nr_to_frac_diff_h_and_a_MMd_IH',
-                        r'..\visualisation\results_model_nr_to_frac_IH_inf')
-    plt.show()
+                        figure_path('results_model_nr_to_frac_IH_inf'))
+    show()
 
 
 """optimise IH administration duration and holiday duration for MMd GF IH -> WMMd
@@ -3590,7 +3713,7 @@ def minimise_MM_GF_W_h():
 
     # Save the results
     save_optimised_results(result,
-                    r'..\data\data_model_nr_to_frac_IH_inf\optimise_GF_W_h.csv')
+               data_path('data_model_nr_to_frac_IH_inf', 'optimise_GF_W_h.csv'))
 
 
 """Optimise IH administration duration and holiday duration for WMMd IH -> MMd GF
@@ -3632,7 +3755,7 @@ def minimise_MM_W_GF_h():
 
     # Save the results
     save_optimised_results(result,
-                    r'..\data\data_model_nr_to_frac_IH_inf\optimise_W_GF_h.csv')
+               data_path('data_model_nr_to_frac_IH_inf', 'optimise_W_GF_h.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -3676,7 +3799,7 @@ def minimise_MM_GF_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            '..\data\data_model_nr_to_frac_IH_inf\optimise_GF_W_h_IH.csv')
+            data_path('data_model_nr_to_frac_IH_inf', 'optimise_GF_W_h_IH.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for
 WMMd IH -> MMd GF IH -> holiday """
@@ -3719,7 +3842,7 @@ def minimise_MM_W_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            '..\data\data_model_nr_to_frac_IH_inf\optimise_W_GF_h_IH.csv')
+            data_path('data_model_nr_to_frac_IH_inf', 'optimise_W_GF_h_IH.csv'))
 
 
 """Optimise IH administration duration, holiday duration and strength for
@@ -3763,7 +3886,7 @@ def minimise_MM_GF_h_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            '..\data\data_model_nr_to_frac_IH_inf\optimise_GF_h_W_h_IH.csv')
+          data_path('data_model_nr_to_frac_IH_inf', 'optimise_GF_h_W_h_IH.csv'))
 
 """Optimise IH administration duration, holiday duration and strength for
 WMMd IH -> holiday -> MMd GF IH -> holiday """
@@ -3805,7 +3928,7 @@ def minimise_MM_W_h_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-            '..\data\data_model_nr_to_frac_IH_inf\optimise_W_h_GF_h_IH.csv')
+          data_path('data_model_nr_to_frac_IH_inf', 'optimise_W_h_GF_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH ->
 IH combination -> MMd GF IH -> holiday"""
@@ -3854,7 +3977,7 @@ def minimise_MM_W_comb_GF_h():
 
     # Save the results
     save_optimised_results(result,
-        '..\data\data_model_nr_to_frac_IH_inf\optimise_W_comb_GF_h.csv')
+        data_path('data_model_nr_to_frac_IH_inf', 'optimise_W_comb_GF_h.csv'))
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
 IH combination -> WMMd IH -> holiday"""
@@ -3902,7 +4025,7 @@ def minimise_MM_GF_comb_W_h():
 
     # Save the results
     save_optimised_results(result,
-            '..\data\data_model_nr_to_frac_IH_inf\optimise_GF_comb_W_h.csv')
+          data_path('data_model_nr_to_frac_IH_inf', 'optimise_GF_comb_W_h.csv'))
 
 """Optimise IH administration duration and holiday duration for WMMd IH->
 IH combination -> MMd GF IH -> holiday"""
@@ -3951,7 +4074,7 @@ def minimise_MM_W_comb_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-        '..\data\data_model_nr_to_frac_IH_inf\optimise_W_comb_GF_h_IH.csv')
+       data_path('data_model_nr_to_frac_IH_inf', 'optimise_W_comb_GF_h_IH.csv'))
 
 """Optimise IH administration duration and holiday duration for MMd GF IH->
 IH combination -> WMMd IH -> holiday"""
@@ -4000,7 +4123,7 @@ def minimise_MM_GF_comb_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-        '..\data\data_model_nr_to_frac_IH_inf\optimise_GF_comb_W_h_IH.csv')
+       data_path('data_model_nr_to_frac_IH_inf', 'optimise_GF_comb_W_h_IH.csv'))
 
 def minimise_MM_W_WandGF_GF_h_IH():
     """Function that determines the best IH administration durations and holliday
@@ -4044,7 +4167,7 @@ def minimise_MM_W_WandGF_GF_h_IH():
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_to_frac_IH_inf\optimise_W_WandGF_GF_h_IH.csv')
+     data_path('data_model_nr_to_frac_IH_inf', 'optimise_W_WandGF_GF_h_IH.csv'))
 
 
 def minimise_MM_GF_GFandW_W_h_IH():
@@ -4090,7 +4213,7 @@ def minimise_MM_GF_GFandW_W_h_IH():
 
     # Save the results
     save_optimised_results(result,
-        r'..\data\data_model_nr_to_frac_IH_inf\optimise_GF_WandGF_W_h_IH.csv')
+     data_path('data_model_nr_to_frac_IH_inf', 'optimise_GF_WandGF_W_h_IH.csv'))
 
 if __name__ == "__main__":
     main()
@@ -26,12 +26,22 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
 from scipy.integrate import odeint
-import csv
-from scipy.optimize import minimize
-from mpl_toolkits.mplot3d import Axes3D
 import doctest
+from MM_cache import cached
+from MM_parameters import derive_matrix, parameter_set_objective
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_scan import adaptive_scan, scan_nr
+from MM_steady_state import fixed_points_nr, unique_stable_fixed_point
+from MM_lazy import lazy_import, lazy_function
+from MM_checkpoint import checkpoint_sweep
+
+# Import the plotting and optimisation libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+minimize = lazy_function('scipy.optimize', 'minimize')
 
 
 def main():
@@ -348,41 +358,40 @@ def combine_dataframes(df_1, df_2):
 
     return(combined_df)
 
-def save_dataframe(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_dataframe(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The dataframe containing the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
-def save_dictionary(dictionary, file_path):
-    """ Function that saves a dictionary as csv file.
+def save_dictionary(dictionary, file_path, metadata = None):
+    """ Function that saves a dictionary as binary (npz) file.
 
     Parameters:
     -----------
     dictionary: Dictionary
         The dictionary containing the collected data.
     file_path: String
-        The name of the csv file and the path where the dictionary will be saved.
+        The name of the file and the path where the dictionary will be
+        saved, the .csv extension is replaced by the extension of the
+        storage format (MM_storage.py).
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-
-        # Create a header
-        writer.writerow(['Key', 'Value'])
-
-        # Loop over the rows
-        for key, value in dictionary.items():
-            writer.writerow([str(key), str(value)])
+    MM_writer.write(MM_storage.save_dictionary, dictionary, file_path,
+                                                                    metadata)
 
 def save_Figure(figure, file_name, folder_path):
     """Save the Figure to a specific folder.
@@ -397,7 +406,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def make_part_df(dataframe, start_time, time, growth_rates, decay_rates, matrix,
                 WMMd_inhibitor = 0):
@@ -674,6 +686,7 @@ def continuous_add_IH_df(end_generation, nOC, nOB, nMMd, nMMr, growth_rates,
 
     return df_total
 
+@cached
 def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, decay_rates,
                             matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor = 0):
     """ Function that create a dataframe with the average MM number for
@@ -711,22 +724,33 @@ def dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates, decay_rates,
     column_names = ['Generations no drug', 'Generations drug', 'MM number']
     df_MM_nr = pd.DataFrame(columns=column_names)
 
-    # Loop over all the t_step values for drug administration and drug holidays
-    for t_steps_no_drug in range(2, 22):
+    # Determine the MM number for all t_step values for drug administration
+    # and drug holidays, in a task of a checkpoint (MM_checkpoint.py) every
+    # finished value is saved
+    t_steps = [(t_steps_no_drug, t_steps_drug) for t_steps_no_drug in
+                                range(2, 22) for t_steps_drug in range(2, 22)]
 
-        for t_steps_drug in range(2, 22):
-            numb_tumour = minimal_tumour_numb_t_steps(t_steps_drug,
+    def numb_tumour_t_steps(t_step):
+        t_steps_no_drug, t_steps_drug = t_step
+        return minimal_tumour_numb_t_steps(t_steps_drug,
                     t_steps_no_drug, nOC, nOB, nMMd, nMMr, growth_rates,
                     decay_rates, matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor)
 
-            # Add results to the dataframe
-            new_row_df = pd.DataFrame([{'Generations no drug': \
+    numb_tumours = checkpoint_sweep(t_steps, numb_tumour_t_steps, (nOC, nOB,
+                         nMMd, nMMr, growth_rates, decay_rates, matrix_no_GF_IH,
+                                                  matrix_GF_IH, WMMd_inhibitor))
+
+    for (t_steps_no_drug, t_steps_drug), numb_tumour in zip(t_steps,
+                                                            numb_tumours):
+        # Add results to the dataframe
+        new_row_df = pd.DataFrame([{'Generations no drug': \
                     int(t_steps_no_drug), 'Generations drug': int(t_steps_drug),
                                              'MM number': float(numb_tumour)}])
-            df_MM_nr = combine_dataframes(df_MM_nr, new_row_df)
+        df_MM_nr = combine_dataframes(df_MM_nr, new_row_df)
 
     return(df_MM_nr)
 
+@parameter_set_objective
 def minimal_tumour_numb_t_steps(t_steps_drug, t_steps_no_drug, nOC, nOB, nMMd,
                                 nMMr, growth_rates, decay_rates, matrix_no_GF_IH,
                                 matrix_GF_IH, WMMd_inhibitor = 0):
@@ -834,8 +858,10 @@ def x_y_z_axis_values_3d_plot(dataframe, name):
 
     return (X_values, Y_values, Z_values)
 
+@parameter_set_objective
 def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
-                                        decay_rates, matrix, b_OC_MMd_array):
+                                        decay_rates, matrix, b_OC_MMd_array,
+                                                        equilibrium = True):
     """Function that determines the number of the population being MM for a
     specific b_OC_MMd value.
 
@@ -859,6 +885,10 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
         4x4 matrix containing the interaction factors.
     b_OC_MMd_array: Float
         If True b_OC_MMd is an array and if False b_OC_MMd is a float.
+    equilibrium: Bool
+        If True the MM number is taken from the stable fixed point of the model
+        during the drug period when there is exactly one, otherwise the model
+        is integrated.
 
     Returns:
     --------
@@ -872,10 +902,34 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
     ...    [0.3, 0.0, -0.3, -0.3],
     ...    [0.6, 0.0, 0.2, 0.0],
     ...    [0.55, 0.0, -0.6, 0.4]])
-    >>> minimal_tumour_numb_b_OC_MMd(0.4, 20, 30, 20, 5,[0.8, 1.2, 0.3, 0.3],
-    ...                                     [0.9, 0.08, 0.2, 0.1], matrix, False)
-    26.318660931596057
+    >>> round(minimal_tumour_numb_b_OC_MMd(0.4, 20, 30, 20, 5,
+    ...     [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], matrix, False), 4)
+    26.3432
+    >>> from MM_parameters import ParameterSet
+    >>> parameters = ParameterSet(nOC = 20, nOB = 30, nMMd = 20, nMMr = 5,
+    ...     growth_rates = [0.8, 1.2, 0.3, 0.3], decay_rates = [0.9, 0.08, 0.2,
+    ...     0.1], matrix = matrix, b_OC_MMd_array = False)
+    >>> MM_number = minimal_tumour_numb_b_OC_MMd(0.4, 20, 30, 20, 5,
+    ...             [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], matrix, False)
+    >>> minimal_tumour_numb_b_OC_MMd(0.4, parameters) == MM_number
+    True
+    >>> round(minimal_tumour_numb_b_OC_MMd(0.4, 20, 30, 20, 5,
+    ...             [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], matrix, False,
+    ...             equilibrium = False), 4)
+    26.3187
     """
+    # Change b_OC_MMd to a float if it is an array
+    if b_OC_MMd_array == True:
+        b_OC_MMd = b_OC_MMd[0]
+
+    # Determine the MM number in the stable fixed point if there is only one
+    if equilibrium == True:
+        matrix_drug = derive_matrix(matrix, {(2, 0): b_OC_MMd})
+        df_fixed_points = fixed_points_nr(growth_rates, decay_rates, matrix_drug)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total nMM'])
+
     # Set the initial conditions
     y0 = [nOC, nOB, nMMd, nMMr]
     parameters = (growth_rates, decay_rates, matrix)
@@ -892,12 +946,8 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
     nMMd = df_1['nMMd'].iloc[-1]
     nMMr = df_1['nMMr'].iloc[-1]
 
-    # Change b_OC_MMd to a float if it is an array
-    if b_OC_MMd_array == True:
-        b_OC_MMd = b_OC_MMd[0]
-
-    # Change the b_OC_MMd value to the specified value
-    matrix[2, 0]= b_OC_MMd
+    # Derive a matrix with the specified b_OC_MMd value
+    matrix = derive_matrix(matrix, {(2, 0): b_OC_MMd})
 
     # Set initial conditions
     t_over = np.linspace(70, 200, 140)
@@ -914,8 +964,10 @@ def minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd, nMMr, growth_rates,
 
     return float(last_MM_number)
 
+@parameter_set_objective
 def minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd, nMMr,
-                    growth_rates, decay_rates, matrix, WMMd_inhibitor_array):
+                    growth_rates, decay_rates, matrix, WMMd_inhibitor_array,
+                                                        equilibrium = True):
     """Function that determines the number of the population being MM for a
     specific WMMd drug inhibitor value.
 
@@ -939,6 +991,10 @@ def minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd, nMMr,
         4x4 matrix containing the interaction factors.
     WMMd_inhibitor_array: Float
         If True WMMd_inhibitor is an array and if False WMMd_inhibitor is a float.
+    equilibrium: Bool
+        If True the MM number is taken from the stable fixed point of the model
+        during the drug period when there is exactly one, otherwise the model
+        is integrated.
 
     Returns:
     --------
@@ -955,14 +1011,26 @@ def minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd, nMMr,
     ...    [0.3, 0.0, -0.3, -0.3],
     ...    [0.6, 0.0, 0.2, 0.0],
     ...    [0.55, 0.0, -0.6, 0.4]])
-    >>> minimal_tumour_numb_WMMd_IH(0.3, 20, 30, 20, 5, [0.8, 1.2, 0.3, 0.3],
-    ...                                 [0.9, 0.08, 0.2, 0.1], matrix, False)
-    28.440744908435057
+    >>> round(minimal_tumour_numb_WMMd_IH(0.3, 20, 30, 20, 5,
+    ...     [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], matrix, False), 4)
+    28.4472
+    >>> round(minimal_tumour_numb_WMMd_IH(0.3, 20, 30, 20, 5,
+    ...             [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], matrix, False,
+    ...             equilibrium = False), 4)
+    28.4407
     """
     # Determine if WMMd_inhibitor is an array
     if WMMd_inhibitor_array == True:
         WMMd_inhibitor = WMMd_inhibitor[0]
 
+    # Determine the MM number in the stable fixed point if there is only one
+    if equilibrium == True:
+        df_fixed_points = fixed_points_nr(growth_rates, decay_rates, matrix,
+                                                                WMMd_inhibitor)
+        fixed_point = unique_stable_fixed_point(df_fixed_points)
+        if fixed_point is not None:
+            return float(fixed_point['total nMM'])
+
     # Set initial conditions
     t = np.linspace(0, 60, 60)
     y0 = [nOC, nOB, nMMd, nMMr]
@@ -1064,19 +1132,28 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
             decay_rates, matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_numb_switch_GF_IH.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_numb_switch_WMMd_IH.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_numb_switch_comb_IH.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_GF, 'df_cell_numb_continuous_GF_IH.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_numb_continuous_WMMd_IH.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_comb, 'df_cell_numb_continuous_comb_IH.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1135,8 +1212,8 @@ def Figure_continuous_MTD_vs_AT(n_switches, t_steps_drug):
                                                                 'Number of MMr']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_numb_AT_MTD',
-                                   r'..\visualisation\results_model_numbers')
-    plt.show()
+                                   figure_path('results_model_numbers'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy.
 Shorter holiday and administration periods compared to the original situation"""
@@ -1207,19 +1284,28 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
     df_total_comb = continuous_add_IH_df(260, nOC, nOB, nMMd, nMMr, growth_rates,
             decay_rates, matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_numb_switch_GF_IH_short_a_h.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_numb_switch_WMMd_IH_short_a_h.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_numb_switch_comb_IH_short_a_h.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_GF, 'df_cell_numb_continuous_GF_IH_short_a_h.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_numb_continuous_WMMd_IH_short_a_h.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_comb, 'df_cell_numb_continuous_comb_IH_short_a_h.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1278,8 +1364,8 @@ def Figure_continuous_MTD_vs_AT_short_a_h(n_switches, t_steps_drug):
                                                                 'Number of MMr']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_numb_AT_MTD_short_a_h',
-                                 r'..\visualisation\results_model_numbers')
-    plt.show()
+                                 figure_path('results_model_numbers'))
+    show()
 
 """ Figure to determine the difference between traditional and adaptive therapy
 Weaker IHs compared to the original situation"""
@@ -1350,19 +1436,28 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
     df_total_comb = continuous_add_IH_df(260, nOC, nOB, nMMd, nMMr, growth_rates,
             decay_rates, matrix_no_GF_IH, matrix_IH_comb, WMMd_inhibitor_comb)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_total_switch_GF, 'df_cell_numb_switch_GF_IH_weak_a_h.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_switch_WMMd, 'df_cell_numb_switch_WMMd_IH_weak_a_h.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_switch_comb, 'df_cell_numb_switch_comb_IH_weak_a_h.csv',
-                                            r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_GF, 'df_cell_numb_continuous_GF_IH_weak_a_h.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_WMMd, 'df_cell_numb_continuous_WMMd_IH_weak_a_h.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_comb, 'df_cell_numb_continuous_comb_IH_weak_a_h.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(2, 3, figsize=(20, 9))
@@ -1421,8 +1516,8 @@ def Figure_continuous_MTD_vs_AT_weak_a_h(n_switches, t_steps_drug):
                                                                 'Number of MMr']
     fig.legend(labels = legend_labels, loc='upper center', ncol=4, fontsize='large')
     save_Figure(plt, 'line_plot_cell_numb_AT_MTD_weak_a_h',
-                                 r'..\visualisation\results_model_numbers')
-    plt.show()
+                                 figure_path('results_model_numbers'))
+    show()
 
 
 """ 3D plot showing the best IH holiday and administration periods"""
@@ -1467,13 +1562,26 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
     # WMMd inhibitor effect when only WMMd IH is present
     WMMd_inhibitor = 0.38
 
+    # Parameter values that are saved with the data
+    parameters = {'y0': [nOC, nOB, nMMd, nMMr], 'growth_rates': growth_rates,
+        'decay_rates': decay_rates, 'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Create a dataframe
     df_holiday_GF_IH = dataframe_3D_plot(nOC, nOB, nMMd, nMMr, growth_rates,
              decay_rates, matrix_no_GF_IH, matrix_GF_IH)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH': matrix_GF_IH, 'matrix_IH_comb': matrix_IH_comb,
+                'WMMd_inhibitor_comb': WMMd_inhibitor_comb,
+                'WMMd_inhibitor': WMMd_inhibitor}
+
     # Save the data
     save_dataframe(df_holiday_GF_IH, 'df_cell_numb_best_MMd_GH_IH_holiday.csv',
-                                             r'..\data\data_model_numbers')
+                data_path('data_model_numbers'), dict(parameters,
+                matrix_IH = matrix_GF_IH, WMMd_inhibitor = 0), metadata)
 
     # Determine the axis values
     X_GF_IH, Y_GF_IH, Z_GF_IH = x_y_z_axis_values_3d_plot(df_holiday_GF_IH,
@@ -1485,7 +1593,8 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_W_IH, 'df_cell_numb_best_WMMd_IH_holiday.csv',
-                                             r'..\data\data_model_numbers')
+                data_path('data_model_numbers'), dict(parameters,
+        matrix_IH = matrix_no_GF_IH, WMMd_inhibitor = WMMd_inhibitor), metadata)
 
     # Determine the axis values
     X_W_IH, Y_W_IH, Z_W_IH = x_y_z_axis_values_3d_plot(df_holiday_W_IH, 'W IH')
@@ -1496,7 +1605,9 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Save the data
     save_dataframe(df_holiday_comb, 'df_cell_numb_best_comb_IH_holiday.csv',
-                                             r'..\data\data_model_numbers')
+                data_path('data_model_numbers'), dict(parameters,
+                matrix_IH = matrix_IH_comb, WMMd_inhibitor = WMMd_inhibitor_comb),
+                                                                       metadata)
 
     # Determine the axis values
     X_comb, Y_comb, Z_comb = x_y_z_axis_values_3d_plot(df_holiday_comb,
@@ -1563,8 +1674,8 @@ def Figure_3D_MM_numb_IH_add_and_holiday():
 
     # Add a color bar
     save_Figure(fig, '3d_plot_MM_numb_best_IH_h_a_periods',
-                                r'..\visualisation\results_model_numbers')
-    plt.show()
+                                figure_path('results_model_numbers'))
+    show()
 
 
 """ 3D plot showing the best IH strengths """
@@ -1630,9 +1741,14 @@ def Figure_3D_MM_numb_MMd_IH_strength():
 
             df_holiday = combine_dataframes(df_holiday, new_row_df)
 
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix_no_GF_IH': matrix_no_GF_IH}
+
     # Save the data
     save_dataframe(df_holiday, 'df_cell_numb_best_comb_IH_strength.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
 
 
     # Find the drug administration and holiday period causing the lowest MM number
@@ -1684,8 +1800,8 @@ def Figure_3D_MM_numb_MMd_IH_strength():
     color_bar.set_label('Number of MM')
 
     save_Figure(fig, '3d_plot_MM_numb_best_IH_strength',
-                                r'..\visualisation\results_model_numbers')
-    plt.show()
+                                figure_path('results_model_numbers'))
+    show()
 
 
 """ Figure to determine the best WMMd IH value """
@@ -1721,19 +1837,25 @@ def Figure_best_WMMd_IH():
     print("Optimal value for the WMMd IH:", float(optimal_WMMd_IH[0]),
                                         ', gives tumour number:', result.fun)
 
-    # Make a dictionary
-    dict_numb_tumour = {}
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 60,
+                        60), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(60, 200, 140)
+
+    # Scan the WMMd_inhibitor values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_numb_tumour = adaptive_scan(lambda values: scan_nr(values,
+                'WMMd_inhibitor', y[-1], t_over, growth_rates,
+                decay_rates, matrix), 0, 0.8)
 
-    # Loop over the different WMMd_inhibitor values
-    for WMMd_inhibitor in range(800):
-        WMMd_inhibitor = WMMd_inhibitor/1000
-        numb_tumour = minimal_tumour_numb_WMMd_IH(WMMd_inhibitor, nOC, nOB, nMMd,
-                                nMMr, growth_rates, decay_rates, matrix, False)
-        dict_numb_tumour[WMMd_inhibitor] = numb_tumour
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix': matrix, 'WMMd_IH_start': WMMd_IH_start}
 
     # Save the data
     save_dictionary(dict_numb_tumour,
-            r'..\data\data_model_numbers\dict_cell_numb_WMMd_IH.csv')
+        data_path('data_model_numbers', 'dict_cell_numb_WMMd_IH.csv'), metadata)
 
     # Make lists of the keys and the values
     WMM_IH = list(dict_numb_tumour.keys())
@@ -1747,8 +1869,8 @@ def Figure_best_WMMd_IH():
     plt.grid(True)
     plt.tight_layout()
     save_Figure(plt, 'line_plot_cell_numb_change_WMMd_IH',
-                                 r'..\visualisation\results_model_numbers')
-    plt.show()
+                                 figure_path('results_model_numbers'))
+    show()
 
 
 """ Figure to determine the best b_OC_MMd value """
@@ -1784,21 +1906,26 @@ def Figure_best_b_OC_MMd():
     print("Optimal value for b_OC_MMd:", float(optimal_b_OC_MMd[0]),
                                             'gives tumour number:', result.fun)
 
-    # Make a dictionary
-    dict_numb_tumour_GF = {}
+    # Determine the numbers after the period without drugs
+    y = odeint(model_dynamics, [nOC, nOB, nMMd, nMMr], np.linspace(0, 70,
+                        70), args = (growth_rates, decay_rates, matrix))
+    t_over = np.linspace(70, 200, 140)
 
-    # Loop over all the b_OC_MMd values
-    for b_OC_MMd in range(800):
-        b_OC_MMd = b_OC_MMd/1000
+    # Scan the b_OC_MMd values, first coarse and then dense close to the
+    # minimum and kinks
+    dict_numb_tumour_GF = adaptive_scan(lambda values: scan_nr(values,
+                'b_OC_MMd', y[-1], t_over, growth_rates,
+                decay_rates, matrix), 0, 0.8)
 
-        # Determine the total MM number
-        numb_tumour = minimal_tumour_numb_b_OC_MMd(b_OC_MMd, nOC, nOB, nMMd,
-                            nMMr, growth_rates, decay_rates, matrix, False)
-        dict_numb_tumour_GF[b_OC_MMd] = numb_tumour
+    # The parameters that are saved with the data
+    metadata = {'nOC': nOC, 'nOB': nOB, 'nMMd': nMMd, 'nMMr': nMMr,
+                'growth_rates': growth_rates, 'decay_rates': decay_rates,
+                'matrix': matrix, 'b_OC_MMd_start': b_OC_MMd_start}
 
     # Save the data
     save_dictionary(dict_numb_tumour_GF,
-                 r'..\data\data_model_numbers\dict_cell_numb_b_OC_MMd.csv')
+                 data_path('data_model_numbers', 'dict_cell_numb_b_OC_MMd.csv'),
+                                                                       metadata)
 
     # Make a list of the keys and one of the values
     b_OC_MMd_values = list(dict_numb_tumour_GF.keys())
@@ -1811,8 +1938,8 @@ def Figure_best_b_OC_MMd():
     plt.title(r'MM number for different $b_{OC, MMd}$ values')
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_numb_change_b_OC_MMd',
-                                r'..\visualisation\results_model_numbers')
-    plt.show()
+                                figure_path('results_model_numbers'))
+    show()
 
 
 """ Figure with a longer IH administration than holiday and the other way around"""
@@ -1863,11 +1990,19 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
             t_steps_no_drug[1], nOC, nOB, nMMd, nMMr, growth_rates, decay_rates,
             matrix_no_GF_IH, matrix_GF_IH_half, WMMd_inhibitor_half)
 
+    # The parameters that are saved with the data
+    metadata = {'n_switches': n_switches, 't_steps_drug': t_steps_drug,
+                't_steps_no_drug': t_steps_no_drug, 'nOC': nOC, 'nOB': nOB,
+                'nMMd': nMMd, 'nMMr': nMMr, 'growth_rates': growth_rates,
+                'decay_rates': decay_rates, 'matrix_no_GF_IH': matrix_no_GF_IH,
+                'matrix_GF_IH_half': matrix_GF_IH_half,
+                'WMMd_inhibitor_half': WMMd_inhibitor_half}
+
     # Save the data
     save_dataframe(df_total_switch_1, 'df_cell_numb_short_a_long_h_MMd_IH.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
     save_dataframe(df_total_switch_2, 'df_cell_numb_long_a_short_h_MMd_IH.csv.csv',
-                                             r'..\data\data_model_numbers')
+                                      data_path('data_model_numbers'), metadata)
 
     # Create a Figure
     fig, axs = plt.subplots(1, 2, figsize=(16, 6))
@@ -1896,8 +2031,8 @@ def Figure_duration_A_h_MMd_IH(n_switches, t_steps_drug, t_steps_no_drug):
     axs[1].grid(True)
     plt.grid(True)
     save_Figure(plt, 'line_plot_cell_numb_diff_h_and_a_MMd_IH',
-                                 r'..\visualisation\results_model_numbers')
-    plt.show()
+                                 figure_path('results_model_numbers'))
+    show()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,346 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code for the parameters of the models of the multiple myeloma (MM)
+              microenvironment. A parameter set stores the parameters
+              (interaction matrices, growth rates, decay rates, IH strengths...)
+              as tuples, so it can not be changed after it is made and it can be
+              hashed. The functions that are minimised (minimal_tumour_*) accept
+              a parameter set as their last input. Functions that need a changed
+              interaction matrix (for example with another b_OC_MMd value)
+              derive a new matrix instead of changing the matrix of the caller.
+              This makes the evaluations independent of the order in which they
+              are done, so they can be run in parallel or be cached. The start
+              values, rates and matrices of the optimisations of the number
+              model with IHs are given by number_parameters, so the model file,
+              the runs (MM_run.py) and the benchmarks (MM_benchmark.py) use the
+              same values.
+"""
+
+# Import the needed libraries
+import numpy as np
+import inspect
+import functools
+import doctest
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def freeze(value):
+    """Function that converts a parameter value to an immutable value.
+
+    Parameters:
+    -----------
+    value: Float, List or Numpy.ndarray
+        The parameter value.
+
+    Returns:
+    --------
+    frozen_value: Float, Int, String or Tuple
+        The parameter value as (nested) tuple of floats or as single value.
+
+    Example:
+    -----------
+    >>> freeze(np.array([[1, 2], [3, 4]]))
+    ((1.0, 2.0), (3.0, 4.0))
+    >>> freeze([0.8, 1.2])
+    (0.8, 1.2)
+    >>> freeze(0.3), freeze(np.int64(20))
+    (0.3, 20)
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, bool, int)) or value is None:
+        return value
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'biu':
+        value = value.astype(float)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(freeze(element) for element in value)
+    return float(value)
+
+class ParameterSet:
+    """Immutable and hashable set of named model parameters.
+
+    Example:
+    -----------
+    >>> parameters = ParameterSet(matrix = np.eye(2), WMMd_inhibitor = 0.3)
+    >>> parameters.WMMd_inhibitor
+    0.3
+    >>> parameters.matrix
+    ((1.0, 0.0), (0.0, 1.0))
+    >>> parameters == ParameterSet(WMMd_inhibitor = 0.3, matrix = [[1, 0],
+    ...                                                             [0, 1]])
+    True
+    >>> parameters.WMMd_inhibitor = 0.5
+    Traceback (most recent call last):
+    ...
+    AttributeError: ParameterSet is immutable
+    """
+    __slots__ = ('_names', '_values', '_hash')
+
+    def __init__(self, **parameters):
+        names = tuple(sorted(parameters))
+        values = tuple(freeze(parameters[name]) for name in names)
+        object.__setattr__(self, '_names', names)
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_hash', hash((names, values)))
+
+    def __getattr__(self, name):
+        names = object.__getattribute__(self, '_names')
+        if name in names:
+            return object.__getattribute__(self, '_values')[names.index(name)]
+        raise AttributeError(f"ParameterSet has no parameter {name}")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ParameterSet is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("ParameterSet is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, ParameterSet):
+            return NotImplemented
+        return self._names == other._names and self._values == other._values
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        parameters = ', '.join(f'{name} = {value!r}' for name, value in \
+                                            zip(self._names, self._values))
+        return f'ParameterSet({parameters})'
+
+    def __reduce__(self):
+        return (_make_parameter_set, (self.as_dict(),))
+
+    def names(self):
+        """Function that returns the names of the parameters.
+
+        Example:
+        -----------
+        >>> ParameterSet(b = 1, a = 2).names()
+        ('a', 'b')
+        """
+        return self._names
+
+    def array(self, name):
+        """Function that returns a new (writable) numpy array of a parameter.
+
+        Parameters:
+        -----------
+        name: String
+            The name of the parameter.
+
+        Returns:
+        --------
+        array: Numpy.ndarray
+            A new array with the parameter values.
+
+        Example:
+        -----------
+        >>> ParameterSet(growth_rates = [0.8, 1.2]).array('growth_rates')
+        array([0.8, 1.2])
+        """
+        return np.array(getattr(self, name), dtype = float)
+
+    def as_dict(self):
+        """Function that returns the parameters in a dictionary, the tuples are
+        converted to new numpy arrays.
+
+        Example:
+        -----------
+        >>> ParameterSet(N = 50, costs = [1, 2]).as_dict()
+        {'N': 50, 'costs': array([1., 2.])}
+        """
+        return {name: np.array(value, dtype = float) if isinstance(value,
+                    tuple) else value for name, value in zip(self._names,
+                                                                self._values)}
+
+    def replace(self, **changes):
+        """Function that makes a new parameter set with some parameters changed.
+
+        Parameters:
+        -----------
+        changes: Dictionary
+            The names of the changed parameters with their new values.
+
+        Returns:
+        --------
+        parameters: ParameterSet
+            The new parameter set.
+
+        Example:
+        -----------
+        >>> ParameterSet(N = 50, cOC = 1).replace(N = 100).N
+        100
+        """
+        parameters = dict(zip(self._names, self._values))
+        parameters.update(changes)
+        return ParameterSet(**parameters)
+
+    def derived_matrix(self, name, changed_values):
+        """Function that derives a new interaction matrix from a matrix in the
+        parameter set in which some values are changed. The matrix in the
+        parameter set stays the same.
+
+        Parameters:
+        -----------
+        name: String
+            The name of the matrix.
+        changed_values: Dictionary
+            Dictionary with the (row, column) positions as keys and the new
+            values as values.
+
+        Returns:
+        --------
+        matrix: Numpy.ndarray
+            The new matrix.
+
+        Example:
+        -----------
+        >>> parameters = ParameterSet(matrix = np.zeros((2, 2)))
+        >>> parameters.derived_matrix('matrix', {(1, 0): 0.4})
+        array([[0. , 0. ],
+               [0.4, 0. ]])
+        >>> parameters.matrix
+        ((0.0, 0.0), (0.0, 0.0))
+        """
+        matrix = self.array(name)
+        for (row, column), value in changed_values.items():
+            matrix[row, column] = value
+        return matrix
+
+def _make_parameter_set(parameters):
+    """Function that remakes a parameter set when it is unpickled."""
+    return ParameterSet(**parameters)
+
+def parameter_set_objective(function):
+    """Function that makes a function that is minimised (minimal_tumour_*)
+    accept a parameter set as its last positional input. The parameters in the
+    set are given to the function by name, so the same function can be called
+    with the separate parameters or with one hashable parameter set (for
+    example as args of scipy.optimize.minimize or as input of a cached
+    function).
+
+    Parameters:
+    -----------
+    function: Function
+        The function that is minimised.
+
+    Returns:
+    --------
+    wrapper: Function
+        The function that also accepts a parameter set.
+
+    Example:
+    -----------
+    >>> @parameter_set_objective
+    ... def objective(x, matrix, WMMd_inhibitor = 0):
+    ...     return float(x * matrix[1, 0] - WMMd_inhibitor)
+    >>> parameters = ParameterSet(matrix = [[0, 1], [2, 0]], WMMd_inhibitor = 1)
+    >>> objective(3, parameters), objective(3, np.array([[0, 1], [2, 0]]), 1)
+    (5.0, 5.0)
+    >>> objective(3, ParameterSet(growth_rates = [0.8]))
+    Traceback (most recent call last):
+    ...
+    TypeError: objective has no parameter growth_rates
+    """
+    names = inspect.signature(function).parameters
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # Give the parameters of a parameter set by name
+        if args and isinstance(args[-1], ParameterSet):
+            *args, parameter_set = args
+            for name, value in parameter_set.as_dict().items():
+                if name not in names:
+                    raise TypeError(f"{function.__name__} has no parameter "
+                                                                    f"{name}")
+                kwargs.setdefault(name, value)
+        return function(*args, **kwargs)
+    return wrapper
+
+def derive_matrix(matrix, changed_values):
+    """Function that derives a new interaction matrix from a given matrix with
+    some changed values, without changing the given matrix.
+
+    Parameters:
+    -----------
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    changed_values: Dictionary
+        Dictionary with the (row, column) positions as keys and the new values
+        as values.
+
+    Returns:
+    --------
+    matrix: Numpy.ndarray
+        The new matrix.
+
+    Example:
+    -----------
+    >>> matrix = np.array([[0.0, 0.4], [0.6, 0.2]])
+    >>> derive_matrix(matrix, {(1, 0): 0.3})
+    array([[0. , 0.4],
+           [0.3, 0.2]])
+    >>> matrix
+    array([[0. , 0.4],
+           [0.6, 0.2]])
+    """
+    matrix = np.array(matrix, dtype = float)
+    for (row, column), value in changed_values.items():
+        matrix[row, column] = value
+    return matrix
+
+def number_parameters():
+    """Function that gives the start values, rates and interaction matrices of
+    the number model with IHs as used by the optimisations of
+    MM_model_nr_IH_inf.py. Every call gives new matrices, so they can be changed
+    by the caller.
+
+    Returns:
+    --------
+    parameters: Dictionary
+        The start numbers (nOC, nOB, nMMd and nMMr), the growth and decay rates
+        without and with IHs and the matrices without IHs (matrix_no_GF_IH),
+        with the MMd GF IH (matrix_GF_IH) and with both IHs (matrix_IH_comb).
+
+    Example:
+    -----------
+    >>> parameters = number_parameters()
+    >>> parameters['nOC'], parameters['growth_rates_IH']
+    (20, [0.7, 1.3, 0.3, 0.3])
+    >>> float(parameters['matrix_GF_IH'][2, 0])
+    0.2
+    >>> parameters['matrix_GF_IH'] is number_parameters()['matrix_GF_IH']
+    False
+    """
+    # Payoff matrix when no drugs are present
+    matrix_no_GF_IH = np.array([
+        [0.0, 0.4, 0.65, 0.55],
+        [0.3, 0.0, -0.3, -0.3],
+        [0.6, 0.0, 0.2, 0.0],
+        [0.55, 0.0, -0.6, 0.4]])
+
+    # Payoff matrix when only GF inhibitor drugs are present
+    matrix_GF_IH = derive_matrix(matrix_no_GF_IH, {(2, 0): 0.2})
+
+    # Payoff matrix when both inhibitor drugs are present
+    matrix_IH_comb = derive_matrix(matrix_no_GF_IH, {(2, 0): 0.4,
+                                                            (3, 2): -0.8})
+
+    return {'nOC': 20, 'nOB': 30, 'nMMd': 20, 'nMMr': 5,
+            'growth_rates': [0.8, 1.2, 0.3, 0.3],
+            'growth_rates_IH': [0.7, 1.3, 0.3, 0.3],
+            'decay_rates': [0.9, 0.08, 0.2, 0.1],
+            'decay_rates_IH': [1.0, 0.08, 0.2, 0.1],
+            'matrix_no_GF_IH': matrix_no_GF_IH,
+            'matrix_GF_IH': matrix_GF_IH,
+            'matrix_IH_comb': matrix_IH_comb}
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code that gives the paths of the data and figure folders. All
+              paths are made with os.path.join from one output root, so they
+              work on every operating system and do not depend on the folder
+              the code is run from. The output root is the folder of the
+              repository, unless it is set with the environment variable
+              MM_OUTPUT_ROOT or with set_output_root (for example to write to a
+              fast local scratch folder in batch jobs).
+"""
+
+# Import the needed libraries
+import os
+import doctest
+
+# The name of the environment variable with the output root
+OUTPUT_ROOT_VARIABLE = 'MM_OUTPUT_ROOT'
+
+# The folder of the repository (the folder above the code folder)
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The output root set with set_output_root, None if it is not set
+OUTPUT_ROOT = None
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def output_root():
+    """Function that gives the output root. The root set with set_output_root
+    is used first, then the environment variable MM_OUTPUT_ROOT and otherwise
+    the folder of the repository.
+
+    Returns:
+    --------
+    root: String
+        The absolute path of the output root.
+
+    Example:
+    -----------
+    >>> os.environ[OUTPUT_ROOT_VARIABLE] = os.path.join(os.sep, 'scratch')
+    >>> output_root() == os.path.join(os.sep, 'scratch')
+    True
+    >>> del os.environ[OUTPUT_ROOT_VARIABLE]
+    >>> output_root() == REPOSITORY_ROOT
+    True
+    """
+    if OUTPUT_ROOT is not None:
+        return OUTPUT_ROOT
+    return os.path.abspath(os.environ.get(OUTPUT_ROOT_VARIABLE,
+                                                            REPOSITORY_ROOT))
+
+def set_output_root(path):
+    """Function that sets the output root, with None the environment variable or
+    the folder of the repository is used again.
+
+    Parameters:
+    -----------
+    path: String
+        The path of the output root.
+
+    Example:
+    -----------
+    >>> set_output_root(os.path.join(os.sep, 'tmp', 'run_1'))
+    >>> data_path('data_model_numbers') == os.path.join(os.sep, 'tmp', 'run_1',
+    ...                                             'data', 'data_model_numbers')
+    True
+    >>> set_output_root(None)
+    """
+    global OUTPUT_ROOT
+    OUTPUT_ROOT = None if path is None else os.path.abspath(path)
+
+def data_path(*parts):
+    """Function that gives the path of a data folder or file.
+
+    Parameters:
+    -----------
+    parts: String
+        The names of the folders and file in the data folder.
+
+    Returns:
+    --------
+    path: String
+        The absolute path.
+
+    Example:
+    -----------
+    >>> data_path('data_model_numbers', 'df_cell_numb.csv') == os.path.join(
+    ...     REPOSITORY_ROOT, 'data', 'data_model_numbers', 'df_cell_numb.csv')
+    True
+    """
+    return os.path.join(output_root(), 'data', *parts)
+
+def figure_path(*parts):
+    """Function that gives the path of a figure folder or file.
+
+    Parameters:
+    -----------
+    parts: String
+        The names of the folders and file in the visualisation folder.
+
+    Returns:
+    --------
+    path: String
+        The absolute path.
+
+    Example:
+    -----------
+    >>> figure_path('results_model_numbers') == os.path.join(REPOSITORY_ROOT,
+    ...                             'visualisation', 'results_model_numbers')
+    True
+    """
+    return os.path.join(output_root(), 'visualisation', *parts)
+
+def repository_path(path):
+    """Function that gives the path in the repository of a path in the output
+    root, for example to read data that is in the repository when it is not
+    made in the output root.
+
+    Parameters:
+    -----------
+    path: String
+        A path in the output root.
+
+    Returns:
+    --------
+    path: String
+        The same path in the repository, None if the path is not in the output
+        root.
+
+    Example:
+    -----------
+    >>> set_output_root(os.path.join(os.sep, 'scratch'))
+    >>> repository_path(data_path('data_model_numbers')) == os.path.join(
+    ...                         REPOSITORY_ROOT, 'data', 'data_model_numbers')
+    True
+    >>> set_output_root(None)
+    """
+    root = output_root()
+    path = os.path.abspath(path)
+    if os.path.commonpath([root, path]) != root:
+        return None
+    return os.path.join(REPOSITORY_ROOT, os.path.relpath(path, root))
+
+if __name__ == "__main__":
+    main()
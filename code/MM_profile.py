@@ -0,0 +1,260 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to measure where the time of a model run goes. A Profile
+              replaces the functions of the model files that are called the
+              most (model_dynamics, make_part_df, combine_dataframes, start_df,
+              the switch_dataframe functions, the minimal_tumour functions and
+              odeint) by versions that count the calls and the time. The odeint
+              calls also give the solver statistics: the number of right-hand
+              side evaluations (nfe), Jacobian evaluations (nje), steps and
+              switches between the Adams and BDF method. The functions are only
+              replaced inside the with block, so without a Profile there is no
+              extra cost at all.
+
+              The results can be saved as JSON or as folded stacks that
+              flamegraph.pl and speedscope can read, for example:
+              python MM_profile.py MM_model_nr_IH_inf minimise_MM_W_comb_GF_h_IH
+                                                --json profile.json --folded
+                                                profile.folded
+"""
+
+# Import the needed libraries
+import sys
+import json
+import time
+import argparse
+import importlib
+import functools
+import doctest
+import numpy as np
+from scipy import integrate
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+# The names of the functions that are measured, names that end with * are
+# prefixes
+DEFAULT_TARGETS = ['model_dynamics', 'model_dynamics_no_mut', 'make_part_df',
+    'combine_dataframes', 'start_df', 'switch_dataframe*', 'minimal_tumour*',
+    'number_rhs', 'mutation_rhs', 'fraction_rhs', 'batch_odeint',
+    'dense_odeint', 'odeint']
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Profile a function of a model file
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description = 'Profile a function.')
+        parser.add_argument('module', help = 'the model file, for example '
+                                                        'MM_model_nr_IH_inf')
+        parser.add_argument('function', help = 'the function without inputs')
+        parser.add_argument('--json', help = 'the path of the JSON file')
+        parser.add_argument('--folded', help = 'the path of the folded stacks')
+        arguments = parser.parse_args()
+
+        module = importlib.import_module(arguments.module)
+        with Profile(module) as profile:
+            getattr(module, arguments.function)()
+
+        print(profile.report().to_string())
+        print(profile.solver_statistics())
+        if arguments.json:
+            profile.save_json(arguments.json)
+        if arguments.folded:
+            profile.save_folded(arguments.folded)
+
+def is_target(name, targets):
+    """Function that gives True when a name is one of the targets.
+
+    Example:
+    -----------
+    >>> is_target('switch_dataframe_GF_W_h', DEFAULT_TARGETS)
+    True
+    >>> is_target('Figure_switch', DEFAULT_TARGETS)
+    False
+    """
+    for target in targets:
+        if target.endswith('*'):
+            if name.startswith(target[:-1]):
+                return True
+        elif name == target:
+            return True
+    return False
+
+class Profile:
+    """Class that measures the calls of the target functions of modules while
+    it is used in a with block.
+
+    Parameters:
+    -----------
+    modules: Module or List
+        The module(s) in which the functions are replaced, MM_scan is always
+        added for the odeint calls of batch_odeint.
+    targets: List
+        The names of the functions, names that end with * are prefixes.
+
+    Example:
+    -----------
+    >>> import MM_model_numbers
+    >>> with Profile(MM_model_numbers) as profile:
+    ...     y = MM_model_numbers.odeint(MM_model_numbers.model_dynamics,
+    ...         [20, 30, 20, 5], np.linspace(0, 10, 11), args = ([0.8, 1.2,
+    ...         0.3, 0.3], [0.9, 0.08, 0.2, 0.1], np.array([
+    ...         [0.0, 0.4, 0.6, 0.5],
+    ...         [0.3, 0.0, -0.3, -0.3],
+    ...         [0.6, 0.0, 0.2, 0.0],
+    ...         [0.55, 0.0, -0.6, 0.4]])))
+    >>> y.shape
+    (11, 4)
+    >>> MM_model_numbers.odeint is integrate.odeint
+    True
+    >>> statistics = profile.solver_statistics()
+    >>> statistics['calls']
+    1
+    >>> statistics['nfe'] == profile.calls['model_dynamics']
+    True
+    """
+    def __init__(self, modules, targets = DEFAULT_TARGETS):
+        import MM_scan
+        if not isinstance(modules, (list, tuple)):
+            modules = [modules]
+        self.modules = list(modules) + ([MM_scan] if MM_scan not in modules
+                                                                    else [])
+        self.targets = targets
+        self.calls = {}
+        self.times = {}
+        self.stacks = {}
+        self.solver = []
+        self._stack = []
+        self._originals = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exception):
+        self.stop()
+        return False
+
+    def start(self):
+        """Function that replaces the target functions by measured versions."""
+        for module in self.modules:
+            for name, value in list(vars(module).items()):
+                if callable(value) and is_target(name, self.targets) and \
+                                            not isinstance(value, type):
+                    self._originals.append((module, name, value))
+                    if value is integrate.odeint:
+                        wrapped = self.measure('odeint', self.odeint)
+                    else:
+                        wrapped = self.measure(name, value)
+                    setattr(module, name, wrapped)
+
+    def stop(self):
+        """Function that puts the original functions back."""
+        for module, name, value in reversed(self._originals):
+            setattr(module, name, value)
+        self._originals = []
+
+    def measure(self, name, function):
+        """Function that gives a version of a function that counts its calls
+        and measures its time (the total time and the time without the calls to
+        other measured functions for the folded stacks)."""
+        @functools.wraps(function)
+        def measured(*args, **kwargs):
+            frame = [name, 0.0]
+            self._stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                self._stack.pop()
+                self.calls[name] = self.calls.get(name, 0) + 1
+                self.times[name] = self.times.get(name, 0.0) + duration
+                stack = ';'.join([item[0] for item in self._stack] + [name])
+                self.stacks[stack] = self.stacks.get(stack, 0.0) + \
+                                                        duration - frame[1]
+                if self._stack:
+                    self._stack[-1][1] += duration
+        return measured
+
+    def odeint(self, func, y0, t, *args, **kwargs):
+        """Function that calls odeint with full_output and saves the solver
+        statistics of the call."""
+        full_output = kwargs.pop('full_output', False)
+        y, info = integrate.odeint(func, y0, t, *args, full_output = True,
+                                                                    **kwargs)
+        methods = np.asarray(info['mused'])
+        self.solver.append({'nfe': int(info['nfe'][-1]),
+                            'nje': int(info['nje'][-1]),
+                            'steps': int(info['nst'][-1]),
+                            'method_switches': int(np.count_nonzero(
+                                                np.diff(methods) != 0)),
+                            'message': info['message']})
+        return (y, info) if full_output else y
+
+    def solver_statistics(self):
+        """Function that gives the total solver statistics of all odeint
+        calls.
+
+        Returns:
+        --------
+        statistics: Dictionary
+            The number of odeint calls and the total nfe, nje, steps and
+            method switches.
+        """
+        statistics = {'calls': len(self.solver)}
+        for key in ['nfe', 'nje', 'steps', 'method_switches']:
+            statistics[key] = sum(call[key] for call in self.solver)
+        return statistics
+
+    def report(self):
+        """Function that makes a dataframe with per function the number of
+        calls, the total time and the time per call, sorted by the total time.
+
+        Returns:
+        --------
+        df_report: DataFrame
+            The calls and times per function.
+        """
+        df_report = pd.DataFrame({'function': list(self.calls),
+            'calls': list(self.calls.values()),
+            'time (s)': [self.times[name] for name in self.calls]})
+        df_report['time per call (ms)'] = df_report['time (s)'] / \
+                                                    df_report['calls'] * 1000
+        return df_report.sort_values('time (s)', ascending = False,
+                                                    ignore_index = True)
+
+    def to_dict(self):
+        """Function that gives all results as a dictionary."""
+        return {'functions': {name: {'calls': self.calls[name],
+                                    'time': self.times[name]} for name in
+                                    self.calls},
+                'solver': self.solver_statistics(),
+                'odeint_calls': self.solver,
+                'stacks': self.stacks}
+
+    def save_json(self, path):
+        """Function that saves the results as a JSON file."""
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent = 2)
+
+    def folded(self):
+        """Function that gives the folded stacks ('a;b;c microseconds' per line)
+        that flamegraph.pl and speedscope can read."""
+        return '\n'.join(f'{stack} {int(round(duration * 1e6))}' for stack,
+                                        duration in sorted(self.stacks.items()))
+
+    def save_folded(self, path):
+        """Function that saves the folded stacks."""
+        with open(path, 'w') as file:
+            file.write(self.folded() + '\n')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to make the figures without a screen (batch mode). In batch
+              mode the Agg backend of matplotlib is used, the figures are not
+              shown (so a run does not wait until a window is closed) and the
+              figures are closed after they are saved, so they do not stay in
+              the memory. The Figure_* functions of a model file can be made in
+              multiple processes at the same time.
+
+              Batch mode is on when the environment variable MM_BATCH is 1,
+              for example:
+              MM_BATCH=1 python MM_model_numbers.py
+              or to make all figures without inputs of a model file in parallel:
+              python MM_render.py MM_model_numbers
+"""
+
+# Import the needed libraries
+import os
+import sys
+import inspect
+import importlib
+import traceback
+import doctest
+from concurrent.futures import ProcessPoolExecutor
+
+# The name of the environment variable that turns batch mode on
+BATCH_VARIABLE = 'MM_BATCH'
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Make the figures of the given model file
+    if len(sys.argv) > 1:
+        results = render_module(sys.argv[1], sys.argv[2:] or None)
+        for name, error in results.items():
+            print(name, 'done' if error is None else f'failed\n{error}')
+
+def batch_mode():
+    """Function that gives True when batch mode is on."""
+    return os.environ.get(BATCH_VARIABLE, '0') not in ('', '0')
+
+def set_batch_mode(batch = True):
+    """Function that turns batch mode on or off. The setting is also used by the
+    processes that are started afterwards.
+
+    Parameters:
+    -----------
+    batch: Bool
+        True to turn batch mode on.
+    """
+    os.environ[BATCH_VARIABLE] = '1' if batch else '0'
+    if batch:
+        use_batch_backend()
+
+def batch_setting():
+    """Function that gives the current batch setting, so it can be set back
+    with restore_batch_setting.
+
+    Returns:
+    --------
+    setting: Tuple
+        The value of MM_BATCH (None when it is not set) and the matplotlib
+        backend (None when no backend is chosen yet).
+    """
+    backend = None
+    if 'matplotlib' in sys.modules:
+        # Read the backend without resolving it when it is not chosen yet
+        backend = dict.get(sys.modules['matplotlib'].rcParams, 'backend')
+        if not isinstance(backend, str):
+            backend = None
+    return os.environ.get(BATCH_VARIABLE), backend
+
+def restore_batch_setting(setting):
+    """Function that sets the batch setting back to a setting of batch_setting.
+
+    Parameters:
+    -----------
+    setting: Tuple
+        The value of MM_BATCH and the matplotlib backend.
+
+    Example:
+    -----------
+    >>> import matplotlib
+    >>> matplotlib.use('pdf')
+    >>> setting = batch_setting()
+    >>> set_batch_mode()
+    >>> batch_mode(), matplotlib.get_backend()
+    (True, 'agg')
+    >>> restore_batch_setting(setting)
+    >>> batch_setting() == setting, matplotlib.get_backend()
+    (True, 'pdf')
+    """
+    variable, backend = setting
+    if variable is None:
+        os.environ.pop(BATCH_VARIABLE, None)
+    else:
+        os.environ[BATCH_VARIABLE] = variable
+    if backend is not None:
+        import matplotlib
+        matplotlib.use(backend)
+
+def use_batch_backend():
+    """Function that makes matplotlib use the Agg backend, which does not need
+    a screen."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+def show(figure = None):
+    """Function that shows a figure (plotly) or all matplotlib figures. In batch
+    mode nothing is shown and the matplotlib figures are closed.
+
+    Parameters:
+    -----------
+    figure: Plotly Figure
+        The figure that is shown, with None all matplotlib figures are shown.
+
+    Example:
+    -----------
+    >>> set_batch_mode()
+    >>> import matplotlib.pyplot as plt
+    >>> figure = plt.figure()
+    >>> show()
+    >>> plt.get_fignums()
+    []
+    """
+    if batch_mode():
+        if figure is None:
+            import matplotlib.pyplot as plt
+            plt.close('all')
+        return
+
+    if figure is None:
+        import matplotlib.pyplot as plt
+        plt.show()
+    else:
+        figure.show()
+
+def close_in_batch_mode(figure):
+    """Function that closes a saved matplotlib figure in batch mode.
+
+    Parameters:
+    -----------
+    figure: Matplotlib Figure
+        The figure, or pyplot itself (also when it is lazily imported) for the
+        current figure.
+
+    Example:
+    -----------
+    >>> import matplotlib.pyplot
+    >>> from MM_lazy import lazy_import
+    >>> set_batch_mode()
+    >>> figure = matplotlib.pyplot.figure()
+    >>> close_in_batch_mode(lazy_import('matplotlib.pyplot'))
+    >>> matplotlib.pyplot.get_fignums()
+    []
+    """
+    if batch_mode():
+        import matplotlib.pyplot as plt
+        from matplotlib.figure import Figure
+        if isinstance(figure, Figure):
+            plt.close(figure)
+        else:
+            plt.close()
+
+def figure_functions(module):
+    """Function that gives the names of the Figure_* functions of a module that
+    can be called without inputs.
+
+    Parameters:
+    -----------
+    module: Module
+        The model file.
+
+    Returns:
+    --------
+    names: List
+        List with the names of the functions, in the order of the file.
+    """
+    functions = []
+    for name, function in vars(module).items():
+        if name.startswith('Figure_') and inspect.isfunction(function) and \
+                                    function.__module__ == module.__name__:
+            parameters = inspect.signature(function).parameters.values()
+            if all(parameter.default is not inspect.Parameter.empty for
+                                                    parameter in parameters):
+                functions.append(name)
+    return functions
+
+def render_figure(module_name, name, args = (), kwargs = None):
+    """Function that makes one figure in batch mode.
+
+    Parameters:
+    -----------
+    module_name: String
+        The name of the model file, for example MM_model_numbers.
+    name: String
+        The name of the Figure_* function.
+    args: Tuple
+        The positional inputs of the function.
+    kwargs: Dictionary
+        The keyword inputs of the function.
+
+    Returns:
+    --------
+    error: String
+        The error message, None when the figure is made.
+    """
+    set_batch_mode()
+    try:
+        module = importlib.import_module(module_name)
+        getattr(module, name)(*args, **(kwargs or {}))
+
+        # Wait for the files that are saved in the background (MM_writer.py)
+        from MM_writer import wait_for_writes
+        wait_for_writes()
+    except Exception:
+        return traceback.format_exc()
+    finally:
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    return None
+
+def render_module(module_name, figures = None, n_workers = None):
+    """Function that makes figures of a model file in batch mode, divided over
+    multiple processes.
+
+    Parameters:
+    -----------
+    module_name: String
+        The name of the model file, for example MM_model_numbers.
+    figures: List
+        List with the names of the Figure_* functions or tuples (name, args) or
+        (name, args, kwargs) for functions with inputs. With None all Figure_*
+        functions without inputs are made.
+    n_workers: Int
+        The number of processes, with 1 everything is done in this process and
+        with None the number of processors is used.
+
+    Returns:
+    --------
+    errors: Dictionary
+        Dictionary with the names of the functions as keys and the error
+        messages (None when the figure is made) as values.
+    """
+    set_batch_mode()
+    if figures is None:
+        figures = figure_functions(importlib.import_module(module_name))
+
+    tasks = []
+    for figure in figures:
+        figure = (figure,) if isinstance(figure, str) else tuple(figure)
+        args = figure[1] if len(figure) > 1 else ()
+        kwargs = figure[2] if len(figure) > 2 else None
+        tasks.append((module_name, figure[0], args, kwargs))
+
+    if n_workers == 1:
+        errors = [render_figure(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(n_workers) as executor:
+            errors = list(executor.map(render_figure, *zip(*tasks)))
+
+    return {task[1]: error for task, error in zip(tasks, errors)}
+
+# Use the Agg backend when batch mode is on from the start
+if batch_mode():
+    use_batch_backend()
+
+if __name__ == "__main__":
+    main()
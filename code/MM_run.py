@@ -0,0 +1,570 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to run the model from the command line without changing
+              main(). A run is a named scenario (SCENARIOS) or any function of a
+              model file (module.function). Every input of the function can be
+              set with -p name=value or in a JSON or TOML config file, elements
+              of a matrix with -p "matrix_GF_IH[2,0]=0.3". With --sweep a list
+              of values is given for an input, the runs of all combinations of
+              the sweep values are divided over worker processes. The results
+              are saved in the output folder (--output, which is also used as
+              output root of MM_paths.py, so the files the model files save
+              themselves end up there too) together with runs.json that gives
+              per run the inputs, the saved files and whether it failed.
+
+              For example:
+              python MM_run.py --list
+              python MM_run.py switch -p n_switches=10 --sweep
+                        "WMMd_inhibitor=[0, 0.2, 0.4]" --workers 3 --output out
+              python MM_run.py MM_model_nr_IH_inf.minimal_tumour_numb_t_steps
+                        --config run.toml
+
+              A config file has the keys target, parameters, sweep, workers and
+              output, the command line inputs are used over the config file:
+              target = "optimise"
+              workers = 4
+              [parameters]
+              order = "W_GF_h"
+              [sweep]
+              WMMd_inhibitor = [0.3, 0.4, 0.5]
+"""
+
+# Import the needed libraries
+import os
+import re
+import sys
+import json
+import inspect
+import argparse
+import importlib
+import itertools
+import traceback
+import doctest
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import MM_paths
+from MM_paths import OUTPUT_ROOT_VARIABLE, set_output_root
+from MM_parameters import number_parameters
+from MM_render import set_batch_mode, batch_setting, restore_batch_setting
+from MM_storage import save_table, to_json
+from MM_lazy import lazy_import, lazy_function
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+# Import the optimisation function only when it is used
+minimize = lazy_function('scipy.optimize', 'minimize')
+
+# The start values, rates and matrices of the number model with IHs that are
+# used by the figures and optimisations of MM_model_nr_IH_inf.py
+NUMBER_PARAMETERS = {name: value for name, value in number_parameters().items()
+                                                if name != 'matrix_IH_comb'}
+
+# The named scenarios: the model file, the function and the default inputs
+SCENARIOS = {
+    'switch': {'module': 'MM_model_nr_IH_inf', 'function': 'switch_dataframe',
+        'parameters': dict(NUMBER_PARAMETERS, time_IH = 60, n_switches = 20,
+                t_steps_drug = 10, t_steps_no_drug = 10, WMMd_inhibitor = 0)},
+    'continuous': {'module': 'MM_model_nr_IH_inf',
+        'function': 'continuous_add_IH_df',
+        'parameters': dict(NUMBER_PARAMETERS, time_IH = 60,
+                                end_generation = 260, WMMd_inhibitor = 0)},
+    'minimal_tumour': {'module': 'MM_model_nr_IH_inf',
+        'function': 'minimal_tumour_numb_t_steps',
+        'parameters': dict(NUMBER_PARAMETERS, t_steps_drug = 10,
+                                    t_steps_no_drug = 10, WMMd_inhibitor = 0)},
+    'optimise': {'module': 'MM_run', 'function': 'optimise_order',
+        'parameters': dict(NUMBER_PARAMETERS, order = 'GF_W_h',
+                    t_steps = [3.0, 2.0, 3.0], WMMd_inhibitor = 0.4)},
+    'cycle_average': {'module': 'MM_run', 'function': 'cycle_average',
+        'parameters': dict(NUMBER_PARAMETERS, time_IH = 60, n_cycles = 10,
+                t_steps_drug = 10, t_steps_no_drug = 10, IH_present = 1,
+                WMMd_inhibitor = 0, last_cycles = 1)}}
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Run a scenario or function with the given inputs
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description = 'Run a scenario.')
+        parser.add_argument('target', nargs = '?', help = 'the name of a '
+                    'scenario or module.function, for example '
+                    'MM_model_nr_IH_inf.switch_dataframe')
+        parser.add_argument('-p', '--parameter', action = 'append', default =
+                    [], help = 'an input as name=value (value in JSON)')
+        parser.add_argument('-s', '--sweep', action = 'append', default = [],
+                    help = 'a list of values of an input as name=[...]')
+        parser.add_argument('-c', '--config', help = 'a JSON or TOML file')
+        parser.add_argument('-w', '--workers', type = int, help = 'the '
+                                                    'number of processes')
+        parser.add_argument('-o', '--output', help = 'the output folder')
+        parser.add_argument('--list', action = 'store_true', help = 'show the '
+                                                                'scenarios')
+        arguments = parser.parse_args()
+
+        if arguments.list:
+            for name, scenario in SCENARIOS.items():
+                print(f"{name}: {scenario['module']}.{scenario['function']}")
+            return
+
+        config = load_config(arguments.config) if arguments.config else {}
+        parameters = dict(config.get('parameters', {}))
+        parameters.update(parse_assignment(text) for text in
+                                                        arguments.parameter)
+        sweep = dict(config.get('sweep', {}))
+        sweep.update(parse_assignment(text) for text in arguments.sweep)
+        target = arguments.target or config.get('target')
+        if target is None:
+            parser.error('give a scenario or module.function')
+
+        summary = run(target, parameters, sweep, arguments.workers or
+                config.get('workers', 1), arguments.output or
+                config.get('output', 'runs'))
+        failed = [item for item in summary if item['error'] is not None]
+        for item in failed:
+            print(f"run {item['run']} failed\n{item['error']}")
+        print(f'{len(summary) - len(failed)} of {len(summary)} runs done')
+        sys.exit(1 if failed else 0)
+
+def parse_value(text):
+    """Function that converts the text of a value from the command line. The
+    text is read as JSON and otherwise kept as text.
+
+    Example:
+    -----------
+    >>> parse_value('0.4'), parse_value('[0.7, 1.3, 0.3, 0.3]')
+    (0.4, [0.7, 1.3, 0.3, 0.3])
+    >>> parse_value('W_GF_h')
+    'W_GF_h'
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def parse_assignment(text):
+    """Function that splits an input of the form name=value.
+
+    Example:
+    -----------
+    >>> parse_assignment('matrix_GF_IH[2,0]=0.3')
+    ('matrix_GF_IH[2,0]', 0.3)
+    """
+    if '=' not in text:
+        raise ValueError(f"Give an input as name=value, not: {text}")
+    name, value = text.split('=', 1)
+    return name.strip(), parse_value(value.strip())
+
+def load_config(path):
+    """Function that reads a JSON or TOML (.toml) config file.
+
+    Parameters:
+    -----------
+    path: String
+        The path of the file.
+
+    Returns:
+    --------
+    config: Dictionary
+        The settings of the run.
+    """
+    if path.endswith('.toml'):
+        import tomllib
+        with open(path, 'rb') as file:
+            return tomllib.load(file)
+    with open(path) as file:
+        return json.load(file)
+
+def set_parameters(parameters, values):
+    """Function that gives the inputs with the given values. A value of a list
+    of lists becomes a matrix and a name like matrix_GF_IH[2,0] sets one element
+    of a matrix (of a copy, the matrix itself is not changed).
+
+    Parameters:
+    -----------
+    parameters: Dictionary
+        The inputs of the function.
+    values: Dictionary
+        The new values.
+
+    Returns:
+    --------
+    parameters: Dictionary
+        The inputs with the new values.
+
+    Example:
+    -----------
+    >>> parameters = set_parameters(NUMBER_PARAMETERS, {'nOC': 25,
+    ...                                     'matrix_GF_IH[2,0]': 0.3})
+    >>> parameters['nOC'], float(parameters['matrix_GF_IH'][2, 0])
+    (25, 0.3)
+    >>> float(NUMBER_PARAMETERS['matrix_GF_IH'][2, 0])
+    0.2
+    """
+    parameters = dict(parameters)
+    for name, value in values.items():
+        if isinstance(value, list) and value and all(isinstance(row, list) for
+                                                                row in value):
+            value = np.array(value, dtype = float)
+
+        element = re.fullmatch(r'(\w+)\[([\d\s,]+)\]', name)
+        if element:
+            name = element.group(1)
+            if name not in parameters:
+                raise KeyError(f"Unknown matrix: {name}")
+            index = tuple(int(i) for i in element.group(2).split(','))
+            matrix = np.array(parameters[name], dtype = float)
+            matrix[index] = value
+            value = matrix
+        parameters[name] = value
+    return parameters
+
+def sweep_values(sweep):
+    """Function that gives the values of all runs of a sweep, all combinations
+    of the values of the inputs (the last input changes the fastest).
+
+    Parameters:
+    -----------
+    sweep: Dictionary
+        Dictionary with per input the list of values.
+
+    Returns:
+    --------
+    runs: List
+        List with a dictionary of the values per run.
+
+    Example:
+    -----------
+    >>> sweep_values({'nOC': [20, 30], 'WMMd_inhibitor': [0, 0.4]})
+    ... # doctest: +NORMALIZE_WHITESPACE
+    [{'nOC': 20, 'WMMd_inhibitor': 0}, {'nOC': 20, 'WMMd_inhibitor': 0.4},
+     {'nOC': 30, 'WMMd_inhibitor': 0}, {'nOC': 30, 'WMMd_inhibitor': 0.4}]
+    >>> sweep_values({})
+    [{}]
+    """
+    for name, values in sweep.items():
+        if not isinstance(values, list):
+            raise ValueError(f"The sweep values of {name} should be a list")
+    names = list(sweep)
+    return [dict(zip(names, values)) for values in
+                                itertools.product(*sweep.values())]
+
+def find_function(target):
+    """Function that gives the model file, the function name and the default
+    inputs of a scenario or of module.function.
+
+    Example:
+    -----------
+    >>> find_function('MM_model_nr_IH_inf.switch_dataframe')
+    ('MM_model_nr_IH_inf', 'switch_dataframe', {})
+    >>> find_function('switch')[:2]
+    ('MM_model_nr_IH_inf', 'switch_dataframe')
+    """
+    if target in SCENARIOS:
+        scenario = SCENARIOS[target]
+        return scenario['module'], scenario['function'], \
+                                                    scenario['parameters']
+    if '.' not in target:
+        raise KeyError(f"Unknown scenario: {target}, the scenarios are "
+                                                f"{', '.join(SCENARIOS)}")
+    module_name, function_name = target.rsplit('.', 1)
+    return module_name, function_name, {}
+
+def optimise_order(order, t_steps, nOC, nOB, nMMd, nMMr, growth_rates,
+                growth_rates_IH, decay_rates, decay_rates_IH, matrix_no_GF_IH,
+                matrix_GF_IH, WMMd_inhibitor):
+    """Function that determines the best IH administration and holiday
+    durations for an order with three situations, like the minimise_MM_*
+    functions of MM_model_nr_IH_inf.py but with all inputs given.
+
+    Parameters:
+    -----------
+    order: String
+        The order: 'GF_W_h', 'W_GF_h', 'GF_h_W_h' or 'W_h_GF_h'.
+    t_steps: List
+        The start values of the MMd GF IH, WMMd IH and holiday durations.
+    nOC: Float
+        Number of OC.
+    nOB: Float
+        Number of OB.
+    nMMd: Float
+        Number of the MMd.
+    nMMr: Float
+        Number of the MMr.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    growth_rates_IH: List
+        List with the growth rate values of the OC, OB, MMd and MMr when a IH
+        is administered.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    decay_rates_IH: List
+        List with the decay rate values of OC, OB, MMd and MMr when a IH is
+        administered.
+    matrix_no_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when no GF IH are
+        administered.
+    matrix_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when GF IH are
+        administered.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    result: Dictionary
+        The best durations and the MM number.
+    """
+    import MM_model_nr_IH_inf
+    function_order = getattr(MM_model_nr_IH_inf, f'switch_dataframe_{order}')
+    result = minimize(MM_model_nr_IH_inf.minimal_tumour_nr_t_3_situations,
+            t_steps, args = (function_order, nOC, nOB, nMMd, nMMr,
+            growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
+            matrix_no_GF_IH, matrix_GF_IH, WMMd_inhibitor), bounds = [(0, None),
+            (0, None), (0, None)], method = 'Nelder-Mead')
+    return {'MMd GF IH duration': result.x[0], 'WMMd IH duration': result.x[1],
+            'Holiday duration': result.x[2], 'MM number': result.fun}
+
+def cycle_average(time_IH, n_cycles, t_steps_drug, t_steps_no_drug, nOC, nOB,
+            nMMd, nMMr, growth_rates, growth_rates_IH, decay_rates,
+            decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, IH_present = 1,
+            WMMd_inhibitor = 0, last_cycles = 1):
+    """Function that gives the average MM number over the last cycles of a
+    schedule in which IH administration and drug holidays alternate from
+    time_IH on (like switch_dataframe). The average is the exact time average
+    of the dense trajectory (MM_dense.py).
+
+    Parameters:
+    -----------
+    time_IH: Int
+        The time point at which the drugs are administered for the first time.
+    n_cycles: Int
+        The number of cycles of an administration and a holiday period.
+    t_steps_drug: Float
+        The number of generations drugs are administared.
+    t_steps_no_drug: Float
+        The number of generations drugs are not administared.
+    nOC: Float
+        Number of OC.
+    nOB: Float
+        Number of OB.
+    nMMd: Float
+        Number of the MMd.
+    nMMr: Float
+        Number of the MMr.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    growth_rates_IH: List
+        List with the growth rate values of the OC, OB, MMd and MMr when a IH
+        is administered.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    decay_rates_IH: List
+        List with the decay rate values of OC, OB, MMd and MMr when a IH is
+        administered.
+    matrix_no_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when no GF IH are
+        administered.
+    matrix_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when GF IH are
+        administered.
+    IH_present: Int
+        The number of IHs present during an administration period.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+    last_cycles: Int
+        The number of cycles at the end over which the average is taken.
+
+    Returns:
+    --------
+    result: Dictionary
+        The average MM, MMd and MMr number.
+
+    Example:
+    -----------
+    >>> result = cycle_average(**SCENARIOS['cycle_average']['parameters'])
+    >>> sorted(result), round(result['MM number'], 2)
+    (['MM number', 'nMMd', 'nMMr'], 32.74)
+    """
+    from MM_schedule import switch_schedule
+    from MM_dense import schedule_trajectory
+
+    # The number model with IHs has no mutations
+    schedule = switch_schedule(time_IH, 2 * n_cycles, t_steps_drug,
+            t_steps_no_drug, growth_rates, growth_rates_IH, decay_rates,
+            decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH, IH_present,
+            WMMd_inhibitor)
+    for phase in schedule:
+        phase['mutations'] = False
+    trajectory = schedule_trajectory(schedule, [nOC, nOB, nMMd, nMMr])
+
+    average = trajectory.tail_average(last_cycles * (t_steps_drug +
+                                                            t_steps_no_drug))
+    return {'MM number': float(average[2] + average[3]),
+            'nMMd': float(average[2]), 'nMMr': float(average[3])}
+
+def save_result(result, path, metadata):
+    """Function that saves the dataframes in a result and gives the other
+    values, so they can be saved in runs.json.
+
+    Parameters:
+    -----------
+    result: Any
+        The result of the function.
+    path: String
+        The path of the file without extension, when there are more
+        dataframes their number is added.
+    metadata: Dictionary
+        The information saved with the dataframes.
+
+    Returns:
+    --------
+    files: List
+        The paths of the saved files.
+    value: Any
+        The result without the dataframes, as JSON values.
+    """
+    items = result if isinstance(result, tuple) else (result,)
+    files = []
+    values = []
+    n_frames = sum(isinstance(item, pd.DataFrame) for item in items)
+    for item in items:
+        if isinstance(item, pd.DataFrame):
+            file_path = path if n_frames == 1 else f'{path}_{len(files)}'
+            files.append(save_table(item, file_path, metadata))
+        else:
+            values.append(to_json(item))
+    value = values if isinstance(result, tuple) else (values[0] if values
+                                                                    else None)
+    return files, value
+
+def run_one(index, module_name, function_name, parameters, folder):
+    """Function that does one run in a worker process and saves the result.
+
+    Parameters:
+    -----------
+    index: Int
+        The number of the run.
+    module_name: String
+        The name of the model file.
+    function_name: String
+        The name of the function.
+    parameters: Dictionary
+        The inputs of the function.
+    folder: String
+        The folder in which the result is saved.
+
+    Returns:
+    --------
+    summary: Dictionary
+        The run number, the inputs, the saved files, the other values of the
+        result and the traceback when the run failed (otherwise None).
+    """
+    summary = {'run': index, 'parameters': to_json(parameters), 'files': [],
+                                                'value': None, 'error': None}
+    try:
+        function = getattr(importlib.import_module(module_name), function_name)
+        result = function(**parameters)
+        files, summary['value'] = save_result(result, os.path.join(folder,
+                f'run_{index}'), {'function': f'{module_name}.{function_name}',
+                'parameters': parameters})
+        summary['files'] = [os.path.relpath(file, folder) for file in files]
+    except Exception:
+        summary['error'] = traceback.format_exc()
+    return summary
+
+def run(target, parameters = None, sweep = None, n_workers = 1, output =
+                                                                    'runs'):
+    """Function that does all runs of a scenario or function and saves the
+    results and runs.json in output/runs/{target}.
+
+    Parameters:
+    -----------
+    target: String
+        The name of a scenario or module.function.
+    parameters: Dictionary
+        The inputs that are set (over the defaults of a scenario).
+    sweep: Dictionary
+        Dictionary with per input the list of values.
+    n_workers: Int
+        The number of processes, with 1 all runs are done in this process.
+    output: String
+        The output folder, also used as output root of MM_paths.py.
+
+    Returns:
+    --------
+    summary: List
+        The summary of every run in the order of the runs.
+
+    Example:
+    -----------
+    >>> import tempfile, shutil
+    >>> output = tempfile.mkdtemp()
+    >>> summary = run('minimal_tumour', {'t_steps_drug': 5}, {'WMMd_inhibitor':
+    ...                                             [0, 0.4]}, output = output)
+    >>> [item['parameters']['WMMd_inhibitor'] for item in summary]
+    [0, 0.4]
+    >>> [item['error'] for item in summary], summary[0]['value'] > 0
+    ([None, None], True)
+    >>> from MM_render import BATCH_VARIABLE
+    >>> BATCH_VARIABLE in os.environ
+    False
+    >>> run('switch', {'n_rounds': 5})
+    Traceback (most recent call last):
+    ...
+    TypeError: got an unexpected keyword argument 'n_rounds'
+    >>> shutil.rmtree(output)
+    """
+    module_name, function_name, defaults = find_function(target)
+    parameters = set_parameters(defaults, parameters or {})
+    runs = [set_parameters(parameters, values) for values in
+                                                sweep_values(sweep or {})]
+
+    # Check all inputs before the runs start
+    function = getattr(importlib.import_module(module_name), function_name)
+    for values in runs:
+        inspect.signature(function).bind(**values)
+
+    # The output folder and batch mode are used by the worker processes as
+    # well, afterwards the output root and batch setting are set back
+    output = os.path.abspath(output)
+    folder = os.path.join(output, 'runs', target)
+    os.makedirs(folder, exist_ok = True)
+    previous_root = MM_paths.OUTPUT_ROOT
+    previous_variable = os.environ.get(OUTPUT_ROOT_VARIABLE)
+    os.environ[OUTPUT_ROOT_VARIABLE] = output
+    set_output_root(output)
+    previous_batch = batch_setting()
+    set_batch_mode()
+
+    try:
+        if n_workers > 1 and len(runs) > 1:
+            with ProcessPoolExecutor(max_workers = n_workers) as executor:
+                futures = [executor.submit(run_one, index, module_name,
+                        function_name, values, folder) for index, values in
+                        enumerate(runs)]
+                summary = [future.result() for future in futures]
+        else:
+            summary = [run_one(index, module_name, function_name, values,
+                                folder) for index, values in enumerate(runs)]
+    finally:
+        restore_batch_setting(previous_batch)
+        set_output_root(previous_root)
+        if previous_variable is None:
+            del os.environ[OUTPUT_ROOT_VARIABLE]
+        else:
+            os.environ[OUTPUT_ROOT_VARIABLE] = previous_variable
+
+    with open(os.path.join(folder, 'runs.json'), 'w') as file:
+        json.dump({'target': target, 'module': module_name, 'function':
+                function_name, 'sweep': to_json(sweep or {}), 'runs':
+                summary}, file, indent = 2)
+    return summary
+
+if __name__ == "__main__":
+    main()
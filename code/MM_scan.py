@@ -0,0 +1,500 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to scan the effect of one IH parameter (the WMMd IH strength
+              or the b_OC_MMd value) on the total MM number or fraction. Instead
+              of solving one ODE system per parameter value, all parameter values
+              are put in one batch that is integrated together. Because the
+              systems of the batch do not interact, the Jacobian of the batch is
+              block diagonal which is given to odeint as a banded Jacobian.
+
+              By default the long-term value of a scanned value is taken from
+              the stable fixed point of the model (MM_steady_state.py) when
+              there is exactly one, only the other values are integrated. This
+              is the same value the functions that are minimised
+              (minimal_tumour_*) give, so the optimum lies on the scanned curve.
+
+              The scan can be made adaptive: first a coarse scan is made and
+              then extra values are added only close to the minimum and close to
+              kinks in the curve. A large scan can be divided in chunks over
+              multiple processes that share the values and the results
+              (MM_shared.py).
+"""
+
+# Import the needed libraries
+import numpy as np
+from scipy.integrate import odeint
+import doctest
+from functools import partial
+from MM_kernels import number_rhs, fraction_rhs
+from MM_steady_state import (fixed_points_nr, fixed_points_frac,
+            unique_stable_fixed_point)
+from MM_shared import shared_map
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def batch_odeint(rhs, y0, t):
+    """Function that integrates a batch of independent ODE systems together.
+
+    Parameters:
+    -----------
+    rhs: Function
+        Function rhs(y, t) that gives the change of the batch of states y, y has
+        the same shape as y0.
+    y0: Numpy.ndarray
+        Array with the start values, the last axis contains the variables of
+        one system and the axes in front of it are batch axes.
+    t: Numpy.ndarray
+        Array with all the time points.
+
+    Returns:
+    --------
+    y: Numpy.ndarray
+        Array with the states at all time points, shape (len(t),) + y0.shape.
+
+    Example:
+    -----------
+    >>> y = batch_odeint(lambda y, t: -y, np.array([[1.0, 2.0], [3.0, 4.0]]),
+    ...                                                     np.linspace(0, 1, 3))
+    >>> y.shape
+    (3, 2, 2)
+    >>> np.round(y[-1], 4).tolist()
+    [[0.3679, 0.7358], [1.1036, 1.4715]]
+    """
+    y0 = np.asarray(y0, dtype = float)
+    shape = y0.shape
+
+    # The systems are independent so the Jacobian only has nonzero values in
+    # blocks on the diagonal
+    band = shape[-1] - 1
+
+    def flat_rhs(y, t):
+        return np.ravel(rhs(y.reshape(shape), t))
+
+    y = odeint(flat_rhs, y0.ravel(), t, ml = band, mu = band)
+    return y.reshape((len(t),) + shape)
+
+def scan_parameters(values, parameter, matrix, WMMd_inhibitor = 0):
+    """Function that makes a batch of interaction matrices and WMMd IH strengths
+    for the scanned parameter values.
+
+    Parameters:
+    -----------
+    values: Numpy.ndarray
+        The values of the scanned parameter.
+    parameter: String
+        The scanned parameter, 'WMMd_inhibitor' or 'b_OC_MMd'.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness when it is not scanned.
+
+    Returns:
+    --------
+    matrices: Numpy.ndarray
+        Array with one 4x4 interaction matrix per value.
+    WMMd_inhibitors: Numpy.ndarray
+        Array with one WMMd IH strength per value.
+
+    Example:
+    -----------
+    >>> matrices, WMMd_inhibitors = scan_parameters([0.1, 0.2], 'b_OC_MMd',
+    ...                                                             np.eye(4))
+    >>> matrices[:, 2, 0].tolist(), WMMd_inhibitors.tolist()
+    ([0.1, 0.2], [0.0, 0.0])
+    """
+    values = np.asarray(values, dtype = float)
+    matrices = np.repeat(np.asarray(matrix, dtype = float)[np.newaxis],
+                                                        len(values), axis = 0)
+    WMMd_inhibitors = np.full(len(values), float(WMMd_inhibitor))
+
+    # Put the scanned values in the right place
+    if parameter == 'WMMd_inhibitor':
+        WMMd_inhibitors = values.copy()
+    elif parameter == 'b_OC_MMd':
+        matrices[:, 2, 0] = values
+    else:
+        raise ValueError(f"Unknown scan parameter: {parameter}")
+
+    return matrices, WMMd_inhibitors
+
+def scan_chunk(start, stop, arrays, scan, parameters):
+    """Function that scans the values start to stop and writes the results in
+    the outputs (the function of shared_map)."""
+    arrays['result'][start:stop] = scan(arrays['values'][start:stop],
+                                                                **parameters)
+
+def parallel_scan(scan, values, chunk_size, n_workers, **parameters):
+    """Function that divides the values of a scan in chunks over n_workers
+    processes that share the values and the results.
+
+    Parameters:
+    -----------
+    scan: Function
+        The scan function, scan_nr or scan_frac.
+    values: Numpy.ndarray
+        The values of the scanned parameter.
+    chunk_size: Int
+        The number of values that are integrated together.
+    n_workers: Int
+        The number of processes, with None the number of processors is used.
+    parameters: Dictionary
+        The other inputs of the scan function.
+
+    Returns:
+    --------
+    results: Numpy.ndarray
+        The result of the scan function for every value.
+    """
+    values = np.asarray(values, dtype = float)
+    return shared_map(partial(scan_chunk, scan = scan, parameters =
+                parameters), len(values), {'values': values}, {'result':
+                len(values)}, chunk_size, n_workers)['result']
+
+def stable_fixed_points(fixed_points, columns, matrices, WMMd_inhibitors):
+    """Function that determines the unique stable fixed point of the model for
+    every scanned value.
+
+    Parameters:
+    -----------
+    fixed_points: Function
+        Function fixed_points(matrix, WMMd_inhibitor) that gives the dataframe
+        with the fixed points (fixed_points_nr or fixed_points_frac).
+    columns: List
+        The names of the columns of the cell types in the dataframe.
+    matrices: Numpy.ndarray
+        Array with one 4x4 interaction matrix per value.
+    WMMd_inhibitors: Numpy.ndarray
+        Array with one WMMd IH strength per value.
+
+    Returns:
+    --------
+    states: Numpy.ndarray
+        Array with the fixed point of every value, the values without exactly
+        one stable fixed point are NaN.
+
+    Example:
+    -----------
+    >>> matrices, WMMd_inhibitors = scan_parameters([0.0, 0.3],
+    ...         'WMMd_inhibitor', np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]]))
+    >>> states = stable_fixed_points(lambda matrix, WMMd_inhibitor:
+    ...     fixed_points_nr([0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], matrix,
+    ...     WMMd_inhibitor), ['nOC', 'nOB', 'nMMd', 'nMMr'], matrices,
+    ...                                                         WMMd_inhibitors)
+    >>> np.round(states[:, 2] + states[:, 3], 2).tolist()
+    [34.64, 28.45]
+    """
+    states = np.full((len(matrices), len(columns)), np.nan)
+    for index, (matrix, WMMd_inhibitor) in enumerate(zip(matrices,
+                                                            WMMd_inhibitors)):
+        fixed_point = unique_stable_fixed_point(fixed_points(matrix,
+                                                                WMMd_inhibitor))
+        if fixed_point is not None:
+            states[index] = fixed_point[columns].to_numpy(float)
+
+    return states
+
+def scan_nr(values, parameter, y0, t, growth_rates, decay_rates, matrix,
+                WMMd_inhibitor = 0, fractions = False, n_workers = 1,
+                chunk_size = 1000, equilibrium = True):
+    """Function that determines the total MM number at the last time point for
+    all values of the scanned parameter. The values with exactly one stable
+    fixed point get the MM number of that fixed point, the other values are
+    integrated in one batch.
+
+    Parameters:
+    -----------
+    values: Numpy.ndarray
+        The values of the scanned parameter.
+    parameter: String
+        The scanned parameter, 'WMMd_inhibitor' or 'b_OC_MMd'.
+    y0: List
+        List with the start values of nOC, nOB, nMMd and nMMr.
+    t: Numpy.ndarray
+        Array with all the time points.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness when it is not scanned.
+    fractions: Bool
+        If True the total MM fraction is returned instead of the total MM
+        number.
+    n_workers: Int
+        The number of processes, with 1 all values are integrated in one batch
+        in this process.
+    chunk_size: Int
+        The number of values that are integrated together when n_workers is
+        not 1.
+    equilibrium: Bool
+        If False all values are integrated, also when they have exactly one
+        stable fixed point.
+
+    Returns:
+    --------
+    last_MM_numbers: Numpy.ndarray
+        The total MM number (or fraction) for every scanned value.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]])
+    >>> np.round(scan_nr([0.0, 0.3], 'WMMd_inhibitor', [20, 30, 20, 5],
+    ...     np.linspace(0, 140, 140), [0.8, 1.2, 0.3, 0.3],
+    ...     [0.9, 0.08, 0.2, 0.1], matrix), 2).tolist()
+    [34.64, 28.45]
+    >>> np.round(scan_nr([0.0, 0.3, 0.6], 'WMMd_inhibitor', [20, 30, 20, 5],
+    ...     np.linspace(0, 140, 140), [0.8, 1.2, 0.3, 0.3],
+    ...     [0.9, 0.08, 0.2, 0.1], matrix, n_workers = 2, chunk_size = 2),
+    ...                                                             2).tolist()
+    [34.64, 28.45, 40.96]
+    >>> np.round(scan_nr([0.0, 0.3], 'WMMd_inhibitor', [20, 30, 20, 5],
+    ...     np.linspace(0, 140, 140), [0.8, 1.2, 0.3, 0.3],
+    ...     [0.9, 0.08, 0.2, 0.1], matrix, equilibrium = False), 2).tolist()
+    [34.62, 28.44]
+    """
+    if n_workers != 1:
+        return parallel_scan(scan_nr, values, chunk_size, n_workers,
+                parameter = parameter, y0 = y0, t = t, growth_rates =
+                growth_rates, decay_rates = decay_rates, matrix = matrix,
+                WMMd_inhibitor = WMMd_inhibitor, fractions = fractions,
+                equilibrium = equilibrium)
+
+    matrices, WMMd_inhibitors = scan_parameters(values, parameter, matrix,
+                                                                WMMd_inhibitor)
+    y = np.full((len(matrices), 4), np.nan)
+
+    # Take the values with exactly one stable fixed point from the fixed point
+    if equilibrium == True:
+        y = stable_fixed_points(lambda matrix, WMMd_inhibitor: fixed_points_nr(
+                growth_rates, decay_rates, matrix, WMMd_inhibitor), ['nOC',
+                'nOB', 'nMMd', 'nMMr'], matrices, WMMd_inhibitors)
+
+    # Determine the ODE solutions of the other values together
+    integrate = np.isnan(y[:, 0])
+    if np.any(integrate):
+        y0 = np.repeat(np.asarray(y0, dtype = float)[np.newaxis],
+                                        np.count_nonzero(integrate), axis = 0)
+        y[integrate] = batch_odeint(lambda y, t: number_rhs(y, growth_rates,
+                        decay_rates, matrices[integrate],
+                        WMMd_inhibitors[integrate]), y0, t)[-1]
+
+    # Determine the total MM number or fraction
+    last_MM_numbers = y[:, 2] + y[:, 3]
+    if fractions == True:
+        return last_MM_numbers / np.sum(y, axis = 1)
+    return last_MM_numbers
+
+def scan_frac(values, parameter, y0, t, N, cOC, cOB, cMMd, cMMr, matrix,
+                        WMMd_inhibitor = 0, n_workers = 1, chunk_size = 1000,
+                        equilibrium = True):
+    """Function that determines the total MM fraction at the last time point
+    for all values of the scanned parameter. The values with exactly one stable
+    fixed point get the MM fraction of that fixed point, the other values are
+    integrated in one batch.
+
+    Parameters:
+    -----------
+    values: Numpy.ndarray
+        The values of the scanned parameter.
+    parameter: String
+        The scanned parameter, 'WMMd_inhibitor' or 'b_OC_MMd'.
+    y0: List
+        List with the start values of xOC, xOB, xMMd and xMMr.
+    t: Numpy.ndarray
+        Array with all the time points.
+    N: Int
+        Number of cells in the difussion range.
+    cOC: Float
+        Cost parameter OC.
+    cOB: Float
+        Cost parameter OB.
+    cMMd: Float
+        Cost parameter MMd.
+    cMMr: Float
+        Cost parameter MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness when it is not scanned.
+    n_workers: Int
+        The number of processes, with 1 all values are integrated in one batch
+        in this process.
+    chunk_size: Int
+        The number of values that are integrated together when n_workers is
+        not 1.
+    equilibrium: Bool
+        If False all values are integrated, also when they have exactly one
+        stable fixed point.
+
+    Returns:
+    --------
+    last_MM_fractions: Numpy.ndarray
+        The total MM fraction for every scanned value.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 1.6, 2.2, 1.9],
+    ...    [0.95, 0.0, -0.5, -0.5],
+    ...    [2.2, 0.0, 0.2, 0.0],
+    ...    [1.9, 0.0, -0.7, 0.2]])
+    >>> np.round(scan_frac([0.5, 1.5], 'b_OC_MMd', [0.4, 0.3, 0.2, 0.1],
+    ...     np.linspace(0, 100, 100), 50, 1, 0.8, 1.2, 1.3, matrix), 4).tolist()
+    [0.3878, 0.3323]
+    """
+    if n_workers != 1:
+        return parallel_scan(scan_frac, values, chunk_size, n_workers,
+                parameter = parameter, y0 = y0, t = t, N = N, cOC = cOC,
+                cOB = cOB, cMMd = cMMd, cMMr = cMMr, matrix = matrix,
+                WMMd_inhibitor = WMMd_inhibitor, equilibrium = equilibrium)
+
+    matrices, WMMd_inhibitors = scan_parameters(values, parameter, matrix,
+                                                                WMMd_inhibitor)
+    costs = [cOC, cOB, cMMd, cMMr]
+    y = np.full((len(matrices), 4), np.nan)
+
+    # Take the values with exactly one stable fixed point from the fixed point
+    if equilibrium == True:
+        y = stable_fixed_points(lambda matrix, WMMd_inhibitor:
+                fixed_points_frac(N, cOC, cOB, cMMd, cMMr, matrix,
+                WMMd_inhibitor), ['xOC', 'xOB', 'xMMd', 'xMMr'], matrices,
+                WMMd_inhibitors)
+
+    # Determine the ODE solutions of the other values together
+    integrate = np.isnan(y[:, 0])
+    if np.any(integrate):
+        y0 = np.repeat(np.asarray(y0, dtype = float)[np.newaxis],
+                                        np.count_nonzero(integrate), axis = 0)
+        y[integrate] = batch_odeint(lambda y, t: fraction_rhs(y, N, costs,
+                        matrices[integrate], WMMd_inhibitors[integrate]), y0,
+                        t)[-1]
+
+    # Determine the total MM fraction
+    last_MM_fractions = y[:, 2] + y[:, 3]
+    return last_MM_fractions
+
+def refine_intervals(values, results, kink_factor = 10):
+    """Function that determines the intervals of a coarse scan in which extra
+    values are needed. These are the intervals next to the minimum and next to
+    kinks, a kink is a point where the slope changes much more than elsewhere.
+
+    Parameters:
+    -----------
+    values: Numpy.ndarray
+        The sorted scanned values.
+    results: Numpy.ndarray
+        The results of the scanned values.
+    kink_factor: Float
+        How many times larger than the median slope change a slope change has to
+        be to be a kink.
+
+    Returns:
+    --------
+    intervals: List
+        List with the (lower, upper) tuples of the intervals to refine.
+
+    Example:
+    -----------
+    >>> values = np.linspace(0, 1, 11)
+    >>> refine_intervals(values, np.abs(values - 0.52) + values ** 2)
+    [(0.4, 0.6)]
+    >>> refine_intervals(values, 3 * np.maximum(values, 0.7) + values ** 2)
+    [(0.0, 0.1), (0.6, 0.8)]
+    """
+    values = np.asarray(values, dtype = float)
+    results = np.asarray(results, dtype = float)
+    indices = {int(np.argmin(results))}
+
+    # Find the kinks with the change in slope
+    if len(values) > 2:
+        slopes = np.diff(results) / np.diff(values)
+        slope_changes = np.abs(np.diff(slopes))
+        threshold = kink_factor * np.median(slope_changes) + 1e-12
+        indices.update((np.nonzero(slope_changes > threshold)[0] + 1).tolist())
+
+    # Make the intervals around the points
+    intervals = []
+    for index in sorted(indices):
+        lower = values[max(index - 1, 0)]
+        upper = values[min(index + 1, len(values) - 1)]
+        intervals.append((round(float(lower), 12), round(float(upper), 12)))
+
+    return intervals
+
+def adaptive_scan(scan, lower, upper, n_coarse = 101, n_refine = 51,
+                                                            kink_factor = 10):
+    """Function that scans a parameter by first making a coarse scan and then
+    adding dense values only close to the minimum and close to kinks.
+
+    Parameters:
+    -----------
+    scan: Function
+        Function that gets an array of parameter values and returns an array
+        with the result of every value (for example the total MM fraction).
+    lower: Float
+        The lowest parameter value.
+    upper: Float
+        The highest parameter value.
+    n_coarse: Int
+        The number of values in the coarse scan.
+    n_refine: Int
+        The number of values in every refined interval.
+    kink_factor: Float
+        How many times larger than the median slope change a slope change has to
+        be to be a kink.
+
+    Returns:
+    --------
+    dict_results: Dictionary
+        Dictionary with the scanned values as keys and the results as values,
+        sorted on the scanned values.
+
+    Example:
+    -----------
+    >>> dict_results = adaptive_scan(lambda values: (values - 0.237) ** 2, 0, 1,
+    ...                                                 n_coarse = 11)
+    >>> len(dict_results)
+    59
+    >>> round(min(dict_results, key = dict_results.get), 3)
+    0.236
+    """
+    # Make a coarse scan
+    values = np.round(np.linspace(lower, upper, n_coarse), 12)
+    results = np.asarray(scan(values), dtype = float)
+
+    # Add dense values in the intervals close to the minimum and kinks
+    intervals = refine_intervals(values, results, kink_factor)
+    extra_values = np.unique(np.round(np.concatenate([np.linspace(
+        interval_lower, interval_upper, n_refine) for interval_lower,
+        interval_upper in intervals]), 12))
+    extra_values = extra_values[~np.isin(extra_values, values)]
+    if len(extra_values) > 0:
+        values = np.concatenate([values, extra_values])
+        results = np.concatenate([results, np.asarray(scan(extra_values),
+                                                                dtype = float)])
+
+    # Sort the values
+    order = np.argsort(values)
+    dict_results = {float(value): float(result) for value, result in \
+                                        zip(values[order], results[order])}
+
+    return dict_results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Therapy schedules of the number model with resistance mutations
+              (MM_model_nr_IH_inf_mutation.py) and a function that integrates a
+              whole schedule. A schedule is a list of phases. A phase is a
+              dictionary with the duration (generations), the number of time
+              points, the growth rates, decay rates, interaction matrix, number
+              of present IHs, WMMd inhibitor effect and whether mutations can
+              happen.
+
+              The start of the mutations is not a separate phase but an event:
+              the mutations are switched on at the generation mutation_start
+              inside the integration of the schedule. The solver is restarted at
+              every phase change and at the mutation start, like when every part
+              is integrated on its own. mutation_start can be an array, then a
+              batch of schedules with different mutation start times is
+              integrated at once.
+"""
+
+# Import the needed libraries
+import numpy as np
+import doctest
+from MM_kernels import mutation_rhs
+from MM_integrators import batch_integrate
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def mutation_rates(IH_present):
+    """Function that gives the MMd to MMr mutation rate for the number of IHs
+    that are present, the same rates as in mutation_MMd_to_MMr.
+
+    Parameters:
+    -----------
+    IH_present: Int
+        Indicates if there is a IH present (0-> zero IHs present, 1 -> one IH
+        present, 2 -> two IHs present)
+
+    Returns:
+    --------
+    mutation_rate: Float
+        The mutation rate.
+
+    Example:
+    -----------
+    >>> mutation_rates(2)
+    7e-05
+    """
+    rates = {0: 0.0001, 1: 0.00012, 2: 0.00007}
+    return rates[IH_present]
+
+def make_phase(duration, growth_rates, decay_rates, matrix, IH_present,
+                        WMMd_inhibitor = 0, mutations = True, n_points = None):
+    """Function that makes a phase of a therapy schedule.
+
+    Parameters:
+    -----------
+    duration: Float
+        The number of generations of the phase.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    IH_present: Int
+        Indicates if there is a IH present (0-> zero IHs present, 1 -> one IH
+        present, 2 -> two IHs present)
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness (can be an array with a value
+        per system of a batch).
+    mutations: Bool
+        True if MMd can become MMr through mutations during the phase.
+    n_points: Int
+        The number of time points of the phase (linspace from the start to the
+        end of the phase), by default one per generation.
+
+    Returns:
+    --------
+    phase: Dictionary
+        The phase.
+    """
+    if n_points is None:
+        n_points = int(duration)
+
+    return {'duration': float(duration),
+            'n_points': int(n_points),
+            'growth_rates': np.asarray(growth_rates, dtype = float),
+            'decay_rates': np.asarray(decay_rates, dtype = float),
+            'matrix': np.array(matrix, dtype = float),
+            'IH_present': int(IH_present),
+            'WMMd_inhibitor': np.asarray(WMMd_inhibitor, dtype = float),
+            'mutations': bool(mutations)}
+
+def continuous_schedule(time_IH, end_generation, growth_rates, growth_rates_IH,
+                decay_rates, decay_rates_IH, matrix_no_GF_IH, matrix_GF_IH,
+                IH_present, WMMd_inhibitor = 0):
+    """Function that makes the schedule in which the IHs are administered
+    continuously from time_IH on, like continuous_add_IH_df.
+
+    Parameters:
+    -----------
+    time_IH: Int
+        The time point at which the IHs get administered
+    end_generation: Int
+        The last generation of the schedule.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    growth_rates_IH: List
+        List with the growth rate values of the OC, OB, MMd and MMr when a IH
+        is administered.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    decay_rates_IH: List
+        List with the decay rate values of OC, OB, MMd and MMr when a IH is
+        administered.
+    matrix_no_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when no GF IH are
+        administrated.
+    matrix_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when GF IH are
+        administrated.
+    IH_present: Int
+        Indicates if there is a IH present (0-> zero IHs present, 1 -> one IH
+        present, 2 -> two IHs present)
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    schedule: List
+        List with the phases.
+
+    Example:
+    -----------
+    >>> schedule = continuous_schedule(30, 100, [0.8, 1.2, 0.3, 0.3],
+    ...     [0.7, 1.3, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1],
+    ...     np.zeros((4, 4)), np.zeros((4, 4)), 1, 0.5)
+    >>> [(phase['duration'], phase['IH_present']) for phase in schedule]
+    [(30.0, 0), (70.0, 1)]
+    """
+    return [make_phase(time_IH, growth_rates, decay_rates, matrix_no_GF_IH, 0),
+            make_phase(end_generation - time_IH, growth_rates_IH,
+                            decay_rates_IH, matrix_GF_IH, IH_present,
+                            WMMd_inhibitor)]
+
+def switch_schedule(time_IH, n_switches, t_steps_drug, t_steps_no_drug,
+                growth_rates, growth_rates_IH, decay_rates, decay_rates_IH,
+                matrix_no_GF_IH, matrix_GF_IH, IH_present, WMMd_inhibitor = 0):
+    """Function that makes the schedule in which IH administration periods and
+    drug holidays alternate from time_IH on, like switch_dataframe.
+
+    Parameters:
+    -----------
+    time_IH: Int
+        The time point at witch the drugs are administered
+    n_switches: Int
+        The number of switches between giving drugs and not giving drugs.
+    t_steps_drug: Int
+        The number of generations drugs are administared.
+    t_steps_no_drug: Int
+        The number of generations drugs are not administared.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    growth_rates_IH: List
+        List with the growth rate values of the OC, OB, MMd and MMr when a IH
+        is administered.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    decay_rates_IH: List
+        List with the decay rate values of OC, OB, MMd and MMr when a IH is
+        administered.
+    matrix_no_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when no GF IH are
+        administrated.
+    matrix_GF_IH: Numpy.ndarray
+        4x4 matrix containing the interaction factors when GF IH are
+        administrated.
+    IH_present: Int
+        The number of IHs present
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    schedule: List
+        List with the phases.
+
+    Example:
+    -----------
+    >>> schedule = switch_schedule(30, 3, 5, 4, [0.8, 1.2, 0.3, 0.3],
+    ...     [0.7, 1.3, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1],
+    ...     np.zeros((4, 4)), np.zeros((4, 4)), 1, 0.5)
+    >>> [(phase['duration'], phase['IH_present']) for phase in schedule]
+    [(30.0, 0), (5.0, 1), (4.0, 0), (5.0, 1)]
+    """
+    schedule = [make_phase(time_IH, growth_rates, decay_rates,
+                                                        matrix_no_GF_IH, 0)]
+
+    # Alternate between administration and holiday phases
+    for i in range(n_switches):
+        if i % 2 == 0:
+            schedule.append(make_phase(t_steps_drug, growth_rates_IH,
+                                decay_rates_IH, matrix_GF_IH, IH_present,
+                                WMMd_inhibitor))
+        else:
+            schedule.append(make_phase(t_steps_no_drug, growth_rates,
+                                decay_rates, matrix_no_GF_IH, 0))
+    return schedule
+
+def schedule_times(schedule):
+    """Function that gives the time points of all phases of a schedule. Every
+    phase has its own time points, so the time at which a phase ends is also the
+    first time point of the next phase.
+
+    Parameters:
+    -----------
+    schedule: List
+        List with the phases.
+
+    Returns:
+    --------
+    t: Numpy.ndarray
+        Array with all the time points.
+
+    Example:
+    -----------
+    >>> schedule = [make_phase(2, np.ones(4), np.ones(4), np.zeros((4, 4)), 0,
+    ...      n_points = 3), make_phase(3, np.ones(4), np.ones(4),
+    ...      np.zeros((4, 4)), 1)]
+    >>> schedule_times(schedule).tolist()
+    [0.0, 1.0, 2.0, 2.0, 3.5, 5.0]
+    """
+    times = []
+    start = 0.0
+    for phase in schedule:
+        end = start + phase['duration']
+        times.append(np.linspace(start, end, phase['n_points']))
+        start = end
+    return np.concatenate(times)
+
+def run_schedule(schedule, y0, mutation_start = 0, method = 'odeint',
+                                                        backend = 'numpy'):
+    """Function that integrates the number model with resistance mutations over
+    a whole schedule. The mutations are switched on at the generation
+    mutation_start (in the phases in which mutations can happen), the solver is
+    restarted at every phase change and at the mutation start.
+
+    Parameters:
+    -----------
+    schedule: List
+        List with the phases.
+    y0: List
+        List with the start values of nOC, nOB, nMMd and nMMr (the last axis
+        can have batch axes in front of it).
+    mutation_start: Float
+        The generation from which resistance mutations can occur (can be an
+        array to integrate a batch of mutation start times).
+    method: String
+        The integrator, 'odeint', 'rk4' or 'rk45' (MM_integrators.py).
+    backend: String
+        'numpy' or 'jit' for the compiled RK4 and RK45 loops of MM_jit.py
+        (when numba is installed).
+
+    Returns:
+    --------
+    t: Numpy.ndarray
+        Array with all the time points.
+    y: Numpy.ndarray
+        Array with the cell numbers at all time points, the first axis is the
+        time.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.54],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.5, 0.0],
+    ...    [0.54, 0.0, -0.6, 0.65]])
+    >>> matrix_GF_IH = matrix.copy()
+    >>> matrix_GF_IH[2, 0] = 0.09
+    >>> schedule = continuous_schedule(30, 100, [0.8, 1.2, 0.3, 0.3],
+    ...     [0.7, 1.3, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1],
+    ...     matrix, matrix_GF_IH, 1)
+    >>> t, y = run_schedule(schedule, [180, 280, 170, 0], np.array([0, 60,
+    ...                                                                 200]))
+    >>> y.shape
+    (100, 3, 4)
+    >>> np.round(y[-1, :, 3], 2).tolist()
+    [267.37, 27.96, 0.0]
+    >>> t, y_rk45 = run_schedule(schedule, [180, 280, 170, 0], np.array([0, 60,
+    ...                                                 200]), method = 'rk45')
+    >>> np.round(y_rk45[-1, :, 3], 2).tolist()
+    [267.37, 27.96, 0.0]
+    >>> t, y_jit = run_schedule(schedule, [180, 280, 170, 0], np.array([0, 60,
+    ...                                 200]), method = 'rk4', backend = 'jit')
+    >>> t, y_rk4 = run_schedule(schedule, [180, 280, 170, 0], np.array([0, 60,
+    ...                                                 200]), method = 'rk4')
+    >>> np.allclose(y_jit, y_rk4)
+    True
+    """
+    y0 = np.asarray(y0, dtype = float)
+    mutation_start = np.asarray(mutation_start, dtype = float)
+    state = y0 * np.ones(mutation_start.shape + (1,))
+    events = np.unique(mutation_start)
+    values = []
+    start = 0.0
+
+    for phase in schedule:
+        end = start + phase['duration']
+        t_phase = np.linspace(start, end, phase['n_points'])
+
+        # Restart the solver at the phase start and end and at mutation starts
+        # inside the phase
+        restarts = np.concatenate(([start], events[(events > start) &
+                                                    (events < end)], [end]))
+        t_all = np.union1d(t_phase, restarts)
+        y_all = np.empty((len(t_all),) + state.shape)
+
+        for restart, next_restart in zip(restarts[:-1], restarts[1:]):
+            part = (t_all >= restart) & (t_all <= next_restart)
+
+            # The mutations are on from the mutation start
+            mutation_rate = mutation_rates(phase['IH_present']) * \
+                        (phase['mutations'] & (mutation_start <= restart))
+
+            if backend == 'jit':
+                from MM_jit import CompiledRHS
+                rhs = CompiledRHS('mutation', phase['growth_rates'],
+                            phase['decay_rates'], phase['matrix'],
+                            mutation_rate, phase['WMMd_inhibitor'])
+            else:
+                rhs = lambda y, t: mutation_rhs(y, phase['growth_rates'],
+                            phase['decay_rates'], phase['matrix'],
+                            mutation_rate, phase['WMMd_inhibitor'])
+            y_part = batch_integrate(rhs, state, t_all[part], method,
+                                                        backend = backend)
+            y_all[part] = y_part
+            state = y_part[-1]
+
+        values.append(y_all[np.searchsorted(t_all, t_phase)])
+        start = end
+
+    return schedule_times(schedule), np.concatenate(values)
+
+def schedule_dataframe(schedule, y0, mutation_start = 0):
+    """Function that makes a dataframe of the nOC, nOB, nMMd and nMMr values
+    over a whole schedule.
+
+    Parameters:
+    -----------
+    schedule: List
+        List with the phases.
+    y0: List
+        List with the start values of nOC, nOB, nMMd and nMMr.
+    mutation_start: Float
+        The generation from which resistance mutations can occur.
+
+    Returns:
+    --------
+    df_total: DataFrame
+        Dataframe with the nOC, nOB, nMMd and nMMr values over time.
+
+    Example:
+    -----------
+    >>> schedule = [make_phase(10, [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1],
+    ...    np.array([
+    ...    [0.0, 0.4, 0.6, 0.54],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.5, 0.0],
+    ...    [0.54, 0.0, -0.6, 0.65]]), 0)]
+    >>> list(schedule_dataframe(schedule, [180, 280, 170, 0]).columns)
+    ['Generation', 'nOC', 'nOB', 'nMMd', 'nMMr', 'total nMM']
+    """
+    t, y = run_schedule(schedule, y0, mutation_start)
+    return pd.DataFrame({'Generation': t, 'nOC': y[:, 0], 'nOB': y[:, 1],
+                'nMMd': y[:, 2], 'nMMr': y[:, 3], 'total nMM': y[:, 3]+ y[:, 2]})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Global sensitivity analysis of the fraction model to the 16 values
+              of the interaction matrix and the 4 cost values. The Sobol indices
+              (the part of the variance of the MM fraction that is caused by a
+              parameter alone (S1) or together with the other parameters (ST))
+              are determined with Saltelli sampling. Morris screening gives a
+              cheaper first indication of the important parameters with the
+              elementary effects (mu*, sigma).
+
+              All samples are evaluated in batches that are integrated together
+              (MM_scan.batch_odeint) and the batches are divided over multiple
+              processes that share the samples and the outputs (MM_shared.py).
+"""
+
+# Import the needed libraries
+import numpy as np
+import doctest
+from functools import partial
+from MM_kernels import fraction_rhs
+from MM_scan import batch_odeint
+from MM_shared import shared_map
+from MM_lazy import lazy_import
+
+# Import pandas and the sampling functions only when they are used
+pd = lazy_import('pandas')
+qmc = lazy_import('scipy.stats.qmc')
+
+# The cell types in the order of the interaction matrix
+CELL_TYPES = ['OC', 'OB', 'MMd', 'MMr']
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def parameter_names():
+    """Function that gives the names of the parameters, matrix[i, j] is the
+    effect of cell type j on cell type i (bj,i).
+
+    Example:
+    -----------
+    >>> names = parameter_names()
+    >>> len(names), names[8], names[-1]
+    (20, 'bOC,MMd', 'cMMr')
+    """
+    names = [f'b{CELL_TYPES[j]},{CELL_TYPES[i]}' for i in range(4) for j in
+                                                                    range(4)]
+    return names + [f'c{cell_type}' for cell_type in CELL_TYPES]
+
+def parameter_bounds(matrix, costs, spread = 0.1):
+    """Function that gives the lower and upper bound of every parameter, the
+    parameters can differ spread from their value.
+
+    Parameters:
+    -----------
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    costs: List
+        List with the cost values of the OC, OB, MMd and MMr.
+    spread: Float
+        The distance between the value and the bounds.
+
+    Returns:
+    --------
+    bounds: Numpy.ndarray
+        Array of shape (20, 2) with the lower and upper bounds.
+
+    Example:
+    -----------
+    >>> np.round(parameter_bounds(np.eye(4), [1, 0.8, 1.2, 1.3])[-2:], 2
+    ...                                                             ).tolist()
+    [[1.1, 1.3], [1.2, 1.4]]
+    """
+    values = np.append(np.ravel(matrix), costs).astype(float)
+    return np.column_stack((values - spread, values + spread))
+
+def samples_to_parameters(samples):
+    """Function that converts samples to interaction matrices and costs.
+
+    Parameters:
+    -----------
+    samples: Numpy.ndarray
+        Array of shape (samples, 20) with the parameter values.
+
+    Returns:
+    --------
+    matrix: Numpy.ndarray
+        Array of shape (samples, 4, 4) with the interaction matrices.
+    costs: Numpy.ndarray
+        Array of shape (samples, 4) with the cost values.
+    """
+    samples = np.asarray(samples, dtype = float)
+    return samples[:, :16].reshape(-1, 4, 4), samples[:, 16:]
+
+def saltelli_sample(bounds, n_base, seed = None):
+    """Function that makes the Saltelli samples for the Sobol indices. There are
+    two base sample matrices A and B (made with a scrambled Sobol sequence) and
+    for every parameter i a matrix AB_i that is A with column i of B.
+
+    Parameters:
+    -----------
+    bounds: Numpy.ndarray
+        Array of shape (parameters, 2) with the lower and upper bounds.
+    n_base: Int
+        The number of base samples (a power of two).
+    seed: Int
+        The seed of the random number generator.
+
+    Returns:
+    --------
+    samples: Numpy.ndarray
+        Array of shape (n_base * (parameters + 2), parameters) with A, B and
+        all AB_i under each other.
+
+    Example:
+    -----------
+    >>> samples = saltelli_sample(np.array([[0, 1], [0, 1], [0, 1]]), 8, 0)
+    >>> samples.shape
+    (40, 3)
+    >>> A, B, AB_1 = samples[:8], samples[8:16], samples[16:24]
+    >>> bool(np.all(AB_1[:, 0] == B[:, 0]) and np.all(AB_1[:, 1:] == A[:, 1:]))
+    True
+    """
+    bounds = np.asarray(bounds, dtype = float)
+    n_parameters = len(bounds)
+
+    # Make the base samples within the bounds
+    sampler = qmc.Sobol(2 * n_parameters, scramble = True, seed = seed)
+    base = qmc.scale(sampler.random(n_base), np.tile(bounds[:, 0], 2),
+                                                    np.tile(bounds[:, 1], 2))
+    A = base[:, :n_parameters]
+    B = base[:, n_parameters:]
+
+    # Make the AB_i matrices
+    samples = [A, B]
+    for i in range(n_parameters):
+        AB_i = A.copy()
+        AB_i[:, i] = B[:, i]
+        samples.append(AB_i)
+
+    return np.concatenate(samples)
+
+def sobol_indices(outputs, n_parameters, names = None):
+    """Function that determines the first order (S1) and total (ST) Sobol
+    indices from the outputs of the Saltelli samples (Saltelli et al., 2010 and
+    Jansen, 1999 estimators).
+
+    Parameters:
+    -----------
+    outputs: Numpy.ndarray
+        The model outputs of the samples of saltelli_sample.
+    n_parameters: Int
+        The number of parameters.
+    names: List
+        List with the names of the parameters.
+
+    Returns:
+    --------
+    df_sobol: DataFrame
+        Dataframe with the S1 and ST value of every parameter.
+
+    Example:
+    -----------
+    >>> samples = saltelli_sample(np.array([[0, 1], [0, 1]]), 4096, 1)
+    >>> outputs = samples[:, 0] + 2 * samples[:, 1]
+    >>> np.round(sobol_indices(outputs, 2, ['x1', 'x2']), 2)
+         S1   ST
+    x1  0.2  0.2
+    x2  0.8  0.8
+    """
+    outputs = np.asarray(outputs, dtype = float)
+    n_base = len(outputs) // (n_parameters + 2)
+    f_A = outputs[:n_base]
+    f_B = outputs[n_base: 2 * n_base]
+    f_AB = outputs[2 * n_base:].reshape(n_parameters, n_base)
+    variance = np.var(np.concatenate((f_A, f_B)))
+
+    first_order = np.mean(f_B * (f_AB - f_A), axis = 1) / variance
+    total = 0.5 * np.mean((f_A - f_AB) ** 2, axis = 1) / variance
+
+    return pd.DataFrame({'S1': first_order, 'ST': total}, index = names)
+
+def morris_sample(bounds, n_trajectories, n_levels = 4, seed = None):
+    """Function that makes the Morris trajectories. Every trajectory starts at a
+    random point of a grid with n_levels levels per parameter and changes one
+    parameter at a time (in a random order) with a step of
+    n_levels / (2 (n_levels - 1)) times the range.
+
+    Parameters:
+    -----------
+    bounds: Numpy.ndarray
+        Array of shape (parameters, 2) with the lower and upper bounds.
+    n_trajectories: Int
+        The number of trajectories.
+    n_levels: Int
+        The number of grid levels (an even number).
+    seed: Int
+        The seed of the random number generator.
+
+    Returns:
+    --------
+    samples: Numpy.ndarray
+        Array of shape (n_trajectories * (parameters + 1), parameters) with the
+        points of all trajectories under each other.
+
+    Example:
+    -----------
+    >>> samples = morris_sample(np.array([[0, 1], [0, 1], [0, 1]]), 5, seed = 0)
+    >>> samples.shape
+    (20, 3)
+    >>> steps = np.diff(samples[:4], axis = 0)
+    >>> np.count_nonzero(steps, axis = 1).tolist()
+    [1, 1, 1]
+    """
+    bounds = np.asarray(bounds, dtype = float)
+    n_parameters = len(bounds)
+    rng = np.random.default_rng(seed)
+    delta = n_levels / (2 * (n_levels - 1))
+
+    trajectories = []
+    for trajectory in range(n_trajectories):
+        # Choose a start point from which all steps stay within the range
+        start = rng.integers(0, n_levels // 2, n_parameters) / (n_levels - 1)
+        direction = rng.choice([-1, 1], n_parameters)
+        start = np.where(direction > 0, start, start + delta)
+
+        # Change the parameters one by one in a random order
+        points = [start]
+        for i in rng.permutation(n_parameters):
+            point = points[-1].copy()
+            point[i] += direction[i] * delta
+            points.append(point)
+        trajectories.append(np.array(points))
+
+    unit_samples = np.concatenate(trajectories)
+    return bounds[:, 0] + unit_samples * (bounds[:, 1] - bounds[:, 0])
+
+def morris_indices(samples, outputs, bounds, names = None):
+    """Function that determines the Morris measures from the elementary effects
+    of the trajectories: the mean (mu), the mean of the absolute values (mu*)
+    and the standard deviation (sigma).
+
+    Parameters:
+    -----------
+    samples: Numpy.ndarray
+        The samples of morris_sample.
+    outputs: Numpy.ndarray
+        The model outputs of the samples.
+    bounds: Numpy.ndarray
+        Array of shape (parameters, 2) with the lower and upper bounds.
+    names: List
+        List with the names of the parameters.
+
+    Returns:
+    --------
+    df_morris: DataFrame
+        Dataframe with mu, mu* and sigma of every parameter.
+
+    Example:
+    -----------
+    >>> bounds = np.array([[0, 1], [0, 1], [0, 1]])
+    >>> samples = morris_sample(bounds, 10, seed = 0)
+    >>> outputs = samples[:, 0] - 3 * samples[:, 1]
+    >>> np.round(morris_indices(samples, outputs, bounds, ['x1', 'x2', 'x3']),
+    ...                                                                     2)
+         mu  mu*  sigma
+    x1  1.0  1.0    0.0
+    x2 -3.0  3.0    0.0
+    x3  0.0  0.0    0.0
+    """
+    bounds = np.asarray(bounds, dtype = float)
+    n_parameters = len(bounds)
+    points = np.asarray(samples, dtype = float).reshape(-1, n_parameters + 1,
+                                                                n_parameters)
+    outputs = np.asarray(outputs, dtype = float).reshape(-1, n_parameters + 1)
+
+    # Determine the elementary effect of the parameter changed in every step
+    steps = np.diff(points, axis = 1) / (bounds[:, 1] - bounds[:, 0])
+    changed = np.argmax(np.abs(steps), axis = 2)
+    step_sizes = np.take_along_axis(steps, changed[..., np.newaxis],
+                                                            axis = 2)[..., 0]
+    effects = np.empty((len(points), n_parameters))
+    rows = np.arange(len(points))[:, np.newaxis]
+    effects[rows, changed] = np.diff(outputs, axis = 1) / step_sizes
+
+    return pd.DataFrame({'mu': effects.mean(axis = 0), 'mu*':
+                np.abs(effects).mean(axis = 0), 'sigma': effects.std(axis = 0,
+                ddof = 1) if len(effects) > 1 else 0.0}, index = names)
+
+def fraction_model_output(samples, y0, N, time, WMMd_inhibitor = 0):
+    """Function that determines the total MM fraction (xMMd + xMMr) after a
+    number of generations for a batch of samples.
+
+    Parameters:
+    -----------
+    samples: Numpy.ndarray
+        Array of shape (samples, 20) with the interaction matrix values and the
+        cost values.
+    y0: List
+        List with the start values of xOC, xOB, xMMd and xMMr.
+    N: Int
+        Number of cells in the difussion range.
+    time: Int
+        The number of generations.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    total_xMM: Numpy.ndarray
+        The total MM fraction of every sample.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 1.6, 2.2, 1.9],
+    ...    [1.0, 0.0, -0.5, -0.5],
+    ...    [2.2, 0.0, 0.2, 0.0],
+    ...    [1.9, 0.0, -0.8, 0.2]])
+    >>> samples = np.array([np.append(matrix, [1, 0.8, 1.2, 1.3])])
+    >>> np.round(fraction_model_output(samples, [0.2, 0.3, 0.2, 0.3], 50, 100),
+    ...                                                             4).tolist()
+    [0.4339]
+    """
+    matrix, costs = samples_to_parameters(samples)
+    y0 = np.broadcast_to(np.asarray(y0, dtype = float), (len(matrix), 4))
+    t = np.array([0.0, time])
+    y = batch_odeint(lambda y, t: fraction_rhs(y, N, costs, matrix,
+                                                    WMMd_inhibitor), y0, t)
+    return y[-1, :, 2] + y[-1, :, 3]
+
+def evaluate_chunk(start, stop, arrays, y0, N, time, WMMd_inhibitor):
+    """Function that evaluates the samples start to stop and writes the total
+    MM fractions in the outputs (the function of shared_map)."""
+    arrays['total xMM'][start:stop] = fraction_model_output(
+                arrays['samples'][start:stop], y0, N, time, WMMd_inhibitor)
+
+def evaluate_samples(samples, y0, N, time, WMMd_inhibitor = 0,
+                                        chunk_size = 1000, n_workers = None):
+    """Function that evaluates the fraction model for all samples. The samples
+    are integrated in batches of chunk_size samples that are divided over
+    n_workers processes, the samples and outputs are in shared memory.
+
+    Parameters:
+    -----------
+    samples: Numpy.ndarray
+        Array of shape (samples, 20) with the interaction matrix values and the
+        cost values.
+    y0: List
+        List with the start values of xOC, xOB, xMMd and xMMr.
+    N: Int
+        Number of cells in the difussion range.
+    time: Int
+        The number of generations.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+    chunk_size: Int
+        The number of samples that are integrated together.
+    n_workers: Int
+        The number of processes, with 1 everything is done in this process and
+        with None the number of processors is used.
+
+    Returns:
+    --------
+    outputs: Numpy.ndarray
+        The total MM fraction of every sample.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 1.6, 2.2, 1.9],
+    ...    [1.0, 0.0, -0.5, -0.5],
+    ...    [2.2, 0.0, 0.2, 0.0],
+    ...    [1.9, 0.0, -0.8, 0.2]])
+    >>> bounds = parameter_bounds(matrix, [1, 0.8, 1.2, 1.3], 0.05)
+    >>> samples = morris_sample(bounds, 4, seed = 3)
+    >>> outputs = evaluate_samples(samples, [0.2, 0.3, 0.2, 0.3], 50, 50,
+    ...                                         chunk_size = 30, n_workers = 2)
+    >>> bool(np.allclose(outputs, fraction_model_output(samples,
+    ...                         [0.2, 0.3, 0.2, 0.3], 50, 50), atol = 1e-6))
+    True
+    """
+    samples = np.asarray(samples, dtype = float)
+    function = partial(evaluate_chunk, y0 = y0, N = N, time = time,
+                                            WMMd_inhibitor = WMMd_inhibitor)
+    outputs = shared_map(function, len(samples), {'samples': samples},
+                    {'total xMM': len(samples)}, chunk_size, n_workers)
+    return outputs['total xMM']
+
+if __name__ == "__main__":
+    main()
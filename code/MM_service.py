@@ -0,0 +1,379 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code of a local job service, so the model can be used without a
+              Python environment of your own. The service is a HTTP server (only
+              the standard library) that gets a scenario or function of
+              MM_run.py with its inputs as JSON and gives the result as JSON.
+              Only the scenarios and the functions of ALLOWED_FUNCTIONS can be
+              run and a request should have the Content-Type application/json,
+              so other programs or web pages can not run other code with it.
+              The runs are done by a pool of worker processes that have the
+              model files already imported, so a request does not wait for the
+              imports. Identical requests that are busy are run only once and
+              the results are saved in the result cache of MM_cache.py, so a
+              repeated request is answered from the cache.
+
+              Start the service (on http://127.0.0.1:8150):
+              python MM_service.py --workers 4
+              Ask the average MM number of the last cycle of a schedule:
+              curl -H 'Content-Type: application/json' -d '{"target":
+                  "cycle_average", "parameters": {"t_steps_drug": 8,
+                  "matrix_GF_IH[2,0]": 0.3}}' http://127.0.0.1:8150/run
+              GET /scenarios gives the scenarios and GET /status the numbers of
+              requests, cache hits and deduplicated requests.
+"""
+
+# Import the needed libraries
+import sys
+import json
+import inspect
+import argparse
+import importlib
+import threading
+import traceback
+import doctest
+from concurrent.futures import ProcessPoolExecutor, Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from MM_run import SCENARIOS, find_function, set_parameters
+from MM_cache import ResultCache, cache_key
+from MM_render import set_batch_mode
+from MM_storage import to_json
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+# The address of the service
+HOST = '127.0.0.1'
+PORT = 8150
+
+# The modules that the worker processes import when they start
+WARM_MODULES = ['numpy', 'scipy.integrate', 'scipy.optimize', 'pandas',
+                'MM_model_nr_IH_inf', 'MM_schedule', 'MM_dense', 'MM_run']
+
+# The functions (module.function) that can be run besides the scenarios
+ALLOWED_FUNCTIONS = ['MM_model_nr_IH_inf.switch_dataframe',
+                     'MM_model_nr_IH_inf.continuous_add_IH_df',
+                     'MM_model_nr_IH_inf.minimal_tumour_numb_t_steps',
+                     'MM_model_nr_IH_inf.dataframe_3D_plot',
+                     'MM_run.optimise_order', 'MM_run.cycle_average']
+
+# The maximum number of seconds a request waits for its result
+REQUEST_TIMEOUT = 600
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Start the service
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description = 'Start the service.')
+        parser.add_argument('--host', default = HOST)
+        parser.add_argument('--port', type = int, default = PORT)
+        parser.add_argument('--workers', type = int, default = 1)
+        parser.add_argument('--no-cache', action = 'store_true', help =
+                                            'do not use the result cache')
+        arguments = parser.parse_args()
+
+        service = JobService(arguments.workers, not arguments.no_cache)
+        server = make_server(service, arguments.host, arguments.port)
+        print(f'Serving on http://{arguments.host}:{server.server_port}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.shutdown()
+
+def warm_up():
+    """Function that is run by every worker process when it starts, it imports
+    the model files and turns batch mode on."""
+    set_batch_mode()
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
+def json_result(result):
+    """Function that converts a result to JSON values, a dataframe becomes a
+    dictionary with a list per column.
+
+    Example:
+    -----------
+    >>> json_result((pd.DataFrame({'Generation': [0, 1]}), 2.5))
+    [{'Generation': [0, 1]}, 2.5]
+    """
+    if isinstance(result, pd.DataFrame):
+        return {str(name): to_json(column.tolist()) for name, column in
+                                                            result.items()}
+    if isinstance(result, (list, tuple)):
+        return [json_result(item) for item in result]
+    if isinstance(result, dict):
+        return {str(name): json_result(item) for name, item in result.items()}
+    return to_json(result)
+
+def compute(module_name, function_name, parameters):
+    """Function that does a run in a worker process and gives the result as
+    JSON values."""
+    function = getattr(importlib.import_module(module_name), function_name)
+    return json_result(function(**parameters))
+
+class RequestError(Exception):
+    """Error of a request that can not be run, such as an unknown scenario or
+    input."""
+
+class JobService:
+    """Class of the service that divides the requests over a pool of warm
+    worker processes.
+
+    Parameters:
+    -----------
+    n_workers: Int
+        The number of worker processes.
+    use_cache: Bool
+        True to save the results in the result cache and to answer repeated
+        requests from it.
+    cache: ResultCache
+        The result cache, by default the cache of MM_cache.py.
+
+    Example:
+    -----------
+    >>> import tempfile, shutil
+    >>> folder = tempfile.mkdtemp()
+    >>> service = JobService(1, cache = ResultCache(folder))
+    >>> parameters = {'t_steps_drug': 8, 'n_cycles': 3}
+    >>> first = service.submit('cycle_average', parameters)
+    >>> second = service.submit('cycle_average', dict(parameters))
+    >>> first is second
+    True
+    >>> result = first.result()
+    >>> repeat = service.submit('cycle_average', parameters)
+    >>> repeat.result() == result
+    True
+    >>> status = service.status()
+    >>> status['runs'], status['deduplicated'], status['cache hits']
+    (1, 1, 1)
+    >>> service.submit('cycle_average', {'n_switches': 3})
+    ... # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    MM_service.RequestError: got an unexpected keyword argument 'n_switches'
+    >>> service.submit('subprocess.getoutput', {'cmd': 'echo run'})
+    ... # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    MM_service.RequestError: Unknown target: subprocess.getoutput
+    >>> service.shutdown()
+    >>> shutil.rmtree(folder)
+    """
+    def __init__(self, n_workers = 1, use_cache = True, cache = None):
+        self.pool = ProcessPoolExecutor(max_workers = n_workers,
+                                                    initializer = warm_up)
+        self.use_cache = use_cache
+        self.cache = cache or ResultCache()
+        self.running = {}
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'runs': 0, 'deduplicated': 0,
+                                                'cache hits': 0, 'failed': 0}
+
+        # Start all worker processes now, so the first requests do not wait
+        for future in [self.pool.submit(int) for _ in range(n_workers)]:
+            future.result()
+
+    def submit(self, target, parameters = None):
+        """Function that starts a request, or gives the busy run of an
+        identical request or the result from the cache.
+
+        Parameters:
+        -----------
+        target: String
+            The name of a scenario or module.function (MM_run.py) of
+            ALLOWED_FUNCTIONS.
+        parameters: Dictionary
+            The inputs that are set (over the defaults of a scenario).
+
+        Returns:
+        --------
+        future: Future
+            The future of the result as JSON values.
+        """
+        # Only run the scenarios and the allowed model functions
+        if target not in SCENARIOS and target not in ALLOWED_FUNCTIONS:
+            raise RequestError(f"Unknown target: {target}, the targets are "
+                    f"{', '.join(list(SCENARIOS) + ALLOWED_FUNCTIONS)}")
+
+        try:
+            module_name, function_name, defaults = find_function(target)
+            parameters = set_parameters(defaults, parameters or {})
+            function = getattr(importlib.import_module(module_name),
+                                                                function_name)
+            inspect.signature(function).bind(**parameters)
+            name = f'{module_name}.{function_name}'
+            key = cache_key(name, (), parameters)
+        except (KeyError, TypeError, ValueError, ImportError,
+                                                AttributeError) as error:
+            raise RequestError(error.args[0] if error.args else
+                                                        str(error)) from None
+
+        with self.lock:
+            self.counts['requests'] += 1
+            if key in self.running:
+                self.counts['deduplicated'] += 1
+                return self.running[key]
+
+            if self.use_cache:
+                found, result = self.cache.load(name, key)
+                if found:
+                    self.counts['cache hits'] += 1
+                    future = Future()
+                    future.set_result(result)
+                    return future
+
+            # The future of the request is finished after the result is saved
+            self.counts['runs'] += 1
+            future = Future()
+            self.running[key] = future
+        run = self.pool.submit(compute, module_name, function_name, parameters)
+        run.add_done_callback(lambda run: self.finish(name, key, run, future))
+        return future
+
+    def finish(self, name, key, run, future):
+        """Function that saves the result of a finished run in the cache,
+        removes the run from the busy runs and gives the result to the future
+        of the request."""
+        error = run.exception() if not run.cancelled() else \
+                                                    RuntimeError('Cancelled')
+        if self.use_cache and error is None:
+            self.cache.save(name, key, run.result())
+        with self.lock:
+            self.running.pop(key, None)
+            self.counts['failed'] += error is not None
+        if error is None:
+            future.set_result(run.result())
+        else:
+            future.set_exception(error)
+
+    def status(self):
+        """Function that gives the numbers of requests, runs, deduplicated
+        requests, cache hits, failed runs and busy runs."""
+        with self.lock:
+            return dict(self.counts, busy = len(self.running))
+
+    def shutdown(self):
+        """Function that stops the worker processes."""
+        self.pool.shutdown(cancel_futures = True)
+
+def make_server(service, host = HOST, port = PORT):
+    """Function that makes the HTTP server of a service.
+
+    Parameters:
+    -----------
+    service: JobService
+        The service that runs the requests.
+    host: String
+        The host name, by default only this computer.
+    port: Int
+        The port, with 0 a free port is chosen.
+
+    Returns:
+    --------
+    server: ThreadingHTTPServer
+        The server, every request is handled in its own thread.
+
+    Example:
+    -----------
+    >>> import tempfile, shutil, urllib.request
+    >>> folder = tempfile.mkdtemp()
+    >>> server = make_server(JobService(cache = ResultCache(folder)), port = 0)
+    >>> thread = threading.Thread(target = server.serve_forever)
+    >>> thread.start()
+    >>> url = f'http://{HOST}:{server.server_port}/run'
+    >>> data = json.dumps({'target': 'cycle_average', 'parameters':
+    ...                                             {'n_cycles': 3}}).encode()
+    >>> request = urllib.request.Request(url, data, headers = {'Content-Type':
+    ...                                                 'application/json'})
+    >>> with urllib.request.urlopen(request) as response:
+    ...     answer = json.load(response)
+    >>> sorted(answer['result'])
+    ['MM number', 'nMMd', 'nMMr']
+    >>> urllib.request.urlopen(url, data)
+    Traceback (most recent call last):
+    ...
+    urllib.error.HTTPError: HTTP Error 415: Unsupported Media Type
+    >>> server.shutdown(); server.server_close(); server.service.shutdown()
+    >>> shutil.rmtree(folder)
+    """
+    server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Class that handles the HTTP requests of the service:
+    POST /run with {"target": ..., "parameters": {...}} runs a scenario (only
+    with the Content-Type application/json),
+    GET /scenarios gives the scenarios and their default inputs and
+    GET /status gives the numbers of the service."""
+
+    def send_json(self, status, value):
+        """Function that sends a JSON answer."""
+        body = json.dumps(value).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == '/status':
+            self.send_json(200, service.status())
+        elif self.path == '/scenarios':
+            self.send_json(200, {name: {'function': f"{scenario['module']}."
+                    f"{scenario['function']}", 'parameters':
+                    to_json(scenario['parameters'])} for name, scenario in
+                    SCENARIOS.items()})
+        else:
+            self.send_json(404, {'error': f'Unknown path: {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/run':
+            self.send_json(404, {'error': f'Unknown path: {self.path}'})
+            return
+
+        # A web page can not send JSON to another address without asking first
+        content_type = self.headers.get('Content-Type', '').split(';')[0]
+        if content_type.strip().lower() != 'application/json':
+            self.send_json(415, {'error': 'The Content-Type should be '
+                                                        'application/json'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            target = request['target']
+            future = self.server.service.submit(target,
+                                            request.get('parameters', {}))
+        except (ValueError, KeyError, TypeError, RequestError) as error:
+            self.send_json(400, {'error': f'{type(error).__name__}: {error}'})
+            return
+
+        try:
+            result = future.result(timeout = REQUEST_TIMEOUT)
+        except Exception:
+            self.send_json(500, {'target': target, 'error':
+                                                    traceback.format_exc()})
+            return
+        self.send_json(200, {'target': target, 'result': result})
+
+    def log_message(self, format, *args):
+        """Function that only shows the requests in the terminal when the
+        service is started from the command line."""
+        if __name__ == '__main__':
+            super().log_message(format, *args)
+
+if __name__ == "__main__":
+    main()
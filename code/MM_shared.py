@@ -0,0 +1,191 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to run the chunks of a large batch (the samples of the
+              sensitivity analysis, the patients of a cohort or the values of a
+              scan) in multiple processes without copying the data to and from
+              every process. The inputs (matrices, rates, start values) and the
+              arrays for the results are placed in shared memory once. Every
+              worker process attaches to them when it starts, a task is then
+              only the first and last index of a chunk and the worker writes
+              its results directly in the shared result arrays. So the payoff
+              matrices, rates and start values are not pickled for every task
+              and no dataframes are sent back.
+"""
+
+# Import the needed libraries
+import numpy as np
+import doctest
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+# The shared arrays and the function of a worker process
+WORKER = {}
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+class SharedArrays:
+    """Class of named arrays in shared memory. The memory is removed with
+    close, or at the end of a with block.
+
+    Parameters:
+    -----------
+    inputs: Dictionary
+        The arrays that are copied to shared memory.
+    outputs: Dictionary
+        The shapes of the result arrays (of floats), which start with zeros.
+
+    Example:
+    -----------
+    >>> with SharedArrays({'matrix': np.eye(2)}, {'total nMM': 3}) as shared:
+    ...     blocks, arrays = attach(shared.specification())
+    ...     arrays['total nMM'][1] = 2.5
+    ...     print(shared.arrays['total nMM'], arrays['matrix'].tolist())
+    ...     del arrays
+    ...     for block in blocks.values():
+    ...         block.close()
+    [0.  2.5 0. ] [[1.0, 0.0], [0.0, 1.0]]
+    """
+    def __init__(self, inputs = None, outputs = None):
+        self.blocks = {}
+        self.arrays = {}
+        try:
+            for name, value in (inputs or {}).items():
+                value = np.asarray(value)
+                self.allocate(name, value.shape, value.dtype)[...] = value
+            for name, shape in (outputs or {}).items():
+                self.allocate(name, shape, float).fill(0)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+        return False
+
+    def allocate(self, name, shape, dtype):
+        """Function that makes an array in a new block of shared memory."""
+        shape = tuple(np.atleast_1d(shape).astype(int).tolist())
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        block = shared_memory.SharedMemory(create = True, size = size)
+        self.blocks[name] = block
+        self.arrays[name] = np.ndarray(shape, dtype, buffer = block.buf)
+        return self.arrays[name]
+
+    def specification(self):
+        """Function that gives per array the name of the shared memory block,
+        the shape and the type, which is all a process needs to attach."""
+        return {name: (self.blocks[name].name, array.shape, array.dtype.str)
+                                        for name, array in self.arrays.items()}
+
+    def close(self):
+        """Function that removes the shared memory."""
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+def attach(specification):
+    """Function that attaches to the arrays of a specification.
+
+    Parameters:
+    -----------
+    specification: Dictionary
+        The specification of SharedArrays.
+
+    Returns:
+    --------
+    blocks: Dictionary
+        The shared memory blocks, they have to be kept as long as the arrays
+        are used.
+    arrays: Dictionary
+        The arrays.
+    """
+    blocks, arrays = {}, {}
+    for name, (block_name, shape, dtype) in specification.items():
+        blocks[name] = shared_memory.SharedMemory(name = block_name)
+        arrays[name] = np.ndarray(shape, dtype, buffer = blocks[name].buf)
+    return blocks, arrays
+
+def start_worker(function, specification):
+    """Function that is run by every worker process when it starts, it
+    attaches to the shared arrays."""
+    WORKER['blocks'], WORKER['arrays'] = attach(specification)
+    WORKER['function'] = function
+
+def run_task(start, stop):
+    """Function that runs the function of the worker for one chunk."""
+    WORKER['function'](start, stop, WORKER['arrays'])
+
+def shared_map(function, n_items, inputs, outputs, chunk_size = 1000,
+                                                            n_workers = None):
+    """Function that runs a function for all chunks of a batch, the chunks are
+    divided over n_workers processes that share the inputs and outputs.
+
+    Parameters:
+    -----------
+    function: Function
+        Function function(start, stop, arrays) that reads the items start to
+        stop of the input arrays and writes the results of these items in the
+        output arrays. It is sent once to every process, so it has to be
+        picklable (a module function or a functools.partial of one).
+    n_items: Int
+        The number of items of the batch.
+    inputs: Dictionary
+        The input arrays.
+    outputs: Dictionary
+        The shapes of the output arrays.
+    chunk_size: Int
+        The number of items of a chunk.
+    n_workers: Int
+        The number of processes, with 1 everything is done in this process
+        (without shared memory) and with None the number of processors is used.
+
+    Returns:
+    --------
+    outputs: Dictionary
+        The output arrays.
+
+    Example:
+    -----------
+    >>> from functools import partial
+    >>> outputs = shared_map(partial(scale_rows, factor = 2), 5,
+    ...     {'values': np.arange(5.0)}, {'result': 5}, chunk_size = 2,
+    ...     n_workers = 2)
+    >>> outputs['result'].tolist()
+    [0.0, 2.0, 4.0, 6.0, 8.0]
+    """
+    starts = list(range(0, n_items, chunk_size))
+    stops = [min(start + chunk_size, n_items) for start in starts]
+
+    if n_workers == 1:
+        arrays = {name: np.asarray(value) for name, value in inputs.items()}
+        arrays.update({name: np.zeros(shape) for name, shape in
+                                                            outputs.items()})
+        for start, stop in zip(starts, stops):
+            function(start, stop, arrays)
+        return {name: arrays[name] for name in outputs}
+
+    with SharedArrays(inputs, outputs) as shared:
+        with ProcessPoolExecutor(n_workers, initializer = start_worker,
+                    initargs = (function, shared.specification())) as executor:
+            list(executor.map(run_task, starts, stops))
+        return {name: shared.arrays[name].copy() for name in outputs}
+
+def scale_rows(start, stop, arrays, factor):
+    """Function that multiplies the values of a chunk by a factor (an example
+    of a function for shared_map)."""
+    arrays['result'][start:stop] = arrays['values'][start:stop] * factor
+
+if __name__ == "__main__":
+    main()
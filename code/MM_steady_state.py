@@ -0,0 +1,571 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code that determines the fixed points (equilibria) of the number
+              and fraction models of the multiple myeloma (MM) microenvironment
+              and classifies their stability with the eigenvalues of the
+              Jacobian of the system. The long-term cell numbers or fractions can
+              in this way be determined without integrating the model over a
+              long time. Only when there is not exactly one stable fixed point
+              the model is integrated.
+
+              Number model: with n_i > 0 the fixed point condition
+              g_i * prod_j n_j**b_j,i = (d_i + WMMd_IH) * n_i is linear in log(n),
+              so the interior fixed point and the fixed points on the boundary
+              (some cell types are zero) follow from a linear system. The results
+              are polished with root finding on the analytic RHS.
+
+              Fraction model: on the face of the simplex where only the cell
+              types in S are present, the fixed point condition is that all
+              fitness values in S are equal, this is again a linear system.
+"""
+
+# Import the needed libraries
+import itertools
+import numpy as np
+from scipy.integrate import odeint
+from scipy.optimize import root
+import doctest
+from MM_kernels import (number_rhs, number_jacobian, fitness_matrix,
+                                                fraction_rhs, fraction_jacobian)
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def classify_stability(eigenvalues, tolerance = 1e-9):
+    """Function that classifies the stability of a fixed point based on the
+    eigenvalues of the Jacobian in that point.
+
+    Parameters:
+    -----------
+    eigenvalues: Numpy.ndarray
+        The eigenvalues of the Jacobian.
+    tolerance: Float
+        Real parts with an absolute value below the tolerance count as zero.
+
+    Returns:
+    --------
+    stability: String
+        'stable' (all real parts negative), 'unstable' (a positive real part),
+        'marginal' (largest real part zero) or 'undetermined' (the Jacobian is
+        not finite).
+
+    Example:
+    -----------
+    >>> classify_stability(np.array([-0.2 + 0.1j, -0.2 - 0.1j, -1.0]))
+    'stable'
+    >>> classify_stability(np.array([-0.5, 0.3]))
+    'unstable'
+    >>> classify_stability(np.array([np.nan, -1.0]))
+    'undetermined'
+    """
+    eigenvalues = np.asarray(eigenvalues)
+    if not np.all(np.isfinite(eigenvalues)):
+        return 'undetermined'
+
+    # Look at the largest real part
+    max_real = np.max(eigenvalues.real)
+    if max_real > tolerance:
+        return 'unstable'
+    if max_real < -tolerance:
+        return 'stable'
+    return 'marginal'
+
+def jacobian_eigenvalues(jacobian):
+    """Function that determines the eigenvalues of a Jacobian. When the Jacobian
+    is not finite an array of NaN values is returned.
+
+    Parameters:
+    -----------
+    jacobian: Numpy.ndarray
+        Square Jacobian matrix.
+
+    Returns:
+    --------
+    eigenvalues: Numpy.ndarray
+        The eigenvalues, sorted from the largest to the smallest real part.
+
+    Example:
+    -----------
+    >>> jacobian_eigenvalues(np.array([[-1.0, 0.0], [0.0, 0.5]])).tolist()
+    [(0.5+0j), (-1+0j)]
+    """
+    if not np.all(np.isfinite(jacobian)):
+        return np.full(len(jacobian), np.nan, dtype = complex)
+
+    eigenvalues = np.linalg.eigvals(jacobian).astype(complex)
+    return eigenvalues[np.argsort(-eigenvalues.real, kind = 'stable')]
+
+def simplex_eigenvalues(jacobian):
+    """Function that determines the eigenvalues of the Jacobian of the fraction
+    model restricted to the simplex (the fractions sum up to one). The direction
+    out of the simplex is left out, so three eigenvalues remain.
+
+    Parameters:
+    -----------
+    jacobian: Numpy.ndarray
+        4x4 Jacobian of the fraction model.
+
+    Returns:
+    --------
+    eigenvalues: Numpy.ndarray
+        The three eigenvalues on the simplex, sorted from the largest to the
+        smallest real part.
+
+    Example:
+    -----------
+    >>> np.round(simplex_eigenvalues(np.diag([-1.0, -1.0, -1.0, -1.0])).real,
+    ...                                                             3).tolist()
+    [-1.0, -1.0, -1.0]
+    """
+    # Orthonormal basis of the vectors of which the elements sum to zero
+    basis = np.linalg.svd(np.ones((1, 4)))[2][1:].T
+    return jacobian_eigenvalues(basis.T @ jacobian @ basis)
+
+def fixed_points_nr(growth_rates, decay_rates, matrix, WMMd_inhibitor = 0):
+    """Function that determines all the fixed points of the number model and
+    their stability. Per combination of present cell types the fixed point
+    follows from a linear system in log(n), which is polished with root finding
+    on the RHS.
+
+    Parameters:
+    -----------
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    df_fixed_points: DataFrame
+        Dataframe with the nOC, nOB, nMMd, nMMr and total nMM value, the
+        stability and the four Jacobian eigenvalues of every fixed point.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.4, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]])
+    >>> df = fixed_points_nr([0.7, 1.3, 0.3, 0.3], [1.0, 0.08, 0.2, 0.1], matrix)
+    >>> df[['nMMd', 'nMMr', 'Stability']].round(4).values.tolist()
+    [[7.9181, 13.8201, 'stable']]
+    """
+    growth_rates = np.asarray(growth_rates, dtype = float)
+    matrix = np.asarray(matrix, dtype = float)
+    loss_rates = np.asarray(decay_rates, dtype = float).copy()
+    loss_rates[2] += WMMd_inhibitor
+
+    rows = []
+    for n_present in range(4, -1, -1):
+        for present in itertools.combinations(range(4), n_present):
+            present = list(present)
+            absent = [i for i in range(4) if i not in present]
+
+            # Present cell types can not depend on absent cell types
+            if np.any(matrix[np.ix_(present, absent)] != 0):
+                continue
+
+            # Absent cell types stay absent when their growth term is zero
+            if not all(growth_rates[i] == 0 or (np.any(matrix[i, absent] > 0)
+                    and np.all(matrix[i, absent] >= 0)) for i in absent):
+                continue
+
+            numbers = np.zeros(4)
+            if present:
+                if np.any(growth_rates[present] <= 0) or \
+                                            np.any(loss_rates[present] <= 0):
+                    continue
+
+                # Solve (B - I) log(n) = log(d + W) - log(g) for the present
+                # cell types
+                system = matrix[np.ix_(present, present)] - np.eye(n_present)
+                right_side = np.log(loss_rates[present]) - \
+                                                np.log(growth_rates[present])
+                log_numbers = np.linalg.lstsq(system, right_side, rcond=None)[0]
+                if not np.allclose(system @ log_numbers, right_side):
+                    continue
+                numbers[present] = np.exp(log_numbers)
+
+                # Polish the fixed point with root finding on the analytic RHS
+                numbers = polish_fixed_point_nr(numbers, present, growth_rates,
+                                            decay_rates, matrix, WMMd_inhibitor)
+                if numbers is None:
+                    continue
+
+            # Determine the stability with the Jacobian eigenvalues
+            jacobian = number_jacobian(numbers, growth_rates, decay_rates,
+                                                        matrix, WMMd_inhibitor)
+            eigenvalues = jacobian_eigenvalues(jacobian)
+            rows.append({'nOC': numbers[0], 'nOB': numbers[1],
+                'nMMd': numbers[2], 'nMMr': numbers[3],
+                'total nMM': numbers[2] + numbers[3],
+                'Stability': classify_stability(eigenvalues),
+                'Eigenvalue 1': eigenvalues[0], 'Eigenvalue 2': eigenvalues[1],
+                'Eigenvalue 3': eigenvalues[2], 'Eigenvalue 4': eigenvalues[3]})
+
+    column_names = ['nOC', 'nOB', 'nMMd', 'nMMr', 'total nMM', 'Stability',
+                'Eigenvalue 1', 'Eigenvalue 2', 'Eigenvalue 3', 'Eigenvalue 4']
+    return pd.DataFrame(rows, columns = column_names)
+
+def polish_fixed_point_nr(numbers, present, growth_rates, decay_rates, matrix,
+                                                            WMMd_inhibitor = 0):
+    """Function that refines a fixed point of the number model with root finding
+    on the RHS of the present cell types.
+
+    Parameters:
+    -----------
+    numbers: Numpy.ndarray
+        The approximate nOC, nOB, nMMd and nMMr values of the fixed point.
+    present: List
+        The indices of the cell types that are present (n > 0).
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    numbers: Numpy.ndarray
+        The refined fixed point or None if no valid fixed point was found.
+
+    Example:
+    -----------
+    >>> np.round(polish_fixed_point_nr(np.array([0.0, 0.0, 1.4, 0.0]), [2],
+    ...    [0.0, 0.0, 0.5, 0.0], [1.0, 1.0, 0.25, 1.0], np.array([
+    ...    [0.0, 0.0, 0.0, 0.0],
+    ...    [0.0, 0.0, 0.0, 0.0],
+    ...    [0.0, 0.0, 0.5, 0.0],
+    ...    [0.0, 0.0, 0.0, 0.0]])), 6).tolist()
+    [0.0, 0.0, 4.0, 0.0]
+    """
+    def rhs_present(values):
+        full = numbers.copy()
+        full[present] = values
+        return number_rhs(full, growth_rates, decay_rates, matrix,
+                                                    WMMd_inhibitor)[present]
+
+    def jacobian_present(values):
+        full = numbers.copy()
+        full[present] = values
+        return number_jacobian(full, growth_rates, decay_rates, matrix,
+                                    WMMd_inhibitor)[np.ix_(present, present)]
+
+    solution = root(rhs_present, numbers[present], jac = jacobian_present)
+    polished = numbers.copy()
+    polished[present] = solution.x
+
+    # Check that the fixed point is valid
+    if not np.all(np.isfinite(polished)) or np.any(polished[present] <= 0):
+        return None
+    scale = np.maximum(np.abs(polished), 1.0)
+    change = number_rhs(polished, growth_rates, decay_rates, matrix,
+                                                                WMMd_inhibitor)
+    if not np.all(np.abs(change) <= 1e-8 * scale):
+        return None
+
+    return polished
+
+def fixed_points_frac(N, cOC, cOB, cMMd, cMMr, matrix, WMMd_inhibitor = 0):
+    """Function that determines all the fixed points of the fraction model on
+    the simplex and their stability. Per combination of present cell types the
+    fitness values of the present cell types have to be equal.
+
+    Parameters:
+    -----------
+    N: Int
+        Number of cells in the difussion range.
+    cOC: Float
+        Cost parameter OC.
+    cOB: Float
+        Cost parameter OB.
+    cMMd: Float
+        Cost parameter MMd.
+    cMMr: Float
+        Cost parameter MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    df_fixed_points: DataFrame
+        Dataframe with the xOC, xOB, xMMd, xMMr and total xMM value, the
+        stability and the three Jacobian eigenvalues on the simplex of every
+        fixed point.
+
+    Example:
+    -----------
+    >>> df = fixed_points_frac(10, 1, 1, 1, 1, np.array([
+    ...    [0.0, 1.0, 0.0, 0.0],
+    ...    [1.0, 0.0, 0.0, 0.0],
+    ...    [0.0, 0.0, 0.0, 0.0],
+    ...    [0.0, 0.0, 0.0, 0.0]]))
+    >>> df[df['Stability'] == 'stable'][['xOC', 'xOB']].round(6).values.tolist()
+    [[0.5, 0.5]]
+    """
+    costs = np.array([cOC, cOB, cMMd, cMMr], dtype = float)
+    A = fitness_matrix(N, costs, matrix)
+    penalty = costs.copy()
+    penalty[2] += WMMd_inhibitor * (N - 1) / N
+
+    rows = []
+    for n_present in range(4, 0, -1):
+        for present in itertools.combinations(range(4), n_present):
+            present = list(present)
+
+            # Solve A_SS x_S - lambda = c_S (+ IH) and sum(x_S) = 1
+            system = np.zeros((n_present + 1, n_present + 1))
+            system[:n_present, :n_present] = A[np.ix_(present, present)]
+            system[:n_present, n_present] = -1.0
+            system[n_present, :n_present] = 1.0
+            right_side = np.append(penalty[present], 1.0)
+            solution = np.linalg.lstsq(system, right_side, rcond = None)[0]
+            if not np.allclose(system @ solution, right_side):
+                continue
+
+            # The fractions have to be on the simplex
+            fractions = np.zeros(4)
+            fractions[present] = solution[:n_present]
+            if np.any(fractions[present] <= 0):
+                continue
+
+            change = fraction_rhs(fractions, N, costs, matrix, WMMd_inhibitor)
+            if not np.all(np.abs(change) <= 1e-10):
+                continue
+
+            # Determine the stability with the Jacobian eigenvalues
+            jacobian = fraction_jacobian(fractions, N, costs, matrix,
+                                                                WMMd_inhibitor)
+            eigenvalues = simplex_eigenvalues(jacobian)
+            rows.append({'xOC': fractions[0], 'xOB': fractions[1],
+                'xMMd': fractions[2], 'xMMr': fractions[3],
+                'total xMM': fractions[2] + fractions[3],
+                'Stability': classify_stability(eigenvalues),
+                'Eigenvalue 1': eigenvalues[0], 'Eigenvalue 2': eigenvalues[1],
+                'Eigenvalue 3': eigenvalues[2]})
+
+    column_names = ['xOC', 'xOB', 'xMMd', 'xMMr', 'total xMM', 'Stability',
+                                'Eigenvalue 1', 'Eigenvalue 2', 'Eigenvalue 3']
+    return pd.DataFrame(rows, columns = column_names)
+
+def unique_stable_fixed_point(df_fixed_points):
+    """Function that returns the stable fixed point if there is exactly one.
+
+    Parameters:
+    -----------
+    df_fixed_points: DataFrame
+        Dataframe made by fixed_points_nr or fixed_points_frac.
+
+    Returns:
+    --------
+    fixed_point: Series
+        The row of the stable fixed point or None if there is no stable fixed
+        point or more than one.
+
+    Example:
+    -----------
+    >>> df = pd.DataFrame({'nMMd': [1.0, 2.0], 'Stability': ['stable',
+    ...                                                         'unstable']})
+    >>> float(unique_stable_fixed_point(df)['nMMd'])
+    1.0
+    """
+    df_stable = df_fixed_points[df_fixed_points['Stability'] == 'stable']
+    if len(df_stable) != 1:
+        return None
+    return df_stable.iloc[0]
+
+def steady_state_nr(y0, growth_rates, decay_rates, matrix, WMMd_inhibitor = 0,
+                                                                time = 140):
+    """Function that determines the long-term cell numbers of the number model.
+    When there is exactly one stable fixed point this fixed point is returned,
+    otherwise the model is integrated from y0 and the last numbers are returned.
+
+    Parameters:
+    -----------
+    y0: List
+        List with the start values of nOC, nOB, nMMd and nMMr.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+    time: Int
+        The number of generations that is integrated when there is no unique
+        stable fixed point.
+
+    Returns:
+    --------
+    numbers: Numpy.ndarray
+        The nOC, nOB, nMMd and nMMr values.
+    method: String
+        'fixed point' or 'integration'.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]])
+    >>> numbers, method = steady_state_nr([20, 30, 20, 5], [0.7, 1.3, 0.3, 0.3],
+    ...                                [1.0, 0.08, 0.2, 0.1], matrix, 0.3)
+    >>> round(float(numbers[2] + numbers[3]), 4), method
+    (24.8112, 'fixed point')
+    """
+    df_fixed_points = fixed_points_nr(growth_rates, decay_rates, matrix,
+                                                                WMMd_inhibitor)
+    fixed_point = unique_stable_fixed_point(df_fixed_points)
+    if fixed_point is not None:
+        numbers = fixed_point[['nOC', 'nOB', 'nMMd', 'nMMr']].to_numpy(float)
+        return numbers, 'fixed point'
+
+    # Fall back to integration
+    t = np.linspace(0, time, int(time))
+    y = odeint(lambda y, t: number_rhs(y, growth_rates, decay_rates, matrix,
+                                            WMMd_inhibitor), y0, t)
+    return y[-1], 'integration'
+
+def steady_state_frac(y0, N, cOC, cOB, cMMd, cMMr, matrix, WMMd_inhibitor = 0,
+                                                                time = 500):
+    """Function that determines the long-term cell fractions of the fraction
+    model. When there is exactly one stable fixed point this fixed point is
+    returned, otherwise the model is integrated from y0 and the last fractions
+    are returned.
+
+    Parameters:
+    -----------
+    y0: List
+        List with the start values of xOC, xOB, xMMd and xMMr.
+    N: Int
+        Number of cells in the difussion range.
+    cOC: Float
+        Cost parameter OC.
+    cOB: Float
+        Cost parameter OB.
+    cMMd: Float
+        Cost parameter MMd.
+    cMMr: Float
+        Cost parameter MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+    time: Int
+        The number of generations that is integrated when there is no unique
+        stable fixed point.
+
+    Returns:
+    --------
+    fractions: Numpy.ndarray
+        The xOC, xOB, xMMd and xMMr values.
+    method: String
+        'fixed point' or 'integration'.
+
+    Example:
+    -----------
+    >>> fractions, method = steady_state_frac([0.2, 0.3, 0.2, 0.3], 10, 1, 1,
+    ...     1, 1, np.array([
+    ...    [0.0, 1.0, 0.0, 0.0],
+    ...    [1.0, 0.0, 0.0, 0.0],
+    ...    [0.0, 0.0, 0.0, 0.0],
+    ...    [0.0, 0.0, 0.0, 0.0]]))
+    >>> np.round(fractions, 6).tolist(), method
+    ([0.5, 0.5, 0.0, 0.0], 'fixed point')
+    """
+    costs = [cOC, cOB, cMMd, cMMr]
+    df_fixed_points = fixed_points_frac(N, cOC, cOB, cMMd, cMMr, matrix,
+                                                                WMMd_inhibitor)
+    fixed_point = unique_stable_fixed_point(df_fixed_points)
+    if fixed_point is not None:
+        fractions = fixed_point[['xOC', 'xOB', 'xMMd', 'xMMr']].to_numpy(float)
+        return fractions, 'fixed point'
+
+    # Fall back to integration
+    t = np.linspace(0, time, int(time))
+    y = odeint(lambda y, t: fraction_rhs(y, N, costs, matrix, WMMd_inhibitor),
+                                                                        y0, t)
+    return y[-1], 'integration'
+
+def reached_fixed_point_frac(y0, N, cOC, cOB, cMMd, cMMr, matrix,
+                                                        WMMd_inhibitor = 0):
+    """Function that determines the fixed point of the fraction model that is
+    reached from y0, together with its Jacobian eigenvalues and stability.
+
+    Parameters:
+    -----------
+    y0: List
+        List with the start values of xOC, xOB, xMMd and xMMr.
+    N: Int
+        Number of cells in the difussion range.
+    cOC: Float
+        Cost parameter OC.
+    cOB: Float
+        Cost parameter OB.
+    cMMd: Float
+        Cost parameter MMd.
+    cMMr: Float
+        Cost parameter MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness.
+
+    Returns:
+    --------
+    fixed_point: Series
+        The row of the reached fixed point made by fixed_points_frac. When the
+        fractions do not end up in a fixed point all values are NaN and the
+        stability is 'undetermined'.
+
+    Example:
+    -----------
+    >>> fixed_point = reached_fixed_point_frac([0.2, 0.3, 0.2, 0.3], 50, 1, 0.8,
+    ...     1.2, 1.3, np.array([
+    ...    [0.0, 1.6, 2.2, 1.9],
+    ...    [1.0, 0.0, -0.5, -0.5],
+    ...    [0.7, 0.0, 0.2, 0.0],
+    ...    [1.9, 0.0, -0.8, 0.2]]))
+    >>> round(fixed_point['xMMr'], 4), fixed_point['Stability']
+    (0.3878, 'stable')
+    """
+    df_fixed_points = fixed_points_frac(N, cOC, cOB, cMMd, cMMr, matrix,
+                                                                WMMd_inhibitor)
+    fractions, method = steady_state_frac(y0, N, cOC, cOB, cMMd, cMMr, matrix,
+                                                                WMMd_inhibitor)
+
+    # Find the fixed point closest to the reached fractions
+    positions = df_fixed_points[['xOC', 'xOB', 'xMMd', 'xMMr']].to_numpy(float)
+    distances = np.linalg.norm(positions - fractions, axis = 1)
+    if len(distances) == 0 or distances.min() > 1e-3:
+        fixed_point = pd.Series(np.nan, index = df_fixed_points.columns,
+                                                            dtype = object)
+        fixed_point['Stability'] = 'undetermined'
+        return fixed_point
+
+    return df_fixed_points.iloc[int(np.argmin(distances))]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Stochastic (tau-leaping) version of the number model in which MMd
+              can become MMr through resistance mutations
+              (MM_model_nr_IH_inf_mutation.py). The growth, decay and mutation
+              terms of the model are used as rates of random births, deaths and
+              mutations, so the moment the first MMr appear differs between
+              runs. Many replicates are simulated at the same time with arrays
+              that have a replicate axis and a seeded random number generator,
+              which gives the distribution of the resistance emergence time for
+              every therapy schedule.
+
+              The therapy schedules are made with the functions in
+              MM_schedule.py.
+"""
+
+# Import the needed libraries
+import numpy as np
+import doctest
+from MM_schedule import mutation_rates, make_phase, continuous_schedule, \
+                                                            switch_schedule
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def birth_rates(n, growth_rates, matrix):
+    """Function that determines the birth rates (the growth terms of the number
+    model) for all replicates. Without MMr the MMr are left out of the
+    interactions, like in the mutation model. Another cell type without cells
+    gives a factor 0**b, which is 0 for a positive interaction factor b and 1
+    for b = 0, a negative factor (an infinite rate) is left out. Cell types
+    without cells can not grow.
+
+    Parameters:
+    -----------
+    n: Numpy.ndarray
+        Array of shape (replicates, 4) with the numbers of OC, OB, MMd and MMr.
+    growth_rates: Numpy.ndarray
+        Array with the growth rate values of the OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+
+    Returns:
+    --------
+    rates: Numpy.ndarray
+        Array of shape (replicates, 4) with the birth rates.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.7, 1.0, 2.5, 2.1],
+    ...    [1.0, 1.4, -0.3, 1.0],
+    ...    [2.5, 0.2, 1.1, -0.2],
+    ...    [2.1, 0.0, -0.2, 1.2]])
+    >>> np.round(birth_rates(np.array([[10, 20, 10, 5], [10, 20, 10, 0]]),
+    ...                     np.array([0.8, 0.9, 1.3, 0.5]), matrix)).tolist()
+    [[744658.0, 1495.0, 6829.0, 274.0], [25358.0, 299.0, 9422.0, 0.0]]
+    >>> np.round(birth_rates(np.array([[10, 20, 0, 5]]), np.array([0.8, 0.9,
+    ...                                     1.3, 0.5]), matrix)).tolist()
+    [[0.0, 2983.0, 0.0, 434.0]]
+    """
+    present = n > 0
+    n_interaction = n[:, np.newaxis, :]
+
+    # Determine the n_j**b_i,j factors, 0**b is 0 for b > 0 and 1 for b = 0
+    with np.errstate(divide = 'ignore'):
+        factors = np.where(n_interaction > 0, n_interaction ** matrix,
+                                            np.where(matrix > 0, 0.0, 1.0))
+
+    # Leave the MMr out of the interactions when there are no MMr
+    factors[:, :, 3] = np.where(present[:, np.newaxis, 3], factors[:, :, 3],
+                                                                        1.0)
+
+    return growth_rates * np.prod(factors, axis = 2) * present
+
+def tau_leaping(y0, schedule, n_replicates, tau = 0.01, threshold = 1,
+                                            seed = None, mutation_start = 0):
+    """Function that simulates the number model with resistance mutations with
+    tau-leaping for a number of replicates at the same time. Every time step
+    of size tau the number of births, deaths and mutations of every cell type
+    are drawn from Poisson distributions with the rates of the model.
+
+    Parameters:
+    -----------
+    y0: List
+        List with the start numbers of OC, OB, MMd and MMr.
+    schedule: List
+        List with the phases.
+    n_replicates: Int
+        The number of replicates.
+    tau: Float
+        The size of a time step in generations.
+    threshold: Int
+        The number of MMr from which the resistance has emerged.
+    seed: Int
+        The seed of the random number generator.
+    mutation_start: Float
+        The generation from which resistance mutations can occur.
+
+    Returns:
+    --------
+    emergence_times: Numpy.ndarray
+        The generation at which the number of MMr reached the threshold for the
+        first time in every replicate (nan if it was not reached).
+    n: Numpy.ndarray
+        Array of shape (replicates, 4) with the numbers at the end.
+
+    Example:
+    -----------
+    >>> schedule = [make_phase(50, [0.8, 1.2, 0.3, 0.3], [0.9, 0.08, 0.2, 0.1],
+    ...    np.array([
+    ...    [0.0, 0.4, 0.6, 0.54],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.5, 0.0],
+    ...    [0.54, 0.0, -0.6, 0.65]]), 0)]
+    >>> times, n = tau_leaping([180, 280, 170, 0], schedule, 200, 0.05,
+    ...                                                         seed = 1)
+    >>> n.shape
+    (200, 4)
+    >>> bool(np.all(np.isnan(times) | ((times > 0) & (times <= 50))))
+    True
+    >>> np.array_equal(times, tau_leaping([180, 280, 170, 0], schedule, 200,
+    ...                                 0.05, seed = 1)[0], equal_nan = True)
+    True
+    """
+    rng = np.random.default_rng(seed)
+    n = np.tile(np.round(np.asarray(y0, dtype = float)), (n_replicates, 1))
+    emergence_times = np.full(n_replicates, np.nan)
+    emergence_times[n[:, 3] >= threshold] = 0.0
+    time = 0.0
+
+    for phase in schedule:
+        n_steps = int(round(phase['duration'] / tau))
+        for step in range(n_steps):
+            # The mutations are on from the mutation start
+            mutation_rate = mutation_rates(phase['IH_present']) * \
+                                (phase['mutations'] and time >= mutation_start)
+
+            # Determine the rates of all events
+            births = birth_rates(n, phase['growth_rates'], phase['matrix'])
+            deaths = phase['decay_rates'] * n
+            deaths[:, 2] += phase['WMMd_inhibitor'] * n[:, 2]
+
+            # Draw the number of events, there can not die more cells than there
+            # are
+            n_births = rng.poisson(births * tau)
+            n_deaths = np.minimum(rng.poisson(deaths * tau), n)
+            n = n + n_births - n_deaths
+            n_mutations = np.minimum(rng.poisson(mutation_rate * n[:, 2] * tau),
+                                                                        n[:, 2])
+            n[:, 2] -= n_mutations
+            n[:, 3] += n_mutations
+
+            # Save the first time the MMr reached the threshold
+            time += tau
+            emerged = np.isnan(emergence_times) & (n[:, 3] >= threshold)
+            emergence_times[emerged] = time
+
+    return emergence_times, n
+
+def emergence_time_distributions(schedules, y0, n_replicates, tau = 0.01,
+                            threshold = 1, seed = None, mutation_start = 0):
+    """Function that determines the distribution of the resistance emergence
+    time for different therapy schedules. Every schedule is simulated with the
+    same seed.
+
+    Parameters:
+    -----------
+    schedules: Dictionary
+        Dictionary with the names of the schedules as keys and the schedules as
+        values.
+    y0: List
+        List with the start numbers of OC, OB, MMd and MMr.
+    n_replicates: Int
+        The number of replicates per schedule.
+    tau: Float
+        The size of a time step in generations.
+    threshold: Int
+        The number of MMr from which the resistance has emerged.
+    seed: Int
+        The seed of the random number generator.
+    mutation_start: Float
+        The generation from which resistance mutations can occur.
+
+    Returns:
+    --------
+    df_emergence: DataFrame
+        Dataframe with a column per schedule with the emergence times of all
+        replicates.
+
+    Example:
+    -----------
+    >>> growth_rates = [0.8, 1.2, 0.3, 0.3]
+    >>> decay_rates = [0.9, 0.08, 0.2, 0.1]
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.54],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.5, 0.0],
+    ...    [0.54, 0.0, -0.6, 0.65]])
+    >>> schedules = {'MTD': continuous_schedule(10, 40, growth_rates,
+    ...     growth_rates, decay_rates, decay_rates, matrix, matrix, 1, 2.5),
+    ...     'AT': switch_schedule(10, 6, 5, 5, growth_rates, growth_rates,
+    ...     decay_rates, decay_rates, matrix, matrix, 1, 2.5)}
+    >>> df = emergence_time_distributions(schedules, [180, 280, 170, 0], 100,
+    ...                                                     0.05, seed = 3)
+    >>> df.shape
+    (100, 2)
+    >>> list(df.columns)
+    ['MTD', 'AT']
+    """
+    distributions = {}
+    for name, schedule in schedules.items():
+        distributions[name] = tau_leaping(y0, schedule, n_replicates, tau,
+                                        threshold, seed, mutation_start)[0]
+    return pd.DataFrame(distributions)
+
+if __name__ == "__main__":
+    main()
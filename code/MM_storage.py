@@ -0,0 +1,305 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to save and load the generated data (dataframes and
+              dictionaries) in a binary format instead of as csv files. Every
+              column is saved as an array with its own type (float64, int64,
+              complex or string), so the values do not have to be converted to
+              text and back, which makes the files smaller, loading faster and
+              keeps the exact float values. Information about the data, such as
+              the parameter values that were used, is saved in the same file.
+
+              The default format is npz (numpy), parquet can be used when
+              pyarrow is installed and csv is still possible. The loading
+              functions look for a binary file first and use the csv file when
+              there is none, so the csv files that are already in the data
+              folder can still be read.
+"""
+
+# Import the needed libraries
+import numpy as np
+import os
+import json
+import doctest
+import tempfile
+import shutil
+from MM_paths import repository_path
+from MM_writer import wait_for_writes
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+# The format in which the data is saved: 'npz', 'parquet' or 'csv'
+STORAGE_FORMAT = 'npz'
+
+# The extensions of the formats, the binary formats are searched in this order
+EXTENSIONS = {'npz': '.npz', 'parquet': '.parquet', 'csv': '.csv'}
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+def storage_path(file_path, storage_format = None):
+    """Function that gives the path of a data file in a storage format. The .csv
+    extension of the file path is replaced by the extension of the format.
+
+    Parameters:
+    -----------
+    file_path: String
+        The path of the file, with or without the .csv extension.
+    storage_format: String
+        The format 'npz', 'parquet' or 'csv', with None STORAGE_FORMAT is used.
+
+    Returns:
+    --------
+    file_path: String
+        The path of the file in the storage format.
+
+    Example:
+    -----------
+    >>> storage_path(os.path.join('data', 'df_cell_frac.csv'))
+    'data/df_cell_frac.npz'
+    >>> storage_path('df_cell_frac.csv', 'csv')
+    'df_cell_frac.csv'
+    >>> storage_path('df_cell_frac', 'parquet')
+    'df_cell_frac.parquet'
+    """
+    if storage_format is None:
+        storage_format = STORAGE_FORMAT
+    if storage_format not in EXTENSIONS:
+        raise ValueError(f"Unknown storage format: {storage_format}")
+
+    if file_path.endswith('.csv'):
+        file_path = file_path[:-len('.csv')]
+    return file_path + EXTENSIONS[storage_format]
+
+def to_json(value):
+    """Function that converts numpy arrays and numbers in a value to values that
+    can be saved as JSON.
+
+    Example:
+    -----------
+    >>> to_json({'matrix': np.eye(2), 'N': np.int64(50), 'costs': (1, 0.8)})
+    {'matrix': [[1.0, 0.0], [0.0, 1.0]], 'N': 50, 'costs': [1, 0.8]}
+    """
+    if hasattr(value, 'as_dict'):
+        value = value.as_dict()
+    if isinstance(value, dict):
+        return {str(name): to_json(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return to_json(value.tolist())
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+    return value
+
+def column_array(column):
+    """Function that converts a column of a dataframe to an array with the type
+    of its values. Columns with mixed types are saved as strings.
+
+    Example:
+    -----------
+    >>> column_array(pd.Series([1, 2], dtype = object)).dtype
+    dtype('int64')
+    >>> column_array(pd.Series(['stable', 'unstable'])).dtype
+    dtype('<U8')
+    >>> column_array(pd.Series([1 + 2j, 0.5])).dtype
+    dtype('complex128')
+    """
+    values = np.asarray(column.tolist())
+    if values.dtype.kind not in 'biufcU':
+        values = np.asarray([str(value) for value in column], dtype = str)
+    return values
+
+def save_table(data_frame, file_path, metadata = None, storage_format = None):
+    """Function that saves a dataframe with information about the data.
+
+    Parameters:
+    -----------
+    data_frame: DataFrame
+        The dataframe containing the data.
+    file_path: String
+        The path of the file, the extension is set by storage_path.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
+    storage_format: String
+        The format 'npz', 'parquet' or 'csv', with None STORAGE_FORMAT is used.
+
+    Returns:
+    --------
+    file_path: String
+        The path of the saved file.
+
+    Example:
+    -----------
+    >>> folder = tempfile.mkdtemp()
+    >>> df = pd.DataFrame({'Generation': [0, 1], 'xMMd': [0.2, 1 / 3]})
+    >>> path = save_table(df, os.path.join(folder, 'df_test.csv'),
+    ...                                         {'N': 50, 'cMMd': 1.2})
+    >>> os.path.basename(path)
+    'df_test.npz'
+    >>> loaded = load_table(os.path.join(folder, 'df_test.csv'))
+    >>> loaded.dtypes.tolist()
+    [dtype('int64'), dtype('float64')]
+    >>> loaded['xMMd'].tolist() == df['xMMd'].tolist()
+    True
+    >>> loaded.attrs['metadata']
+    {'N': 50, 'cMMd': 1.2}
+    >>> shutil.rmtree(folder)
+    """
+    if storage_format is None:
+        storage_format = STORAGE_FORMAT
+    file_path = storage_path(file_path, storage_format)
+    folder_path = os.path.dirname(file_path)
+    if folder_path:
+        os.makedirs(folder_path, exist_ok = True)
+    metadata = to_json(metadata if metadata is not None else {})
+
+    if storage_format == 'csv':
+        data_frame.to_csv(file_path, index = False)
+
+    elif storage_format == 'parquet':
+        # The metadata is saved by pandas in the parquet file from attrs
+        data_frame = data_frame.copy()
+        data_frame.columns = [str(name) for name in data_frame.columns]
+        data_frame.attrs = {'metadata': metadata}
+        data_frame.to_parquet(file_path, index = False)
+
+    else:
+        # Save every column as its own array, the names and the order of the
+        # columns are saved with the metadata
+        columns = [str(name) for name in data_frame.columns]
+        arrays = {f'column_{i}': column_array(data_frame.iloc[:, i]) for i in
+                                                        range(len(columns))}
+        header = json.dumps({'columns': columns, 'metadata': metadata})
+        np.savez_compressed(file_path, header = np.array(header), **arrays)
+
+    return file_path
+
+def find_data_file(file_path):
+    """Function that finds the file with the data, the binary formats are
+    preferred over the csv file. When the file is not in the output root
+    (MM_paths.py) the same file in the repository is used.
+
+    Parameters:
+    -----------
+    file_path: String
+        The path of the file, with or without extension.
+
+    Returns:
+    --------
+    file_path: String
+        The path of the file that exists.
+    """
+    # Wait for the files that are still saved in the background (MM_writer.py)
+    wait_for_writes()
+
+    stem = file_path
+    for extension in EXTENSIONS.values():
+        if stem.endswith(extension):
+            stem = stem[:-len(extension)]
+
+    # Look in the output root first and then in the data of the repository
+    for location in [file_path, repository_path(file_path)]:
+        if location is None:
+            continue
+        location_stem = os.path.join(os.path.dirname(location),
+                                                    os.path.basename(stem))
+        for storage_format in EXTENSIONS:
+            if os.path.exists(storage_path(location_stem, storage_format)):
+                return storage_path(location_stem, storage_format)
+        if os.path.exists(location):
+            return location
+    raise FileNotFoundError(f"No data file found for {file_path}")
+
+def load_table(file_path):
+    """Function that loads a dataframe saved with save_table or as csv file. The
+    metadata is in the attrs of the dataframe.
+
+    Parameters:
+    -----------
+    file_path: String
+        The path of the file, with or without extension.
+
+    Returns:
+    --------
+    data_frame: DataFrame
+        The dataframe containing the data.
+    """
+    file_path = find_data_file(file_path)
+
+    if file_path.endswith('.npz'):
+        with np.load(file_path, allow_pickle = False) as data:
+            header = json.loads(str(data['header']))
+            data_frame = pd.DataFrame({name: data[f'column_{i}'] for i, name
+                                            in enumerate(header['columns'])})
+        data_frame.attrs['metadata'] = header['metadata']
+        return data_frame
+
+    if file_path.endswith('.parquet'):
+        data_frame = pd.read_parquet(file_path)
+        data_frame.attrs.setdefault('metadata', {})
+        return data_frame
+
+    data_frame = pd.read_csv(file_path)
+    data_frame.attrs['metadata'] = {}
+    return data_frame
+
+def save_dictionary(dictionary, file_path, metadata = None,
+                                                        storage_format = None):
+    """Function that saves a dictionary as a table with the columns Key and
+    Value.
+
+    Parameters:
+    -----------
+    dictionary: Dictionary
+        The dictionary containing the data.
+    file_path: String
+        The path of the file, the extension is set by storage_path.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
+    storage_format: String
+        The format 'npz', 'parquet' or 'csv', with None STORAGE_FORMAT is used.
+
+    Returns:
+    --------
+    file_path: String
+        The path of the saved file.
+
+    Example:
+    -----------
+    >>> folder = tempfile.mkdtemp()
+    >>> path = save_dictionary({0.0: 0.75, 0.1: 0.7123456789012345},
+    ...                         os.path.join(folder, 'dict_test.csv'))
+    >>> load_dictionary(path)
+    {0.0: 0.75, 0.1: 0.7123456789012345}
+    >>> shutil.rmtree(folder)
+    """
+    data_frame = pd.DataFrame({'Key': list(dictionary.keys()),
+                               'Value': list(dictionary.values())})
+    return save_table(data_frame, file_path, metadata, storage_format)
+
+def load_dictionary(file_path):
+    """Function that loads a dictionary saved with save_dictionary or as csv
+    file with the columns Key and Value.
+
+    Parameters:
+    -----------
+    file_path: String
+        The path of the file, with or without extension.
+
+    Returns:
+    --------
+    dictionary: Dictionary
+        The dictionary containing the data.
+    """
+    data_frame = load_table(file_path)
+    return dict(zip(data_frame['Key'].tolist(), data_frame['Value'].tolist()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code of a task graph for making the data and figures. A task is a
+              function of a model file with its inputs, the data files it reads
+              (inputs) and the files it writes (outputs). A task that reads a
+              file depends on the task that writes it. A task is only run again
+              when it is stale: when an output is missing or when its key
+              changed. The key is a hash of the model version, the code of the
+              model file and of all MM_* files it imports, the function, its
+              inputs and the content of the files it reads, so a changed helper
+              function or data file makes the tasks that use it stale. The
+              figures have the PNG files they save as outputs, so a deleted
+              figure is made again. Tasks that
+              do not depend on each other are run in parallel processes in batch
+              mode (MM_render.py).
+
+              The graph of MM_model_nr_IH_inf.py contains the optimisations for
+              changing IH strengths that Figure_optimisation reads and all other
+              figures. Make only Figure_optimisation (and the data it needs):
+              python MM_tasks.py Figure_optimisation
+              Use the data that is already in the repository without running the
+              optimisations again:
+              python MM_tasks.py --adopt
+"""
+
+# Import the needed libraries
+import os
+import sys
+import ast
+import json
+import hashlib
+import argparse
+import importlib
+import importlib.util
+import doctest
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from MM_cache import MODEL_VERSION, update_hash
+from MM_paths import data_path, figure_path, repository_path
+from MM_render import render_figure
+import MM_storage
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+    # Build the graph of MM_model_nr_IH_inf.py
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description = 'Make data and figures.')
+        parser.add_argument('targets', nargs = '*', help = 'the tasks, all '
+                                                'when no tasks are given')
+        parser.add_argument('--workers', type = int, help = 'the number of '
+                                                                'processes')
+        parser.add_argument('--force', action = 'store_true', help = 'run the '
+                                                'tasks also when up to date')
+        parser.add_argument('--adopt', action = 'store_true', help = 'mark tasks '
+                        'whose outputs exist as up to date without running them')
+        arguments = parser.parse_args()
+
+        graph = nr_IH_inf_graph()
+        if arguments.adopt:
+            print('Adopted', graph.adopt(arguments.targets or None))
+        else:
+            results = graph.build(arguments.targets or None, arguments.workers,
+                                                                arguments.force)
+            for name, status in results.items():
+                print(name, status)
+
+def make_task(module, function, args = (), kwargs = None, inputs = (),
+                                                outputs = (), name = None):
+    """Function that makes a task.
+
+    Parameters:
+    -----------
+    module: String
+        The name of the model file, for example MM_model_nr_IH_inf.
+    function: String
+        The name of the function.
+    args: Tuple
+        The positional inputs of the function.
+    kwargs: Dictionary
+        The keyword inputs of the function.
+    inputs: List
+        The paths of the data files the function reads.
+    outputs: List
+        The paths of the files the function writes.
+    name: String
+        The name of the task, by default the name of the function.
+
+    Returns:
+    --------
+    task: Dictionary
+        The task.
+    """
+    return {'name': name or function, 'module': module, 'function': function,
+            'args': tuple(args), 'kwargs': dict(kwargs or {}),
+            'inputs': list(inputs), 'outputs': list(outputs)}
+
+def existing_file(path):
+    """Function that gives the path of the file that exists for a path of a
+    data file or figure, None when there is no such file. Data files can be
+    saved in another format (MM_storage.py) or be in the repository."""
+    if path.endswith('.csv'):
+        try:
+            return MM_storage.find_data_file(path)
+        except FileNotFoundError:
+            return None
+    for location in [path, repository_path(path)]:
+        if location is not None and os.path.exists(location):
+            return location
+    return None
+
+def file_hash(path):
+    """Function that gives the SHA-256 hash of the content of a file, None when
+    the file does not exist."""
+    location = existing_file(path)
+    if location is None:
+        return None
+    hash_object = hashlib.sha256()
+    with open(location, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            hash_object.update(block)
+    return hash_object.hexdigest()
+
+def imported_modules(source):
+    """Function that gives the names of the MM_* files that are imported in the
+    code of a file, also inside functions and with lazy_import or
+    lazy_function (MM_lazy.py).
+
+    Parameters:
+    -----------
+    source: String
+        The code of the file.
+
+    Returns:
+    --------
+    names: List
+        The sorted names of the imported MM_* files.
+
+    Example:
+    -----------
+    >>> imported_modules("import MM_cache\\nfrom MM_paths import data_path\\n"
+    ...     "def f():\\n    from MM_jit import CompiledRHS\\nimport numpy\\n"
+    ...     "pd = lazy_import('MM_storage')")
+    ['MM_cache', 'MM_jit', 'MM_paths', 'MM_storage']
+    """
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module is not None:
+            names.add(node.module)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                and node.func.id in ('lazy_import', 'lazy_function') and \
+                node.args and isinstance(node.args[0], ast.Constant):
+            names.add(str(node.args[0].value))
+    return sorted(name for name in names if name.startswith('MM_'))
+
+def code_hash(module):
+    """Function that gives the SHA-256 hash of the code of a model file and of
+    all MM_* files it imports, directly or through other MM_* files.
+
+    Parameters:
+    -----------
+    module: String
+        The name of the model file, for example MM_model_nr_IH_inf.
+
+    Returns:
+    --------
+    hash: String
+        The hexadecimal hash.
+
+    Example:
+    -----------
+    >>> len(code_hash('MM_tasks'))
+    64
+    """
+    sources = {}
+    names = [module]
+    while names:
+        name = names.pop()
+        if name in sources:
+            continue
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.origin is None:
+            continue
+        with open(spec.origin, encoding = 'utf-8') as file:
+            sources[name] = file.read()
+        names.extend(imported_modules(sources[name]))
+
+    hash_object = hashlib.sha256()
+    update_hash(hash_object, sources)
+    return hash_object.hexdigest()
+
+def figure_outputs(module, function):
+    """Function that gives the paths of the PNG files a figure function saves
+    with save_Figure(figure, 'name', figure_path('folder')).
+
+    Parameters:
+    -----------
+    module: String
+        The name of the model file, for example MM_model_nr_IH_inf.
+    function: String
+        The name of the figure function.
+
+    Returns:
+    --------
+    outputs: List
+        The paths of the figures.
+
+    Example:
+    -----------
+    >>> outputs = figure_outputs('MM_model_nr_IH_inf', 'Figure_best_WMMd_IH')
+    >>> [os.path.relpath(path, figure_path()) for path in outputs]
+    ['results_model_nr_IH_inf/line_plot_cell_nr_IH_inf_change_WMMd_IH.png']
+    """
+    with open(importlib.util.find_spec(module).origin, encoding = 'utf-8') as \
+                                                                        file:
+        tree = ast.parse(file.read())
+
+    outputs = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.FunctionDef) or node.name != function:
+            continue
+        for call in ast.walk(node):
+            # Only the names and folders that are written in the code are known
+            if not (isinstance(call, ast.Call) and isinstance(call.func,
+                    ast.Name) and call.func.id == 'save_Figure' and
+                    len(call.args) == 3):
+                continue
+            name, folder = call.args[1], call.args[2]
+            if isinstance(name, ast.Constant) and isinstance(folder,
+                    ast.Call) and isinstance(folder.func, ast.Name) and \
+                    folder.func.id == 'figure_path' and all(isinstance(part,
+                    ast.Constant) for part in folder.args):
+                outputs.append(figure_path(*[part.value for part in
+                                        folder.args], f'{name.value}.png'))
+    return outputs
+
+class TaskGraph:
+    """Class of a graph of tasks. The state (the keys of the tasks that are up
+    to date) is saved in data/tasks/{name}.json.
+
+    Parameters:
+    -----------
+    name: String
+        The name of the graph.
+    tasks: List
+        The tasks (make_task).
+    state_path: String
+        The path of the state file, by default in the tasks folder.
+
+    Example:
+    -----------
+    >>> graph = TaskGraph('example', [
+    ...     make_task('m', 'figure', inputs = ['a.csv', 'b.csv']),
+    ...     make_task('m', 'data_a', outputs = ['a.csv']),
+    ...     make_task('m', 'data_b', inputs = ['a.csv'], outputs = ['b.csv'])])
+    >>> graph.dependencies('figure')
+    ['data_a', 'data_b']
+    >>> graph.order()
+    ['data_a', 'data_b', 'figure']
+    >>> graph.order(['data_b'])
+    ['data_a', 'data_b']
+    """
+    def __init__(self, name, tasks = (), state_path = None):
+        self.name = name
+        self.tasks = {}
+        self.state_path = state_path or data_path('tasks', f'{name}.json')
+        self.code_hashes = {}
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task):
+        """Function that adds a task to the graph."""
+        if task['name'] in self.tasks:
+            raise ValueError(f"Task {task['name']} is already in the graph")
+        self.tasks[task['name']] = task
+
+    def producers(self):
+        """Function that gives per output path the name of the task that
+        writes it."""
+        return {output: name for name, task in self.tasks.items() for output in
+                                                            task['outputs']}
+
+    def dependencies(self, name):
+        """Function that gives the names of the tasks that write the files a
+        task reads."""
+        producers = self.producers()
+        return sorted({producers[path] for path in self.tasks[name]['inputs']
+                                                        if path in producers})
+
+    def order(self, targets = None):
+        """Function that gives the tasks (the targets and the tasks they depend
+        on) in an order in which every task comes after its dependencies.
+
+        Parameters:
+        -----------
+        targets: List
+            The names of the tasks, with None all tasks.
+
+        Returns:
+        --------
+        order: List
+            The names of the tasks.
+        """
+        targets = list(self.tasks) if targets is None else list(targets)
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"The tasks depend on each other: {name}")
+            if name not in self.tasks:
+                raise KeyError(f"Unknown task: {name}")
+            visiting.add(name)
+            for dependency in self.dependencies(name):
+                visit(dependency)
+            visiting.remove(name)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def key(self, name):
+        """Function that gives the key of a task: a hash of the model version,
+        the code of the model file and the MM_* files it imports (code_hash),
+        the function, its inputs and the content of the files it reads."""
+        task = self.tasks[name]
+        if task['module'] not in self.code_hashes:
+            self.code_hashes[task['module']] = code_hash(task['module'])
+        hash_object = hashlib.sha256()
+        update_hash(hash_object, [MODEL_VERSION, task['module'],
+            task['function'], self.code_hashes[task['module']],
+            list(task['args']), task['kwargs'], [str(file_hash(path)) for path
+                                                        in task['inputs']]])
+        return hash_object.hexdigest()
+
+    def load_state(self):
+        """Function that loads the keys of the tasks that are up to date."""
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as file:
+            return json.load(file)
+
+    def save_state(self, state):
+        """Function that saves the keys of the tasks that are up to date."""
+        os.makedirs(os.path.dirname(self.state_path), exist_ok = True)
+        temporary_path = f'{self.state_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump(state, file, indent = 2)
+        os.replace(temporary_path, self.state_path)
+
+    def up_to_date(self, name, state):
+        """Function that gives True when a task does not have to run: the key
+        is the same as at the last run and all outputs exist."""
+        task = self.tasks[name]
+        return state.get(name) == self.key(name) and all(existing_file(path)
+                                        is not None for path in task['outputs'])
+
+    def stale(self, targets = None):
+        """Function that gives the names of the tasks that are stale, a task
+        is also stale when a task it depends on is stale."""
+        state = self.load_state()
+        stale = []
+        for name in self.order(targets):
+            if not self.up_to_date(name, state) or any(dependency in stale for
+                                    dependency in self.dependencies(name)):
+                stale.append(name)
+        return stale
+
+    def adopt(self, targets = None):
+        """Function that marks the tasks whose outputs exist as up to date
+        without running them, for example for the data in the repository.
+
+        Returns:
+        --------
+        adopted: List
+            The names of the adopted tasks.
+        """
+        state = self.load_state()
+        adopted = []
+        for name in self.order(targets):
+            task = self.tasks[name]
+            if task['outputs'] and all(existing_file(path) is not None for
+                                                    path in task['outputs']):
+                state[name] = self.key(name)
+                adopted.append(name)
+        self.save_state(state)
+        return adopted
+
+    def build(self, targets = None, n_workers = None, force = False):
+        """Function that runs the stale tasks, tasks that do not depend on each
+        other are run at the same time in different processes.
+
+        Parameters:
+        -----------
+        targets: List
+            The names of the tasks, with None all tasks. The tasks they depend
+            on are also made when they are stale.
+        n_workers: Int
+            The number of processes, with 1 everything is done in this process
+            and with None the number of processors is used.
+        force: Bool
+            True to run the targets also when they are up to date.
+
+        Returns:
+        --------
+        results: Dictionary
+            Per task 'up to date', 'done', 'skipped' (a task it depends on
+            failed) or the error message.
+        """
+        order = self.order(targets)
+        forced = set(order if targets is None else targets) if force else set()
+        state = self.load_state()
+        results = {}
+        running = {}
+        executor = None if n_workers == 1 else ProcessPoolExecutor(n_workers)
+
+        def finish(name, error):
+            task = self.tasks[name]
+            missing = [path for path in task['outputs'] if existing_file(path)
+                                                                    is None]
+            if error is None and missing:
+                error = f"The outputs are not made: {', '.join(missing)}"
+            if error is None:
+                results[name] = 'done'
+                state[name] = self.key(name)
+            else:
+                results[name] = error
+                state.pop(name, None)
+            self.save_state(state)
+
+        try:
+            while len(results) < len(order):
+                # Start all tasks whose dependencies are finished
+                for name in order:
+                    if name in results or name in running:
+                        continue
+                    dependencies = [results.get(dependency) for dependency in
+                                                    self.dependencies(name)]
+                    if any(status not in (None, 'done', 'up to date') for
+                                                    status in dependencies):
+                        results[name] = 'skipped'
+                    elif None in dependencies:
+                        continue
+                    elif name not in forced and \
+                        all(status == 'up to date' for status in dependencies) \
+                                            and self.up_to_date(name, state):
+                        results[name] = 'up to date'
+                    else:
+                        task = self.tasks[name]
+                        arguments = (task['module'], task['function'],
+                                                task['args'], task['kwargs'])
+                        if executor is None:
+                            finish(name, render_figure(*arguments))
+                        else:
+                            running[name] = executor.submit(render_figure,
+                                                                    *arguments)
+
+                # Wait until a running task is finished
+                if running:
+                    finished, _ = wait(running.values(), return_when =
+                                                                FIRST_COMPLETED)
+                    for name in [name for name, future in running.items() if
+                                                        future in finished]:
+                        finish(name, running.pop(name).result())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return {name: results[name] for name in order}
+
+def nr_IH_inf_graph():
+    """Function that makes the task graph of MM_model_nr_IH_inf.py: the
+    optimisations for changing IH strengths, Figure_optimisation that reads
+    their data and all other figures without inputs. The figures have the PNG
+    files they save as outputs.
+
+    Returns:
+    --------
+    graph: TaskGraph
+        The task graph.
+
+    Example:
+    -----------
+    >>> graph = nr_IH_inf_graph()
+    >>> len(graph.dependencies('Figure_optimisation'))
+    12
+    >>> [os.path.basename(path) for path in
+    ...                     graph.tasks['Figure_best_b_OC_MMd']['outputs']]
+    ['line_plot_cell_nr_IH_inf_change_b_OC_MMd.png']
+    """
+    module = 'MM_model_nr_IH_inf'
+    folder = data_path('data_model_nr_IH_inf')
+
+    # The growth and decay rates (normal, increased and decreased)
+    rates = {'': ([0.8, 1.2, 0.3, 0.3], [0.7, 1.3, 0.3, 0.3],
+                  [0.9, 0.08, 0.2, 0.1], [1.0, 0.08, 0.2, 0.1]),
+             '_h_gr_dr': ([0.88, 1.32, 0.33, 0.33], [0.77, 1.43, 0.33, 0.33],
+                  [0.99, 0.088, 0.22, 0.11], [1.1, 0.088, 0.22, 0.11]),
+             '_l_gr_dr': ([0.72, 1.08, 0.27, 0.27], [0.63, 1.17, 0.27, 0.27],
+                  [0.81, 0.072, 0.18, 0.09], [0.9, 0.072, 0.18, 0.09])}
+
+    # The optimisations for changing IH strengths
+    tasks = []
+    for suffix, rate_values in rates.items():
+        for order in ['GF_W_h', 'W_GF_h']:
+            for changing in ['W_IH', 'GF_IH']:
+                filename = f'df_MM_{order}_changing_{changing}{suffix}.csv'
+                tasks.append(make_task(module,
+                    f'minimise_MM_{order}_changing_{changing}',
+                    rate_values + (filename,), outputs = [os.path.join(folder,
+                    filename)], name = filename[:-len('.csv')]))
+
+    # The figure that reads the data of the optimisations
+    tasks.append(make_task(module, 'Figure_optimisation', inputs = [output for
+        task in tasks for output in task['outputs']], outputs =
+        figure_outputs(module, 'Figure_optimisation')))
+
+    # The other figures
+    from MM_render import figure_functions
+    for name in figure_functions(importlib.import_module(module)):
+        if name != 'Figure_optimisation':
+            tasks.append(make_task(module, name, outputs = figure_outputs(
+                                                                module, name)))
+
+    return TaskGraph(module, tasks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code of a memory-mapped store for the trajectories of large sweeps
+              and cohorts. All trajectories of a sweep are in one file that is
+              made before the sweep starts, with the shape (runs, time points,
+              cell types), next to a file with the parameter values of every
+              run. The simulations write their results directly in the file, so
+              the sweep can be larger than the memory and multiple processes can
+              write in and read from the same store without copies. The analysis
+              and plotting code can take slices (for example one cell type of
+              some runs) without loading the whole store.
+"""
+
+# Import the needed libraries
+import numpy as np
+import os
+import json
+import doctest
+import tempfile
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from MM_kernels import number_rhs, fraction_rhs
+from MM_scan import batch_odeint, scan_parameters
+from MM_schedule import schedule_times
+from MM_cohort import run_chunk, chunk_schedule
+from MM_lazy import lazy_import
+
+# Import pandas only when it is used
+pd = lazy_import('pandas')
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+class TrajectoryStore:
+    """Class of a memory-mapped store with the trajectories of a sweep.
+
+    Parameters:
+    -----------
+    folder: String
+        The folder of the store, made with TrajectoryStore.create.
+    mode: String
+        'r' to only read and 'r+' to read and write.
+
+    Attributes:
+    -----------
+    t: Numpy.ndarray
+        Array with all the time points.
+    trajectories: Numpy.memmap
+        Array with the values, shape (runs, time points, states).
+    parameters: Numpy.memmap
+        Array with the parameter values, shape (runs, parameters).
+    finished: Numpy.memmap
+        Array that is True for the runs that are written.
+
+    Example:
+    -----------
+    >>> folder = os.path.join(tempfile.mkdtemp(), 'sweep')
+    >>> store = TrajectoryStore.create(folder, 3, np.linspace(0, 1, 5),
+    ...     ['nOC', 'nOB', 'nMMd', 'nMMr'], ['WMMd_inhibitor'])
+    >>> store.trajectories.shape
+    (3, 5, 4)
+    >>> store.write(1, np.ones((5, 2, 4)), [[0.1], [0.2]])
+    >>> TrajectoryStore(folder).finished.tolist()
+    [False, True, True]
+    >>> float(TrajectoryStore(folder).state('nMMd')[2, -1])
+    1.0
+    >>> shutil.rmtree(os.path.dirname(folder))
+    """
+    def __init__(self, folder, mode = 'r'):
+        self.folder = folder
+        with open(os.path.join(folder, 'index.json')) as file:
+            index = json.load(file)
+
+        self.t = np.asarray(index['t'])
+        self.state_names = index['state_names']
+        self.parameter_names = index['parameter_names']
+        n_runs = index['n_runs']
+
+        self.trajectories = np.memmap(os.path.join(folder, 'trajectories.dat'),
+            dtype = float, mode = mode, shape = (n_runs, len(self.t),
+                                                    len(self.state_names)))
+        self.parameters = np.memmap(os.path.join(folder, 'parameters.dat'),
+            dtype = float, mode = mode, shape = (n_runs,
+                                        max(len(self.parameter_names), 1)))
+        self.finished = np.memmap(os.path.join(folder, 'finished.dat'),
+                            dtype = bool, mode = mode, shape = (n_runs,))
+
+    @classmethod
+    def create(cls, folder, n_runs, t, state_names, parameter_names):
+        """Function that makes a new store with space for all runs.
+
+        Parameters:
+        -----------
+        folder: String
+            The folder of the store, an existing store is overwritten.
+        n_runs: Int
+            The number of runs.
+        t: Numpy.ndarray
+            Array with all the time points.
+        state_names: List
+            List with the names of the states, for example nOC, nOB, nMMd, nMMr.
+        parameter_names: List
+            List with the names of the parameters of the runs.
+
+        Returns:
+        --------
+        store: TrajectoryStore
+            The store, opened to read and write.
+        """
+        os.makedirs(folder, exist_ok = True)
+        t = np.asarray(t, dtype = float)
+        with open(os.path.join(folder, 'index.json'), 'w') as file:
+            json.dump({'n_runs': int(n_runs), 't': t.tolist(),
+                'state_names': list(state_names),
+                'parameter_names': list(parameter_names)}, file)
+
+        # Make the files with their full size, the disk space is only used when
+        # the values are written
+        shapes = {'trajectories.dat': (n_runs, len(t), len(state_names), 8),
+                  'parameters.dat': (n_runs, max(len(parameter_names), 1), 8),
+                  'finished.dat': (n_runs, 1)}
+        for file_name, shape in shapes.items():
+            with open(os.path.join(folder, file_name), 'wb') as file:
+                file.truncate(int(np.prod(shape)))
+
+        return cls(folder, 'r+')
+
+    def __len__(self):
+        return len(self.trajectories)
+
+    def write(self, start, y, parameters = None):
+        """Function that writes the results of a batch of runs.
+
+        Parameters:
+        -----------
+        start: Int
+            The index of the first run of the batch.
+        y: Numpy.ndarray
+            Array with the values, shape (time points, runs, states) as given
+            by batch_odeint.
+        parameters: Numpy.ndarray
+            Array with the parameter values, shape (runs, parameters).
+        """
+        y = np.asarray(y)
+        stop = start + y.shape[1]
+        self.trajectories[start: stop] = np.swapaxes(y, 0, 1)
+        if parameters is not None:
+            self.parameters[start: stop] = np.reshape(parameters,
+                                                        (stop - start, -1))
+        self.finished[start: stop] = True
+        self.flush()
+
+    def flush(self):
+        """Function that writes the changes to the disk."""
+        if self.trajectories.mode != 'r':
+            self.trajectories.flush()
+            self.parameters.flush()
+            self.finished.flush()
+
+    def state(self, name):
+        """Function that gives the values of one state of all runs as an array
+        of shape (runs, time points), without loading them."""
+        return self.trajectories[:, :, self.state_names.index(name)]
+
+    def parameter_index(self):
+        """Function that gives a dataframe with the parameter values of all
+        runs."""
+        return pd.DataFrame(np.asarray(self.parameters[:,
+            :len(self.parameter_names)]), columns = self.parameter_names)
+
+    def select(self, **values):
+        """Function that gives the indices of the runs with the given parameter
+        values.
+
+        Example:
+        -----------
+        >>> folder = tempfile.mkdtemp()
+        >>> store = TrajectoryStore.create(folder, 4, [0, 1], ['x'], ['a', 'b'])
+        >>> store.parameters[:] = [[0, 1], [0, 2], [1, 1], [1, 2]]
+        >>> store.select(a = 1).tolist(), store.select(a = 0, b = 2).tolist()
+        ([2, 3], [1])
+        >>> shutil.rmtree(folder)
+        """
+        selected = np.ones(len(self), dtype = bool)
+        for name, value in values.items():
+            column = self.parameters[:, self.parameter_names.index(name)]
+            selected &= np.isclose(column, value)
+        return np.flatnonzero(selected)
+
+def sweep_nr(folder, values, parameter, y0, t, growth_rates, decay_rates,
+                                matrix, WMMd_inhibitor = 0, chunk_size = 1000):
+    """Function that simulates the number model for all values of a scanned
+    parameter and writes the trajectories in a store. The values are integrated
+    in batches of chunk_size values.
+
+    Parameters:
+    -----------
+    folder: String
+        The folder of the store.
+    values: Numpy.ndarray
+        The values of the scanned parameter.
+    parameter: String
+        The scanned parameter, 'WMMd_inhibitor' or 'b_OC_MMd'.
+    y0: List
+        List with the start values of nOC, nOB, nMMd and nMMr.
+    t: Numpy.ndarray
+        Array with all the time points.
+    growth_rates: List
+        List with the growth rate values of the OC, OB, MMd and MMr.
+    decay_rates: List
+        List with the decay rate values of OC, OB, MMd and MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness when it is not scanned.
+    chunk_size: Int
+        The number of values that are integrated together.
+
+    Returns:
+    --------
+    store: TrajectoryStore
+        The store with the trajectories.
+
+    Example:
+    -----------
+    >>> matrix = np.array([
+    ...    [0.0, 0.4, 0.6, 0.5],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.2, 0.0],
+    ...    [0.55, 0.0, -0.6, 0.4]])
+    >>> folder = tempfile.mkdtemp()
+    >>> store = sweep_nr(folder, np.linspace(0, 0.3, 4), 'WMMd_inhibitor',
+    ...     [20, 30, 20, 5], np.linspace(0, 140, 140), [0.8, 1.2, 0.3, 0.3],
+    ...     [0.9, 0.08, 0.2, 0.1], matrix, chunk_size = 3)
+    >>> run = store.select(WMMd_inhibitor = 0.3)
+    >>> np.round(store.state('nMMd')[run, -1] + store.state('nMMr')[run, -1],
+    ...                                                         2).tolist()
+    [28.44]
+    >>> shutil.rmtree(folder)
+    """
+    values = np.asarray(values, dtype = float)
+    store = TrajectoryStore.create(folder, len(values), t, ['nOC', 'nOB',
+                                            'nMMd', 'nMMr'], [parameter])
+
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start: start + chunk_size]
+        matrices, WMMd_inhibitors = scan_parameters(chunk, parameter, matrix,
+                                                                WMMd_inhibitor)
+        y0_chunk = np.repeat(np.asarray(y0, dtype = float)[np.newaxis],
+                                                        len(chunk), axis = 0)
+        y = batch_odeint(lambda y, t: number_rhs(y, growth_rates, decay_rates,
+                                    matrices, WMMd_inhibitors), y0_chunk, t)
+        store.write(start, y, chunk[:, np.newaxis])
+
+    return store
+
+def sweep_frac(folder, values, parameter, y0, t, N, cOC, cOB, cMMd, cMMr,
+                                matrix, WMMd_inhibitor = 0, chunk_size = 1000):
+    """Function that simulates the fraction model for all values of a scanned
+    parameter and writes the trajectories in a store. The values are integrated
+    in batches of chunk_size values.
+
+    Parameters:
+    -----------
+    folder: String
+        The folder of the store.
+    values: Numpy.ndarray
+        The values of the scanned parameter.
+    parameter: String
+        The scanned parameter, 'WMMd_inhibitor' or 'b_OC_MMd'.
+    y0: List
+        List with the start values of xOC, xOB, xMMd and xMMr.
+    t: Numpy.ndarray
+        Array with all the time points.
+    N: Int
+        Number of cells in the difussion range.
+    cOC: Float
+        Cost parameter OC.
+    cOB: Float
+        Cost parameter OB.
+    cMMd: Float
+        Cost parameter MMd.
+    cMMr: Float
+        Cost parameter MMr.
+    matrix: Numpy.ndarray
+        4x4 matrix containing the interaction factors.
+    WMMd_inhibitor: Float
+        The effect of a drug on the MMd fitness when it is not scanned.
+    chunk_size: Int
+        The number of values that are integrated together.
+
+    Returns:
+    --------
+    store: TrajectoryStore
+        The store with the trajectories.
+    """
+    values = np.asarray(values, dtype = float)
+    store = TrajectoryStore.create(folder, len(values), t, ['xOC', 'xOB',
+                                            'xMMd', 'xMMr'], [parameter])
+    costs = [cOC, cOB, cMMd, cMMr]
+
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start: start + chunk_size]
+        matrices, WMMd_inhibitors = scan_parameters(chunk, parameter, matrix,
+                                                                WMMd_inhibitor)
+        y0_chunk = np.repeat(np.asarray(y0, dtype = float)[np.newaxis],
+                                                        len(chunk), axis = 0)
+        y = batch_odeint(lambda y, t: fraction_rhs(y, N, costs, matrices,
+                                        WMMd_inhibitors), y0_chunk, t)
+        store.write(start, y, chunk[:, np.newaxis])
+
+    return store
+
+def flatten_parameters(parameters):
+    """Function that makes one array with the values of all parameters of all
+    runs, with a column per parameter value.
+
+    Parameters:
+    -----------
+    parameters: Dictionary
+        Dictionary with the names of the parameters as keys and arrays with the
+        runs on the first axis as values.
+
+    Returns:
+    --------
+    names: List
+        List with the names of the columns.
+    values: Numpy.ndarray
+        Array with the values, shape (runs, columns).
+
+    Example:
+    -----------
+    >>> names, values = flatten_parameters({'N': np.array([50, 60]),
+    ...                             'costs': np.array([[1, 0.8], [1, 0.9]])})
+    >>> names, values.tolist()
+    (['N', 'costs[0]', 'costs[1]'], [[50.0, 1.0, 0.8], [60.0, 1.0, 0.9]])
+    """
+    names, columns = [], []
+    for name, value in parameters.items():
+        value = np.asarray(value, dtype = float)
+        value = value.reshape(len(value), -1)
+        shape = np.asarray(parameters[name]).shape[1:]
+        if shape:
+            names += [f"{name}[{','.join(map(str, index))}]" for index in
+                                                            np.ndindex(shape)]
+        else:
+            names.append(name)
+        columns.append(value)
+    return names, np.concatenate(columns, axis = 1)
+
+def schedule_trajectories(t, y):
+    """Function that gives the trajectories of a batch of patients with the
+    patients on the first axis (used as outcomes function of run_chunk)."""
+    return {'y': np.swapaxes(y, 0, 1)}
+
+def store_chunk(folder, start, schedule, y0, mutation_start):
+    """Function that integrates a chunk of patients and writes their
+    trajectories in the store."""
+    store = TrajectoryStore(folder, 'r+')
+    y = run_chunk(schedule, y0, mutation_start, schedule_trajectories)['y']
+    store.write(start, np.swapaxes(y, 0, 1))
+
+def store_cohort(folder, cohort, therapy, mutation_start = 0, chunk_size = 500,
+                                                            n_workers = None):
+    """Function that simulates a therapy for a cohort of virtual patients
+    (MM_cohort.py) and writes the trajectories of all patients in a store. The
+    processes write their chunks directly in the store.
+
+    Parameters:
+    -----------
+    folder: String
+        The folder of the store.
+    cohort: Dictionary
+        Dictionary with the parameter values of all patients (from
+        draw_cohort), it has to contain the start numbers y0.
+    therapy: Function
+        Function that makes the schedule from the cohort dictionary.
+    mutation_start: Float
+        The generation from which resistance mutations can occur.
+    chunk_size: Int
+        The number of patients that are integrated together.
+    n_workers: Int
+        The number of processes, with 1 everything is done in this process and
+        with None the number of processors is used.
+
+    Returns:
+    --------
+    store: TrajectoryStore
+        The store with the trajectories, opened to read.
+
+    Example:
+    -----------
+    >>> from MM_cohort import draw_cohort, run_cohort
+    >>> from MM_schedule import continuous_schedule
+    >>> cohort = draw_cohort(6, {'y0': ('uniform', [170, 270, 160, 0],
+    ...     [190, 290, 180, 0]), 'growth_rates': [0.8, 1.2, 0.3, 0.3],
+    ...     'decay_rates': [0.9, 0.08, 0.2, 0.1], 'matrix': ('normal',
+    ...     np.array([
+    ...    [0.0, 0.4, 0.6, 0.54],
+    ...    [0.3, 0.0, -0.3, -0.3],
+    ...    [0.6, 0.0, 0.5, 0.0],
+    ...    [0.54, 0.0, -0.6, 0.65]]), 0.01)}, seed = 2)
+    >>> def MTD_therapy(cohort):
+    ...     return continuous_schedule(10, 40, cohort['growth_rates'],
+    ...         cohort['growth_rates'] * 0.9, cohort['decay_rates'],
+    ...         cohort['decay_rates'], cohort['matrix'], cohort['matrix'],
+    ...         1, 0.5)
+    >>> folder = tempfile.mkdtemp()
+    >>> store = store_cohort(folder, cohort, MTD_therapy, chunk_size = 4,
+    ...                                                     n_workers = 2)
+    >>> store.trajectories.shape
+    (6, 40, 4)
+    >>> df = run_cohort(cohort, MTD_therapy, n_workers = 1)
+    >>> bool(np.allclose(store.state('nMMd')[:, -1] +
+    ...     store.state('nMMr')[:, -1], df['total nMM'], rtol = 1e-6))
+    True
+    >>> shutil.rmtree(folder)
+    """
+    y0 = np.asarray(cohort['y0'], dtype = float)
+    n_patients = len(y0)
+    schedule = therapy(cohort)
+
+    # Make the store with the parameter values of all patients
+    names, parameters = flatten_parameters(cohort)
+    store = TrajectoryStore.create(folder, n_patients,
+        schedule_times(schedule), ['nOC', 'nOB', 'nMMd', 'nMMr'], names)
+    store.parameters[:] = parameters
+    store.flush()
+
+    chunks = [(folder, start, chunk_schedule(schedule, start, start +
+                chunk_size, n_patients), y0[start: start + chunk_size],
+                mutation_start) for start in range(0, n_patients, chunk_size)]
+
+    if n_workers == 1:
+        for chunk in chunks:
+            store_chunk(*chunk)
+    else:
+        with ProcessPoolExecutor(n_workers) as executor:
+            list(executor.map(store_chunk, *zip(*chunks)))
+
+    return TrajectoryStore(folder)
+
+if __name__ == "__main__":
+    main()
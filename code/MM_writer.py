@@ -0,0 +1,291 @@
+"""
+Author:       Eva Nieuwenhuis
+Student ID:   13717405
+Group:        Biosystems Data Analysis Group
+Course:       Bachelor project biomedical science, UvA
+
+Description:  Code to save the data files and figures in the background, so the
+              next computation does not wait until a dataframe is written or a
+              figure is rendered. A BackgroundWriter has a bounded queue of
+              writes that are done by background threads, when the queue is
+              full a new write waits (so the memory use stays limited). The
+              dataframes, arrays and dictionaries that are saved are copied
+              first, so they can be changed afterwards. flush waits until all
+              writes are done and raises the error of a failed write, a write
+              after a failed write also raises it.
+
+              The save functions of the model files use the active writer (a
+              writer in a with block of background_output, or the writer of
+              the environment variable MM_ASYNC_IO=1) and otherwise save
+              directly. Figures are only rendered in the background in batch
+              mode (MM_render.py), where they are not shown. Loading a data
+              file (MM_storage.py) first waits for the active writer.
+
+              MM_ASYNC_IO=1 MM_BATCH=1 python MM_model_numbers.py
+"""
+
+# Import the needed libraries
+import os
+import sys
+import queue
+import atexit
+import threading
+import doctest
+import numpy as np
+from contextlib import contextmanager
+from MM_render import batch_mode
+
+# The name of the environment variable that turns background saving on
+ASYNC_VARIABLE = 'MM_ASYNC_IO'
+
+# The default number of threads and the size of the queue
+N_THREADS = 2
+QUEUE_SIZE = 16
+
+# The writers of the with blocks of background_output, the last is active
+ACTIVE_WRITERS = []
+
+# The writer of the environment variable, made when it is first used
+DEFAULT_WRITER = None
+
+def main():
+    # Do doc tests
+    doctest.testmod()
+
+class WriterError(Exception):
+    """Error raised when one or more background writes failed, the error of
+    the first failed write is the cause."""
+
+def snapshot(value):
+    """Function that copies the dataframes, arrays, lists and dictionaries in a
+    value, so a write in the background saves the value as it was.
+
+    Example:
+    -----------
+    >>> values = {'MM number': np.zeros(2), 'strengths': [0.1]}
+    >>> copy = snapshot(values)
+    >>> values['MM number'][0] = 1
+    >>> values['strengths'].append(0.2)
+    >>> copy['MM number'].tolist(), copy['strengths']
+    ([0.0, 0.0], [0.1])
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if hasattr(value, 'copy') and type(value).__name__ in ('DataFrame',
+                                                                'Series'):
+        return value.copy(deep = True)
+    if isinstance(value, dict):
+        return {name: snapshot(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(snapshot(item) for item in value)
+    return value
+
+class BackgroundWriter:
+    """Class of a writer with a bounded queue and background threads.
+
+    Parameters:
+    -----------
+    n_threads: Int
+        The number of background threads.
+    queue_size: Int
+        The maximum number of writes in the queue.
+
+    Example:
+    -----------
+    >>> written = []
+    >>> with BackgroundWriter() as writer:
+    ...     values = [1, 2]
+    ...     writer.submit(written.append, values)
+    ...     values.append(3)
+    >>> written
+    [[1, 2]]
+    >>> writer = BackgroundWriter(n_threads = 1)
+    >>> writer.submit(open, os.path.join('no folder', 'no file'))
+    >>> writer.flush() # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    MM_writer.WriterError: 1 background write(s) failed
+    >>> writer.close()
+    """
+    def __init__(self, n_threads = N_THREADS, queue_size = QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize = queue_size)
+        self.lock = threading.Lock()
+        self.errors = []
+        self.threads = [threading.Thread(target = self.work, daemon = True,
+                            name = f'MM_writer_{i}') for i in range(n_threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, *exception):
+        # Do not hide the error of the with block by an error of a write
+        if exception_type is None:
+            self.close()
+        else:
+            try:
+                self.close()
+            except WriterError:
+                pass
+        return False
+
+    def work(self):
+        """Function of the background threads that does the writes."""
+        while True:
+            task = self.queue.get()
+            try:
+                if task is None:
+                    return
+                function, args, kwargs = task
+                function(*args, **kwargs)
+            except BaseException as error:
+                with self.lock:
+                    self.errors.append(error)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, function, *args, **kwargs):
+        """Function that puts a write in the queue, it waits when the queue is
+        full. The inputs are copied with snapshot.
+
+        Parameters:
+        -----------
+        function: Function
+            The function that writes, for example MM_storage.save_table.
+        args: Tuple
+            The inputs of the function.
+        kwargs: Dictionary
+            The keyword inputs of the function.
+        """
+        self.raise_errors()
+        self.queue.put((function, snapshot(args), snapshot(kwargs)))
+
+    def raise_errors(self):
+        """Function that raises a WriterError when writes failed, the errors
+        are removed so the writer can be used again."""
+        with self.lock:
+            errors, self.errors = self.errors, []
+        if errors:
+            raise WriterError(f'{len(errors)} background write(s) failed') \
+                                                                from errors[0]
+
+    def flush(self):
+        """Function that waits until all writes in the queue are done and
+        raises a WriterError when writes failed."""
+        self.queue.join()
+        self.raise_errors()
+
+    def close(self):
+        """Function that does all writes and stops the threads."""
+        if not any(thread.is_alive() for thread in self.threads):
+            self.raise_errors()
+            return
+        self.queue.join()
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.raise_errors()
+
+@contextmanager
+def background_output(n_threads = N_THREADS, queue_size = QUEUE_SIZE):
+    """Function that makes a writer that is active in a with block, at the end
+    of the block all writes are done and the errors are raised.
+
+    Example:
+    -----------
+    >>> written = []
+    >>> with background_output() as writer:
+    ...     write(written.append, 'df_cell_nr.npz')
+    ...     active_writer() is writer
+    True
+    >>> written, active_writer() is None
+    (['df_cell_nr.npz'], True)
+    """
+    writer = BackgroundWriter(n_threads, queue_size)
+    ACTIVE_WRITERS.append(writer)
+    try:
+        with writer:
+            yield writer
+    finally:
+        ACTIVE_WRITERS.remove(writer)
+
+def close_default_writer():
+    """Function that does the writes of the default writer at the end of the
+    program, the errors are shown because they can not be raised anymore."""
+    global DEFAULT_WRITER
+    if DEFAULT_WRITER is not None:
+        try:
+            DEFAULT_WRITER.close()
+        except WriterError as error:
+            print(f'{error}: {error.__cause__!r}', file = sys.stderr)
+        DEFAULT_WRITER = None
+
+def active_writer():
+    """Function that gives the active writer, None when the files are saved
+    directly."""
+    global DEFAULT_WRITER
+    if ACTIVE_WRITERS:
+        return ACTIVE_WRITERS[-1]
+    if os.environ.get(ASYNC_VARIABLE, '0') in ('', '0'):
+        return None
+    if DEFAULT_WRITER is None:
+        DEFAULT_WRITER = BackgroundWriter()
+        atexit.register(close_default_writer)
+    return DEFAULT_WRITER
+
+def write(function, *args, **kwargs):
+    """Function that saves with the active writer, or directly when there is
+    none.
+
+    Parameters:
+    -----------
+    function: Function
+        The function that writes, for example MM_storage.save_table.
+    args: Tuple
+        The inputs of the function.
+    kwargs: Dictionary
+        The keyword inputs of the function.
+    """
+    writer = active_writer()
+    if writer is None:
+        function(*args, **kwargs)
+    else:
+        writer.submit(function, *args, **kwargs)
+
+def save_figure(figure, file_path, **kwargs):
+    """Function that saves a matplotlib figure, in batch mode with the active
+    writer. The figure is then first closed in pyplot, so the next plots can
+    not change it.
+
+    Parameters:
+    -----------
+    figure: Matplotlib Figure
+        The figure, or pyplot itself for the current figure.
+    file_path: String
+        The path of the file.
+    kwargs: Dictionary
+        The keyword inputs of savefig.
+    """
+    writer = active_writer()
+    if writer is None or not batch_mode():
+        figure.savefig(file_path, **kwargs)
+        return
+
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+    if not isinstance(figure, Figure):
+        figure = plt.gcf()
+    plt.close(figure)
+    writer.submit(figure.savefig, file_path, **kwargs)
+
+def wait_for_writes():
+    """Function that waits until the writes of the active writer are done, for
+    example before a saved file is loaded."""
+    writer = ACTIVE_WRITERS[-1] if ACTIVE_WRITERS else DEFAULT_WRITER
+    if writer is not None:
+        writer.flush()
+
+if __name__ == "__main__":
+    main()
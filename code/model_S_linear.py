@@ -42,12 +42,19 @@ import math
 import numpy as np
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import ternary
-import plotly.express as px
-import plotly.io as pio
 from scipy.integrate import odeint
 import doctest
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_lazy import lazy_import
+
+# Import the plotting libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+ternary = lazy_import('ternary')
+px = lazy_import('plotly.express')
+pio = lazy_import('plotly.io')
 
 def main():
     # Do doc tests
@@ -135,21 +142,23 @@ def combine_dataframes(df_1, df_2):
 
     return(combined_df)
 
-def save_data(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_data(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The data frame contain the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
 def save_Figure(figure, file_name, folder_path):
     """Save the Figure to a specific folder.
@@ -164,7 +173,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def save_ternary(figure, file_name, folder_path):
     """Save the ternary plot in a specific folder.
@@ -179,11 +191,12 @@ def save_ternary(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    pio.write_image(figure, os.path.join(folder_path, f'{file_name}.png'),
-                                                                 format='png')
+    MM_writer.write(pio.write_image, figure, os.path.join(folder_path,
+                                    f'{file_name}.png'), format='png')
 
 def collect_data(file_name, folder_path):
-    """ Function that reads the data from a csv file to a dataframe.
+    """ Function that reads the data from a binary (npz) or csv file to a
+    dataframe, the binary file is used when it exists.
 
     Parameters:
     -----------
@@ -199,7 +212,7 @@ def collect_data(file_name, folder_path):
     """
     os.makedirs(folder_path, exist_ok=True)
     file_path = os.path.join(folder_path, file_name)
-    data_frame = pd.read_csv(file_path)
+    data_frame = MM_storage.load_table(file_path)
 
     return data_frame
 
@@ -495,11 +508,14 @@ def Figure_2():
     df_Figure_2_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_2_first_line, 'df_Figure_2_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_2_second_line, 'df_Figure_2_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # determine the fitness values
     df_fitness_first_line = frac_to_fitness_values(df_Figure_2_first_line, N, c1,
@@ -529,8 +545,8 @@ def Figure_2():
                                                             loc='upper right')
     plt.tight_layout()
     save_Figure(plt, 'line_plot_Figure_2_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Create a Figure with subplots
     fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(14,6))
@@ -554,8 +570,8 @@ def Figure_2():
                                                                 loc='upper right')
     plt.tight_layout()
     save_Figure(plt, 'line_plot_Figure_2_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Determine the direction of both lines in a ternary plot
     fig1 = px.line_ternary(df_Figure_2_first_line, a='xOC', b='xOB', c='xMM')
@@ -576,8 +592,8 @@ def Figure_2():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig1.update_layout(title_text='Dynamics for a scenario where c2<c1<c3 (Figure 2)')
     save_ternary(fig1, 'Ternary_plot_Figure_2',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """Figure 3"""
 def Figure_3():
@@ -638,13 +654,16 @@ def Figure_3():
     df_Figure_3_third_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_3_first_line, 'df_Figure_3_first_line.csv',
-                                r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_3_second_line, 'df_Figure_3_second_line.csv',
-                                r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_3_third_line, 'df_Figure_3_third_line.csv',
-                                r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot with three subplos
     fig1, axes = plt.subplots(1, 3, figsize=(15, 5))
@@ -672,8 +691,8 @@ def Figure_3():
     axes[2].legend(loc ='upper right')
     plt.tight_layout()
     save_Figure(fig1, 'Line_plot_Figure_3',
-                     r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                     figure_path('results_model_Sartakhti_linear'))
+    show()
 
 """ Figure 5"""
 def Figure_5():
@@ -718,11 +737,14 @@ def Figure_5():
     df_Figure_5_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_5_first_line, 'df_Figure_5_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_5_second_line, 'df_Figure_5_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Determine the fitness values
     df_fitness_first_line = frac_to_fitness_values(df_Figure_5_first_line, N, c1,
@@ -752,8 +774,8 @@ def Figure_5():
                                                             loc ='upper right')
     plt.tight_layout()
     save_Figure(plt, 'line_plot_Figure_5_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Create a Figure and axes for subplots
     fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(14,6))
@@ -777,8 +799,8 @@ def Figure_5():
                                                             loc ='upper right')
     plt.tight_layout()
     save_Figure(plt, 'line_plot_Figure_5_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_5_first_line, a='xOC', b='xOB', c='xMM')
@@ -796,8 +818,8 @@ def Figure_5():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2<c1<c3 (Figure 5)')
     save_ternary(fig1, 'Ternary_plot_Figure_5',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """Figure 8A"""
 def Figure_8A():
@@ -842,11 +864,14 @@ def Figure_8A():
     df_Figure_8A_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_8A_first_line, 'df_Figure_8A_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_8A_second_line, 'df_Figure_8A_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_8A_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -856,8 +881,8 @@ def Figure_8A():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 8A)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_8A_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_8A_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -867,8 +892,8 @@ def Figure_8A():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 8A)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_8A_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_8A_first_line, a='xOC', b='xOB', c='xMM')
@@ -886,8 +911,8 @@ def Figure_8A():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2<c1<c3 (Figure 8A)')
     save_ternary(fig1, 'Ternary_plot_Figure_8A',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """Figure 8B"""
 def Figure_8B():
@@ -933,11 +958,14 @@ def Figure_8B():
     df_Figure_8B_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_8B_first_line, 'df_Figure_8B_first_line.csv',
-                                   r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_8B_second_line, 'df_Figure_8B_second_line.csv',
-                                   r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_8B_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -947,8 +975,8 @@ def Figure_8B():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 8B)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_8B_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_8B_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM', ],
@@ -958,8 +986,8 @@ def Figure_8B():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 8B)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_8B_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_8B_first_line, a='xOC', b='xOB', c='xMM')
@@ -977,8 +1005,8 @@ def Figure_8B():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2<c1<c3 (Figure 8B)')
     save_ternary(fig1, 'Ternary_plot_Figure_8B',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """SENARIO 2"""
 """Figure 9A"""
@@ -1025,11 +1053,14 @@ def Figure_9A():
     df_Figure_9A_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_9A_first_line, 'df_Figure_9A_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_9A_second_line, 'df_Figure_9A_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_9A_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1039,8 +1070,8 @@ def Figure_9A():
     plt.title('Dynamics for a scenario where c2=c1=c3 (Figure 9A)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_9A_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_9A_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1050,8 +1081,8 @@ def Figure_9A():
     plt.title('Dynamics for a scenario where c2=c1=c3 (Figure 9A)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_9A_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_9A_first_line, a='xOC', b='xOB', c='xMM')
@@ -1070,8 +1101,8 @@ def Figure_9A():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2=c1=c3 (Figure 9A)')
     save_ternary(fig1, 'Ternary_plot_Figure_9A',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """ Figure 9B """
 def Figure_9B():
@@ -1116,11 +1147,14 @@ def Figure_9B():
     df_Figure_9B_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_9B_first_line, 'df_Figure_9B_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_9B_second_line, 'df_Figure_9B_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_9B_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1130,8 +1164,8 @@ def Figure_9B():
     plt.title('Dynamics for a scenario where c2=c1=c3 (Figure 9B)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_9B_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_9B_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1141,8 +1175,8 @@ def Figure_9B():
     plt.title('Dynamics for a scenario where c2=c1=c3 (Figure 9B)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_9B_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_9B_first_line, a='xOC', b='xOB', c='xMM')
@@ -1161,8 +1195,8 @@ def Figure_9B():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2=c1=c3 (Figure 9B)')
     save_ternary(fig1, 'Ternary_plot_Figure_9B',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """ Figure 9C """
 def Figure_9C():
@@ -1207,11 +1241,14 @@ def Figure_9C():
     df_Figure_9C_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_9C_first_line, 'df_Figure_9C_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_9C_second_line, 'df_Figure_9C_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_9C_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1221,8 +1258,8 @@ def Figure_9C():
     plt.title('Dynamics for a scenario where c2=c1=c3 (Figure 9C)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_9C_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_9C_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1232,8 +1269,8 @@ def Figure_9C():
     plt.title('Dynamics for a scenario where c2=c1=c3 (Figure 9C)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_9C_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_9C_first_line, a='xOC', b='xOB', c='xMM')
@@ -1251,8 +1288,8 @@ def Figure_9C():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2=c1=c3 (Figure 9C)')
     save_ternary(fig1, 'Ternary_plot_Figure_9C',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """SENARIO 3"""
 """Figure 10A"""
@@ -1298,11 +1335,14 @@ def Figure_10A():
     df_Figure_10A_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_10A_first_line, 'df_Figure_10A_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_10A_second_line, 'df_Figure_10A_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_10A_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1312,8 +1352,8 @@ def Figure_10A():
     plt.title('Dynamics for a scenario where c3<c1<c2 (Figure 10A)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_10A_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_10A_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1323,8 +1363,8 @@ def Figure_10A():
     plt.title('Dynamics for a scenario where c3<c1<c2 (Figure 10A)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_10A_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_10A_first_line, a='xOC', b='xOB', c='xMM')
@@ -1343,8 +1383,8 @@ def Figure_10A():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c3<c1<c2 (Figure 10A)')
     save_ternary(fig1, 'Ternary_plot_Figure_10A',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """Figure 10B"""
 def Figure_10B():
@@ -1389,10 +1429,13 @@ def Figure_10B():
     df_Figure_10B_second_line = pd.DataFrame({'Generation': t, 'xOC': y[:, 0],
     'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     save_data(df_Figure_10B_first_line, 'df_Figure_10B_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_10B_second_line, 'df_Figure_10B_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_10B_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1402,8 +1445,8 @@ def Figure_10B():
     plt.title('Dynamics for a scenario where c3<c1<c2 (Figure 10B)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_10B_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     df_Figure_10B_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
                         label = ['fraction OC', 'fraction OB', 'fraction MM'])
@@ -1412,8 +1455,8 @@ def Figure_10B():
     plt.title('Dynamics for a scenario where c3<c1<c2 (Figure 10B)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_10B_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_10B_first_line, a='xOC', b='xOB', c='xMM')
@@ -1432,8 +1475,8 @@ def Figure_10B():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c3<c1<c2 (Figure 10B)')
     save_ternary(fig1, 'Ternary_plot_Figure_10B',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """Figure 11"""
 def Figure_11():
@@ -1478,8 +1521,11 @@ def Figure_11():
     'xOB': y[:, 1], 'xMM': y[:, 2]})
     df_Figure_11_first_line = combine_dataframes(df_1, df_2)
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     save_data(df_Figure_11_first_line, 'df_Figure_11_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
 
     # Make a plot
@@ -1490,8 +1536,8 @@ def Figure_11():
     plt.title('Effect reducing the MM cell fraction (Figure 11)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_11',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_11_first_line, a='xOC', b='xOB', c='xMM')
@@ -1505,8 +1551,8 @@ def Figure_11():
     # Add both lines to one ternary plot
     fig1.update_layout(title_text= 'Effect reducing MM cells (Figure 11)')
     save_ternary(fig1, 'Ternary_plot_Figure_11',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """Figure 12 A middle"""
 def Figure_12A_middle():
@@ -1552,11 +1598,14 @@ def Figure_12A_middle():
     df_Figure_12A_middle_second_line = pd.DataFrame({'Generation': t,
                                 'xOC': y[:, 0], 'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_12A_middle_first_line, 'df_Figure_12A_middle_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_12A_middle_second_line, 'df_Figure_12A_middle_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_12A_middle_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1566,8 +1615,8 @@ def Figure_12A_middle():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12A middle)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12A_middle_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_12A_middle_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1577,8 +1626,8 @@ def Figure_12A_middle():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12A middle)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12A_middle_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_12A_middle_first_line, a='xOC', b='xOB',
@@ -1599,8 +1648,8 @@ def Figure_12A_middle():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2<c1<c3 (Figure 12A middle)')
     save_ternary(fig1, 'Ternary_plot_Figure_12A_middle',
-                    r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                    figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """Figure 12 A right"""
 def Figure_12A_right():
@@ -1646,11 +1695,14 @@ def Figure_12A_right():
     df_Figure_12A_right_second_line = pd.DataFrame({'Generation': t,
                                 'xOC': y[:, 0], 'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_12A_right_first_line, 'df_Figure_12A_right_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_12A_right_second_line, 'df_Figure_12A_right_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_12A_right_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1660,8 +1712,8 @@ def Figure_12A_right():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12A right)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12A_right_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_12A_right_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1671,8 +1723,8 @@ def Figure_12A_right():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12A right)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12A_right_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_12A_right_first_line, a='xOC', b='xOB',
@@ -1693,8 +1745,8 @@ def Figure_12A_right():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2<c1<c3 (Figure 12A right)')
     save_ternary(fig1, 'Ternary_plot_Figure_12A_right',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """ Figure 12B middle"""
 def Figure_12B_middle():
@@ -1739,11 +1791,14 @@ def Figure_12B_middle():
     df_Figure_12B_middle_second_line = pd.DataFrame({'Generation': t,
                                 'xOC': y[:, 0], 'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_12B_middle_first_line, 'df_Figure_12B_middle_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_12B_middle_second_line, 'df_Figure_12B_middle_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_12B_middle_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1753,8 +1808,8 @@ def Figure_12B_middle():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12B middle)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12B_middle_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_12B_middle_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1764,8 +1819,8 @@ def Figure_12B_middle():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12B middle)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12B_middle_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_12B_middle_first_line, a='xOC', b='xOB',
@@ -1786,9 +1841,9 @@ def Figure_12B_middle():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2<c1<c3 (Figure 12B middle)')
     save_ternary(fig1, 'Ternary_plot_Figure_12B_middle',
-                        r'..\visualisation\results_model_Sartakhti_linear')
+                        figure_path('results_model_Sartakhti_linear'))
 
-    fig1.show()
+    show(fig1)
 
 """ Figure 12B right"""
 def Figure_12B_right():
@@ -1833,11 +1888,14 @@ def Figure_12B_right():
     df_Figure_12B_right_second_line = pd.DataFrame({'Generation': t,
                                 'xOC': y[:, 0], 'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_12B_right_first_line, 'df_Figure_12B_right_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_12B_right_second_line, 'df_Figure_12B_right_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_12B_right_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1847,8 +1905,8 @@ def Figure_12B_right():
     plt.title('Dynamics for a scenario where c3=c2<c1 (Figure 12B right)')
     plt.legend(loc ='upper right')
     save_Figure(plt,'line_plot_Figure_12B_right_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_12B_right_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1858,8 +1916,8 @@ def Figure_12B_right():
     plt.title('Dynamics for a scenario where c3=c2<c1 (Figure 12B right)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12B_right_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_12B_right_first_line, a='xOC', b='xOB',
@@ -1880,9 +1938,9 @@ def Figure_12B_right():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c3=c2<c1 (Figure 12B right)')
     save_ternary(fig1, 'Ternary_plot_Figure_12B_right',
-                        r'..\visualisation\results_model_Sartakhti_linear')
+                        figure_path('results_model_Sartakhti_linear'))
 
-    fig1.show()
+    show(fig1)
 
 """ Figure 12C middle"""
 def Figure_12C_middle():
@@ -1928,11 +1986,14 @@ def Figure_12C_middle():
     df_Figure_12C_middle_second_line = pd.DataFrame({'Generation': t,
                                 'xOC': y[:, 0], 'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_12C_middle_first_line, 'df_Figure_12C_middle_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_12C_middle_second_line, 'df_Figure_12C_middle_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_12C_middle_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1942,8 +2003,8 @@ def Figure_12C_middle():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12C middle)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12C_middle_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_12C_middle_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1953,8 +2014,8 @@ def Figure_12C_middle():
     plt.title('Dynamics for a scenario where c2<c1<c3 (Figure 12C middle)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12C_middle_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_12C_middle_first_line, a='xOC', b='xOB',
@@ -1975,8 +2036,8 @@ def Figure_12C_middle():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c2<c1<c3 (Figure 12C middle)')
     save_ternary(fig1, 'Ternary_plot_Figure_12C_middle',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 """ Figure 12C right"""
 def Figure_12C_right():
@@ -2021,11 +2082,14 @@ def Figure_12C_right():
     df_Figure_12C_right_second_line = pd.DataFrame({'Generation': t,
                                 'xOC': y[:, 0], 'xOB': y[:, 1], 'xMM': y[:, 2]})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'c3': c3, 'c2': c2, 'c1': c1, 'matrix': matrix}
+
     # Save the data as csv file
     save_data(df_Figure_12C_right_first_line, 'df_Figure_12C_right_first_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
     save_data(df_Figure_12C_right_second_line, 'df_Figure_12C_right_second_line.csv',
-                                    r'..\data\data_model_Sartakhti_linear')
+                             data_path('data_model_Sartakhti_linear'), metadata)
 
     # Make a plot
     df_Figure_12C_right_first_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -2035,8 +2099,8 @@ def Figure_12C_right():
     plt.title('Dynamics for a scenario where c3<c2<c1 (Figure 12C right)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12C_right_first_line_red',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a plot
     df_Figure_12C_right_second_line.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -2046,8 +2110,8 @@ def Figure_12C_right():
     plt.title('Dynamics for a scenario where c3<c2<c1 (Figure 12C right)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'line_plot_Figure_12C_right_second_line_blue',
-                        r'..\visualisation\results_model_Sartakhti_linear')
-    plt.show()
+                        figure_path('results_model_Sartakhti_linear'))
+    show()
 
     # Make a ternary plot
     fig1 = px.line_ternary(df_Figure_12C_right_first_line, a='xOC', b='xOB',
@@ -2068,8 +2132,8 @@ def Figure_12C_right():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Dynamics for a scenario where c3<c2<c1 (Figure 12C right)')
     save_ternary(fig1, 'Ternary_plot_Figure_12C_right',
-                    r'..\visualisation\results_model_Sartakhti_linear')
-    fig1.show()
+                    figure_path('results_model_Sartakhti_linear'))
+    show(fig1)
 
 if __name__ == "__main__":
     main()
@@ -28,13 +28,20 @@ Stroma Interactions in Multiple Myeloma: Effect of nonlinear benefits. Games, 9(
 import math
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import ternary
-import plotly.express as px
-import plotly.io as pio
 from scipy.integrate import odeint
 import os
 import doctest
+import MM_storage
+import MM_writer
+from MM_render import show, close_in_batch_mode
+from MM_paths import data_path, figure_path
+from MM_lazy import lazy_import
+
+# Import the plotting libraries only when they are used
+plt = lazy_import('matplotlib.pyplot')
+ternary = lazy_import('ternary')
+px = lazy_import('plotly.express')
+pio = lazy_import('plotly.io')
 
 def main():
     # Do doc tests
@@ -489,24 +496,27 @@ def combine_dataframes(df_1, df_2):
 
     return(combined_df)
 
-def save_data(data_frame, file_name, folder_path):
-    """ Function that saves a dataframe as csv file.
+def save_data(data_frame, file_name, folder_path, metadata = None):
+    """ Function that saves a dataframe as binary (npz) file.
 
     Parameters:
     -----------
     data_frame: DataFrame
         The data frame contain the collected data.
     file_name: String
-        The name of the csv file.
+        The name of the file, the .csv extension is replaced by the
+        extension of the storage format (MM_storage.py).
     folder_path: String
         Path to the folder where the data will be saved.
+    metadata: Dictionary
+        Information about the data, for example the used parameter values.
     """
-    os.makedirs(folder_path, exist_ok=True)
-    file_path = os.path.join(folder_path, file_name)
-    data_frame.to_csv(file_path, index=False)
+    MM_writer.write(MM_storage.save_table, data_frame,
+                    os.path.join(folder_path, file_name), metadata)
 
 def collect_data(file_name, folder_path):
-    """ Function that reads the data from a csv file to a dataframe.
+    """ Function that reads the data from a binary (npz) or csv file to a
+    dataframe, the binary file is used when it exists.
 
     Parameters:
     -----------
@@ -522,7 +532,7 @@ def collect_data(file_name, folder_path):
     """
     os.makedirs(folder_path, exist_ok=True)
     file_path = os.path.join(folder_path, file_name)
-    data_frame = pd.read_csv(file_path)
+    data_frame = MM_storage.load_table(file_path)
 
     return data_frame
 
@@ -539,7 +549,10 @@ def save_Figure(figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    figure.savefig(os.path.join(folder_path, file_name))
+    MM_writer.save_figure(figure, os.path.join(folder_path, file_name))
+
+    # Close the figure in batch mode so it does not stay in the memory
+    close_in_batch_mode(figure)
 
 def save_ternary(Figure, file_name, folder_path):
     """Save the ternary plot in a specific folder.
@@ -554,8 +567,8 @@ def save_ternary(Figure, file_name, folder_path):
         Path to the folder where the data will be saved.
     """
     os.makedirs(folder_path, exist_ok=True)
-    pio.write_image(Figure, os.path.join(folder_path, f'{file_name}.png'),
-                                                                    format='png')
+    MM_writer.write(pio.write_image, Figure, os.path.join(folder_path,
+                                    f'{file_name}.png'), format='png')
 
 def dynamics_same_h_and_s(y, t, parameters):
     """Determines the fracuenty dynamics in a population over time. The h value
@@ -719,9 +732,16 @@ def Figure_1():
     df_Figure_1 = pd.DataFrame({'Generation': t, 'xOC': xOC_values,
                                         'xOB': xOB_values, 'xMM': xMM_values})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOC_OB': BOC_OB,
+                'BOC_MM': BOC_MM, 'BOB_OC': BOB_OC, 'BOB_OB': BOB_OB,
+                'BOB_MM': BOB_MM, 'BMM_OC': BMM_OC, 'BMM_OB': BMM_OB,
+                'BMM_MM': BMM_MM, 's': s, 'h': h}
+
     # Save the data as csv file
     save_data(df_Figure_1, 'data_Figure_1.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make lists
     WOC_list = []
@@ -794,8 +814,8 @@ def Figure_1():
                                                             loc = 'upper left')
     plt.tight_layout()
     save_Figure(plt, 'Line_plot_Figure_1',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot
     fig = px.line_ternary(df_Figure_1, a='xOB', b='xMM', c='xOC')
@@ -807,8 +827,8 @@ def Figure_1():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text='Linear benefits (Figure 1)')
     save_ternary(fig, 'Ternary_plot_Figure_1',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
 """Figure 2"""
 def Figure_2():
@@ -854,9 +874,12 @@ def Figure_2():
                 pd.DataFrame({ 'n_values': n_values,
                 'benefit_values': benefit_values, 'h_value': h_value}))
 
+    # The parameters that are saved with the data
+    metadata = {'h_values': h_values, 'B_value': B_value}
+
     # Save the data as csv file
     save_data(df_sigmoids_Figure_2, 'data_sigmoids_Figure_2.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make a plot
     fig, axes = plt.subplots(1, len(h_values), figsize=(14, 5))
@@ -876,8 +899,8 @@ def Figure_2():
     # Show the plot
     plt.tight_layout()
     save_Figure(plt, 'Benefit_curves_Figure_2',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     df_ternary_Figure_2 = pd.DataFrame(columns=['Generation', 'xOC', 'xOB', 'xMM',
                                                                     'h_value'])
@@ -933,7 +956,7 @@ def Figure_2():
 
     # Save the data as csv file
     save_data(df_ternary_Figure_2, 'data_ternary_Figure_2.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Loop over all the h values
     for h_value in h_values:
@@ -949,8 +972,8 @@ def Figure_2():
         h at {h_value} (Figure 2)""")
         name = f'subset_plot_h_{h_value}_Figure_2'
         save_ternary(fig, name,
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-        fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+        show(fig)
 
 
 """ Figure 3"""
@@ -1050,11 +1073,24 @@ def Figure_3():
     df_Figure_3_linear = pd.DataFrame({'Generation': t, 'xOC': xOC_values,
                                         'xOB': xOB_values, 'xMM': xMM_values})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOB_OC': BOB_OC,
+                'BMM_OC': BMM_OC, 'BOC_OB': BOC_OB, 'BOB_OB': BOB_OB,
+                'BMM_OB': BMM_OB, 'BOC_MM': BOC_MM, 'BOB_MM': BOB_MM,
+                'BMM_MM': BMM_MM, 'hOC_OC': hOC_OC, 'hOC_OB': hOC_OB,
+                'hOC_MM': hOC_MM, 'hOB_OC': hOB_OC, 'hOB_OB': hOB_OB,
+                'hOB_MM': hOB_MM, 'hMM_OC': hMM_OC, 'hMM_OB': hMM_OB,
+                'hMM_MM': hMM_MM, 'sOC_OC': sOC_OC, 'sOC_OB': sOC_OB,
+                'sOC_MM': sOC_MM, 'sOB_OC': sOB_OC, 'sOB_OB': sOB_OB,
+                'sOB_MM': sOB_MM, 'sMM_OC': sMM_OC, 'sMM_OB': sMM_OB,
+                'sMM_MM': sMM_MM, 's_linear': s_linear}
+
     # Save the data as csv file
     save_data(df_Figure_3_nonlinear, 'data_Figure_3_nonlinear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_Figure_3_linear, 'data_Figure_3_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make a line plot of non-linear data
     df_Figure_3_nonlinear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1064,8 +1100,8 @@ def Figure_3():
     plt.title('Nonlinear benefits (Figure 3)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_3_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot of non-linear data
     fig = px.line_ternary(df_Figure_3_nonlinear, a='xOB', b='xMM', c='xOC')
@@ -1076,8 +1112,8 @@ def Figure_3():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text=f'Nonlinear benefits (Figure 3)')
     save_ternary(fig, 'Ternary_plot_Figure_3_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
     # Make a line plot of linear data
     df_Figure_3_linear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1088,8 +1124,8 @@ def Figure_3():
     plt.title('Linear benefits (Figure 3)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_3_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot  of linear data
     fig = px.line_ternary(df_Figure_3_linear, a='xOB', b='xMM', c='xOC')
@@ -1100,8 +1136,8 @@ def Figure_3():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Linear benefits (Figure 3)')
     save_ternary(fig, 'Ternary_plot_Figure_3_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
 """Figure 4"""
 def Figure_4():
@@ -1200,11 +1236,24 @@ def Figure_4():
                                             'xOB': xOB_values, 'xMM': xMM_values})
 
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOB_OC': BOB_OC,
+                'BMM_OC': BMM_OC, 'BOC_OB': BOC_OB, 'BOB_OB': BOB_OB,
+                'BMM_OB': BMM_OB, 'BOC_MM': BOC_MM, 'BOB_MM': BOB_MM,
+                'BMM_MM': BMM_MM, 'hOC_OC': hOC_OC, 'hOC_OB': hOC_OB,
+                'hOC_MM': hOC_MM, 'hOB_OC': hOB_OC, 'hOB_OB': hOB_OB,
+                'hOB_MM': hOB_MM, 'hMM_OC': hMM_OC, 'hMM_OB': hMM_OB,
+                'hMM_MM': hMM_MM, 'sOC_OC': sOC_OC, 'sOC_OB': sOC_OB,
+                'sOC_MM': sOC_MM, 'sOB_OC': sOB_OC, 'sOB_OB': sOB_OB,
+                'sOB_MM': sOB_MM, 'sMM_OC': sMM_OC, 'sMM_OB': sMM_OB,
+                'sMM_MM': sMM_MM, 's_linear': s_linear}
+
     # Save the data as csv file
     save_data(df_Figure_4_nonlinear, 'data_Figure_4_nonlinear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_Figure_4_linear, 'data_Figure_4_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make a line plot of non-linear data
     df_Figure_4_nonlinear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1214,8 +1263,8 @@ def Figure_4():
     plt.title('Nonlinear benefits (Figure 4)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_4_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot of non-linear data
     fig = px.line_ternary(df_Figure_4_nonlinear, a='xOB', b='xMM', c='xOC')
@@ -1226,8 +1275,8 @@ def Figure_4():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Nonlinear benefits (Figure 4)')
     save_ternary(fig, 'Ternary_plot_Figure_4_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
     # Make a line plot of linear data
     df_Figure_4_linear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1237,8 +1286,8 @@ def Figure_4():
     plt.title('Linear benefits (Figure 4)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_4_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot  of linear data
     fig = px.line_ternary(df_Figure_4_linear, a='xOB', b='xMM', c='xOC')
@@ -1249,8 +1298,8 @@ def Figure_4():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Linear benefits (Figure 4)')
     save_ternary(fig, 'Ternary_plot_Figure_4_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
 """Figure 5"""
 def Figure_5():
@@ -1350,11 +1399,24 @@ def Figure_5():
     df_Figure_5_linear = pd.DataFrame({'Generation': t, 'xOC': xOC_values,
                                         'xOB': xOB_values, 'xMM': xMM_values})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOB_OC': BOB_OC,
+                'BMM_OC': BMM_OC, 'BOC_OB': BOC_OB, 'BOB_OB': BOB_OB,
+                'BMM_OB': BMM_OB, 'BOC_MM': BOC_MM, 'BOB_MM': BOB_MM,
+                'BMM_MM': BMM_MM, 'hOC_OC': hOC_OC, 'hOC_OB': hOC_OB,
+                'hOC_MM': hOC_MM, 'hOB_OC': hOB_OC, 'hOB_OB': hOB_OB,
+                'hOB_MM': hOB_MM, 'hMM_OC': hMM_OC, 'hMM_OB': hMM_OB,
+                'hMM_MM': hMM_MM, 'sOC_OC': sOC_OC, 'sOC_OB': sOC_OB,
+                'sOC_MM': sOC_MM, 'sOB_OC': sOB_OC, 'sOB_OB': sOB_OB,
+                'sOB_MM': sOB_MM, 'sMM_OC': sMM_OC, 'sMM_OB': sMM_OB,
+                'sMM_MM': sMM_MM, 's_linear': s_linear}
+
     # Save the data as csv file
     save_data(df_Figure_5_nonlinear, 'data_Figure_5_nonlinear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_Figure_5_linear, 'data_Figure_5_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make a line plot of non-linear df
     df_Figure_5_nonlinear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1364,8 +1426,8 @@ def Figure_5():
     plt.title('Nonlinear benefits (Figure 5)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_5_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot of non-linear data
     fig = px.line_ternary(df_Figure_5_nonlinear, a='xOB', b='xMM', c='xOC')
@@ -1376,8 +1438,8 @@ def Figure_5():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Nonlinear benefits (Figure 5)')
     save_ternary(fig, 'Ternary_plot_Figure_5_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
     # Make a line plot of linear data
     df_Figure_5_linear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1387,8 +1449,8 @@ def Figure_5():
     plt.legend(loc ='upper right')
     plt.title('linear benefits (Figure 5)')
     save_Figure(plt, 'Line_plot_Figure_5_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot  of linear data
     fig = px.line_ternary(df_Figure_5_linear, a='xOB', b='xMM', c='xOC')
@@ -1399,8 +1461,8 @@ def Figure_5():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Linear benefits (Figure 5)')
     save_ternary(fig, 'Ternary_plot_Figure_5_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
 """Figure 6"""
 def Figure_6():
@@ -1501,11 +1563,24 @@ def Figure_6():
     df_Figure_6_linear = pd.DataFrame({'Generation': t, 'xOC': xOC_values, 'xOB':
                                                 xOB_values, 'xMM': xMM_values})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOB_OC': BOB_OC,
+                'BMM_OC': BMM_OC, 'BOC_OB': BOC_OB, 'BOB_OB': BOB_OB,
+                'BMM_OB': BMM_OB, 'BOC_MM': BOC_MM, 'BOB_MM': BOB_MM,
+                'BMM_MM': BMM_MM, 'hOC_OC': hOC_OC, 'hOC_OB': hOC_OB,
+                'hOC_MM': hOC_MM, 'hOB_OC': hOB_OC, 'hOB_OB': hOB_OB,
+                'hOB_MM': hOB_MM, 'hMM_OC': hMM_OC, 'hMM_OB': hMM_OB,
+                'hMM_MM': hMM_MM, 'sOC_OC': sOC_OC, 'sOC_OB': sOC_OB,
+                'sOC_MM': sOC_MM, 'sOB_OC': sOB_OC, 'sOB_OB': sOB_OB,
+                'sOB_MM': sOB_MM, 'sMM_OC': sMM_OC, 'sMM_OB': sMM_OB,
+                'sMM_MM': sMM_MM, 's_linear': s_linear}
+
     # Save the data as csv file
     save_data(df_Figure_6_nonlinear, 'data_Figure_6_nonlinear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_Figure_6_linear, 'data_Figure_6_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make a line plot of non-linear data
     df_Figure_6_nonlinear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1515,8 +1590,8 @@ def Figure_6():
     plt.title('Nonlinear benefits (Figure 6)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_6_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot of non-linear data
     fig = px.line_ternary(df_Figure_6_nonlinear, a='xOB', b='xMM', c='xOC')
@@ -1527,8 +1602,8 @@ def Figure_6():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Nonlinear benefits (Figure 6)')
     save_ternary(fig, 'Ternary_plot_Figure_6_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
     # Make a line plot of linear data
     df_Figure_6_linear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1538,8 +1613,8 @@ def Figure_6():
     plt.title('Linear benefits (Figure 6)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_6_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot  of linear data
     fig = px.line_ternary(df_Figure_6_linear, a='xOB', b='xMM', c='xOC')
@@ -1550,8 +1625,8 @@ def Figure_6():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Linear benefits (Figure 6)')
     save_ternary(fig, 'Ternary_plot_Figure_6_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
 """Figure 7"""
 def Figure_7():
@@ -1704,13 +1779,26 @@ def Figure_7():
     df_Figure_7_linear = pd.DataFrame({'Generation': t, 'xOC': xOC_values,
                                         'xOB': xOB_values, 'xMM': xMM_values})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOB_OC': BOB_OC,
+                'BMM_OC': BMM_OC, 'BOC_OB': BOC_OB, 'BOB_OB': BOB_OB,
+                'BMM_OB': BMM_OB, 'BOC_MM': BOC_MM, 'BOB_MM': BOB_MM,
+                'BMM_MM': BMM_MM, 'hOC_OC': hOC_OC, 'hOC_OB': hOC_OB,
+                'hOC_MM': hOC_MM, 'hOB_OC': hOB_OC, 'hOB_OB': hOB_OB,
+                'hOB_MM': hOB_MM, 'hMM_OC': hMM_OC, 'hMM_OB': hMM_OB,
+                'hMM_MM': hMM_MM, 'sOC_OC': sOC_OC, 'sOC_OB': sOC_OB,
+                'sOC_MM': sOC_MM, 'sOB_OC': sOB_OC, 'sOB_OB': sOB_OB,
+                'sOB_MM': sOB_MM, 'sMM_OC': sMM_OC, 'sMM_OB': sMM_OB,
+                'sMM_MM': sMM_MM, 's_linear': s_linear}
+
     # Save the data as csv file
     save_data(df_Figure_7_nonlinear, 'data_Figure_7_nonlinear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_Figure_7_linear, 'data_Figure_7_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_Figure_7_linear, 'data_Figure_7_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Create a Figure and axes for subplots
     fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(14,6))
@@ -1731,8 +1819,8 @@ def Figure_7():
     axes[1].legend(['fraction OC', 'fraction OB', 'fraction MM'])
     plt.tight_layout()
     save_Figure(plt, 'Line_plot_Figure_7_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
 
     # Make a ternary plot of non-linear data
@@ -1744,8 +1832,8 @@ def Figure_7():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Nonlinear benefits (Figure 7)')
     save_ternary(fig, 'Ternary_plot_Figure_7_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
     # Make a line plot of linear data
     df_Figure_7_linear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1755,8 +1843,8 @@ def Figure_7():
     plt.title('Linear benefits (Figure 7)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_7_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot  of linear data
     fig = px.line_ternary(df_Figure_7_linear, a='xOB', b='xMM', c='xOC')
@@ -1767,8 +1855,8 @@ def Figure_7():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Linear benefits (Figure 7)')
     save_ternary(fig, 'Ternary_plot_Figure_7_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
 """Figure 8"""
 def Figure_8():
@@ -1921,13 +2009,26 @@ def Figure_8():
     df_Figure_8_linear = pd.DataFrame({'Generation': t, 'xOC': xOC_values,
                                             'xOB': xOB_values, 'xMM': xMM_values})
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOB_OC': BOB_OC,
+                'BMM_OC': BMM_OC, 'BOC_OB': BOC_OB, 'BOB_OB': BOB_OB,
+                'BMM_OB': BMM_OB, 'BOC_MM': BOC_MM, 'BOB_MM': BOB_MM,
+                'BMM_MM': BMM_MM, 'hOC_OC': hOC_OC, 'hOC_OB': hOC_OB,
+                'hOC_MM': hOC_MM, 'hOB_OC': hOB_OC, 'hOB_OB': hOB_OB,
+                'hOB_MM': hOB_MM, 'hMM_OC': hMM_OC, 'hMM_OB': hMM_OB,
+                'hMM_MM': hMM_MM, 'sOC_OC': sOC_OC, 'sOC_OB': sOC_OB,
+                'sOC_MM': sOC_MM, 'sOB_OC': sOB_OC, 'sOB_OB': sOB_OB,
+                'sOB_MM': sOB_MM, 'sMM_OC': sMM_OC, 'sMM_OB': sMM_OB,
+                'sMM_MM': sMM_MM, 's_linear': s_linear}
+
     # Save the data as csv file
     save_data(df_Figure_8_nonlinear, 'data_Figure_8_nonlinear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_Figure_8_linear, 'data_Figure_8_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
     save_data(df_fitness_nonlinear, 'data_fitness_Figure_8_linear.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Create a Figure and axes for subplots
     fig, axes = plt.subplots(nrows=1, ncols=2, figsize=(14,6))
@@ -1948,8 +2049,8 @@ def Figure_8():
     axes[1].legend(['fraction OC', 'fraction OB', 'fraction MM'])
     plt.tight_layout()
     save_Figure(plt, 'Line_plot_Figure_8_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot of nonlinear data
     fig = px.line_ternary(df_Figure_8_nonlinear, a='xOB', b='xMM', c='xOC')
@@ -1960,8 +2061,8 @@ def Figure_8():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Nonlinear benefits (Figure 8)')
     save_ternary(fig, 'Ternary_plot_Figure_8_nonlinear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
     # Make a line plot of linear data
     df_Figure_8_linear.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -1971,8 +2072,8 @@ def Figure_8():
     plt.title('Linear benefits (Figure 8)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_8_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot of linear data
     fig = px.line_ternary(df_Figure_8_linear, a='xOB', b='xMM', c='xOC')
@@ -1983,8 +2084,8 @@ def Figure_8():
             caxis=dict(ticks='outside', tickvals=[0, 0.25, 0.5, 0.75, 1]),))
     fig.update_layout(title_text= 'Linear benefits (Figure 8)')
     save_ternary(fig, 'Ternary_plot_Figure_8_linear',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig)
 
 """Figure 9"""
 def Figure_9():
@@ -2040,9 +2141,16 @@ def Figure_9():
     df_Figure_9_no_treatment = pd.DataFrame({'Generation': t, 'xOC': xOC_values,
                                         'xOB': xOB_values, 'xMM': xMM_values})
 
+    # The parameters that are saved with the data
+    metadata = {'cOC_value': cOC_value, 'cOB_value': cOB_value,
+                'cMM_value': cMM_value, 'BOC_OC': BOC_OC, 'BOC_OB': BOC_OB,
+                'BOC_MM': BOC_MM, 'BOB_OC': BOB_OC, 'BOB_OB': BOB_OB,
+                'BOB_MM': BOB_MM, 'BMM_OC': BMM_OC, 'BMM_OB': BMM_OB,
+                'BMM_MM': BMM_MM}
+
     # Save the data as csv file
     save_data(df_Figure_9_no_treatment, 'data_Figure_9_no_treatment.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Reset initial values for each h iteration
     xOC = 0.5
@@ -2073,7 +2181,7 @@ def Figure_9():
 
     # Save the data as csv file
     save_data(df_Figure_9_reducing_MM, 'data_Figure_9_reducing_MM.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Reset initial values for each h iteration
     xOC = 0.4
@@ -2104,7 +2212,7 @@ def Figure_9():
 
     # Save the data as csv file
     save_data(df_Figure_9_increasing_h, 'data_Figure_9_increasing_h.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make a line plot of no treatment
     df_Figure_9_no_treatment.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -2114,8 +2222,8 @@ def Figure_9():
     plt.title('No treatment (Figure 9)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_9_reducing_MM',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot to show the effect of a decrease in MM cells
     fig1 = px.line_ternary(df_Figure_9_reducing_MM, a='xOB', b='xMM', c='xOC')
@@ -2134,8 +2242,8 @@ def Figure_9():
     fig1.data[1].update(line=dict(color='blue'))
     fig1.update_layout(title_text= 'Reducing MM cells (Figure 9)')
     save_ternary(fig1, 'Ternary_plot_Figure_9_reducing_MM',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig1.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig1)
 
     # Make a line plot of the effect of a decrease in MM cells
     df_Figure_9_reducing_MM.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -2145,8 +2253,8 @@ def Figure_9():
     plt.title('Reducing MM cells (Figure 9)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_9_reducing_MM',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
     # Make a ternary plot to show the effect of an increase in h
     fig3 = px.line_ternary(df_Figure_9_increasing_h, a='xOB', b='xMM', c='xOC')
@@ -2164,8 +2272,8 @@ def Figure_9():
     fig3.data[1].update(line=dict(color='blue'))
     fig3.update_layout(title_text= 'Increasing h (Figure 9)')
     save_ternary(fig3, 'Ternary_plot_Figure_9_increasing_h',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    fig3.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show(fig3)
 
     # Make a line plot of the effect of a increase in the h value
     df_Figure_9_increasing_h.plot(x= 'Generation', y= ['xOC', 'xOB', 'xMM'],
@@ -2175,8 +2283,8 @@ def Figure_9():
     plt.title('Increase of the inflection point h (Figure 9)')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Line_plot_Figure_9_increasing_h',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
 """Figure 10"""
 def Figure_10():
@@ -2201,9 +2309,13 @@ def Figure_10():
                 pd.DataFrame({'n_values': n_values, 'benefit_values': benefit_data,
                 's_value': s_value}))
 
+    # The parameters that are saved with the data
+    metadata = {'N': N, 'h_value': h_value, 'B_value': B_value,
+                'steepness_values': steepness_values}
+
     # Save the data as csv file
     save_data(df_Figure_10, 'data_Figure_10.csv',
-                                r'..\data\data_model_Sartakhti_nonlinear')
+                          data_path('data_model_Sartakhti_nonlinear'), metadata)
 
     # Make a plot
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -2220,8 +2332,8 @@ def Figure_10():
     plt.ylabel('Benefit')
     plt.legend(loc ='upper right')
     save_Figure(plt, 'Benefit_function_Figure_10',
-                    r'..\visualisation\results_model_Sartakhti_nonlinear')
-    plt.show()
+                    figure_path('results_model_Sartakhti_nonlinear'))
+    show()
 
 if __name__ == "__main__":
     main()